@@ -0,0 +1,17 @@
+# Generated by Django 3.2.22 on 2026-10-19 12:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("app", "0025_auto_20230420_1544"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="app",
+            name="query_cost_budget",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+    ]
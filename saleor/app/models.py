@@ -65,6 +65,8 @@ class App(ModelWithMetadata):
     brand_logo_default = models.ImageField(
         upload_to="app-brand-data", blank=True, null=True
     )
+    # Overrides the GRAPHQL_QUERY_COST_BUDGET setting, 0 means no budget.
+    query_cost_budget = models.PositiveIntegerField(blank=True, null=True)
     objects = AppManager()
 
     class Meta(ModelWithMetadata.Meta):
@@ -89,8 +91,15 @@ class App(ModelWithMetadata):
             return set()
         perm_cache_name = "_app_perm_cache"
         if not hasattr(self, perm_cache_name):
-            perms = self.permissions.all()
-            perms = perms.values_list("content_type__app_label", "codename").order_by()
+            if "permissions" in getattr(self, "_prefetched_objects_cache", {}):
+                perms = [
+                    (perm.content_type.app_label, perm.codename)
+                    for perm in self.permissions.all()
+                ]
+            else:
+                perms = self.permissions.values_list(
+                    "content_type__app_label", "codename"
+                ).order_by()
             setattr(self, perm_cache_name, {f"{ct}.{name}" for ct, name in perms})
         return getattr(self, perm_cache_name)
 
@@ -8,6 +8,7 @@ https://docs.djangoproject.com/en/3.1/howto/deployment/asgi/
 
 import os
 
+from django.conf import settings
 from django.core.asgi import get_asgi_application
 
 from .cors_handler import cors_handler
@@ -16,7 +17,24 @@ from .health_check import health_check
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "saleor.settings")
 
+
+def build_graphql_schema():
+    # Imported after the Django setup, as it loads the models.
+    from ..graphql.api import get_schema
+    from ..graphql.introspection import get_schema_artifacts
+
+    get_schema_artifacts(get_schema())
+
+
 application = get_asgi_application()
+
+# Build the GraphQL schema and its introspection before serving the first request.
+build_graphql_schema()
+
 application = health_check(application, "/health/")  # type: ignore[arg-type] # Django's ASGI app is less strict than the spec # noqa: E501
-application = gzip_compression(application)
+application = gzip_compression(
+    application,
+    compresslevel=settings.GZIP_COMPRESSION_LEVEL,
+    brotli_quality=settings.BROTLI_COMPRESSION_QUALITY,
+)
 application = cors_handler(application)
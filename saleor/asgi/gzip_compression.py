@@ -3,7 +3,7 @@
 
 import gzip
 import io
-from typing import Optional
+from typing import Optional, Union
 
 from asgiref.typing import (
     ASGI3Application,
@@ -14,30 +14,84 @@ from asgiref.typing import (
     Scope,
 )
 
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+class GzipCompressor:
+    encoding = b"gzip"
+
+    def __init__(self, compresslevel: int):
+        self.buffer = io.BytesIO()
+        self.file = gzip.GzipFile(
+            mode="wb", fileobj=self.buffer, compresslevel=compresslevel
+        )
+
+    def compress(self, data: bytes, finish: bool) -> bytes:
+        self.file.write(data)
+        if finish:
+            self.file.close()
+        compressed = self.buffer.getvalue()
+        self.buffer.seek(0)
+        self.buffer.truncate()
+        return compressed
+
+
+class BrotliCompressor:
+    encoding = b"br"
+
+    def __init__(self, quality: int):
+        self.compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes, finish: bool) -> bytes:
+        compressed = self.compressor.process(data)
+        if finish:
+            compressed += self.compressor.finish()
+        return compressed
+
+
+def get_accepted_encodings(scope: Scope) -> set:
+    accepted_encoding = next(
+        (value for key, value in scope["headers"] if key.lower() == b"accept-encoding"),
+        b"",
+    )
+    return {
+        encoding.split(b";")[0].strip() for encoding in accepted_encoding.split(b",")
+    }
+
 
 def gzip_compression(
-    app: ASGI3Application, minimum_size: int = 500, compresslevel: int = 9
+    app: ASGI3Application,
+    minimum_size: int = 500,
+    compresslevel: int = 9,
+    brotli_quality: Optional[int] = None,
 ) -> ASGI3Application:
+    """Compress responses with gzip, or brotli when enabled and accepted.
+
+    Streamed responses, including the Django responses sent in chunks, are
+    compressed incrementally.
+    """
+
     async def gzip_compression_wrapper(
         scope: Scope, receive: ASGIReceiveCallable, send: ASGISendCallable
     ) -> None:
         if scope["type"] == "http":
-            accepted_encoding = next(
-                (
-                    value
-                    for key, value in scope["headers"]
-                    if key.lower() == b"accept-encoding"
-                ),
-                b"",
-            )
-            if b"gzip" in accepted_encoding:
+            accepted_encodings = get_accepted_encodings(scope)
+            compressor: Union[GzipCompressor, BrotliCompressor, None] = None
+            if (
+                brotli is not None
+                and brotli_quality is not None
+                and b"br" in accepted_encodings
+            ):
+                compressor = BrotliCompressor(brotli_quality)
+            elif b"gzip" in accepted_encodings:
+                compressor = GzipCompressor(compresslevel)
+            if compressor is not None:
                 start_message: Optional[HTTPResponseStartEvent] = None
                 content_encoding_set = False
                 started = False
-                gzip_buffer = io.BytesIO()
-                gzip_file = gzip.GzipFile(
-                    mode="wb", fileobj=gzip_buffer, compresslevel=compresslevel
-                )
 
                 async def send_compressed(message: ASGISendEvent) -> None:
                     nonlocal content_encoding_set
@@ -65,14 +119,12 @@ def gzip_compression(
                         body = message.get("body", b"")
                         more_body = message.get("more_body", False)
                         if len(body) < minimum_size and not more_body:
-                            # Don't apply GZip to small outgoing responses.
+                            # Don't compress small outgoing responses.
                             await send(start_message)
                             await send(message)
                         elif not more_body:
-                            # Standard GZip response.
-                            gzip_file.write(body)
-                            gzip_file.close()
-                            body = gzip_buffer.getvalue()
+                            # Standard compressed response.
+                            body = compressor.compress(body, finish=True)
 
                             headers = start_message["headers"]
                             headers = [
@@ -81,7 +133,7 @@ def gzip_compression(
                                 if key.lower()
                                 not in (b"content-length", b"content-encoding")
                             ]
-                            headers.append((b"content-encoding", b"gzip"))
+                            headers.append((b"content-encoding", compressor.encoding))
                             headers.append(
                                 (
                                     b"content-length",
@@ -100,7 +152,7 @@ def gzip_compression(
                             await send(start_message)
                             await send(message)
                         else:
-                            # Initial body in streaming GZip response.
+                            # Initial body in streaming compressed response.
                             headers = start_message["headers"]
                             headers = [
                                 (key, value)
@@ -108,7 +160,7 @@ def gzip_compression(
                                 if key.lower()
                                 not in (b"content-length", b"content-encoding")
                             ]
-                            headers.append((b"content-encoding", b"gzip"))
+                            headers.append((b"content-encoding", compressor.encoding))
                             for key, value in headers:
                                 if key.lower() == b"vary":
                                     if b"Accept-Encoding" not in value:
@@ -116,26 +168,19 @@ def gzip_compression(
                                         break
                             start_message["headers"] = headers
 
-                            gzip_file.write(body)
-                            message["body"] = gzip_buffer.getvalue()
-                            gzip_buffer.seek(0)
-                            gzip_buffer.truncate()
+                            message["body"] = compressor.compress(body, finish=False)
 
                             await send(start_message)
                             await send(message)
 
                     elif message["type"] == "http.response.body":
-                        # Remaining body in streaming GZip response.
+                        # Remaining body in streaming compressed response.
                         body = message.get("body", b"")
                         more_body = message.get("more_body", False)
 
-                        gzip_file.write(body)
-                        if not more_body:
-                            gzip_file.close()
-
-                        message["body"] = gzip_buffer.getvalue()
-                        gzip_buffer.seek(0)
-                        gzip_buffer.truncate()
+                        message["body"] = compressor.compress(
+                            body, finish=not more_body
+                        )
 
                         await send(message)
 
@@ -1,6 +1,7 @@
 import gzip
 from typing import List
 
+import brotli
 from asgiref.typing import (
     ASGI3Application,
     ASGIReceiveEvent,
@@ -87,3 +88,57 @@ async def test_with_supported_compression(large_asgi_app: ASGI3Application, sett
             type="http.response.body", body=expected_payload, more_body=False
         ),
     ]
+
+
+async def test_with_brotli_compression(large_asgi_app: ASGI3Application, settings):
+    settings.ALLOWED_GRAPHQL_ORIGINS = ["*"]
+    cors_app = gzip_compression(large_asgi_app, brotli_quality=4)
+    events = await run_app(
+        cors_app, build_scope("http://localhost:3000", b"gzip, deflate, br")
+    )
+    start, body = events
+    assert (b"content-encoding", b"br") in start["headers"]
+    assert brotli.decompress(body["body"]) == 10000 * b"x"
+
+
+async def test_brotli_compression_disabled(large_asgi_app: ASGI3Application, settings):
+    settings.ALLOWED_GRAPHQL_ORIGINS = ["*"]
+    cors_app = gzip_compression(large_asgi_app)
+    events = await run_app(
+        cors_app, build_scope("http://localhost:3000", b"gzip, deflate, br")
+    )
+    start, body = events
+    assert (b"content-encoding", b"gzip") in start["headers"]
+    assert gzip.decompress(body["body"]) == 10000 * b"x"
+
+
+async def test_streaming_compression(settings):
+    settings.ALLOWED_GRAPHQL_ORIGINS = ["*"]
+    chunks = [1000 * b"x", 1000 * b"y", b""]
+
+    async def streaming_app(scope, receive, send) -> None:
+        await send(
+            HTTPResponseStartEvent(
+                type="http.response.start",
+                status=200,
+                headers=[(b"content-type", b"application/json")],
+                trailers=False,
+            )
+        )
+        for index, chunk in enumerate(chunks):
+            await send(
+                HTTPResponseBodyEvent(
+                    type="http.response.body",
+                    body=chunk,
+                    more_body=index < len(chunks) - 1,
+                )
+            )
+
+    cors_app = gzip_compression(streaming_app, compresslevel=1)
+    events = await run_app(cors_app, build_scope("http://localhost:3000", b"gzip"))
+    start, *bodies = events
+    assert (b"content-encoding", b"gzip") in start["headers"]
+    assert len(bodies) == len(chunks)
+    assert gzip.decompress(b"".join(body["body"] for body in bodies)) == b"".join(
+        chunks
+    )
@@ -66,6 +66,7 @@ from ..tax.utils import (
     get_tax_class_kwargs_for_order_line,
 )
 from ..warehouse.availability import check_stock_and_preorder_quantity_bulk
+from ..warehouse.availability_projection import mark_variants_availability_changed
 from ..warehouse.management import allocate_preorders, allocate_stocks
 from ..warehouse.models import Reservation, Stock
 from ..warehouse.reservations import is_reservation_enabled
@@ -1648,4 +1649,7 @@ def _reserve_stocks_without_availability_check(
                 )
             )
     Reservation.objects.bulk_create(reservations)
+    mark_variants_availability_changed(
+        reservation.stock.product_variant_id for reservation in reservations
+    )
     return reservations
@@ -1,5 +1,16 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from http.cookiejar import DefaultCookiePolicy
+from typing import Optional, Tuple
+from urllib.parse import urlsplit
+
 import requests_hardened
 from django.conf import settings
+from requests.adapters import HTTPAdapter
+from requests_hardened import HTTPSession
+from requests_hardened.host_header_adapter import HostHeaderSSLAdapter
 
 from .. import user_agent_version
 
@@ -12,3 +23,135 @@ HTTPConfig = requests_hardened.Config(
 )
 
 HTTPClient = requests_hardened.Manager(HTTPConfig)
+
+
+class _PooledSession:
+    __slots__ = ("session", "last_used_at", "users_count", "evicted")
+
+    def __init__(self, session: HTTPSession):
+        self.session = session
+        self.last_used_at = time.monotonic()
+        self.users_count = 0
+        self.evicted = False
+
+
+class HTTPSessionPool(requests_hardened.Manager):
+    """Keep a hardened HTTP session, with its open connections, per target host.
+
+    Sessions are shared by the threads of a process and dropped after a fork.
+    Sessions that weren't used for `idle_timeout` seconds are evicted, as well as
+    the least recently used ones when there are more than `max_hosts` of them.
+    Evicted sessions are closed once the requests using them finish.
+    With `max_hosts` set to 0 every request uses a new session.
+    """
+
+    __slots__ = (
+        "max_hosts",
+        "max_connections_per_host",
+        "idle_timeout",
+        "_sessions",
+        "_lock",
+        "_pid",
+    )
+
+    def __init__(
+        self,
+        config: requests_hardened.Config,
+        max_hosts: int,
+        max_connections_per_host: int,
+        idle_timeout: float,
+    ):
+        super().__init__(config)
+        self.max_hosts = max_hosts
+        self.max_connections_per_host = max_connections_per_host
+        self.idle_timeout = idle_timeout
+        self._sessions: "OrderedDict[Tuple[str, str], _PooledSession]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._pid: Optional[int] = None
+
+    def send_request(self, method: str, url: str, **kwargs):
+        if not self.max_hosts:
+            return super().send_request(method, url, **kwargs)
+        pooled_session = self._acquire_session(url)
+        try:
+            return pooled_session.session.request(method, url, **kwargs)
+        finally:
+            self._release_session(pooled_session)
+
+    def get_pooled_session(self, url: str) -> HTTPSession:
+        """Return the session of the URL host without marking it as in use."""
+        pooled_session = self._acquire_session(url)
+        self._release_session(pooled_session)
+        return pooled_session.session
+
+    def _acquire_session(self, url: str) -> _PooledSession:
+        parts = urlsplit(url)
+        key = (parts.scheme.lower(), parts.netloc.lower())
+        now = time.monotonic()
+        with self._lock:
+            if self._pid != os.getpid():
+                # Connections opened by the parent process can't be shared.
+                self._sessions.clear()
+                self._pid = os.getpid()
+            self._evict_idle_sessions(now)
+            pooled_session = self._sessions.pop(key, None)
+            if pooled_session is None:
+                pooled_session = _PooledSession(self._create_session())
+            pooled_session.last_used_at = now
+            pooled_session.users_count += 1
+            self._sessions[key] = pooled_session
+            while len(self._sessions) > self.max_hosts:
+                _, evicted = self._sessions.popitem(last=False)
+                self._evict_session(evicted)
+        return pooled_session
+
+    def _release_session(self, pooled_session: _PooledSession):
+        with self._lock:
+            pooled_session.users_count -= 1
+            if pooled_session.evicted and not pooled_session.users_count:
+                pooled_session.session.close()
+
+    def _evict_session(self, pooled_session: _PooledSession):
+        # Sessions still in use are closed by the last request using them.
+        pooled_session.evicted = True
+        if not pooled_session.users_count:
+            pooled_session.session.close()
+
+    def _evict_idle_sessions(self, now: float):
+        while self._sessions:
+            key, pooled_session = next(iter(self._sessions.items()))
+            if now - pooled_session.last_used_at < self.idle_timeout:
+                break
+            del self._sessions[key]
+            self._evict_session(pooled_session)
+
+    def _create_session(self) -> HTTPSession:
+        session = self.get_session()
+        session.mount(
+            "https://",
+            HostHeaderSSLAdapter(
+                pool_connections=1, pool_maxsize=self.max_connections_per_host
+            ),
+        )
+        session.mount(
+            "http://",
+            HTTPAdapter(pool_connections=1, pool_maxsize=self.max_connections_per_host),
+        )
+        # Sessions are shared between requests, cookies set by one app response
+        # mustn't be sent with the next requests.
+        session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        return session
+
+    def clear(self):
+        with self._lock:
+            for pooled_session in self._sessions.values():
+                self._evict_session(pooled_session)
+            self._sessions.clear()
+
+
+PooledHTTPClient = HTTPSessionPool(
+    HTTPConfig,
+    max_hosts=settings.HTTP_SESSION_POOL_MAX_HOSTS,
+    max_connections_per_host=settings.HTTP_SESSION_POOL_MAX_CONNECTIONS_PER_HOST,
+    idle_timeout=settings.HTTP_SESSION_POOL_IDLE_TIMEOUT,
+)
@@ -0,0 +1,62 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from ....product.models import ProductVariant
+from ....warehouse.availability_projection import (
+    VARIANTS_AVAILABILITY_BATCH_SIZE,
+    get_channels_shipping_configuration,
+    get_variants_availability_mismatches,
+    update_variants_availability,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Verify the projected availability of product variants against their "
+        "stocks, allocations and reservations."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--fix",
+            action="store_true",
+            help="Recalculate the availability of the mismatched variants.",
+        )
+
+    def handle(self, *args, **options):
+        configuration = get_channels_shipping_configuration()
+        mismatched_variant_ids = []
+        start_pk = 0
+        while True:
+            variant_ids = list(
+                ProductVariant.objects.filter(pk__gt=start_pk)
+                .order_by("pk")
+                .values_list("pk", flat=True)[:VARIANTS_AVAILABILITY_BATCH_SIZE]
+            )
+            if not variant_ids:
+                break
+            mismatched_variant_ids.extend(
+                get_variants_availability_mismatches(variant_ids, configuration)
+            )
+            start_pk = variant_ids[-1]
+
+        if not mismatched_variant_ids:
+            self.stdout.write("Variants availability is consistent.")
+            return
+
+        self.stdout.write(
+            f"Availability of {len(mismatched_variant_ids)} variants is inconsistent: "
+            f"{', '.join(str(pk) for pk in mismatched_variant_ids)}."
+        )
+        if not options["fix"]:
+            raise CommandError("Variants availability is inconsistent.")
+
+        for index in range(
+            0, len(mismatched_variant_ids), VARIANTS_AVAILABILITY_BATCH_SIZE
+        ):
+            update_variants_availability(
+                mismatched_variant_ids[
+                    index : index + VARIANTS_AVAILABILITY_BATCH_SIZE
+                ],
+                configuration,
+            )
+        self.stdout.write("Recalculated availability of the inconsistent variants.")
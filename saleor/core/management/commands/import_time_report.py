@@ -0,0 +1,70 @@
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+from django.core.management.base import BaseCommand, CommandError
+
+IMPORT_TIME_PREFIX = "import time:"
+
+
+def parse_import_times(output: str, depth: int) -> List[Tuple[str, int]]:
+    """Sum the self import times reported by `python -X importtime` per package.
+
+    Modules are grouped by the first `depth` parts of their names. Return the
+    groups with their times in microseconds, the slowest first.
+    """
+    times: Dict[str, int] = defaultdict(int)
+    for line in output.splitlines():
+        if not line.startswith(IMPORT_TIME_PREFIX):
+            continue
+        self_time, _cumulative, module = line[len(IMPORT_TIME_PREFIX) :].split("|")
+        if not self_time.strip().isdigit():
+            # Header line.
+            continue
+        group = ".".join(module.strip().split(".")[:depth])
+        times[group] += int(self_time)
+    return sorted(times.items(), key=lambda item: item[1], reverse=True)
+
+
+class Command(BaseCommand):
+    help = (
+        "Report the time of importing a module after the Django setup, per package. "
+        "Use it to find the imports slowing down the start of API and Celery workers."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "module",
+            nargs="?",
+            default="saleor.urls",
+            help="Module to import, e.g. saleor.urls or saleor.celeryconf.",
+        )
+        parser.add_argument(
+            "--depth",
+            type=int,
+            default=3,
+            help="Number of module name parts by which the import times are grouped.",
+        )
+        parser.add_argument(
+            "--limit", type=int, default=20, help="Number of packages to report."
+        )
+
+    def handle(self, *args, **options):
+        code = f"import django; django.setup(); import {options['module']}"
+        process = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            env=os.environ.copy(),
+            capture_output=True,
+            text=True,
+        )
+        if process.returncode:
+            raise CommandError(process.stderr.strip().splitlines()[-1])
+
+        import_times = parse_import_times(process.stderr, options["depth"])
+        total = sum(time for _, time in import_times)
+        self.stdout.write(f"Total import time: {total / 1e6:.2f}s")
+        for package, time in import_times[: options["limit"]]:
+            share = time / total if total else 0
+            self.stdout.write(f"{time / 1e6:8.3f}s {share:6.1%}  {package}")
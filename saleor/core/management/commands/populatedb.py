@@ -19,6 +19,7 @@ from ...utils.random_data import (
     create_page_type,
     create_pages,
     create_permission_groups,
+    create_product_copies,
     create_product_promotions,
     create_products_by_schema,
     create_shipping_zones,
@@ -52,6 +53,15 @@ class Command(BaseCommand):
             default=False,
             help="Don't create product images",
         )
+        parser.add_argument(
+            "--scale",
+            type=int,
+            default=1,
+            help=(
+                "Multiply the number of products, users and orders, e.g. to "
+                "benchmark the API against a larger database."
+            ),
+        )
         parser.add_argument(
             "--skipsequencereset",
             action="store_true",
@@ -88,6 +98,7 @@ class Command(BaseCommand):
             "DummyCreditCardGatewayPlugin",
         ]
         create_images = not options["withoutimages"]
+        scale = options["scale"]
         for msg in create_channels():
             self.stdout.write(msg)
         for msg in create_shipping_zones():
@@ -100,13 +111,15 @@ class Command(BaseCommand):
             self.stdout.write(msg)
         create_products_by_schema(self.placeholders_dir, create_images)
         self.stdout.write("Created products")
+        for msg in create_product_copies(scale - 1):
+            self.stdout.write(msg)
         for msg in create_product_promotions(2):
             self.stdout.write(msg)
         for msg in create_vouchers():
             self.stdout.write(msg)
-        for msg in create_users(user_password, 20):
+        for msg in create_users(user_password, 20 * scale):
             self.stdout.write(msg)
-        for msg in create_orders(20):
+        for msg in create_orders(20 * scale):
             self.stdout.write(msg)
         for msg in create_gift_cards():
             self.stdout.write(msg)
@@ -0,0 +1,86 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_datetime
+
+from ...models import EventDeliveryReplay
+from ...tasks import get_failed_event_deliveries, replay_event_deliveries_task
+
+
+def datetime_argument(value):
+    parsed_value = parse_datetime(value)
+    if parsed_value is None:
+        raise ValueError(value)
+    return parsed_value
+
+
+class Command(BaseCommand):
+    help = (
+        "Send again the failed webhook event deliveries that ran out of retries. "
+        "Deliveries are sent in batches, one batch every "
+        "EVENT_DELIVERY_REPLAY_BATCH_INTERVAL seconds."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--app", type=int, help="Replay deliveries of the app.")
+        parser.add_argument(
+            "--webhook", type=int, help="Replay deliveries of the webhook."
+        )
+        parser.add_argument(
+            "--created-after",
+            type=datetime_argument,
+            help="Replay deliveries created at or after the ISO 8601 date time.",
+        )
+        parser.add_argument(
+            "--created-before",
+            type=datetime_argument,
+            help="Replay deliveries created before the ISO 8601 date time.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.EVENT_DELIVERY_REPLAY_BATCH_SIZE,
+            help="Number of deliveries sent in a single batch.",
+        )
+        parser.add_argument(
+            "--progress",
+            action="store_true",
+            help="Show the progress of the recent replays instead of starting one.",
+        )
+
+    def handle(self, **options):
+        if options["progress"]:
+            self.show_progress()
+            return
+
+        if options["batch_size"] < 1:
+            raise CommandError("Batch size must be a positive number.")
+        total_count = get_failed_event_deliveries(
+            options["app"],
+            options["webhook"],
+            options["created_after"],
+            options["created_before"],
+        ).count()
+        if not total_count:
+            self.stdout.write("No failed event deliveries to replay.")
+            return
+
+        replay = EventDeliveryReplay.objects.create(
+            app_id=options["app"],
+            webhook_id=options["webhook"],
+            created_after=options["created_after"],
+            created_before=options["created_before"],
+            batch_size=options["batch_size"],
+            total_count=total_count,
+        )
+        replay_event_deliveries_task.delay(replay.pk)
+        self.stdout.write(
+            f"Replay {replay.pk} of {total_count} failed event deliveries started."
+        )
+
+    def show_progress(self):
+        for replay in EventDeliveryReplay.objects.all()[:10]:
+            self.stdout.write(
+                f"Replay {replay.pk} ({replay.status}): "
+                f"{replay.replayed_count}/{replay.total_count} deliveries, "
+                f"{replay.throughput:.2f} deliveries/s"
+            )
@@ -0,0 +1,17 @@
+# Generated by Django 3.2.22 on 2023-11-06 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0010_drop_vatlayer_tables"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="eventpayload",
+            name="payload_path",
+            field=models.CharField(blank=True, max_length=255, null=True),
+        ),
+    ]
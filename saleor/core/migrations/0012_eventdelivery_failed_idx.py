@@ -0,0 +1,24 @@
+# Generated by Django 3.2.22 on 2026-10-19 12:42
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("core", "0011_eventpayload_payload_path"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="eventdelivery",
+            index=django.contrib.postgres.indexes.BTreeIndex(
+                condition=models.Q(("status", "failed")),
+                fields=["webhook", "created_at"],
+                name="eventdelivery_failed_idx",
+            ),
+        ),
+    ]
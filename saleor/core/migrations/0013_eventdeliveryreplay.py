@@ -0,0 +1,53 @@
+# Generated by Django 3.2.22 on 2026-10-19 12:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0012_eventdelivery_failed_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EventDeliveryReplay",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("success", "Success"),
+                            ("failed", "Failed"),
+                            ("deleted", "Deleted"),
+                        ],
+                        default="pending",
+                        max_length=50,
+                    ),
+                ),
+                ("message", models.CharField(blank=True, max_length=255, null=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("created_after", models.DateTimeField(blank=True, null=True)),
+                ("created_before", models.DateTimeField(blank=True, null=True)),
+                ("batch_size", models.PositiveIntegerField()),
+                ("total_count", models.PositiveIntegerField(default=0)),
+                ("replayed_count", models.PositiveIntegerField(default=0)),
+                ("last_delivery_id", models.PositiveIntegerField(default=0)),
+                ("app_id", models.PositiveIntegerField(blank=True, null=True)),
+                ("webhook_id", models.PositiveIntegerField(blank=True, null=True)),
+            ],
+            options={
+                "ordering": ("-created_at",),
+            },
+        ),
+    ]
@@ -2,11 +2,12 @@ import datetime
 from typing import Any, TypeVar
 
 import pytz
-from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.indexes import BTreeIndex, GinIndex
 from django.db import models, transaction
 from django.db.models import F, JSONField, Max, Q
 
 from . import EventDeliveryStatus, JobStatus
+from .payload_storage import get_payload_storage, should_offload_payload
 from .utils.json_serializer import CustomJsonEncoder
 
 
@@ -142,10 +143,32 @@ class Job(models.Model):
         abstract = True
 
 
+class EventPayloadManager(models.Manager["EventPayload"]):
+    def build_with_payload_file(self, payload: str) -> "EventPayload":
+        """Return an unsaved payload, offloading large bodies to payload storage."""
+        if isinstance(payload, str) and should_offload_payload(payload):
+            payload_path = get_payload_storage().save(payload)
+            return self.model(payload="", payload_path=payload_path)
+        return self.model(payload=payload)
+
+    def create_with_payload_file(self, payload: str) -> "EventPayload":
+        event_payload = self.build_with_payload_file(payload)
+        event_payload.save(force_insert=True, using=self.db)
+        return event_payload
+
+
 class EventPayload(models.Model):
     payload = models.TextField()
+    payload_path = models.CharField(max_length=255, blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = EventPayloadManager()
+
+    def get_payload(self) -> str:
+        if self.payload_path:
+            return get_payload_storage().load(self.payload_path)
+        return self.payload
+
 
 class EventDelivery(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
@@ -162,6 +185,39 @@ class EventDelivery(models.Model):
 
     class Meta:
         ordering = ("-created_at",)
+        indexes = [
+            # Dead-letter index of deliveries that ran out of retries. Deliveries
+            # of an app are looked up by the webhooks of the app.
+            BTreeIndex(
+                fields=["webhook", "created_at"],
+                name="eventdelivery_failed_idx",
+                condition=Q(status=EventDeliveryStatus.FAILED),
+            ),
+        ]
+
+
+class EventDeliveryReplay(Job):
+    """Replay of failed event deliveries matching the filters, sent in batches."""
+
+    # Plain ids, not foreign keys: a replay of a deleted app or webhook must fail
+    # instead of losing its filter.
+    app_id = models.PositiveIntegerField(blank=True, null=True)
+    webhook_id = models.PositiveIntegerField(blank=True, null=True)
+    created_after = models.DateTimeField(blank=True, null=True)
+    created_before = models.DateTimeField(blank=True, null=True)
+    batch_size = models.PositiveIntegerField()
+    total_count = models.PositiveIntegerField(default=0)
+    replayed_count = models.PositiveIntegerField(default=0)
+    last_delivery_id = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ("-created_at",)
+
+    @property
+    def throughput(self) -> float:
+        """Return the number of deliveries replayed per second."""
+        duration = (self.updated_at - self.created_at).total_seconds()
+        return self.replayed_count / duration if duration > 0 else 0.0
 
 
 class EventDeliveryAttempt(models.Model):
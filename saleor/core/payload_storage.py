@@ -0,0 +1,120 @@
+import gzip
+import hashlib
+import os
+from datetime import datetime
+from typing import Iterator, Optional
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage, Storage, default_storage
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+PAYLOAD_FILES_DIRECTORY = "event_payloads"
+
+
+class BasePayloadStorage:
+    """Base class for stores keeping large event payloads outside the database."""
+
+    def save(self, payload: str) -> str:
+        """Store the payload and return the reference kept on `EventPayload`."""
+        raise NotImplementedError
+
+    def load(self, path: str) -> str:
+        raise NotImplementedError
+
+    def delete(self, path: str):
+        raise NotImplementedError
+
+    def exists(self, path: str) -> bool:
+        raise NotImplementedError
+
+    def get_modified_time(self, path: str) -> datetime:
+        raise NotImplementedError
+
+    def list_paths(self) -> Iterator[str]:
+        """Return references of all stored payloads."""
+        raise NotImplementedError
+
+
+class PayloadStorage(BasePayloadStorage):
+    """Keep gzip-compressed payloads in a Django storage.
+
+    Files are content-addressed by the SHA-256 of the payload, so identical payloads
+    sent to many apps (or triggered multiple times) are stored only once.
+
+    Unused files are deleted only after `EVENT_PAYLOAD_FILE_GRACE_PERIOD` since
+    their last modification, so a file reused by a payload which isn't committed
+    yet is not deleted. A file is reused only in the first half of that period;
+    later it's written again, which refreshes its modification time.
+    """
+
+    def __init__(self, storage: Optional[Storage] = None):
+        self.storage = storage or default_storage
+
+    @staticmethod
+    def get_path(content: bytes) -> str:
+        digest = hashlib.sha256(content).hexdigest()
+        return f"{PAYLOAD_FILES_DIRECTORY}/{digest[:2]}/{digest}.json.gz"
+
+    def save(self, payload: str) -> str:
+        content = payload.encode("utf-8")
+        path = self.get_path(content)
+        if self.storage.exists(path):
+            reuse_period = settings.EVENT_PAYLOAD_FILE_GRACE_PERIOD / 2
+            if self.get_modified_time(path) > timezone.now() - reuse_period:
+                return path
+            if isinstance(self.storage, FileSystemStorage):
+                # The storage would save the file under a new name.
+                os.utime(self.storage.path(path))
+                return path
+        # `mtime=0` keeps the compressed output deterministic for the same payload.
+        compressed = gzip.compress(
+            content, compresslevel=settings.EVENT_PAYLOAD_COMPRESS_LEVEL, mtime=0
+        )
+        # Object storages overwrite an existing file, others save it under a new
+        # name, which is returned.
+        return self.storage.save(path, ContentFile(compressed))
+
+    def load(self, path: str) -> str:
+        with self.storage.open(path, "rb") as payload_file:
+            return gzip.decompress(payload_file.read()).decode("utf-8")
+
+    def delete(self, path: str):
+        self.storage.delete(path)
+
+    def exists(self, path: str) -> bool:
+        return self.storage.exists(path)
+
+    def get_modified_time(self, path: str) -> datetime:
+        return self.storage.get_modified_time(path)
+
+    def list_paths(self) -> Iterator[str]:
+        try:
+            directories, _ = self.storage.listdir(PAYLOAD_FILES_DIRECTORY)
+        except FileNotFoundError:
+            return
+        for directory in directories:
+            directory_path = f"{PAYLOAD_FILES_DIRECTORY}/{directory}"
+            _, file_names = self.storage.listdir(directory_path)
+            for file_name in file_names:
+                yield f"{directory_path}/{file_name}"
+
+
+class FileSystemPayloadStorage(PayloadStorage):
+    """Keep payloads on the local filesystem under `MEDIA_ROOT`.
+
+    Meant for tests and local development, regardless of `DEFAULT_FILE_STORAGE`.
+    """
+
+    def __init__(self):
+        super().__init__(storage=FileSystemStorage())
+
+
+def get_payload_storage() -> BasePayloadStorage:
+    return import_string(settings.EVENT_PAYLOAD_STORAGE)()
+
+
+def should_offload_payload(payload: str) -> bool:
+    threshold = settings.EVENT_PAYLOAD_STORAGE_THRESHOLD
+    return bool(threshold) and len(payload) > threshold
@@ -0,0 +1,111 @@
+"""Selection of the database replica for reads, aware of the replication lag.
+
+With `DATABASE_REPLICA_LAG_AWARE_ROUTING` enabled, the lag and the replayed WAL
+position of every replica are measured at most once per
+`DATABASE_REPLICA_LAG_CHECK_INTERVAL` and shared by all processes through
+the cache. Replicas lagging more than `DATABASE_REPLICA_MAX_LAG` seconds are
+skipped. The WAL position of the last write of each requestor is kept in
+the cache too, so its reads go to the primary database until a replica
+replays that write (read-your-writes consistency). Reads are balanced
+randomly between the replicas that can serve them.
+"""
+import logging
+import math
+import random
+from dataclasses import dataclass
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, connections
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY_PREFIX = "db-replica:"
+
+REPLICA_STATUS_SQL = """
+    SELECT
+        pg_is_in_recovery(),
+        pg_last_wal_replay_lsn() - '0/0'::pg_lsn,
+        CASE
+            WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+            ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+        END
+"""
+CURRENT_LSN_SQL = "SELECT pg_current_wal_lsn() - '0/0'::pg_lsn"
+
+
+@dataclass
+class ReplicaStatus:
+    lag: float
+    # Replayed WAL position, None when the connection isn't a replica.
+    lsn: Optional[int] = None
+
+
+def measure_replica_status(connection_name: str) -> ReplicaStatus:
+    try:
+        with connections[connection_name].cursor() as cursor:
+            cursor.execute(REPLICA_STATUS_SQL)
+            in_recovery, lsn, lag = cursor.fetchone()
+    except DatabaseError:
+        logger.warning("Can't check the status of %s replica.", connection_name)
+        return ReplicaStatus(lag=math.inf)
+    if not in_recovery:
+        return ReplicaStatus(lag=0)
+    return ReplicaStatus(lag=float(lag or 0), lsn=int(lsn or 0))
+
+
+def get_replica_status(connection_name: str) -> ReplicaStatus:
+    key = f"{CACHE_KEY_PREFIX}status:{connection_name}"
+    status = cache.get(key)
+    if status is None:
+        status = measure_replica_status(connection_name)
+        cache.set(key, status, settings.DATABASE_REPLICA_LAG_CHECK_INTERVAL)
+    return status
+
+
+def _get_last_write_key(requestor_key: str) -> str:
+    return f"{CACHE_KEY_PREFIX}last-write:{requestor_key}"
+
+
+def record_write(requestor_key: str):
+    """Store the WAL position after the requestor's write.
+
+    It's kept for `DATABASE_REPLICA_MAX_LAG`, as replicas lagging more are skipped
+    anyway.
+    """
+    if not settings.DATABASE_REPLICA_LAG_AWARE_ROUTING:
+        return
+    with connections[settings.DATABASE_CONNECTION_DEFAULT_NAME].cursor() as cursor:
+        cursor.execute(CURRENT_LSN_SQL)
+        (lsn,) = cursor.fetchone()
+    cache.set(
+        _get_last_write_key(requestor_key),
+        int(lsn),
+        math.ceil(settings.DATABASE_REPLICA_MAX_LAG),
+    )
+
+
+def get_replica_connection_name(requestor_key: Optional[str] = None) -> str:
+    """Return the connection for the reads of the requestor.
+
+    Return the default connection when no replica has replayed the last write of
+    the requestor or all replicas lag too much.
+    """
+    replicas = settings.DATABASE_CONNECTION_REPLICA_NAMES
+    if not settings.DATABASE_REPLICA_LAG_AWARE_ROUTING:
+        return random.choice(replicas)
+    last_write_lsn = (
+        cache.get(_get_last_write_key(requestor_key)) if requestor_key else None
+    )
+    available_replicas = []
+    for connection_name in replicas:
+        status = get_replica_status(connection_name)
+        if status.lag > settings.DATABASE_REPLICA_MAX_LAG:
+            continue
+        if last_write_lsn and status.lsn is not None and status.lsn < last_write_lsn:
+            continue
+        available_replicas.append(connection_name)
+    if not available_replicas:
+        return settings.DATABASE_CONNECTION_DEFAULT_NAME
+    return random.choice(available_replicas)
@@ -1,5 +1,6 @@
 import datetime
 import logging
+from typing import List, Optional
 
 from botocore.exceptions import ClientError
 from celery.utils.log import get_task_logger
@@ -8,8 +9,13 @@ from django.core.files.storage import default_storage
 from django.db.models import Exists, OuterRef
 from django.utils import timezone
 
+from ..app.models import App
 from ..celeryconf import app
-from .models import EventDelivery, EventPayload
+from ..webhook.event_types import WebhookEventAsyncType
+from ..webhook.models import Webhook
+from . import EventDeliveryStatus, JobStatus
+from .models import EventDelivery, EventDeliveryReplay, EventPayload
+from .payload_storage import BasePayloadStorage, get_payload_storage
 
 task_logger: logging.Logger = get_task_logger(__name__)
 
@@ -36,12 +42,77 @@ def delete_event_payloads_task(expiration_date=None):
     qs = EventPayload.objects.filter(pk__in=ids)
     if ids:
         if expiration_date > timezone.now():
+            payload_paths = list(
+                qs.filter(payload_path__isnull=False)
+                .values_list("payload_path", flat=True)
+                .distinct()
+            )
             qs.delete()
+            if payload_paths:
+                delete_event_payload_files_task(payload_paths)
             delete_event_payloads_task.delay(expiration_date)
         else:
             task_logger.warning("Task invocation time limit reached, aborting task")
 
 
+@app.task
+def delete_event_payload_files_task(paths):
+    """Delete offloaded payload files that are no longer used by any payload.
+
+    Payload files are content-addressed and can be shared between payloads, so
+    a file is removed only when no remaining payload points to it. Files modified
+    within `EVENT_PAYLOAD_FILE_GRACE_PERIOD` can be used by payloads which aren't
+    committed yet; they are checked again once the period passes.
+    """
+    recent_paths = _delete_unused_event_payload_files(paths)
+    if recent_paths:
+        grace_period = settings.EVENT_PAYLOAD_FILE_GRACE_PERIOD
+        delete_event_payload_files_task.apply_async(
+            (recent_paths,), countdown=grace_period.total_seconds()
+        )
+
+
+@app.task
+def delete_unused_event_payload_files_task():
+    """Delete all stored payload files that are not used by any payload.
+
+    Payload files are saved before the transaction creating their payloads is
+    committed, so a rolled back transaction leaves the file behind. Files within
+    the grace period are skipped; they are checked again in the next run.
+    """
+    storage = get_payload_storage()
+    paths: List[str] = []
+    for path in storage.list_paths():
+        paths.append(path)
+        if len(paths) >= BATCH_SIZE:
+            _delete_unused_event_payload_files(paths, storage)
+            paths = []
+    if paths:
+        _delete_unused_event_payload_files(paths, storage)
+
+
+def _delete_unused_event_payload_files(
+    paths: List[str], storage: Optional[BasePayloadStorage] = None
+) -> List[str]:
+    """Delete the unused payload files and return the ones within the grace period."""
+    used_paths = set(
+        EventPayload.objects.filter(payload_path__in=paths).values_list(
+            "payload_path", flat=True
+        )
+    )
+    storage = storage or get_payload_storage()
+    grace_period = settings.EVENT_PAYLOAD_FILE_GRACE_PERIOD
+    recent_paths = []
+    for path in set(paths) - used_paths:
+        if not storage.exists(path):
+            continue
+        if storage.get_modified_time(path) > timezone.now() - grace_period:
+            recent_paths.append(path)
+            continue
+        storage.delete(path)
+    return recent_paths
+
+
 @app.task(
     autoretry_for=(ClientError,),
     retry_backoff=10,
@@ -56,3 +127,101 @@ def delete_product_media_task(media_id):
 def delete_files_from_storage_task(paths):
     for path in paths:
         default_storage.delete(path)
+
+
+def get_failed_event_deliveries(
+    app_id=None, webhook_id=None, created_after=None, created_before=None
+):
+    """Return failed async deliveries of active webhooks that can be sent again."""
+    deliveries = EventDelivery.objects.filter(
+        status=EventDeliveryStatus.FAILED,
+        event_type__in=WebhookEventAsyncType.ALL,
+        payload__isnull=False,
+        webhook__is_active=True,
+        webhook__app__is_active=True,
+    )
+    if app_id:
+        # Filter by the webhooks of the app, to look up the deliveries with
+        # the failed deliveries index.
+        deliveries = deliveries.filter(
+            webhook_id__in=Webhook.objects.filter(app_id=app_id).values("pk")
+        )
+    if webhook_id:
+        deliveries = deliveries.filter(webhook_id=webhook_id)
+    if created_after:
+        deliveries = deliveries.filter(created_at__gte=created_after)
+    if created_before:
+        deliveries = deliveries.filter(created_at__lt=created_before)
+    return deliveries
+
+
+def _get_deleted_replay_filter(replay: EventDeliveryReplay) -> Optional[str]:
+    if replay.app_id and not App.objects.filter(pk=replay.app_id).exists():
+        return "app"
+    if replay.webhook_id and not Webhook.objects.filter(pk=replay.webhook_id).exists():
+        return "webhook"
+    return None
+
+
+@app.task
+def replay_event_deliveries_task(replay_id):
+    """Send the next batch of failed deliveries matching the replay filters.
+
+    The task schedules itself for the next batch after
+    `EVENT_DELIVERY_REPLAY_BATCH_INTERVAL` seconds, until there are no deliveries
+    left to replay.
+    """
+    # Imported here, the webhook transport imports tasks from this module.
+    from ..webhook.transport.asynchronous.transport import send_webhook_requests_async
+
+    replay = EventDeliveryReplay.objects.filter(
+        pk=replay_id, status=JobStatus.PENDING
+    ).first()
+    if not replay:
+        return
+
+    deleted_filter = _get_deleted_replay_filter(replay)
+    if deleted_filter:
+        # Replaying without the filter would send deliveries of all apps.
+        replay.status = JobStatus.FAILED
+        replay.message = f"The {deleted_filter} of the replay was deleted."
+        replay.save(update_fields=["status", "message", "updated_at"])
+        task_logger.warning(
+            "Event delivery replay %r stopped, the %s was deleted.",
+            replay.pk,
+            deleted_filter,
+        )
+        return
+
+    deliveries = list(
+        get_failed_event_deliveries(
+            replay.app_id,
+            replay.webhook_id,
+            replay.created_after,
+            replay.created_before,
+        )
+        .filter(pk__gt=replay.last_delivery_id)
+        .select_related("webhook")
+        .order_by("pk")[: replay.batch_size]
+    )
+    if not deliveries:
+        replay.status = JobStatus.SUCCESS
+        replay.save(update_fields=["status", "updated_at"])
+        task_logger.info(
+            "Event delivery replay %r finished, %r deliveries replayed (%.2f/s).",
+            replay.pk,
+            replay.replayed_count,
+            replay.throughput,
+        )
+        return
+
+    EventDelivery.objects.filter(
+        pk__in=[delivery.pk for delivery in deliveries]
+    ).update(status=EventDeliveryStatus.PENDING)
+    replay.replayed_count += len(deliveries)
+    replay.last_delivery_id = deliveries[-1].pk
+    replay.save(update_fields=["replayed_count", "last_delivery_id", "updated_at"])
+    send_webhook_requests_async(deliveries)
+    replay_event_deliveries_task.apply_async(
+        (replay_id,), countdown=settings.EVENT_DELIVERY_REPLAY_BATCH_INTERVAL
+    )
@@ -1,3 +1,4 @@
+from io import StringIO
 from unittest.mock import Mock, patch
 from urllib.parse import urljoin
 
@@ -16,8 +17,12 @@ from ...giftcard.models import GiftCard, GiftCardEvent
 from ...order.models import Order
 from ...payment.models import TransactionItem
 from ...product import ProductTypeKind
-from ...product.models import ProductType
+from ...product.models import Product, ProductType
 from ...shipping.models import ShippingZone
+from ...webhook.event_types import WebhookEventAsyncType
+from .. import EventDeliveryStatus
+from ..management.commands.import_time_report import parse_import_times
+from ..models import EventDelivery, EventDeliveryReplay, EventPayload
 from ..storages import S3MediaStorage
 from ..utils import (
     build_absolute_uri,
@@ -145,6 +150,30 @@ def test_create_fake_order(db, monkeypatch, image, media_root, warehouse):
     assert Order.objects.all().count() == how_many_orders
 
 
+def test_create_product_copies(product):
+    # given
+    product.default_variant = product.variants.first()
+    product.save(update_fields=["default_variant"])
+
+    # when
+    for _ in random_data.create_product_copies(2):
+        pass
+
+    # then
+    copies = Product.objects.exclude(pk=product.pk)
+    assert copies.count() == 2
+    for copy in copies:
+        assert copy.slug.startswith(f"{product.slug}-copy-")
+        assert copy.variants.count() == product.variants.count()
+        assert copy.default_variant.product == copy
+        assert copy.channel_listings.count() == product.channel_listings.count()
+        assert copy.attributevalues.count() == product.attributevalues.count()
+        variant = copy.variants.get()
+        assert variant.sku.startswith("123-copy-")
+        assert variant.stocks.count() == 1
+        assert variant.attributes.get().values.count() == 1
+
+
 def test_create_product_promotions(db):
     how_many = 5
     channel_count = 0
@@ -455,3 +484,106 @@ def test_prepare_unique_attribute_value_slug_non_existing_slug(color_attribute):
     result = prepare_unique_attribute_value_slug(color_attribute, non_existing_slug)
 
     assert result == non_existing_slug
+
+
+@patch(
+    "saleor.core.management.commands.replay_event_deliveries."
+    "replay_event_deliveries_task.delay"
+)
+def test_replay_event_deliveries_command(mocked_task, webhook):
+    # given
+    payload = EventPayload.objects.create(payload="{}")
+    EventDelivery.objects.create(
+        status=EventDeliveryStatus.FAILED,
+        event_type=WebhookEventAsyncType.ANY,
+        payload=payload,
+        webhook=webhook,
+    )
+    out = StringIO()
+
+    # when
+    call_command(
+        "replay_event_deliveries",
+        "--app",
+        webhook.app_id,
+        "--created-after",
+        "2020-01-01T00:00:00+00:00",
+        "--batch-size",
+        "50",
+        stdout=out,
+    )
+
+    # then
+    replay = EventDeliveryReplay.objects.get()
+    assert replay.app_id == webhook.app_id
+    assert replay.batch_size == 50
+    assert replay.total_count == 1
+    mocked_task.assert_called_once_with(replay.pk)
+    assert f"Replay {replay.pk} of 1 failed event deliveries started." in (
+        out.getvalue()
+    )
+
+
+@patch(
+    "saleor.core.management.commands.replay_event_deliveries."
+    "replay_event_deliveries_task.delay"
+)
+def test_replay_event_deliveries_command_without_failed_deliveries(
+    mocked_task, webhook
+):
+    # when
+    call_command("replay_event_deliveries", "--webhook", webhook.pk, stdout=StringIO())
+
+    # then
+    assert not EventDeliveryReplay.objects.exists()
+    mocked_task.assert_not_called()
+
+
+def test_replay_event_deliveries_command_progress(webhook):
+    # given
+    replay = EventDeliveryReplay.objects.create(
+        webhook_id=webhook.pk, batch_size=10, total_count=20, replayed_count=10
+    )
+    out = StringIO()
+
+    # when
+    call_command("replay_event_deliveries", "--progress", stdout=out)
+
+    # then
+    assert f"Replay {replay.pk} (pending): 10/20 deliveries" in out.getvalue()
+
+
+IMPORT_TIME_OUTPUT = """import time: self [us] | cumulative | imported package
+import time:      1000 |       1000 |   saleor.graphql.core.enums
+import time:      2500 |       3500 | saleor.graphql.core
+import time:       500 |        500 |     django.utils.functional
+import time:       700 |       1200 |   saleor.graphql.product.types
+Some warning
+"""
+
+
+def test_parse_import_times():
+    # when
+    import_times = parse_import_times(IMPORT_TIME_OUTPUT, depth=2)
+
+    # then
+    assert import_times == [("saleor.graphql", 4200), ("django.utils", 500)]
+
+
+@patch("saleor.core.management.commands.import_time_report.subprocess.run")
+def test_import_time_report_command(mocked_run):
+    # given
+    mocked_run.return_value = Mock(returncode=0, stderr=IMPORT_TIME_OUTPUT)
+    out = StringIO()
+
+    # when
+    call_command("import_time_report", "saleor.celeryconf", "--limit", "1", stdout=out)
+
+    # then
+    command = mocked_run.call_args.args[0]
+    assert command[1:3] == ["-X", "importtime"]
+    assert command[-1].endswith("import saleor.celeryconf")
+    assert out.getvalue().splitlines() == [
+        "Total import time: 0.00s",
+        "   0.004s  74.5%  saleor.graphql.core",
+    ]
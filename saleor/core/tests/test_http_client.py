@@ -1,8 +1,13 @@
+from email.message import Message
+from unittest.mock import patch
+
 import requests_hardened
 from django.conf import settings
 from requests import Request
+from requests.cookies import MockRequest, MockResponse
 
 from ... import user_agent_version
+from ..http_client import HTTPSessionPool
 
 HTTPConfig = requests_hardened.Config(
     ip_filter_enable=settings.HTTP_IP_FILTER_ENABLED,
@@ -25,3 +30,137 @@ def test_user_agent_override():
 
     # then
     assert request.headers.get("User-Agent") == user_agent_version
+
+
+def _get_session_pool(**kwargs):
+    params = {"max_hosts": 2, "max_connections_per_host": 1, "idle_timeout": 60}
+    params.update(kwargs)
+    return HTTPSessionPool(HTTPConfig, **params)
+
+
+def test_session_pool_reuses_session_for_host():
+    # given
+    pool = _get_session_pool()
+
+    # when
+    session = pool.get_pooled_session("https://example.com/webhook")
+
+    # then
+    assert isinstance(session, requests_hardened.HTTPSession)
+    assert pool.get_pooled_session("https://EXAMPLE.com/other") is session
+    assert pool.get_pooled_session("https://example.org/webhook") is not session
+    assert pool.get_pooled_session("http://example.com/webhook") is not session
+
+
+def test_session_pool_keeps_hardened_config():
+    # given
+    pool = _get_session_pool()
+    request = Request("GET", "http://www.example.com")
+
+    # when
+    session = pool.get_pooled_session(request.url)
+    session.prepare_request(request)
+
+    # then
+    assert session._config is HTTPConfig
+    assert request.headers.get("User-Agent") == user_agent_version
+    adapter = session.get_adapter("https://example.com")
+    assert adapter.poolmanager.connection_pool_kw["maxsize"] == 1
+
+
+def test_session_pool_evicts_idle_sessions():
+    # given
+    pool = _get_session_pool(idle_timeout=10)
+    with patch("saleor.core.http_client.time.monotonic", return_value=100):
+        session = pool.get_pooled_session("https://example.com")
+
+    # when
+    with patch.object(session, "close") as mocked_close, patch(
+        "saleor.core.http_client.time.monotonic", return_value=110
+    ):
+        new_session = pool.get_pooled_session("https://example.com")
+
+    # then
+    assert new_session is not session
+    mocked_close.assert_called_once_with()
+
+
+def test_session_pool_evicts_least_recently_used_host():
+    # given
+    pool = _get_session_pool(max_hosts=2)
+    first_session = pool.get_pooled_session("https://first.example.com")
+    pool.get_pooled_session("https://second.example.com")
+    pool.get_pooled_session("https://first.example.com")
+
+    # when
+    pool.get_pooled_session("https://third.example.com")
+
+    # then
+    assert pool.get_pooled_session("https://first.example.com") is first_session
+    assert [host for _, host in pool._sessions] == [
+        "third.example.com",
+        "first.example.com",
+    ]
+
+
+def test_session_pool_closes_evicted_session_after_request():
+    # given
+    pool = _get_session_pool(max_hosts=1)
+    session = pool.get_pooled_session("https://first.example.com")
+
+    def request(*args, **kwargs):
+        # the session of another host evicts the one in use
+        pool.get_pooled_session("https://second.example.com")
+        mocked_close.assert_not_called()
+
+    # when
+    with patch.object(session, "close") as mocked_close, patch.object(
+        session, "request", side_effect=request
+    ):
+        pool.send_request("POST", "https://first.example.com", data="{}")
+
+    # then
+    mocked_close.assert_called_once_with()
+    assert [host for _, host in pool._sessions] == ["second.example.com"]
+
+
+def test_session_pool_drops_sessions_after_fork():
+    # given
+    pool = _get_session_pool()
+    session = pool.get_pooled_session("https://example.com")
+
+    # when
+    with patch("saleor.core.http_client.os.getpid", return_value=-1):
+        new_session = pool.get_pooled_session("https://example.com")
+
+    # then
+    assert new_session is not session
+
+
+def test_session_pool_does_not_keep_cookies():
+    # given
+    pool = _get_session_pool()
+    session = pool.get_pooled_session("https://example.com")
+
+    headers = Message()
+    headers["Set-Cookie"] = "session_id=123"
+    request = Request("GET", "https://example.com").prepare()
+
+    # when
+    session.cookies.extract_cookies(MockResponse(headers), MockRequest(request))
+
+    # then
+    assert not session.cookies
+
+
+@patch.object(requests_hardened.HTTPSession, "request")
+def test_session_pool_disabled(mocked_request):
+    # given
+    pool = _get_session_pool(max_hosts=0)
+
+    # when
+    pool.send_request("POST", "https://example.com", data="{}")
+
+    # then
+    mocked_request.assert_called_once_with("POST", "https://example.com", data="{}")
+    assert not pool._sessions
@@ -1,4 +1,6 @@
+import pytest
 from django.core.handlers.base import BaseHandler
+from django.utils.module_loading import import_string
 from freezegun import freeze_time
 
 from ..jwt import (
@@ -10,6 +12,11 @@ from ..jwt import (
 )
 
 
+@pytest.fixture
+def refresh_token(customer_user):
+    return create_refresh_token(customer_user)
+
+
 @freeze_time("2020-03-18 12:00:00")
 def test_jwt_refresh_token_middleware(rf, customer_user, settings):
     refresh_token = create_refresh_token(customer_user)
@@ -78,3 +85,23 @@ def test_jwt_refresh_token_middleware_samesite_none(rf, customer_user, settings)
     response = handler.get_response(request)
     cookie = response.cookies.get(JWT_REFRESH_TOKEN_COOKIE_NAME)
     assert cookie["samesite"] == "None"
+
+
+@freeze_time("2020-03-18 12:00:00")
+async def test_jwt_refresh_token_middleware_async(rf, refresh_token, settings):
+    settings.MIDDLEWARE = [
+        "saleor.core.middleware.jwt_refresh_token_middleware",
+    ]
+    request = rf.request()
+    request.refresh_token = refresh_token
+    handler = BaseHandler()
+    handler.load_middleware(is_async=True)
+    response = await handler.get_response_async(request)
+    cookie = response.cookies.get(JWT_REFRESH_TOKEN_COOKIE_NAME)
+    assert cookie.value == refresh_token
+
+
+def test_middleware_is_async_capable(settings):
+    for middleware_path in settings.MIDDLEWARE:
+        middleware = import_string(middleware_path)
+        assert middleware.async_capable, middleware_path
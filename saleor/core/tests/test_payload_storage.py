@@ -0,0 +1,122 @@
+import gzip
+import os
+import time
+
+from django.core.files.storage import default_storage
+
+from ..models import EventPayload
+from ..payload_storage import PayloadStorage, get_payload_storage
+
+
+def test_payload_storage_save_and_load(media_root):
+    # given
+    storage = PayloadStorage(storage=default_storage)
+    payload = '{"key": "value"}'
+
+    # when
+    path = storage.save(payload)
+
+    # then
+    assert path.endswith(".json.gz")
+    assert storage.load(path) == payload
+    with default_storage.open(path, "rb") as payload_file:
+        assert gzip.decompress(payload_file.read()).decode() == payload
+
+
+def test_payload_storage_save_is_content_addressed(media_root):
+    # given
+    storage = PayloadStorage(storage=default_storage)
+
+    # when
+    first_path = storage.save('{"key": "value"}')
+    second_path = storage.save('{"key": "value"}')
+    other_path = storage.save('{"key": "other"}')
+
+    # then
+    assert first_path == second_path
+    assert first_path != other_path
+
+
+def test_payload_storage_save_refreshes_file_close_to_grace_period(
+    media_root, settings
+):
+    # given
+    storage = PayloadStorage(storage=default_storage)
+    path = storage.save('{"key": "value"}')
+    modified_time = time.time() - settings.EVENT_PAYLOAD_FILE_GRACE_PERIOD.seconds
+    os.utime(default_storage.path(path), (modified_time, modified_time))
+
+    # when
+    second_path = storage.save('{"key": "value"}')
+
+    # then
+    assert second_path == path
+    assert os.path.getmtime(default_storage.path(path)) > modified_time
+    assert storage.load(path) == '{"key": "value"}'
+
+
+def test_payload_storage_list_paths(media_root):
+    # given
+    storage = PayloadStorage(storage=default_storage)
+    first_path = storage.save('{"key": "value"}')
+    second_path = storage.save('{"key": "other"}')
+
+    # when
+    paths = list(storage.list_paths())
+
+    # then
+    assert sorted(paths) == sorted([first_path, second_path])
+
+
+def test_payload_storage_list_paths_no_files(media_root):
+    # given
+    storage = PayloadStorage(storage=default_storage)
+
+    # when
+    paths = list(storage.list_paths())
+
+    # then
+    assert paths == []
+
+
+def test_build_with_payload_file_below_threshold(media_root, settings):
+    # given
+    settings.EVENT_PAYLOAD_STORAGE_THRESHOLD = 100
+    payload = '{"key": "value"}'
+
+    # when
+    event_payload = EventPayload.objects.create_with_payload_file(payload)
+
+    # then
+    assert event_payload.payload == payload
+    assert event_payload.payload_path is None
+    assert event_payload.get_payload() == payload
+
+
+def test_build_with_payload_file_above_threshold(media_root, settings):
+    # given
+    settings.EVENT_PAYLOAD_STORAGE_THRESHOLD = 10
+    payload = '{"key": "%s"}' % ("a" * 100)
+
+    # when
+    event_payload = EventPayload.objects.create_with_payload_file(payload)
+
+    # then
+    event_payload.refresh_from_db()
+    assert event_payload.payload == ""
+    assert event_payload.payload_path
+    assert get_payload_storage().load(event_payload.payload_path) == payload
+    assert event_payload.get_payload() == payload
+
+
+def test_build_with_payload_file_storage_disabled(media_root, settings):
+    # given
+    settings.EVENT_PAYLOAD_STORAGE_THRESHOLD = 0
+    payload = '{"key": "%s"}' % ("a" * 100)
+
+    # when
+    event_payload = EventPayload.objects.create_with_payload_file(payload)
+
+    # then
+    assert event_payload.payload == payload
+    assert event_payload.payload_path is None
@@ -0,0 +1,144 @@
+from unittest import mock
+
+import pytest
+from django.core.cache import cache
+from django.db import DatabaseError
+
+from ..replicas import (
+    ReplicaStatus,
+    get_replica_connection_name,
+    get_replica_status,
+    measure_replica_status,
+    record_write,
+)
+
+REPLICAS = ["replica", "replica_1"]
+
+
+@pytest.fixture(autouse=True)
+def lag_aware_routing(settings):
+    settings.DATABASE_REPLICA_LAG_AWARE_ROUTING = True
+    settings.DATABASE_REPLICA_MAX_LAG = 10
+    settings.DATABASE_CONNECTION_REPLICA_NAMES = REPLICAS
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def _set_replica_statuses(*statuses):
+    for connection_name, status in zip(REPLICAS, statuses):
+        cache.set(f"db-replica:status:{connection_name}", status)
+
+
+def test_measure_replica_status_of_primary_database(settings):
+    # when
+    status = measure_replica_status(settings.DATABASE_CONNECTION_DEFAULT_NAME)
+
+    # then
+    assert status == ReplicaStatus(lag=0)
+
+
+@mock.patch("saleor.core.replicas.connections")
+def test_measure_replica_status_of_replica(mocked_connections):
+    # given
+    cursor = mocked_connections.__getitem__.return_value.cursor.return_value
+    cursor.__enter__.return_value.fetchone.return_value = (True, 1200, 1.5)
+
+    # when
+    status = measure_replica_status("replica")
+
+    # then
+    assert status == ReplicaStatus(lag=1.5, lsn=1200)
+
+
+@mock.patch("saleor.core.replicas.connections")
+def test_measure_replica_status_of_unavailable_replica(mocked_connections):
+    # given
+    mocked_connections.__getitem__.return_value.cursor.side_effect = DatabaseError()
+
+    # when
+    status = measure_replica_status("replica")
+
+    # then
+    assert status.lag > 10
+
+
+@mock.patch("saleor.core.replicas.measure_replica_status")
+def test_get_replica_status_is_cached(mocked_measure):
+    # given
+    mocked_measure.return_value = ReplicaStatus(lag=0.5, lsn=100)
+
+    # when
+    statuses = [get_replica_status("replica") for _ in range(3)]
+
+    # then
+    assert statuses == [ReplicaStatus(lag=0.5, lsn=100)] * 3
+    mocked_measure.assert_called_once_with("replica")
+
+
+def test_get_replica_connection_name_skips_lagging_replicas():
+    # given
+    _set_replica_statuses(ReplicaStatus(lag=30, lsn=100), ReplicaStatus(lag=1, lsn=50))
+
+    # when
+    connection_names = {get_replica_connection_name("user:1") for _ in range(10)}
+
+    # then
+    assert connection_names == {"replica_1"}
+
+
+def test_get_replica_connection_name_balances_replicas():
+    # given
+    _set_replica_statuses(ReplicaStatus(lag=0, lsn=100), ReplicaStatus(lag=0, lsn=100))
+
+    # when
+    with mock.patch("saleor.core.replicas.random.choice") as mocked_choice:
+        get_replica_connection_name("user:1")
+
+    # then
+    mocked_choice.assert_called_once_with(REPLICAS)
+
+
+def test_get_replica_connection_name_reads_own_writes():
+    # given
+    _set_replica_statuses(ReplicaStatus(lag=1, lsn=100), ReplicaStatus(lag=1, lsn=200))
+    cache.set("db-replica:last-write:user:1", 150)
+
+    # when
+    own_connection_names = {get_replica_connection_name("user:1") for _ in range(10)}
+    other_connection_names = {get_replica_connection_name("user:2") for _ in range(10)}
+
+    # then
+    assert own_connection_names == {"replica_1"}
+    assert other_connection_names == set(REPLICAS)
+
+
+def test_get_replica_connection_name_falls_back_to_primary(settings):
+    # given
+    _set_replica_statuses(ReplicaStatus(lag=1, lsn=100), ReplicaStatus(lag=1, lsn=100))
+    cache.set("db-replica:last-write:user:1", 150)
+
+    # when
+    connection_name = get_replica_connection_name("user:1")
+
+    # then
+    assert connection_name == settings.DATABASE_CONNECTION_DEFAULT_NAME
+
+
+def test_record_write():
+    # when
+    record_write("user:1")
+
+    # then
+    assert cache.get("db-replica:last-write:user:1") > 0
+
+
+def test_record_write_lag_aware_routing_disabled(settings):
+    # given
+    settings.DATABASE_REPLICA_LAG_AWARE_ROUTING = False
+
+    # when
+    record_write("user:1")
+
+    # then
+    assert cache.get("db-replica:last-write:user:1") is None
@@ -1,15 +1,29 @@
 from datetime import timedelta
+from unittest import mock
 
+import pytest
 from django.core.files.storage import default_storage
+from django.db import DatabaseError, transaction
 from django.utils import timezone
 from freezegun import freeze_time
 
-from ...webhook.event_types import WebhookEventAsyncType
-from ..models import EventDelivery, EventDeliveryAttempt, EventPayload
+from ...webhook.event_types import WebhookEventAsyncType, WebhookEventSyncType
+from .. import EventDeliveryStatus, JobStatus
+from ..models import (
+    EventDelivery,
+    EventDeliveryAttempt,
+    EventDeliveryReplay,
+    EventPayload,
+)
+from ..payload_storage import get_payload_storage
 from ..tasks import (
+    delete_event_payload_files_task,
     delete_event_payloads_task,
     delete_files_from_storage_task,
     delete_from_storage_task,
+    delete_unused_event_payload_files_task,
+    get_failed_event_deliveries,
+    replay_event_deliveries_task,
 )
 
 
@@ -86,3 +100,243 @@ def test_delete_files_from_storage_task_files_not_existing_files(media_root):
 
     # when
     delete_files_from_storage_task([path, path_2])
+
+
+def test_delete_event_payload_files_task(media_root, settings):
+    # given
+    settings.EVENT_PAYLOAD_STORAGE_THRESHOLD = 10
+    payload = '{"key": "%s"}' % ("a" * 100)
+    used_payload = EventPayload.objects.create_with_payload_file(payload)
+    unused_path = get_payload_storage().save('{"key": "%s"}' % ("b" * 100))
+    storage = get_payload_storage()
+    grace_period = settings.EVENT_PAYLOAD_FILE_GRACE_PERIOD
+
+    # when
+    with freeze_time(timezone.now() + grace_period + timedelta(seconds=1)):
+        delete_event_payload_files_task([used_payload.payload_path, unused_path])
+
+    # then
+    assert storage.storage.exists(used_payload.payload_path)
+    assert not storage.storage.exists(unused_path)
+
+
+@mock.patch("saleor.core.tasks.delete_event_payload_files_task.apply_async")
+def test_delete_event_payload_files_task_keeps_recent_files(
+    mocked_apply_async, media_root, settings
+):
+    # given
+    path = get_payload_storage().save('{"key": "%s"}' % ("b" * 100))
+    storage = get_payload_storage()
+    grace_period = settings.EVENT_PAYLOAD_FILE_GRACE_PERIOD
+
+    # when
+    delete_event_payload_files_task([path])
+
+    # then
+    assert storage.storage.exists(path)
+    mocked_apply_async.assert_called_once_with(
+        ([path],), countdown=grace_period.total_seconds()
+    )
+
+
+def test_delete_unused_event_payload_files_task(media_root, settings):
+    # given
+    settings.EVENT_PAYLOAD_STORAGE_THRESHOLD = 10
+    used_payload = EventPayload.objects.create_with_payload_file(
+        '{"key": "%s"}' % ("a" * 100)
+    )
+    with pytest.raises(DatabaseError):
+        with transaction.atomic():
+            rolled_back_payload = EventPayload.objects.create_with_payload_file(
+                '{"key": "%s"}' % ("b" * 100)
+            )
+            raise DatabaseError()
+    storage = get_payload_storage()
+    grace_period = settings.EVENT_PAYLOAD_FILE_GRACE_PERIOD
+
+    # when
+    with freeze_time(timezone.now() + grace_period + timedelta(seconds=1)):
+        delete_unused_event_payload_files_task()
+
+    # then
+    assert storage.storage.exists(used_payload.payload_path)
+    assert not storage.storage.exists(rolled_back_payload.payload_path)
+
+
+def test_delete_unused_event_payload_files_task_keeps_recent_files(
+    media_root, settings
+):
+    # given
+    path = get_payload_storage().save('{"key": "%s"}' % ("b" * 100))
+
+    # when
+    delete_unused_event_payload_files_task()
+
+    # then
+    assert get_payload_storage().storage.exists(path)
+
+
+def test_delete_unused_event_payload_files_task_no_files(media_root):
+    # when
+    delete_unused_event_payload_files_task()
+
+    # then
+    assert not EventPayload.objects.exists()
+
+
+def test_delete_event_payloads_task_deletes_payload_files(
+    webhook, media_root, settings
+):
+    # given
+    settings.EVENT_PAYLOAD_STORAGE_THRESHOLD = 10
+    delete_period = settings.EVENT_PAYLOAD_DELETE_PERIOD
+    start_time = timezone.now()
+    with freeze_time(start_time - delete_period - timedelta(seconds=1)):
+        payload = EventPayload.objects.create_with_payload_file(
+            '{"key": "%s"}' % ("a" * 100)
+        )
+    storage = get_payload_storage()
+    assert storage.storage.exists(payload.payload_path)
+
+    # when
+    grace_period = settings.EVENT_PAYLOAD_FILE_GRACE_PERIOD
+    with freeze_time(start_time + grace_period + timedelta(seconds=1)):
+        delete_event_payloads_task()
+
+    # then
+    assert not EventPayload.objects.exists()
+    assert not storage.storage.exists(payload.payload_path)
+
+
+def _create_failed_deliveries(webhook, count, event_type=WebhookEventAsyncType.ANY):
+    payload = EventPayload.objects.create(payload='{"key": "data"}')
+    return EventDelivery.objects.bulk_create(
+        EventDelivery(
+            status=EventDeliveryStatus.FAILED,
+            event_type=event_type,
+            payload=payload,
+            webhook=webhook,
+        )
+        for _ in range(count)
+    )
+
+
+@mock.patch(
+    "saleor.webhook.transport.asynchronous.transport.send_webhook_requests_async"
+)
+def test_replay_event_deliveries_task(mocked_send, webhook):
+    # given
+    deliveries = _create_failed_deliveries(webhook, 5)
+    replay = EventDeliveryReplay.objects.create(
+        webhook_id=webhook.pk, batch_size=2, total_count=len(deliveries)
+    )
+
+    # when
+    replay_event_deliveries_task(replay.pk)
+
+    # then
+    assert [call.args[0] for call in mocked_send.call_args_list] == [
+        deliveries[0:2],
+        deliveries[2:4],
+        deliveries[4:],
+    ]
+    assert not EventDelivery.objects.filter(status=EventDeliveryStatus.FAILED).exists()
+    replay.refresh_from_db()
+    assert replay.status == JobStatus.SUCCESS
+    assert replay.replayed_count == len(deliveries)
+    assert replay.last_delivery_id == deliveries[-1].pk
+
+
+@mock.patch(
+    "saleor.webhook.transport.asynchronous.transport.send_webhook_requests_async"
+)
+def test_replay_event_deliveries_task_skips_not_replayable_deliveries(
+    mocked_send, webhook
+):
+    # given
+    delivery = _create_failed_deliveries(webhook, 1)[0]
+    with freeze_time(timezone.now() - timedelta(days=1)):
+        _create_failed_deliveries(webhook, 1)
+    _create_failed_deliveries(webhook, 1, WebhookEventSyncType.CHECKOUT_CALCULATE_TAXES)
+    EventDelivery.objects.create(
+        status=EventDeliveryStatus.FAILED,
+        event_type=WebhookEventAsyncType.ANY,
+        webhook=webhook,
+    )
+    replay = EventDeliveryReplay.objects.create(
+        app_id=webhook.app_id,
+        created_after=timezone.now() - timedelta(hours=1),
+        batch_size=10,
+    )
+
+    # when
+    replay_event_deliveries_task(replay.pk)
+
+    # then
+    mocked_send.assert_called_once_with([delivery])
+    replay.refresh_from_db()
+    assert replay.replayed_count == 1
+
+
+@mock.patch(
+    "saleor.webhook.transport.asynchronous.transport.send_webhook_requests_async"
+)
+def test_replay_event_deliveries_task_webhook_deleted_during_replay(
+    mocked_send, webhook, external_app
+):
+    # given
+    deliveries = _create_failed_deliveries(webhook, 2)
+    other_webhook = external_app.webhooks.create(target_url="https://example.com")
+    _create_failed_deliveries(other_webhook, 1)
+    replay = EventDeliveryReplay.objects.create(
+        webhook_id=webhook.pk, batch_size=1, total_count=len(deliveries)
+    )
+
+    def delete_webhook(deliveries):
+        webhook.delete()
+
+    mocked_send.side_effect = delete_webhook
+
+    # when
+    replay_event_deliveries_task(replay.pk)
+
+    # then
+    mocked_send.assert_called_once_with(deliveries[:1])
+    replay.refresh_from_db()
+    assert replay.status == JobStatus.FAILED
+    assert replay.message == "The webhook of the replay was deleted."
+    assert EventDelivery.objects.filter(
+        webhook=other_webhook, status=EventDeliveryStatus.FAILED
+    ).exists()
+
+
+def test_get_failed_event_deliveries_of_app(webhook, external_app):
+    # given
+    deliveries = _create_failed_deliveries(webhook, 2)
+    other_webhook = external_app.webhooks.create(target_url="https://example.com")
+    _create_failed_deliveries(other_webhook, 1)
+
+    # when
+    app_deliveries = get_failed_event_deliveries(app_id=webhook.app_id)
+
+    # then
+    assert set(app_deliveries) == set(deliveries)
+    # the deliveries are filtered by webhooks to use the failed deliveries index
+    assert '"core_eventdelivery"."webhook_id" IN (SELECT' in str(app_deliveries.query)
+
+
+@mock.patch(
+    "saleor.webhook.transport.asynchronous.transport.send_webhook_requests_async"
+)
+def test_replay_event_deliveries_task_not_pending_replay(mocked_send, webhook):
+    # given
+    _create_failed_deliveries(webhook, 1)
+    replay = EventDeliveryReplay.objects.create(
+        webhook_id=webhook.pk, batch_size=10, status=JobStatus.FAILED
+    )
+
+    # when
+    replay_event_deliveries_task(replay.pk)
+
+    # then
+    mocked_send.assert_not_called()
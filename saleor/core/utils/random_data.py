@@ -477,6 +477,99 @@ def create_products_by_schema(placeholder_dir, create_images):
     update_products_search_vector(all_products_qs)
 
 
+def _copy_instances(instances, **fields):
+    instances = list(instances)
+    for instance in instances:
+        instance.pk = None
+        for field, value in fields.items():
+            setattr(instance, field, value)
+    if not instances:
+        return []
+    return type(instances[0]).objects.bulk_create(instances)
+
+
+def _copy_assigned_attributes(assignments, values, fields, value_fields=None):
+    """Copy the attribute assignments and the values assigned through them."""
+    assignments = list(assignments)
+    old_assignment_ids = [assignment.pk for assignment in assignments]
+    copies = _copy_instances(assignments, **fields)
+    assignment_ids = dict(zip(old_assignment_ids, (copy.pk for copy in copies)))
+    values = list(values)
+    for value in values:
+        value.assignment_id = assignment_ids[value.assignment_id]
+    _copy_instances(values, **(value_fields or {}))
+
+
+def copy_product(product_id, suffix):
+    product = Product.objects.get(pk=product_id)
+    variants = list(product.variants.all())
+    default_variant_id = product.default_variant_id
+    product.pk = None
+    product._state.adding = True
+    product.name = f"{product.name} {suffix}"
+    product.slug = f"{product.slug}-{suffix}"
+    product.external_reference = None
+    product.default_variant = None
+    product.save()
+
+    _copy_instances(
+        ProductChannelListing.objects.filter(product_id=product_id),
+        product_id=product.pk,
+    )
+    _copy_instances(
+        ProductMedia.objects.filter(product_id=product_id), product_id=product.pk
+    )
+    _copy_assigned_attributes(
+        AssignedProductAttribute.objects.filter(product_id=product_id),
+        AssignedProductAttributeValue.objects.filter(product_id=product_id),
+        fields={"product_id": product.pk},
+        value_fields={"product_id": product.pk},
+    )
+
+    for variant in variants:
+        variant_id = variant.pk
+        variant.pk = None
+        variant._state.adding = True
+        variant.product = product
+        variant.sku = f"{variant.sku}-{suffix}" if variant.sku else None
+        variant.external_reference = None
+        variant.save()
+        _copy_instances(
+            ProductVariantChannelListing.objects.filter(variant_id=variant_id),
+            variant_id=variant.pk,
+        )
+        _copy_instances(
+            Stock.objects.filter(product_variant_id=variant_id),
+            product_variant_id=variant.pk,
+            quantity_allocated=0,
+        )
+        _copy_assigned_attributes(
+            AssignedVariantAttribute.objects.filter(variant_id=variant_id),
+            AssignedVariantAttributeValue.objects.filter(
+                assignment__variant_id=variant_id
+            ),
+            fields={"variant_id": variant.pk},
+        )
+        if variant_id == default_variant_id:
+            product.default_variant = variant
+            product.save(update_fields=["default_variant", "updated_at"])
+    return product
+
+
+def create_product_copies(how_many=1):
+    """Copy the products of the catalog to populate the database at scale."""
+    product_ids = list(Product.objects.values_list("pk", flat=True))
+    for copy_number in range(1, how_many + 1):
+        copies = [
+            copy_product(product_id, f"copy-{copy_number}")
+            for product_id in product_ids
+        ]
+        update_products_search_vector(
+            Product.objects.filter(pk__in=[product.pk for product in copies])
+        )
+        yield f"Copied {len(copies)} products"
+
+
 class SaleorProvider(BaseProvider):
     def money(self):
         return Money(fake.pydecimal(2, 2, positive=True), DEFAULT_CURRENCY)
@@ -1,3 +1,9 @@
+import logging
+import threading
+import time
+from typing import Optional
+
+import graphene
 import graphql
 from django.urls import reverse
 from django.utils.functional import SimpleLazyObject
@@ -160,11 +166,39 @@ GraphQLWebhookEventsInfoDirective = graphql.GraphQLDirective(
         graphql.DirectiveLocation.OBJECT,
     ],
 )
-schema = build_federated_schema(
-    Query,
-    mutation=Mutation,
-    types=unit_enums + list(WEBHOOK_TYPES_MAP.values()),
-    subscription=Subscription,
-    directives=graphql.specified_directives
-    + [GraphQLDocDirective, GraphQLWebhookEventsInfoDirective],
-)
+logger = logging.getLogger(__name__)
+
+_schema: Optional[graphene.Schema] = None
+_schema_lock = threading.Lock()
+
+
+def get_schema() -> graphene.Schema:
+    """Return the GraphQL schema, built on the first use.
+
+    Processes that don't serve the API, like Celery workers, build the schema only
+    when they need it, e.g. to generate subscription webhook payloads.
+    """
+    global _schema
+    if _schema is None:
+        with _schema_lock:
+            if _schema is None:
+                start = time.perf_counter()
+                _schema = build_federated_schema(
+                    Query,
+                    mutation=Mutation,
+                    types=unit_enums + list(WEBHOOK_TYPES_MAP.values()),
+                    subscription=Subscription,
+                    directives=graphql.specified_directives
+                    + [GraphQLDocDirective, GraphQLWebhookEventsInfoDirective],
+                )
+                logger.debug(
+                    "GraphQL schema built in %.3fs.", time.perf_counter() - start
+                )
+    return _schema
+
+
+def __getattr__(name):
+    # Keep `from saleor.graphql.api import schema` working.
+    if name == "schema":
+        return get_schema()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,8 +1,11 @@
 import graphene
+from django.core.exceptions import ValidationError
 
 from ....app import models
+from ....app.error_codes import AppErrorCode
 from ....permission.enums import AppPermission, get_permissions
 from ....webhook.event_types import WebhookEventAsyncType
+from ...core.descriptions import ADDED_IN_318, PREVIEW_FEATURE
 from ...core.doc_category import DOC_CATEGORY_APPS
 from ...core.enums import PermissionEnum
 from ...core.mutations import ModelMutation
@@ -21,11 +24,32 @@ class AppInput(BaseInputObjectType):
         PermissionEnum,
         description="List of permission code names to assign to this app.",
     )
+    query_cost_budget = graphene.Int(
+        description=(
+            "Query cost budget of the app, refilled within the budget period. "
+            "`null` means the default budget is used and `0` means no budget."
+            + ADDED_IN_318
+            + PREVIEW_FEATURE
+        )
+    )
 
     class Meta:
         doc_category = DOC_CATEGORY_APPS
 
 
+def clean_query_cost_budget(cleaned_input):
+    query_cost_budget = cleaned_input.get("query_cost_budget")
+    if query_cost_budget is not None and query_cost_budget < 0:
+        raise ValidationError(
+            {
+                "query_cost_budget": ValidationError(
+                    "The query cost budget can't be negative.",
+                    code=AppErrorCode.INVALID.value,
+                )
+            }
+        )
+
+
 class AppCreate(ModelMutation):
     auth_token = graphene.types.String(
         description="The newly created authentication token."
@@ -58,6 +82,7 @@ class AppCreate(ModelMutation):
     @classmethod
     def clean_input(cls, info, instance, data, **kwargs):
         cleaned_input = super().clean_input(info, instance, data, **kwargs)
+        clean_query_cost_budget(cleaned_input)
         # clean and prepare permissions
         if "permissions" in cleaned_input:
             requestor = get_user_or_app_from_context(info.context)
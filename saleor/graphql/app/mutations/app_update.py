@@ -13,7 +13,7 @@ from ...plugins.dataloaders import get_plugin_manager_promise
 from ...utils import get_user_or_app_from_context, requestor_is_superuser
 from ..types import App
 from ..utils import ensure_can_manage_permissions
-from .app_create import AppInput
+from .app_create import AppInput, clean_query_cost_budget
 
 
 class AppUpdate(ModelMutation):
@@ -49,6 +49,14 @@ class AppUpdate(ModelMutation):
             code = AppErrorCode.OUT_OF_SCOPE_APP.value
             raise ValidationError({"id": ValidationError(msg, code=code)})
 
+        clean_query_cost_budget(cleaned_input)
+        if "query_cost_budget" in cleaned_input and requestor == instance:
+            msg = "App can't change its own query cost budget."
+            code = AppErrorCode.FORBIDDEN.value
+            raise ValidationError(
+                {"query_cost_budget": ValidationError(msg, code=code)}
+            )
+
         # clean and prepare permissions
         if "permissions" in cleaned_input:
             permissions = cleaned_input.pop("permissions")
@@ -420,3 +420,80 @@ def test_app_update_no_permission(app, staff_api_client, staff_user):
     }
     response = staff_api_client.post_graphql(query, variables=variables)
     assert_no_permission(response)
+
+
+APP_UPDATE_QUERY_COST_BUDGET_MUTATION = """
+mutation AppUpdate($id: ID!, $queryCostBudget: Int){
+    appUpdate(id: $id, input: {queryCostBudget: $queryCostBudget}){
+        app{
+            queryCostBudget
+        }
+        errors{
+            field
+            code
+        }
+    }
+}
+"""
+
+
+def test_app_update_query_cost_budget(app, staff_api_client, permission_manage_apps):
+    # given
+    variables = {"id": graphene.Node.to_global_id("App", app.id), "queryCostBudget": 0}
+
+    # when
+    response = staff_api_client.post_graphql(
+        APP_UPDATE_QUERY_COST_BUDGET_MUTATION,
+        variables=variables,
+        permissions=(permission_manage_apps,),
+    )
+
+    # then
+    content = get_graphql_content(response)
+    assert content["data"]["appUpdate"]["app"]["queryCostBudget"] == 0
+    app.refresh_from_db()
+    assert app.query_cost_budget == 0
+
+
+def test_app_update_negative_query_cost_budget(
+    app, staff_api_client, permission_manage_apps
+):
+    # given
+    variables = {
+        "id": graphene.Node.to_global_id("App", app.id),
+        "queryCostBudget": -1,
+    }
+
+    # when
+    response = staff_api_client.post_graphql(
+        APP_UPDATE_QUERY_COST_BUDGET_MUTATION,
+        variables=variables,
+        permissions=(permission_manage_apps,),
+    )
+
+    # then
+    content = get_graphql_content(response)
+    assert content["data"]["appUpdate"]["errors"] == [
+        {"field": "queryCostBudget", "code": AppErrorCode.INVALID.name}
+    ]
+
+
+def test_app_update_own_query_cost_budget(app_api_client, permission_manage_apps):
+    # given
+    app = app_api_client.app
+    variables = {"id": graphene.Node.to_global_id("App", app.id), "queryCostBudget": 0}
+
+    # when
+    response = app_api_client.post_graphql(
+        APP_UPDATE_QUERY_COST_BUDGET_MUTATION,
+        variables=variables,
+        permissions=(permission_manage_apps,),
+    )
+
+    # then
+    content = get_graphql_content(response)
+    assert content["data"]["appUpdate"]["errors"] == [
+        {"field": "queryCostBudget", "code": AppErrorCode.FORBIDDEN.name}
+    ]
+    app.refresh_from_db()
+    assert app.query_cost_budget is None
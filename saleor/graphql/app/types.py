@@ -28,6 +28,7 @@ from ..core.descriptions import (
     ADDED_IN_38,
     ADDED_IN_313,
     ADDED_IN_314,
+    ADDED_IN_318,
     DEPRECATED_IN_3X_FIELD,
     PREVIEW_FEATURE,
 )
@@ -551,6 +552,14 @@ class App(ModelObjectType[models.App]):
     brand = graphene.Field(
         AppBrand, description="App's brand data." + ADDED_IN_314 + PREVIEW_FEATURE
     )
+    query_cost_budget = graphene.Int(
+        description=(
+            "Query cost budget of the app, refilled within the budget period. "
+            "`null` means the default budget is used and `0` means no budget."
+            + ADDED_IN_318
+            + PREVIEW_FEATURE
+        )
+    )
 
     class Meta:
         description = "Represents app data."
@@ -0,0 +1,407 @@
+"""Benchmark of the most frequent storefront and dashboard operations.
+
+Operations are sent through the whole HTTP stack against the current database,
+e.g. one populated with `populatedb --scale`. Each operation is run once to warm
+up and then measured: the number of database queries, the median wall time and
+the peak of memory allocated while executing it. Mutations are rolled back, so
+the benchmark can be repeated against the same data.
+"""
+import json
+import statistics
+import time
+import tracemalloc
+from contextlib import ExitStack
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, List, Optional
+
+import graphene
+from django.conf import settings
+from django.db import connections, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from ..channel.models import Channel
+from ..product.models import Product, ProductVariant
+from ..warehouse.models import Stock
+from .api import API_PATH
+
+PRODUCT_LIST_QUERY = """
+query ProductList($channel: String!, $first: Int!) {
+  products(first: $first, channel: $channel) {
+    edges {
+      node {
+        id
+        name
+        slug
+        thumbnail {
+          url
+          alt
+        }
+        category {
+          id
+          name
+        }
+        pricing {
+          onSale
+          priceRange {
+            start {
+              gross {
+                amount
+                currency
+              }
+            }
+            stop {
+              gross {
+                amount
+                currency
+              }
+            }
+          }
+        }
+        variants {
+          id
+          name
+        }
+      }
+    }
+    pageInfo {
+      hasNextPage
+      endCursor
+    }
+  }
+}
+"""
+
+PRODUCT_DETAILS_QUERY = """
+query ProductDetails($slug: String!, $channel: String!) {
+  product(slug: $slug, channel: $channel) {
+    id
+    name
+    description
+    seoTitle
+    seoDescription
+    category {
+      id
+      name
+      slug
+    }
+    media {
+      url
+      alt
+      type
+    }
+    attributes {
+      attribute {
+        name
+        slug
+      }
+      values {
+        name
+        slug
+      }
+    }
+    pricing {
+      priceRange {
+        start {
+          gross {
+            amount
+            currency
+          }
+        }
+      }
+    }
+    variants {
+      id
+      name
+      sku
+      quantityAvailable
+      attributes {
+        attribute {
+          name
+        }
+        values {
+          name
+        }
+      }
+      pricing {
+        price {
+          gross {
+            amount
+            currency
+          }
+        }
+        priceUndiscounted {
+          gross {
+            amount
+            currency
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
+CHECKOUT_CREATE_MUTATION = """
+mutation CheckoutCreate($channel: String!, $lines: [CheckoutLineInput!]!) {
+  checkoutCreate(
+    input: {channel: $channel, email: "benchmark@example.com", lines: $lines}
+  ) {
+    checkout {
+      id
+      token
+      totalPrice {
+        gross {
+          amount
+          currency
+        }
+      }
+      subtotalPrice {
+        gross {
+          amount
+        }
+      }
+      lines {
+        id
+        quantity
+        totalPrice {
+          gross {
+            amount
+          }
+        }
+        variant {
+          id
+          name
+          product {
+            name
+            thumbnail {
+              url
+            }
+          }
+        }
+      }
+    }
+    errors {
+      field
+      code
+      message
+    }
+  }
+}
+"""
+
+ORDER_LIST_QUERY = """
+query OrderList($first: Int!) {
+  orders(first: $first, sortBy: {field: NUMBER, direction: DESC}) {
+    edges {
+      node {
+        id
+        number
+        created
+        status
+        paymentStatus
+        userEmail
+        user {
+          email
+        }
+        channel {
+          slug
+        }
+        total {
+          gross {
+            amount
+            currency
+          }
+        }
+        lines {
+          id
+          productName
+          quantity
+        }
+      }
+    }
+  }
+}
+"""
+
+PAGE_SIZE = 20
+
+
+def get_product_list_variables(channel: Channel) -> Optional[dict]:
+    return {"channel": channel.slug, "first": PAGE_SIZE}
+
+
+def get_product_details_variables(channel: Channel) -> Optional[dict]:
+    product = (
+        Product.objects.filter(
+            channel_listings__channel=channel, channel_listings__is_published=True
+        )
+        .order_by("pk")
+        .first()
+    )
+    if not product:
+        return None
+    return {"channel": channel.slug, "slug": product.slug}
+
+
+def get_checkout_create_variables(channel: Channel) -> Optional[dict]:
+    available_stocks = (
+        Stock.objects.filter(warehouse__channels=channel)
+        .annotate_available_quantity()
+        .filter(available_quantity__gt=0)
+    )
+    variants = (
+        ProductVariant.objects.filter(
+            channel_listings__channel=channel,
+            channel_listings__price_amount__isnull=False,
+            product__channel_listings__channel=channel,
+            product__channel_listings__is_published=True,
+            pk__in=available_stocks.values("product_variant_id"),
+        )
+        .order_by("pk")
+        .distinct()[:3]
+    )
+    if not variants:
+        return None
+    lines = [
+        {
+            "variantId": graphene.Node.to_global_id("ProductVariant", variant.pk),
+            "quantity": 1,
+        }
+        for variant in variants
+    ]
+    return {"channel": channel.slug, "lines": lines}
+
+
+def get_order_list_variables(channel: Channel) -> Optional[dict]:
+    return {"first": PAGE_SIZE}
+
+
+@dataclass
+class BenchmarkOperation:
+    name: str
+    query: str
+    # Return None when the database has no data for the operation.
+    get_variables: Callable[[Channel], Optional[dict]]
+    staff: bool = False
+
+
+OPERATIONS = [
+    BenchmarkOperation("product_list", PRODUCT_LIST_QUERY, get_product_list_variables),
+    BenchmarkOperation(
+        "product_details", PRODUCT_DETAILS_QUERY, get_product_details_variables
+    ),
+    BenchmarkOperation(
+        "checkout_create", CHECKOUT_CREATE_MUTATION, get_checkout_create_variables
+    ),
+    BenchmarkOperation(
+        "order_list", ORDER_LIST_QUERY, get_order_list_variables, staff=True
+    ),
+]
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    queries: int
+    # Median wall time in milliseconds.
+    time: float
+    # Peak of the memory allocated during the execution, in KiB.
+    allocations: float
+
+
+class BenchmarkError(Exception):
+    pass
+
+
+def execute_operation(
+    client: Client, operation: BenchmarkOperation, variables: dict, headers: dict
+):
+    data = json.dumps({"query": operation.query, "variables": variables})
+    with transaction.atomic():
+        response = client.post(
+            str(API_PATH), data=data, content_type="application/json", **headers
+        )
+        transaction.set_rollback(True)
+    content = json.loads(response.content)
+    errors = content.get("errors") or [
+        error
+        for payload in (content.get("data") or {}).values()
+        if isinstance(payload, dict)
+        for error in payload.get("errors") or []
+    ]
+    if errors:
+        raise BenchmarkError(f"{operation.name}: {errors[0]['message']}")
+
+
+def run_operation(
+    client: Client,
+    operation: BenchmarkOperation,
+    variables: dict,
+    headers: dict,
+    repeat: int,
+) -> BenchmarkResult:
+    # Warm up the caches of the schema, the plugins and the database connections.
+    execute_operation(client, operation, variables, headers)
+
+    connection_names = {
+        settings.DATABASE_CONNECTION_DEFAULT_NAME,
+        *settings.DATABASE_CONNECTION_REPLICA_NAMES,
+    }
+    times = []
+    for _ in range(repeat):
+        with ExitStack() as stack:
+            captured_queries = [
+                stack.enter_context(CaptureQueriesContext(connections[name]))
+                for name in connection_names
+            ]
+            start = time.perf_counter()
+            execute_operation(client, operation, variables, headers)
+            times.append(time.perf_counter() - start)
+    queries = sum(len(captured) for captured in captured_queries)
+
+    tracemalloc.start()
+    try:
+        execute_operation(client, operation, variables, headers)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return BenchmarkResult(
+        name=operation.name,
+        queries=queries,
+        time=round(statistics.median(times) * 1000, 2),
+        allocations=round(peak / 1024, 1),
+    )
+
+
+def compare_results(
+    baseline: Dict[str, dict], results: List[BenchmarkResult], threshold: float
+) -> List[str]:
+    """Return the regressions of the results compared to the baseline.
+
+    Any additional database query is a regression. The wall time and allocations
+    may grow by `threshold` (a fraction) before they are reported, as they vary
+    between runs.
+    """
+    regressions = []
+    for result in results:
+        if result.name not in baseline:
+            continue
+        expected = BenchmarkResult(**baseline[result.name])
+        if result.queries > expected.queries:
+            regressions.append(
+                f"{result.name}: {result.queries} queries "
+                f"instead of {expected.queries}"
+            )
+        for metric in ["time", "allocations"]:
+            value, expected_value = getattr(result, metric), getattr(expected, metric)
+            if value > expected_value * (1 + threshold):
+                regressions.append(
+                    f"{result.name}: {metric} {value} instead of {expected_value}"
+                )
+    return regressions
+
+
+def serialize_results(results: List[BenchmarkResult]) -> Dict[str, dict]:
+    return {result.name: asdict(result) for result in results}
@@ -5,6 +5,7 @@ from ....channel import models
 from ....core.tracing import traced_atomic_transaction
 from ....permission.enums import ChannelPermissions
 from ....tax.models import TaxConfiguration
+from ....warehouse.availability_projection import mark_all_variants_availability_changed
 from ....webhook.event_types import WebhookEventAsyncType
 from ...account.enums import CountryCodeEnum
 from ...core import ResolveInfo
@@ -282,6 +283,7 @@ class ChannelCreate(ModelMutation):
             warehouses = cleaned_data.get("add_warehouses")
             if warehouses:
                 instance.warehouses.add(*warehouses)
+            mark_all_variants_availability_changed()
 
     @classmethod
     def post_save_action(cls, info: ResolveInfo, instance, cleaned_input):
@@ -14,6 +14,7 @@ from ....permission.enums import (
 from ....shipping.tasks import (
     drop_invalid_shipping_methods_relations_for_given_channels,
 )
+from ....warehouse.availability_projection import mark_all_variants_availability_changed
 from ....webhook.event_types import WebhookEventAsyncType
 from ...account.enums import CountryCodeEnum
 from ...core import ResolveInfo
@@ -189,6 +190,7 @@ class ChannelUpdate(ModelMutation):
                 delete_invalid_warehouse_to_shipping_zone_relations(
                     instance, warehouse_ids, shipping_zone_ids
                 )
+            mark_all_variants_availability_changed()
 
     @classmethod
     def _update_shipping_zones(cls, instance, cleaned_data):
@@ -16,7 +16,12 @@ from .core import SaleorContext
 
 def get_context_value(request: HttpRequest) -> SaleorContext:
     request = cast(SaleorContext, request)
-    request.dataloaders = {}
+    # Operations of a batched request can share the dataloaders, see
+    # `GRAPHQL_BATCH_SHARED_CONTEXT`.
+    if not getattr(request, "share_dataloaders", False) or not hasattr(
+        request, "dataloaders"
+    ):
+        request.dataloaders = {}
     request.allow_replica = getattr(request, "allow_replica", True)
     request.request_time = timezone.now()
     set_app_on_context(request)
@@ -7,9 +7,12 @@ from django.utils.functional import empty
 
 from ...account.models import User
 from ...app.models import App
+from ...core.replicas import get_replica_connection_name
+from ...core.utils import get_client_ip
 
 if TYPE_CHECKING:
     from .dataloaders import DataLoader
+    from .profiling import QueryProfile
 
 
 class SaleorContext(HttpRequest):
@@ -17,10 +20,13 @@ class SaleorContext(HttpRequest):
     decoded_auth_token: Optional[Dict[str, Any]]
     allow_replica: bool = True
     dataloaders: Dict[str, "DataLoader"]
+    share_dataloaders: bool
     app: Optional[App]
     user: Optional[User]  # type: ignore[assignment]
     requestor: Union[App, User, None]
     request_time: datetime.datetime
+    profile: Optional["QueryProfile"]
+    replica_connection_name: Optional[str]
 
 
 def disallow_replica_in_context(context: SaleorContext) -> None:
@@ -48,9 +54,29 @@ def get_database_connection_name(context: SaleorContext) -> str:
     Queryset to read replica: `User.objects.using(connection_name).all()`.
     """
     allow_replica = getattr(context, "allow_replica", True)
-    if allow_replica:
+    if not allow_replica:
+        return settings.DATABASE_CONNECTION_DEFAULT_NAME
+    if (
+        not settings.DATABASE_REPLICA_LAG_AWARE_ROUTING
+        and len(settings.DATABASE_CONNECTION_REPLICA_NAMES) == 1
+    ):
         return settings.DATABASE_CONNECTION_REPLICA_NAME
-    return settings.DATABASE_CONNECTION_DEFAULT_NAME
+    # The replica is selected once per request to read from a single snapshot.
+    connection_name = getattr(context, "replica_connection_name", None)
+    if connection_name is None:
+        connection_name = get_replica_connection_name(get_requestor_key(context))
+        context.replica_connection_name = connection_name
+    return connection_name
+
+
+def get_requestor_key(context: SaleorContext) -> str:
+    """Return the key identifying the app, user or IP address sending the request."""
+    if app := getattr(context, "app", None):
+        return f"app:{app.pk}"
+    token = getattr(context, "decoded_auth_token", None)
+    if token and token.get("user_id"):
+        return f"user:{token['user_id']}"
+    return f"ip:{get_client_ip(context)}"
 
 
 def setup_context_user(context: SaleorContext) -> None:
@@ -46,6 +46,11 @@ class DataLoader(BaseLoader, Generic[K, R]):
         ) as scope:
             span = scope.span
             span.set_tag(opentracing.tags.COMPONENT, "dataloaders")
+            if profile := getattr(self.context, "profile", None):
+                profile.record_dataloader_batch(
+                    self.__class__.__name__,
+                    len(keys),  # type: ignore[arg-type]
+                )
             results = self.batch_load(keys)
             if not isinstance(results, Promise):
                 return Promise.resolve(results)
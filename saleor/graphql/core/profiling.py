@@ -0,0 +1,156 @@
+"""Per-request profile of GraphQL operations returned in `extensions.profile`.
+
+A request is profiled when it is sent with the `Saleor-Profile` header by a staff
+user or an app with the `MANAGE_OBSERVABILITY` permission. The profile contains
+the SQL queries count and time, the queries executed more than once (usually
+a sign of an N+1 problem), the slowest resolvers and the dataloader batch sizes.
+"""
+import hashlib
+import heapq
+import re
+import time
+from collections import defaultdict
+from contextlib import ExitStack, contextmanager
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from django.db import connections
+from promise import Promise
+
+from ...permission.enums import AppPermission
+from ..utils import get_user_or_app_from_context
+
+if TYPE_CHECKING:
+    from . import SaleorContext
+
+PROFILE_HEADER = "Saleor-Profile"
+DUPLICATE_QUERIES_LIMIT = 10
+SLOWEST_RESOLVERS_LIMIT = 10
+SQL_MAX_LENGTH = 200
+
+# Lists of query parameters differ in length between otherwise identical queries.
+SQL_PARAMS_LIST_RE = re.compile(r"\((?:%s, )+%s\)")
+
+
+def is_profiling_requested(context: "SaleorContext") -> bool:
+    if not context.headers.get(PROFILE_HEADER):
+        return False
+    requestor = get_user_or_app_from_context(context)
+    return bool(requestor) and requestor.has_perm(  # type: ignore[union-attr]
+        AppPermission.MANAGE_OBSERVABILITY
+    )
+
+
+def get_sql_fingerprint(sql: str) -> Tuple[str, str]:
+    normalized_sql = SQL_PARAMS_LIST_RE.sub("(...)", sql)
+    fingerprint = hashlib.sha1(normalized_sql.encode("utf-8")).hexdigest()[:16]
+    return fingerprint, normalized_sql
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 3)
+
+
+class _QueryStats:
+    __slots__ = ("sql", "count", "duration")
+
+    def __init__(self, sql: str):
+        self.sql = sql
+        self.count = 0
+        self.duration = 0.0
+
+
+class QueryProfile:
+    """Collect the profile of a single GraphQL operation.
+
+    The instance is also a graphene middleware timing the resolvers.
+    """
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.sql_count = 0
+        self.sql_duration = 0.0
+        self.queries: Dict[str, _QueryStats] = {}
+        self.resolvers: List[Tuple[float, str]] = []
+        self.dataloader_batches: Dict[str, List[int]] = defaultdict(list)
+
+    def sql_wrapper(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.record_sql(sql, time.perf_counter() - start)
+
+    def record_sql(self, sql: str, duration: float):
+        fingerprint, normalized_sql = get_sql_fingerprint(sql)
+        stats = self.queries.get(fingerprint)
+        if stats is None:
+            stats = self.queries[fingerprint] = _QueryStats(normalized_sql)
+        stats.count += 1
+        stats.duration += duration
+        self.sql_count += 1
+        self.sql_duration += duration
+
+    def resolve(self, next_, root, info, **kwargs):
+        start = time.perf_counter()
+        result = next_(root, info, **kwargs)
+
+        def record(value):
+            path = ".".join(str(key) for key in info.path)
+            self.resolvers.append((time.perf_counter() - start, path))
+            return value
+
+        if isinstance(result, Promise):
+            return result.then(record)
+        return record(result)
+
+    def record_dataloader_batch(self, name: str, size: int):
+        self.dataloader_batches[name].append(size)
+
+    def as_dict(self) -> Dict[str, Any]:
+        duplicates = sorted(
+            (
+                (fingerprint, stats)
+                for fingerprint, stats in self.queries.items()
+                if stats.count > 1
+            ),
+            key=lambda item: (item[1].count, item[1].duration),
+            reverse=True,
+        )
+        slowest_resolvers = heapq.nlargest(SLOWEST_RESOLVERS_LIMIT, self.resolvers)
+        return {
+            "duration": _ms(time.perf_counter() - self.start),
+            "sqlQueriesCount": self.sql_count,
+            "sqlDuration": _ms(self.sql_duration),
+            "duplicateQueries": [
+                {
+                    "fingerprint": fingerprint,
+                    "count": stats.count,
+                    "duration": _ms(stats.duration),
+                    "sql": stats.sql[:SQL_MAX_LENGTH],
+                }
+                for fingerprint, stats in duplicates[:DUPLICATE_QUERIES_LIMIT]
+            ],
+            "slowestResolvers": [
+                {"path": path, "duration": _ms(duration)}
+                for duration, path in slowest_resolvers
+            ],
+            "dataloaders": [
+                {
+                    "name": name,
+                    "batchesCount": len(sizes),
+                    "keysCount": sum(sizes),
+                    "maxBatchSize": max(sizes),
+                }
+                for name, sizes in sorted(self.dataloader_batches.items())
+            ],
+        }
+
+
+@contextmanager
+def profile_sql(profile: Optional[QueryProfile]):
+    """Record the queries sent to any database connection in the profile."""
+    with ExitStack() as stack:
+        if profile is not None:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(profile.sql_wrapper))
+        yield
@@ -0,0 +1,138 @@
+import asyncio
+import json
+import threading
+from unittest import mock
+
+import pytest
+from django.urls import reverse
+from graphql.utils.introspection_query import introspection_query
+
+from ...api import get_schema
+from ...introspection import get_schema_artifacts
+from ...views import AsyncGraphQLView, GraphQLView
+from ..validators.query_cost_budget import charge_query_cost
+
+QUERY_TYPENAME = "query { __typename }"
+
+
+@pytest.fixture
+def schema_artifacts():
+    # built with the canonical introspection before the execution is mocked
+    return get_schema_artifacts(get_schema())
+
+
+def _post(rf, data):
+    return rf.post(reverse("api"), data=data, content_type="application/json")
+
+
+async def test_async_view_executes_operation(rf):
+    # given
+    request = _post(rf, {"query": QUERY_TYPENAME})
+
+    # when
+    response = await AsyncGraphQLView.as_view()(request)
+
+    # then
+    assert response.status_code == 200
+    assert json.loads(response.content)["data"] == {"__typename": "Query"}
+
+
+async def test_async_view_executes_operation_in_thread_pool(rf):
+    # given
+    request = _post(rf, {"query": QUERY_TYPENAME})
+    execute = GraphQLView.execute_graphql_operation
+    thread_names = []
+
+    def execute_graphql_operation(self, *args):
+        thread_names.append(threading.current_thread().name)
+        return execute(self, *args)
+
+    # when
+    with mock.patch.object(
+        GraphQLView, "execute_graphql_operation", execute_graphql_operation
+    ):
+        await AsyncGraphQLView.as_view()(request)
+
+    # then
+    assert thread_names[0].startswith("graphql")
+    assert thread_names[0] != threading.current_thread().name
+
+
+async def test_async_view_executes_operations_concurrently(rf):
+    # given
+    requests = [_post(rf, {"query": QUERY_TYPENAME}) for _ in range(2)]
+    execute = GraphQLView.execute_graphql_operation
+    second_operation_started = threading.Event()
+    calls_count = 0
+    lock = threading.Lock()
+
+    def execute_graphql_operation(self, *args):
+        # the first operation is slow, eg. waits for a webhook response, until the
+        # second one is executed
+        nonlocal calls_count
+        with lock:
+            calls_count += 1
+            is_first = calls_count == 1
+        if is_first:
+            assert second_operation_started.wait(5)
+        else:
+            second_operation_started.set()
+        return execute(self, *args)
+
+    # when
+    with mock.patch.object(
+        GraphQLView, "execute_graphql_operation", execute_graphql_operation
+    ):
+        responses = await asyncio.gather(
+            *(AsyncGraphQLView.as_view()(request) for request in requests)
+        )
+
+    # then
+    assert [response.status_code for response in responses] == [200, 200]
+
+
+async def test_async_view_batch(rf):
+    # given
+    request = _post(rf, [{"query": QUERY_TYPENAME}, {"query": "query { unknown }"}])
+
+    # when
+    response = await AsyncGraphQLView.as_view()(request)
+
+    # then
+    valid, invalid = json.loads(response.content)
+    assert response.status_code == 400
+    assert valid["data"] == {"__typename": "Query"}
+    assert invalid["errors"]
+
+
+@mock.patch.object(GraphQLView, "execute_graphql_operation")
+async def test_async_view_invalid_query_not_executed(mocked_execute, rf):
+    # given
+    request = _post(rf, {"query": "query {"})
+
+    # when
+    response = await AsyncGraphQLView.as_view()(request)
+
+    # then
+    assert response.status_code == 400
+    mocked_execute.assert_not_called()
+
+
+@mock.patch("saleor.graphql.views.charge_query_cost", wraps=charge_query_cost)
+@mock.patch("graphql.backend.core.execute_and_validate")
+async def test_async_view_returns_cached_introspection(
+    mocked_execute, mocked_charge_query_cost, schema_artifacts, rf, settings
+):
+    # given
+    settings.DEBUG = False
+    request = _post(rf, {"query": introspection_query})
+
+    # when
+    response = await AsyncGraphQLView.as_view()(request)
+
+    # then
+    content = json.loads(response.content)
+    assert content["data"]["__schema"]["queryType"] == {"name": "Query"}
+    assert response["ETag"]
+    mocked_execute.assert_not_called()
+    mocked_charge_query_cost.assert_called_once()
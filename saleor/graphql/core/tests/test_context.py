@@ -1,6 +1,10 @@
+from unittest import mock
+
+import graphene
 from django.urls import reverse
 
 from ...context import set_app_on_context
+from ..context import get_database_connection_name
 
 
 def test_app_middleware_accepts_app_requests(app, rf):
@@ -42,3 +46,60 @@ def test_app_middleware_skips_when_token_length_is_different_than_30(
 
     # then
     assert not request.app
+
+
+def test_get_database_connection_name_selects_replica_once_per_request(rf, settings):
+    # given
+    settings.DATABASE_REPLICA_LAG_AWARE_ROUTING = True
+    request = rf.get(reverse("api"))
+    request.app = None
+    request.decoded_auth_token = {"user_id": "VXNlcjox"}
+
+    # when
+    with mock.patch(
+        "saleor.graphql.core.context.get_replica_connection_name",
+        return_value="replica_1",
+    ) as mocked_get_replica:
+        connection_names = [get_database_connection_name(request) for _ in range(3)]
+
+    # then
+    assert connection_names == ["replica_1"] * 3
+    mocked_get_replica.assert_called_once_with("user:VXNlcjox")
+
+
+def test_get_database_connection_name_replica_not_allowed(rf, settings):
+    # given
+    settings.DATABASE_REPLICA_LAG_AWARE_ROUTING = True
+    request = rf.get(reverse("api"))
+    request.allow_replica = False
+
+    # when
+    connection_name = get_database_connection_name(request)
+
+    # then
+    assert connection_name == settings.DATABASE_CONNECTION_DEFAULT_NAME
+
+
+@mock.patch("saleor.graphql.views.record_write")
+def test_mutation_records_write_of_requestor(
+    mocked_record_write, staff_api_client, permission_manage_products, category
+):
+    # given
+    staff_api_client.user.user_permissions.add(permission_manage_products)
+    query = """
+        mutation CategoryUpdate($id: ID!) {
+            categoryUpdate(id: $id, input: {name: "New name"}) {
+                category {
+                    name
+                }
+            }
+        }
+    """
+    variables = {"id": graphene.Node.to_global_id("Category", category.pk)}
+
+    # when
+    staff_api_client.post_graphql(query, variables)
+
+    # then
+    user_id = graphene.Node.to_global_id("User", staff_api_client.user.pk)
+    mocked_record_write.assert_called_once_with(f"user:{user_id}")
@@ -25,6 +25,7 @@ from ..utils import (
     add_hash_to_file_name,
     ext_ref_to_global_id_or_error,
     get_duplicated_values,
+    get_selected_fields,
     snake_to_camel_case,
 )
 from . import ErrorTest
@@ -369,3 +370,52 @@ def test_get_instance_by_both_id_and_external_reference():
         e.value.messages[0]
         == "Argument 'id' cannot be combined with 'external_reference'"
     )
+
+
+class SelectedFieldsNode(graphene.ObjectType):
+    name = graphene.String()
+    children = graphene.List(lambda: SelectedFieldsNode)
+
+
+class SelectedFieldsQuery(graphene.ObjectType):
+    node = graphene.Field(SelectedFieldsNode)
+
+    @staticmethod
+    def resolve_node(_root, info):
+        info.context.selected_fields = get_selected_fields(info)
+        info.context.selected_children_fields = get_selected_fields(info, ["children"])
+        return None
+
+
+def test_get_selected_fields():
+    # given
+    schema = graphene.Schema(query=SelectedFieldsQuery)
+    query = """
+        query {
+          node {
+            name
+            ...NodeFragment
+            ... on SelectedFieldsNode {
+              children {
+                name
+              }
+            }
+          }
+        }
+        fragment NodeFragment on SelectedFieldsNode {
+          children {
+            children {
+              name
+            }
+          }
+        }
+    """
+    context = graphene.Context()
+
+    # when
+    result = schema.execute(query, context=context)
+
+    # then
+    assert not result.errors
+    assert context.selected_fields == {"name", "children"}
+    assert context.selected_children_fields == {"name", "children"}
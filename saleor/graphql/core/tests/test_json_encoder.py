@@ -0,0 +1,79 @@
+import datetime
+import json
+import uuid
+from decimal import Decimal
+from unittest import mock
+
+import orjson
+import pytest
+from django.utils.translation import gettext_lazy
+
+from ...tests.utils import get_graphql_content
+from ..json_encoder import encode_json, encode_json_stdlib
+
+PAYLOAD = {
+    "data": {
+        "order": {
+            "id": uuid.UUID("2b6d6f6c-0a1c-4b8f-9a3e-3b9a5c3d7e1f"),
+            "created": datetime.datetime(2023, 1, 1, 12, tzinfo=datetime.timezone.utc),
+            "total": Decimal("10.50"),
+            "status": gettext_lazy("Unfulfilled"),
+            "lines": [{"quantity": 2, "productName": "Żółta koszulka"}],
+        }
+    }
+}
+
+
+@pytest.mark.parametrize("encoder", [encode_json, encode_json_stdlib])
+def test_encode_json(encoder):
+    # when
+    encoded = encoder(PAYLOAD)
+
+    # then
+    order = json.loads(encoded)["data"]["order"]
+    assert order["id"] == "2b6d6f6c-0a1c-4b8f-9a3e-3b9a5c3d7e1f"
+    assert order["created"].startswith("2023-01-01T12:00:00")
+    assert order["total"] == "10.50"
+    assert order["status"] == "Unfulfilled"
+    assert order["lines"] == [{"quantity": 2, "productName": "Żółta koszulka"}]
+
+
+def test_encode_json_uses_orjson():
+    # when
+    with mock.patch(
+        "saleor.graphql.core.json_encoder.orjson.dumps", wraps=orjson.dumps
+    ) as mocked_dumps:
+        encoded = encode_json(PAYLOAD)
+
+    # then
+    mocked_dumps.assert_called_once()
+    assert json.loads(encoded) == json.loads(encode_json_stdlib(PAYLOAD))
+
+
+@mock.patch("saleor.graphql.core.json_encoder.orjson", None)
+def test_encode_json_without_orjson():
+    # when
+    encoded = encode_json(PAYLOAD)
+
+    # then
+    assert encoded == encode_json_stdlib(PAYLOAD)
+
+
+@mock.patch(
+    "saleor.graphql.core.tests.test_json_encoder.encode_json",
+    wraps=encode_json_stdlib,
+)
+def test_graphql_response_encoder_setting(mocked_encoder, api_client, settings):
+    # given
+    settings.GRAPHQL_RESPONSE_ENCODER = (
+        "saleor.graphql.core.tests.test_json_encoder.encode_json"
+    )
+
+    # when
+    response = api_client.post_graphql("{ shop { name } }")
+
+    # then
+    content = get_graphql_content(response)
+    assert content["data"]["shop"]
+    assert response["Content-Type"] == "application/json"
+    mocked_encoder.assert_called_once_with(content)
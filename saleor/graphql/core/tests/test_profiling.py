@@ -0,0 +1,126 @@
+from ...tests.utils import get_graphql_content
+from ..profiling import QueryProfile, get_sql_fingerprint
+
+QUERY_PRODUCTS = """
+    query {
+      products(first: 10, channel: "main") {
+        edges {
+          node {
+            name
+            category {
+              name
+            }
+          }
+        }
+      }
+    }
+"""
+
+
+def test_profile_returned_for_staff_with_observability_permission(
+    staff_api_client, permission_manage_observability, product_list
+):
+    # given
+    staff_api_client.user.user_permissions.add(permission_manage_observability)
+
+    # when
+    response = staff_api_client.post_graphql(QUERY_PRODUCTS, HTTP_SALEOR_PROFILE="true")
+
+    # then
+    content = get_graphql_content(response)
+    assert len(content["data"]["products"]["edges"]) == len(product_list)
+    profile = content["extensions"]["profile"]
+    assert profile["sqlQueriesCount"] > 0
+    assert profile["sqlDuration"] >= 0
+    assert len(profile["slowestResolvers"]) > 0
+    assert {"path", "duration"} == set(profile["slowestResolvers"][0])
+    # All categories are loaded in a single batch.
+    category_ids = {product.category_id for product in product_list}
+    assert {
+        "name": "CategoryByIdLoader",
+        "batchesCount": 1,
+        "keysCount": len(category_ids),
+        "maxBatchSize": len(category_ids),
+    } in profile["dataloaders"]
+
+
+def test_profile_returned_for_app_with_observability_permission(
+    app_api_client, permission_manage_observability, product_list
+):
+    # given
+    app_api_client.app.permissions.add(permission_manage_observability)
+
+    # when
+    response = app_api_client.post_graphql(QUERY_PRODUCTS, HTTP_SALEOR_PROFILE="true")
+
+    # then
+    content = get_graphql_content(response)
+    assert "profile" in content["extensions"]
+
+
+def test_profile_not_returned_without_header(
+    staff_api_client, permission_manage_observability, product_list
+):
+    # given
+    staff_api_client.user.user_permissions.add(permission_manage_observability)
+
+    # when
+    response = staff_api_client.post_graphql(QUERY_PRODUCTS)
+
+    # then
+    content = get_graphql_content(response)
+    assert "profile" not in content.get("extensions", {})
+
+
+def test_profile_not_returned_without_permission(staff_api_client, product_list):
+    # when
+    response = staff_api_client.post_graphql(QUERY_PRODUCTS, HTTP_SALEOR_PROFILE="true")
+
+    # then
+    content = get_graphql_content(response)
+    assert "profile" not in content.get("extensions", {})
+
+
+def test_profile_not_returned_for_anonymous_user(api_client, product_list):
+    # when
+    response = api_client.post_graphql(QUERY_PRODUCTS, HTTP_SALEOR_PROFILE="true")
+
+    # then
+    content = get_graphql_content(response)
+    assert "profile" not in content.get("extensions", {})
+
+
+def test_get_sql_fingerprint_ignores_params_list_length():
+    # given
+    sql = 'SELECT "id" FROM "product" WHERE "id" IN (%s, %s)'
+
+    # when
+    fingerprint, normalized_sql = get_sql_fingerprint(sql)
+
+    # then
+    assert normalized_sql == 'SELECT "id" FROM "product" WHERE "id" IN (...)'
+    assert fingerprint == get_sql_fingerprint(sql.replace("%s)", "%s, %s)"))[0]
+
+
+def test_query_profile_reports_duplicate_queries():
+    # given
+    profile = QueryProfile()
+    duplicated_sql = 'SELECT "name" FROM "category" WHERE "id" = %s'
+    for _ in range(3):
+        profile.record_sql(duplicated_sql, 0.001)
+    profile.record_sql('SELECT "id" FROM "product"', 0.002)
+
+    # when
+    result = profile.as_dict()
+
+    # then
+    assert result["sqlQueriesCount"] == 4
+    assert result["sqlDuration"] == 5.0
+    assert result["duplicateQueries"] == [
+        {
+            "fingerprint": get_sql_fingerprint(duplicated_sql)[0],
+            "count": 3,
+            "duration": 3.0,
+            "sql": duplicated_sql,
+        }
+    ]
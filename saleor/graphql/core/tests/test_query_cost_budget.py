@@ -0,0 +1,112 @@
+import pytest
+from django.core.cache import cache
+from freezegun import freeze_time
+
+from ...tests.utils import get_graphql_content, get_graphql_content_from_response
+
+QUERY_CATEGORIES = """
+    query {
+      categories(first: 1) {
+        edges {
+          node {
+            name
+          }
+        }
+      }
+    }
+"""
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@freeze_time("2023-01-01 12:00:00")
+def test_query_cost_budget_charged(api_client, category, settings):
+    # given
+    settings.GRAPHQL_QUERY_COST_BUDGET = 3
+    settings.GRAPHQL_QUERY_COST_BUDGET_PERIOD = 60
+
+    # when
+    responses = [api_client.post_graphql(QUERY_CATEGORIES) for _ in range(4)]
+
+    # then
+    costs = [
+        get_graphql_content_from_response(response)["extensions"]["cost"]
+        for response in responses
+    ]
+    assert [cost["remainingBudget"] for cost in costs] == [2, 1, 0, 0]
+    assert all(cost["budget"] == 3 for cost in costs)
+    assert all(response.status_code == 200 for response in responses[:3])
+    content = get_graphql_content_from_response(responses[3])
+    assert "data" not in content
+    assert content["errors"][0]["message"] == (
+        "The query exceeds the remaining query cost budget of 0. "
+        "Retry in 20 seconds."
+    )
+
+
+def test_query_cost_budget_refilled(api_client, category, settings):
+    # given
+    settings.GRAPHQL_QUERY_COST_BUDGET = 1
+    settings.GRAPHQL_QUERY_COST_BUDGET_PERIOD = 60
+    with freeze_time("2023-01-01 12:00:00"):
+        get_graphql_content(api_client.post_graphql(QUERY_CATEGORIES))
+
+    # when
+    with freeze_time("2023-01-01 12:01:00"):
+        response = api_client.post_graphql(QUERY_CATEGORIES)
+
+    # then
+    content = get_graphql_content(response)
+    assert content["data"]["categories"]["edges"][0]["node"]["name"] == category.name
+
+
+@freeze_time("2023-01-01 12:00:00")
+def test_query_cost_budget_kept_per_requestor(
+    api_client, app_api_client, staff_api_client, category, settings
+):
+    # given
+    settings.GRAPHQL_QUERY_COST_BUDGET = 1
+    settings.GRAPHQL_QUERY_COST_BUDGET_PERIOD = 60
+
+    # when
+    responses = [
+        client.post_graphql(QUERY_CATEGORIES)
+        for client in [api_client, app_api_client, staff_api_client]
+    ]
+
+    # then
+    for response in responses:
+        get_graphql_content(response)
+
+
+@freeze_time("2023-01-01 12:00:00")
+def test_query_cost_budget_app_override(app_api_client, category, settings):
+    # given
+    settings.GRAPHQL_QUERY_COST_BUDGET = 1
+    app_api_client.app.query_cost_budget = 0
+    app_api_client.app.save(update_fields=["query_cost_budget"])
+
+    # when
+    responses = [app_api_client.post_graphql(QUERY_CATEGORIES) for _ in range(3)]
+
+    # then
+    for response in responses:
+        content = get_graphql_content(response)
+        assert "remainingBudget" not in content["extensions"]["cost"]
+
+
+def test_query_cost_budget_disabled(api_client, category, settings):
+    # given
+    settings.GRAPHQL_QUERY_COST_BUDGET = 0
+
+    # when
+    response = api_client.post_graphql(QUERY_CATEGORIES)
+
+    # then
+    content = get_graphql_content(response)
+    assert "remainingBudget" not in content["extensions"]["cost"]
@@ -2,15 +2,19 @@ from unittest import mock
 
 import graphene
 import pytest
+from django.db import connection
 from django.test import override_settings
-from graphql.execution.base import ExecutionResult
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from graphql.backend.core import execute_and_validate
+from graphql.utils.introspection_query import introspection_query
 
-from .... import __version__ as saleor_version
 from ....demo.views import EXAMPLE_QUERY
 from ....graphql.utils import INTERNAL_ERROR_MESSAGE
+from ...api import get_schema
+from ...introspection import get_schema_artifacts
 from ...tests.fixtures import API_PATH
 from ...tests.utils import get_graphql_content, get_graphql_content_from_response
-from ...views import generate_cache_key
 
 
 def test_batch_queries(category, product, api_client, channel_USD):
@@ -59,6 +63,92 @@ def test_batch_queries(category, product, api_client, channel_USD):
     assert data["category"]["name"] == category.name
 
 
+QUERY_CATEGORY = """
+    query GetCategory($id: ID!) {
+        category(id: $id) {
+            name
+        }
+    }
+"""
+
+MUTATION_CATEGORY_UPDATE = """
+    mutation CategoryUpdate($id: ID!, $name: String) {
+        categoryUpdate(id: $id, input: {name: $name}) {
+            category {
+                name
+            }
+        }
+    }
+"""
+
+
+@pytest.mark.parametrize("shared_context", [True, False])
+def test_batch_queries_shared_context(shared_context, category, api_client, settings):
+    # given
+    settings.GRAPHQL_BATCH_SHARED_CONTEXT = shared_context
+    variables = {"id": graphene.Node.to_global_id("Category", category.pk)}
+    data = [{"query": QUERY_CATEGORY, "variables": variables} for _ in range(3)]
+
+    # when
+    with CaptureQueriesContext(connection) as queries:
+        response = api_client.post(data)
+
+    # then
+    batch_content = get_graphql_content(response)
+    assert [content["data"]["category"]["name"] for content in batch_content] == [
+        category.name
+    ] * 3
+    category_queries = [
+        query for query in queries if 'FROM "product_category"' in query["sql"]
+    ]
+    assert len(category_queries) == (1 if shared_context else 3)
+
+
+def test_batch_queries_shared_context_reset_by_mutation(
+    category, staff_api_client, permission_manage_products, settings
+):
+    # given
+    settings.GRAPHQL_BATCH_SHARED_CONTEXT = True
+    staff_api_client.user.user_permissions.add(permission_manage_products)
+    variables = {"id": graphene.Node.to_global_id("Category", category.pk)}
+    data = [
+        {"query": QUERY_CATEGORY, "variables": variables},
+        {
+            "query": MUTATION_CATEGORY_UPDATE,
+            "variables": {**variables, "name": "New name"},
+        },
+        {"query": QUERY_CATEGORY, "variables": variables},
+    ]
+
+    # when
+    response = staff_api_client.post(data)
+
+    # then
+    first, mutation, last = get_graphql_content(response)
+    assert first["data"]["category"]["name"] == category.name
+    assert mutation["data"]["categoryUpdate"]["category"]["name"] == "New name"
+    assert last["data"]["category"]["name"] == "New name"
+
+
+def test_batch_queries_shared_context_isolates_errors(category, api_client, settings):
+    # given
+    settings.GRAPHQL_BATCH_SHARED_CONTEXT = True
+    variables = {"id": graphene.Node.to_global_id("Category", category.pk)}
+    data = [
+        {"query": "query { category(id: 1) { unknownField } }"},
+        {"query": QUERY_CATEGORY, "variables": variables},
+    ]
+
+    # when
+    response = api_client.post(data)
+
+    # then
+    invalid, valid = response.json()
+    assert response.status_code == 400
+    assert invalid["errors"]
+    assert valid["data"]["category"]["name"] == category.name
+
+
 def test_graphql_view_query_with_invalid_object_type(
     staff_api_client, product, permission_manage_orders, graphql_log_handler
 ):
@@ -286,49 +376,93 @@ query IntrospectionQuery {
 INTROSPECTION_RESULT = {"__schema": {"queryType": {"name": "Query"}}}
 
 
-@mock.patch("saleor.graphql.views.cache.set")
-@mock.patch("saleor.graphql.views.cache.get")
+@pytest.fixture
+def introspection_results():
+    artifacts = get_schema_artifacts(get_schema())
+    artifacts._introspection_results.clear()
+    yield
+    artifacts._introspection_results.clear()
+
+
+@mock.patch("graphql.backend.core.execute_and_validate", wraps=execute_and_validate)
 @override_settings(DEBUG=False, OBSERVABILITY_REPORT_ALL_API_CALLS=False)
-def test_introspection_query_is_cached(cache_get_mock, cache_set_mock, api_client):
-    cache_get_mock.return_value = None
-    cache_key = generate_cache_key(INTROSPECTION_QUERY)
+def test_introspection_query_is_cached(execute_mock, introspection_results, api_client):
+    # given
     response = api_client.post_graphql(INTROSPECTION_QUERY)
-    content = get_graphql_content(response)
-    assert content["data"] == INTROSPECTION_RESULT
-    cache_get_mock.assert_called_once_with(cache_key)
-    cache_set_mock.assert_called_once_with(
-        cache_key, ExecutionResult(data=INTROSPECTION_RESULT)
-    )
+    reformatted_query = "# Dashboard\n" + " ".join(INTROSPECTION_QUERY.split())
+
+    # when
+    reformatted_response = api_client.post_graphql(reformatted_query)
+
+    # then
+    assert get_graphql_content(reformatted_response)["data"] == INTROSPECTION_RESULT
+    assert reformatted_response["ETag"] == response["ETag"]
+    execute_mock.assert_called_once()
 
 
-@mock.patch("saleor.graphql.views.cache.set")
-@mock.patch("saleor.graphql.views.cache.get")
+@mock.patch("graphql.backend.core.execute_and_validate", wraps=execute_and_validate)
 @override_settings(DEBUG=False, OBSERVABILITY_REPORT_ALL_API_CALLS=False)
-def test_introspection_query_is_cached_only_once(
-    cache_get_mock, cache_set_mock, api_client
+def test_canonical_introspection_query_is_precomputed(
+    execute_mock, introspection_results, api_client
 ):
-    cache_get_mock.return_value = ExecutionResult(data=INTROSPECTION_RESULT)
-    cache_key = generate_cache_key(INTROSPECTION_QUERY)
-    response = api_client.post_graphql(INTROSPECTION_QUERY)
+    # when
+    response = api_client.post_graphql(introspection_query)
+
+    # then
     content = get_graphql_content(response)
-    assert content["data"] == INTROSPECTION_RESULT
-    cache_get_mock.assert_called_once_with(cache_key)
-    cache_set_mock.assert_not_called()
+    assert content["data"]["__schema"]["queryType"] == {"name": "Query"}
+    assert response["ETag"]
+    execute_mock.assert_not_called()
 
 
-@mock.patch("saleor.graphql.views.cache.set")
-@mock.patch("saleor.graphql.views.cache.get")
+@override_settings(DEBUG=False, OBSERVABILITY_REPORT_ALL_API_CALLS=False)
+def test_introspection_query_with_matching_etag_is_not_304(
+    introspection_results, api_client
+):
+    # given
+    etag = api_client.post_graphql(INTROSPECTION_QUERY)["ETag"]
+
+    # when
+    response = api_client.post_graphql(INTROSPECTION_QUERY, HTTP_IF_NONE_MATCH=etag)
+
+    # then
+    assert response.status_code == 200
+    assert response["ETag"] == etag
+    assert get_graphql_content(response)["data"] == INTROSPECTION_RESULT
+
+
+@mock.patch("graphql.backend.core.execute_and_validate", wraps=execute_and_validate)
 @override_settings(DEBUG=True, OBSERVABILITY_REPORT_ALL_API_CALLS=False)
 def test_introspection_query_is_not_cached_in_debug_mode(
-    cache_get_mock, cache_set_mock, api_client
+    execute_mock, introspection_results, api_client
 ):
-    response = api_client.post_graphql(INTROSPECTION_QUERY)
+    # when
+    for _ in range(2):
+        response = api_client.post_graphql(INTROSPECTION_QUERY)
+
+    # then
     content = get_graphql_content(response)
     assert content["data"] == INTROSPECTION_RESULT
-    cache_get_mock.assert_not_called()
-    cache_set_mock.assert_not_called()
+    assert not response.has_header("ETag")
+    assert execute_mock.call_count == 2
+
+
+def test_schema_sdl(client):
+    # when
+    response = client.get(reverse("api-schema-sdl"))
+
+    # then
+    assert response.status_code == 200
+    assert "type Query {" in response.content.decode()
+    assert response["ETag"] == get_schema_artifacts(get_schema()).sdl_etag
+
+
+def test_schema_sdl_not_modified(client):
+    # given
+    etag = get_schema_artifacts(get_schema()).sdl_etag
 
+    # when
+    response = client.get(reverse("api-schema-sdl"), HTTP_IF_NONE_MATCH=etag)
 
-def test_generate_cache_key_use_saleor_version():
-    cache_key = generate_cache_key(INTROSPECTION_QUERY)
-    assert saleor_version in cache_key
+    # then
+    assert response.status_code == 304
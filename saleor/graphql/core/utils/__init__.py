@@ -2,18 +2,34 @@ import binascii
 import os
 import secrets
 from dataclasses import dataclass
-from typing import List, Literal, Optional, Tuple, Type, Union, overload
+from typing import (
+    TYPE_CHECKING,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    Union,
+    overload,
+)
 
 import graphene
 from django.core.exceptions import ValidationError
 from graphene import ObjectType
 from graphql.error import GraphQLError
+from graphql.language import ast
 
 from ....plugins.const import APP_ID_PREFIX
 from ....thumbnail import FILE_NAME_MAX_LENGTH
 from ....webhook.event_types import WebhookEventAsyncType
 from ..validators import validate_if_int_or_uuid
 
+if TYPE_CHECKING:
+    from .. import ResolveInfo
+
 
 def snake_to_camel_case(name):
     """Convert snake_case variable name to camelCase."""
@@ -143,6 +159,46 @@ def ext_ref_to_global_id_or_error(model, external_reference):
         )
 
 
+def _get_selected_field_nodes(
+    selection_sets: Iterable[Optional[ast.SelectionSet]], fragments: dict
+) -> Iterator[ast.Field]:
+    for selection_set in selection_sets:
+        if not selection_set:
+            continue
+        for selection in selection_set.selections:
+            if isinstance(selection, ast.Field):
+                yield selection
+            elif isinstance(selection, ast.FragmentSpread):
+                fragment = fragments[selection.name.value]
+                yield from _get_selected_field_nodes(
+                    [fragment.selection_set], fragments
+                )
+            elif isinstance(selection, ast.InlineFragment):
+                yield from _get_selected_field_nodes(
+                    [selection.selection_set], fragments
+                )
+
+
+def get_selected_fields(info: "ResolveInfo", path: Iterable[str] = ()) -> Set[str]:
+    """Return the names of the fields selected at the path below the resolved field.
+
+    Fragments are followed, and directives are ignored. For example,
+    `get_selected_fields(info, ["edges", "node"])` returns the fields selected on
+    the nodes of a connection.
+    """
+    selection_sets = [field_ast.selection_set for field_ast in info.field_asts]
+    for name in path:
+        selection_sets = [
+            field_node.selection_set
+            for field_node in _get_selected_field_nodes(selection_sets, info.fragments)
+            if field_node.name.value == name
+        ]
+    return {
+        field_node.name.value
+        for field_node in _get_selected_field_nodes(selection_sets, info.fragments)
+    }
+
+
 @dataclass
 class WebhookEventInfo:
     type: str
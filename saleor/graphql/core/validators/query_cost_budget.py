@@ -0,0 +1,84 @@
+"""Token bucket budgets of query cost, shared by all API instances through the cache.
+
+Each app, user or IP address has a bucket of `GRAPHQL_QUERY_COST_BUDGET` cost
+points, refilled completely within `GRAPHQL_QUERY_COST_BUDGET_PERIOD` seconds.
+Every operation takes its computed cost from the bucket and is rejected when
+the remaining budget is lower than the cost. The bucket is kept as the time at
+which it will be full again (GCRA). The update isn't atomic, so concurrent
+requests can exceed the budget slightly.
+"""
+import math
+import time
+from dataclasses import dataclass
+from typing import List, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from graphql import GraphQLError
+
+from ..context import SaleorContext, get_requestor_key
+
+CACHE_KEY_PREFIX = "query-cost-budget:"
+
+
+@dataclass
+class QueryCostBudget:
+    limit: int
+    remaining: int
+    retry_after: float = 0
+
+
+def get_query_cost_budget_limit(context: SaleorContext) -> int:
+    app = getattr(context, "app", None)
+    if app and app.query_cost_budget is not None:
+        return app.query_cost_budget
+    return settings.GRAPHQL_QUERY_COST_BUDGET
+
+
+def get_query_cost_budget_key(context: SaleorContext) -> str:
+    return f"{CACHE_KEY_PREFIX}{get_requestor_key(context)}"
+
+
+def charge_query_cost(
+    context: SaleorContext, query_cost: int
+) -> Optional[QueryCostBudget]:
+    """Take the query cost from the requestor's budget.
+
+    Return None when the requestor has no budget. When the remaining budget is too
+    low, nothing is taken and the returned budget has a non-zero `retry_after`.
+    """
+    limit = get_query_cost_budget_limit(context)
+    if not limit:
+        return None
+    period = settings.GRAPHQL_QUERY_COST_BUDGET_PERIOD
+    interval = period / limit
+    key = get_query_cost_budget_key(context)
+    now = time.time()
+    full_at = max(cache.get(key) or now, now)
+    new_full_at = full_at + query_cost * interval
+    if new_full_at - now > period:
+        return QueryCostBudget(
+            limit=limit,
+            remaining=_get_remaining(full_at - now, period, interval),
+            retry_after=new_full_at - now - period,
+        )
+    cache.set(key, new_full_at, math.ceil(new_full_at - now))
+    return QueryCostBudget(
+        limit=limit, remaining=_get_remaining(new_full_at - now, period, interval)
+    )
+
+
+def _get_remaining(refill_time: float, period: float, interval: float) -> int:
+    # Rounded to not lose a point to floating point errors.
+    return math.floor(round((period - refill_time) / interval, 6))
+
+
+def validate_query_cost_budget(budget: Optional[QueryCostBudget]) -> List[GraphQLError]:
+    if not budget or not budget.retry_after:
+        return []
+    return [
+        GraphQLError(
+            "The query exceeds the remaining query cost budget of "
+            f"{budget.remaining}. Retry in {math.ceil(budget.retry_after)} seconds."
+        )
+    ]
@@ -0,0 +1,123 @@
+"""Introspection results and the SDL of the schema, kept in memory.
+
+The dashboard and code generators fetch the introspection of the whole schema
+on every start. It doesn't depend on the requestor, so the results are computed
+once per process and per query, and served from memory with an ETag.
+The canonical introspection query is executed when the artifacts are built;
+other introspection queries are executed on the first use and kept by their
+normalized document, so formatting and comments don't matter.
+"""
+import hashlib
+import json
+import threading
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+import graphene
+from django.core.serializers.json import DjangoJSONEncoder
+from graphql import GraphQLDocument, get_default_backend
+from graphql.execution import ExecutionResult
+from graphql.language.printer import print_ast
+from graphql.utils.introspection_query import introspection_query
+
+from .schema_printer import print_schema
+
+# Introspection queries other than the canonical one kept per schema.
+MAX_INTROSPECTION_RESULTS = 32
+
+
+def generate_etag(value) -> str:
+    # Weak, as responses include the query cost extensions.
+    content = (
+        value if isinstance(value, str) else json.dumps(value, cls=DjangoJSONEncoder)
+    )
+    return f'W/"{hashlib.sha256(content.encode("utf-8")).hexdigest()[:32]}"'
+
+
+def generate_introspection_key(
+    document: GraphQLDocument,
+    variables: Optional[dict] = None,
+    operation_name: Optional[str] = None,
+) -> str:
+    normalized_query = print_ast(document.document_ast)
+    key = json.dumps([normalized_query, variables, operation_name], sort_keys=True)
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class IntrospectionResult:
+    data: dict
+    etag: str
+
+    def get_execution_result(self) -> ExecutionResult:
+        # A new result, as the view adds extensions to it.
+        return ExecutionResult(data=self.data)
+
+
+class SchemaArtifacts:
+    def __init__(self, schema: graphene.Schema):
+        self.sdl = print_schema(schema)
+        self.sdl_etag = generate_etag(self.sdl)
+        self._lock = threading.Lock()
+        self._introspection_results: OrderedDict[
+            str, IntrospectionResult
+        ] = OrderedDict()
+
+        document = get_default_backend().document_from_string(
+            schema, introspection_query
+        )
+        result = document.execute()
+        self._canonical_key = generate_introspection_key(document)
+        self._canonical_result = IntrospectionResult(
+            data=result.data, etag=generate_etag(result.data)
+        )
+
+    def get_introspection_result(
+        self,
+        document: GraphQLDocument,
+        variables: Optional[dict] = None,
+        operation_name: Optional[str] = None,
+    ) -> Optional[IntrospectionResult]:
+        key = generate_introspection_key(document, variables, operation_name)
+        if key == self._canonical_key:
+            return self._canonical_result
+        with self._lock:
+            result = self._introspection_results.get(key)
+            if result:
+                self._introspection_results.move_to_end(key)
+        return result
+
+    def set_introspection_result(
+        self,
+        document: GraphQLDocument,
+        variables: Optional[dict],
+        operation_name: Optional[str],
+        execution_result: ExecutionResult,
+    ) -> Optional[IntrospectionResult]:
+        if execution_result.errors or execution_result.invalid:
+            return None
+        key = generate_introspection_key(document, variables, operation_name)
+        data = execution_result.data
+        result = IntrospectionResult(data=data, etag=generate_etag(data))
+        with self._lock:
+            self._introspection_results[key] = result
+            if len(self._introspection_results) > MAX_INTROSPECTION_RESULTS:
+                self._introspection_results.popitem(last=False)
+        return result
+
+
+_artifacts: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+_artifacts_lock = threading.Lock()
+
+
+def get_schema_artifacts(schema: graphene.Schema) -> SchemaArtifacts:
+    """Return the artifacts of the schema, built on the first use."""
+    artifacts = _artifacts.get(schema)
+    if artifacts is None:
+        with _artifacts_lock:
+            artifacts = _artifacts.get(schema)
+            if artifacts is None:
+                artifacts = _artifacts[schema] = SchemaArtifacts(schema)
+    return artifacts
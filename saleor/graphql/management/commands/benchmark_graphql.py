@@ -0,0 +1,135 @@
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client, override_settings
+
+from ....account.models import User
+from ....channel.models import Channel
+from ....core.jwt import create_access_token
+from ...benchmark import (
+    OPERATIONS,
+    BenchmarkError,
+    compare_results,
+    run_operation,
+    serialize_results,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the most frequent storefront and dashboard GraphQL operations "
+        "against the current database. Report the number of database queries, "
+        "the wall time and the allocated memory, and compare them to a baseline."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--operation",
+            action="append",
+            dest="operations",
+            choices=[operation.name for operation in OPERATIONS],
+            help="Operation to benchmark, all by default.",
+        )
+        parser.add_argument(
+            "--channel",
+            default=settings.DEFAULT_CHANNEL_SLUG,
+            help="Slug of the channel of the storefront operations.",
+        )
+        parser.add_argument(
+            "--staff-email",
+            help=(
+                "Email of the staff user of the dashboard operations, the first "
+                "active superuser by default."
+            ),
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Number of measured executions of each operation.",
+        )
+        parser.add_argument("--output", help="Path of the JSON file with results.")
+        parser.add_argument(
+            "--compare",
+            help="Path of the JSON file with baseline results to compare against.",
+        )
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=0.2,
+            help=(
+                "Allowed increase of the wall time and allocations compared to "
+                "the baseline, as a fraction."
+            ),
+        )
+
+    def handle(self, *args, **options):
+        channel = Channel.objects.filter(slug=options["channel"]).first()
+        if not channel:
+            raise CommandError(f"Channel {options['channel']} doesn't exist.")
+        staff_headers = self.get_staff_headers(options["staff_email"])
+        operations = [
+            operation
+            for operation in OPERATIONS
+            if not options["operations"] or operation.name in options["operations"]
+        ]
+
+        results = []
+        client = Client()
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]):
+            for operation in operations:
+                variables = operation.get_variables(channel)
+                if variables is None:
+                    self.stdout.write(f"Skipping {operation.name}: no data.")
+                    continue
+                headers = staff_headers if operation.staff else {}
+                try:
+                    result = run_operation(
+                        client, operation, variables, headers, options["repeat"]
+                    )
+                except BenchmarkError as e:
+                    raise CommandError(str(e))
+                results.append(result)
+
+        baseline = {}
+        if options["compare"]:
+            with open(options["compare"]) as f:
+                baseline = json.load(f)
+        self.write_report(results, baseline)
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                json.dump(serialize_results(results), f, indent=2)
+
+        if regressions := compare_results(baseline, results, options["threshold"]):
+            raise CommandError("Performance regressions:\n" + "\n".join(regressions))
+
+    def get_staff_headers(self, email):
+        staff_users = User.objects.filter(is_active=True, is_staff=True)
+        if email:
+            user = staff_users.filter(email=email).first()
+        else:
+            user = staff_users.filter(is_superuser=True).order_by("pk").first()
+        if not user:
+            return {}
+        return {"HTTP_AUTHORIZATION": f"JWT {create_access_token(user)}"}
+
+    def write_report(self, results, baseline):
+        self.stdout.write(
+            f"{'operation':<20}{'queries':>16}{'time [ms]':>22}{'memory [KiB]':>24}"
+        )
+        for result in results:
+            expected = baseline.get(result.name, {})
+            columns = [
+                self.format_value(result.queries, expected.get("queries"), 16),
+                self.format_value(result.time, expected.get("time"), 22),
+                self.format_value(result.allocations, expected.get("allocations"), 24),
+            ]
+            self.stdout.write(f"{result.name:<20}" + "".join(columns))
+
+    @staticmethod
+    def format_value(value, expected, width):
+        if expected is None:
+            return f"{value:>{width}}"
+        change = (value - expected) / expected if expected else 0
+        return f"{f'{expected} -> {value} ({change:+.0%})':>{width}}"
@@ -44,6 +44,7 @@ from ....permission.enums import OrderPermissions
 from ....product.models import ProductVariant
 from ....shipping.models import ShippingMethod, ShippingMethodChannelListing
 from ....tax.models import TaxClass
+from ....warehouse.availability_projection import mark_variants_availability_changed
 from ....warehouse.models import Stock, Warehouse
 from ...account.i18n import I18nMixin
 from ...account.types import AddressInput
@@ -2152,6 +2153,7 @@ class OrderBulkCreate(BaseMutation, I18nMixin):
         FulfillmentLine.objects.bulk_create(fulfillment_lines)
 
         Stock.objects.bulk_update(stocks, ["quantity"])
+        mark_variants_availability_changed(stock.product_variant_id for stock in stocks)
 
         transactions: List[TransactionItem] = sum(
             [
@@ -831,15 +831,18 @@ class ProductBulkCreate(BaseMutation):
     @classmethod
     def post_save_actions(cls, info, products, variants, channels):
         manager = get_plugin_manager_promise(info.context).get()
-        product_ids = []
+        product_ids = [product.node.id for product in products]
         webhooks = get_webhooks_for_event(WebhookEventAsyncType.PRODUCT_CREATED)
-        for product in products:
-            cls.call_event(manager.product_created, product.node, webhooks=webhooks)
-            product_ids.append(product.node.id)
+        cls.call_event(
+            manager.product_created_bulk,
+            [product.node for product in products],
+            webhooks=webhooks,
+        )
 
         webhooks = get_webhooks_for_event(WebhookEventAsyncType.PRODUCT_VARIANT_CREATED)
-        for variant in variants:
-            cls.call_event(manager.product_variant_created, variant, webhooks=webhooks)
+        cls.call_event(
+            manager.product_variant_created_bulk, list(variants), webhooks=webhooks
+        )
 
         webhooks = get_webhooks_for_event(WebhookEventAsyncType.CHANNEL_UPDATED)
         for channel in channels:
@@ -924,10 +924,11 @@ class ProductVariantBulkCreate(BaseMutation):
 
         webhooks = get_webhooks_for_event(WebhookEventAsyncType.PRODUCT_VARIANT_CREATED)
         manager = get_plugin_manager_promise(info.context).get()
-        for instance in instances:
-            cls.call_event(
-                manager.product_variant_created, instance.node, webhooks=webhooks
-            )
+        cls.call_event(
+            manager.product_variant_created_bulk,
+            [instance.node for instance in instances],
+            webhooks=webhooks,
+        )
 
     @classmethod
     @traced_atomic_transaction()
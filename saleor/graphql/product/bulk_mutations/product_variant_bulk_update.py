@@ -12,6 +12,7 @@ from ....product import models
 from ....product.error_codes import ProductErrorCode, ProductVariantBulkErrorCode
 from ....product.tasks import update_products_discounted_prices_for_promotion_task
 from ....warehouse import models as warehouse_models
+from ....warehouse.availability_projection import mark_variants_availability_changed
 from ....webhook.event_types import WebhookEventAsyncType
 from ....webhook.utils import get_webhooks_for_event
 from ...attribute.utils import AttributeAssignmentMixin
@@ -652,6 +653,7 @@ class ProductVariantBulkUpdate(BaseMutation):
             fields=["price_amount", "cost_price_amount", "preorder_quantity_threshold"],
         )
         warehouse_models.Stock.objects.filter(id__in=stocks_to_remove).delete()
+        mark_variants_availability_changed(variant.pk for variant in variants_to_update)
         models.ProductVariantChannelListing.objects.filter(
             id__in=listings_to_remove
         ).delete()
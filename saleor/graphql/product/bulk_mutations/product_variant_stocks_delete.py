@@ -6,6 +6,7 @@ from ....core.tracing import traced_atomic_transaction
 from ....permission.enums import ProductPermissions
 from ....product import models
 from ....warehouse import models as warehouse_models
+from ....warehouse.availability_projection import mark_variants_availability_changed
 from ....webhook.event_types import WebhookEventAsyncType
 from ....webhook.utils import get_webhooks_for_event
 from ...channel import ChannelContext
@@ -85,6 +86,7 @@ class ProductVariantStocksDelete(BaseMutation):
             )
 
         stocks_to_delete.delete()
+        mark_variants_availability_changed([variant.id])
 
         StocksWithAvailableQuantityByProductVariantIdCountryCodeAndChannelLoader(
             info.context
@@ -0,0 +1,187 @@
+"""Prefetch of the data selected on the nodes of product and variant connections.
+
+Resolvers of products and variants load their data in sequential waves of batched
+queries; e.g. the pricing loads the channel, then its tax configuration, then
+the configuration per country and finally the tax rates. When a connection is
+resolved all its nodes are known, so the loaders of the selected fields are
+primed at once, and the deeper loads start as soon as their keys are known.
+The loaders by ID are primed with the nodes, so loaders that go through them,
+e.g. the tax class of a product or a variant, don't fetch the nodes again.
+Child resolvers then get the data from the cache of the loaders.
+"""
+from typing import TYPE_CHECKING, Iterable, List, Optional
+
+from promise import Promise
+
+from ...core.utils.country import get_active_country
+from ...permission.utils import has_one_of_permissions
+from ...product import models
+from ...product.models import ALL_PRODUCTS_PERMISSIONS
+from ..channel.dataloaders import ChannelBySlugLoader
+from ..core.utils import get_selected_fields
+from ..tax.dataloaders import (
+    TaxClassByProductIdLoader,
+    TaxClassByVariantIdLoader,
+    TaxClassCountryRateByTaxClassIDLoader,
+    TaxClassDefaultRateByCountryLoader,
+    TaxConfigurationByChannelId,
+    TaxConfigurationPerCountryByTaxConfigurationIDLoader,
+)
+from ..utils import get_user_or_app_from_context
+from ..warehouse.dataloaders import (
+    AvailableQuantityByProductVariantIdCountryCodeAndChannelSlugLoader,
+)
+from .dataloaders import (
+    ProductByIdLoader,
+    ProductChannelListingByProductIdAndChannelSlugLoader,
+    ProductVariantByIdLoader,
+    ProductVariantsByProductIdLoader,
+    VariantChannelListingByVariantIdAndChannelSlugLoader,
+    VariantsChannelListingByProductIdAndChannelSlugLoader,
+)
+from .dataloaders.products import (
+    AvailableProductVariantsByProductIdAndChannel,
+    ProductVariantsByProductIdAndChannel,
+)
+
+if TYPE_CHECKING:
+    from ..core import ResolveInfo
+
+# Product fields resolved from the channel listing of the product.
+PRODUCT_CHANNEL_LISTING_FIELDS = {
+    "availableForPurchase",
+    "availableForPurchaseAt",
+    "isAvailable",
+    "isAvailableForPurchase",
+    "pricing",
+}
+
+
+def prefetch_tax_configuration(context, channel_slug: str):
+    def load_tax_configuration_per_country(tax_config):
+        if not tax_config:
+            return None
+        return TaxConfigurationPerCountryByTaxConfigurationIDLoader(context).load(
+            tax_config.id
+        )
+
+    def load_tax_configuration(channel):
+        if not channel:
+            return None
+        TaxClassDefaultRateByCountryLoader(context).load(get_active_country(channel))
+        return (
+            TaxConfigurationByChannelId(context)
+            .load(channel.id)
+            .then(load_tax_configuration_per_country)
+        )
+
+    ChannelBySlugLoader(context).load(channel_slug).then(load_tax_configuration)
+
+
+def prefetch_tax_class_rates(context, tax_classes: Promise):
+    def load_tax_class_rates(tax_classes):
+        tax_class_ids = {tax_class.pk for tax_class in tax_classes if tax_class}
+        return TaxClassCountryRateByTaxClassIDLoader(context).load_many(
+            list(tax_class_ids)
+        )
+
+    tax_classes.then(load_tax_class_rates)
+
+
+def load_product_variants(
+    info: "ResolveInfo", product_ids: List[int], channel_slug: Optional[str]
+) -> Promise:
+    # Uses the loaders of `Product.variants`, so the resolver hits their cache.
+    requestor = get_user_or_app_from_context(info.context)
+    has_required_permissions = has_one_of_permissions(
+        requestor, ALL_PRODUCTS_PERMISSIONS
+    )
+    if has_required_permissions and not channel_slug:
+        return ProductVariantsByProductIdLoader(info.context).load_many(product_ids)
+    keys = [(product_id, channel_slug) for product_id in product_ids]
+    if has_required_permissions:
+        return ProductVariantsByProductIdAndChannel(info.context).load_many(keys)
+    return AvailableProductVariantsByProductIdAndChannel(info.context).load_many(keys)
+
+
+def prefetch_variants(
+    context,
+    variants: Iterable[models.ProductVariant],
+    channel_slug: Optional[str],
+    fields: Iterable[str],
+):
+    variants = list(variants)
+    variant_loader = ProductVariantByIdLoader(context)
+    for variant in variants:
+        variant_loader.prime(variant.id, variant)
+    if not variants or channel_slug is None or "pricing" not in fields:
+        return
+    # The slug of the default channel is lazy; loaders get it in the keys.
+    channel_slug = str(channel_slug)
+    variant_ids = [variant.id for variant in variants]
+    VariantChannelListingByVariantIdAndChannelSlugLoader(context).load_many(
+        [(variant_id, channel_slug) for variant_id in variant_ids]
+    )
+    ProductChannelListingByProductIdAndChannelSlugLoader(context).load_many(
+        list({(variant.product_id, channel_slug) for variant in variants})
+    )
+    prefetch_tax_configuration(context, channel_slug)
+    prefetch_tax_class_rates(
+        context, TaxClassByVariantIdLoader(context).load_many(variant_ids)
+    )
+
+
+def prefetch_products(
+    info: "ResolveInfo",
+    products: Iterable[models.Product],
+    channel_slug: Optional[str],
+):
+    """Prime the loaders of the fields selected on the nodes of the connection."""
+    products = list(products)
+    if not products:
+        return
+    context = info.context
+    product_loader = ProductByIdLoader(context)
+    for product in products:
+        product_loader.prime(product.id, product)
+    product_ids = [product.id for product in products]
+    if channel_slug is not None:
+        # The slug of the default channel is lazy; loaders get it in the keys.
+        channel_slug = str(channel_slug)
+    fields = get_selected_fields(info, ["edges", "node"])
+    variant_fields = get_selected_fields(info, ["edges", "node", "variants"])
+
+    if channel_slug:
+        keys = [(product_id, channel_slug) for product_id in product_ids]
+        if fields & PRODUCT_CHANNEL_LISTING_FIELDS:
+            ProductChannelListingByProductIdAndChannelSlugLoader(context).load_many(
+                keys
+            )
+        if "pricing" in fields:
+            VariantsChannelListingByProductIdAndChannelSlugLoader(context).load_many(
+                keys
+            )
+            prefetch_tax_configuration(context, channel_slug)
+            prefetch_tax_class_rates(
+                context, TaxClassByProductIdLoader(context).load_many(product_ids)
+            )
+
+    is_available_selected = bool(channel_slug) and "isAvailable" in fields
+    if not is_available_selected and not variant_fields:
+        return
+
+    def prefetch_loaded_variants(variants_per_product):
+        variants = [
+            variant
+            for product_variants in variants_per_product
+            for variant in product_variants
+        ]
+        if is_available_selected:
+            AvailableQuantityByProductVariantIdCountryCodeAndChannelSlugLoader(
+                context
+            ).load_many([(variant.id, None, channel_slug) for variant in variants])
+        prefetch_variants(context, variants, channel_slug, variant_fields)
+
+    load_product_variants(info, product_ids, channel_slug).then(
+        prefetch_loaded_variants
+    )
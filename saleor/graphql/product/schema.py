@@ -19,7 +19,7 @@ from ..core.fields import (
 )
 from ..core.tracing import traced_resolver
 from ..core.types import NonNullList
-from ..core.utils import from_global_id_or_error
+from ..core.utils import from_global_id_or_error, get_selected_fields
 from ..core.validators import validate_one_of_args_is_in_query
 from ..translations.mutations import (
     CategoryTranslate,
@@ -104,6 +104,7 @@ from .mutations.digital_contents import (
     DigitalContentUpdate,
     DigitalContentUrlCreate,
 )
+from .prefetch import prefetch_products, prefetch_variants
 from .resolvers import (
     resolve_categories,
     resolve_collection_by_id,
@@ -454,7 +455,11 @@ class ProductQueries(graphene.ObjectType):
             )
         kwargs["channel"] = channel
         qs = filter_connection_queryset(qs, kwargs)
-        return create_connection_slice(qs, info, kwargs, ProductCountableConnection)
+        connection = create_connection_slice(
+            qs, info, kwargs, ProductCountableConnection
+        )
+        prefetch_products(info, [edge.node.node for edge in connection.edges], channel)
+        return connection
 
     @staticmethod
     def resolve_product_type(_root, _info: ResolveInfo, *, id):
@@ -520,9 +525,16 @@ class ProductQueries(graphene.ObjectType):
         )
         kwargs["channel"] = qs.channel_slug
         qs = filter_connection_queryset(qs, kwargs)
-        return create_connection_slice(
+        connection = create_connection_slice(
             qs, info, kwargs, ProductVariantCountableConnection
         )
+        prefetch_variants(
+            info.context,
+            [edge.node.node for edge in connection.edges],
+            qs.channel_slug,
+            get_selected_fields(info, ["edges", "node"]),
+        )
+        return connection
 
     @staticmethod
     @traced_resolver
@@ -861,3 +861,45 @@ def test_products_types_for_federation_query_count(
         response = api_client.post_graphql(query, variables)
         content = get_graphql_content(response)
         assert len(content["data"]["_entities"]) == 2
+
+
+@pytest.mark.django_db
+@pytest.mark.count_queries(autouse=False)
+def test_retrieve_product_list_with_pricing_and_variants(
+    product_list, api_client, count_queries, channel_USD
+):
+    query = """
+        query($channel: String) {
+          products(first: 10, channel: $channel) {
+            edges {
+              node {
+                id
+                isAvailable
+                pricing {
+                  onSale
+                  priceRange {
+                    start {
+                      gross {
+                        amount
+                      }
+                    }
+                  }
+                }
+                variants {
+                  id
+                  pricing {
+                    price {
+                      gross {
+                        amount
+                      }
+                    }
+                  }
+                }
+              }
+            }
+          }
+        }
+    """
+
+    variables = {"channel": channel_USD.slug}
+    get_graphql_content(api_client.post_graphql(query, variables))
@@ -150,7 +150,7 @@ def test_product_bulk_create_with_base_data(
     assert args == {product.id for product in products}
 
 
-@patch("saleor.plugins.manager.PluginsManager.product_created")
+@patch("saleor.plugins.manager.PluginsManager.product_created_bulk")
 def test_product_bulk_create_send_product_created_webhook(
     created_webhook_mock,
     staff_api_client,
@@ -205,9 +205,11 @@ def test_product_bulk_create_send_product_created_webhook(
     assert not data["results"][0]["errors"]
     assert not data["results"][1]["errors"]
     assert data["count"] == 2
-    assert created_webhook_mock.call_count == 2
-    for call in created_webhook_mock.call_args_list:
-        assert isinstance(call.args[0], Product)
+    created_webhook_mock.assert_called_once()
+    created_products = created_webhook_mock.call_args.args[0]
+    assert len(created_products) == 2
+    for product in created_products:
+        assert isinstance(product, Product)
 
 
 def test_product_bulk_create_with_same_name_and_no_slug(
@@ -1198,8 +1200,8 @@ def test_product_bulk_create_with_variants_with_duplicated_sku(
     "saleor.graphql.product.bulk_mutations."
     "product_bulk_create.get_webhooks_for_event"
 )
-@patch("saleor.plugins.manager.PluginsManager.product_variant_created")
-@patch("saleor.plugins.manager.PluginsManager.product_created")
+@patch("saleor.plugins.manager.PluginsManager.product_variant_created_bulk")
+@patch("saleor.plugins.manager.PluginsManager.product_created_bulk")
 def test_product_bulk_create_with_variants_send_product_variant_created_event(
     product_created_webhook_mock,
     variant_created_webhook_mock,
@@ -1304,8 +1306,8 @@ def test_product_bulk_create_with_variants_send_product_variant_created_event(
     assert not data["results"][0]["errors"]
     assert not data["results"][1]["errors"]
     assert data["count"] == 2
-    assert product_created_webhook_mock.call_count == 2
-    assert variant_created_webhook_mock.call_count == 3
+    assert len(product_created_webhook_mock.call_args.args[0]) == 2
+    assert len(variant_created_webhook_mock.call_args.args[0]) == 3
 
 
 def test_product_bulk_create_with_variants_and_stocks(
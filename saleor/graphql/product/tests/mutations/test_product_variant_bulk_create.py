@@ -108,7 +108,7 @@ PRODUCT_VARIANT_BULK_CREATE_MUTATION = """
 @patch(
     "saleor.product.tasks.update_products_discounted_prices_for_promotion_task.delay"
 )
-@patch("saleor.plugins.manager.PluginsManager.product_variant_created")
+@patch("saleor.plugins.manager.PluginsManager.product_variant_created_bulk")
 def test_product_variant_bulk_create_by_name(
     product_variant_created_webhook_mock,
     update_products_discounted_prices_for_promotion_task_mock,
@@ -176,7 +176,8 @@ def test_product_variant_bulk_create_by_name(
     product_variant = ProductVariant.objects.get(sku=sku1)
     product.refresh_from_db()
     assert product.default_variant == product_variant
-    assert product_variant_created_webhook_mock.call_count == data["count"]
+    product_variant_created_webhook_mock.assert_called_once()
+    assert len(product_variant_created_webhook_mock.call_args.args[0]) == data["count"]
     update_products_discounted_prices_for_promotion_task_mock.assert_called_once_with(
         [product.id]
     )
@@ -191,7 +192,7 @@ def test_product_variant_bulk_create_by_name(
 @patch(
     "saleor.product.tasks.update_products_discounted_prices_for_promotion_task.delay"
 )
-@patch("saleor.plugins.manager.PluginsManager.product_variant_created")
+@patch("saleor.plugins.manager.PluginsManager.product_variant_created_bulk")
 def test_product_variant_bulk_create_by_attribute_id(
     product_variant_created_webhook_mock,
     update_products_discounted_prices_for_promotion_task_mock,
@@ -242,7 +243,8 @@ def test_product_variant_bulk_create_by_attribute_id(
     product_variant = ProductVariant.objects.get(sku=sku)
     product.refresh_from_db()
     assert product.default_variant == product_variant
-    assert product_variant_created_webhook_mock.call_count == data["count"]
+    product_variant_created_webhook_mock.assert_called_once()
+    assert len(product_variant_created_webhook_mock.call_args.args[0]) == data["count"]
     update_products_discounted_prices_for_promotion_task_mock.assert_called_once_with(
         [product.id]
     )
@@ -0,0 +1,121 @@
+from unittest.mock import patch
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from ...tests.utils import get_graphql_content
+
+QUERY_PRODUCTS_WITH_PRICING = """
+    query ($channel: String) {
+      products(first: 10, channel: $channel) {
+        edges {
+          node {
+            id
+            isAvailable
+            pricing {
+              onSale
+              priceRange {
+                start {
+                  gross {
+                    amount
+                  }
+                }
+              }
+            }
+            variants {
+              id
+              pricing {
+                price {
+                  gross {
+                    amount
+                  }
+                }
+              }
+            }
+          }
+        }
+      }
+    }
+"""
+
+
+def _query_products(api_client, variables):
+    with CaptureQueriesContext(connection) as captured_queries:
+        content = get_graphql_content(
+            api_client.post_graphql(QUERY_PRODUCTS_WITH_PRICING, variables)
+        )
+    return content["data"], len(captured_queries)
+
+
+def test_prefetch_products_reduces_queries(product_list, api_client, channel_USD):
+    # given
+    variables = {"channel": channel_USD.slug}
+    # warm up the caches of the plugins
+    _query_products(api_client, variables)
+
+    with patch("saleor.graphql.product.schema.prefetch_products"):
+        expected_data, expected_queries = _query_products(api_client, variables)
+
+    # when
+    data, queries = _query_products(api_client, variables)
+
+    # then
+    assert data == expected_data
+    assert len(data["products"]["edges"]) == len(product_list)
+    assert queries < expected_queries
+
+
+@patch(
+    "saleor.graphql.product.prefetch.ProductChannelListingByProductIdAndChannelSlugLoader"
+)
+def test_prefetch_products_without_channel(
+    loader_mock, product_list, staff_api_client, permission_manage_products
+):
+    # given
+    staff_api_client.user.user_permissions.add(permission_manage_products)
+
+    # when
+    content = get_graphql_content(
+        staff_api_client.post_graphql(QUERY_PRODUCTS_WITH_PRICING, {})
+    )
+
+    # then
+    assert len(content["data"]["products"]["edges"]) == len(product_list)
+    loader_mock.assert_not_called()
+
+
+def test_prefetch_product_variants(product_list, api_client, channel_USD):
+    # given
+    query = """
+        query ($channel: String) {
+          productVariants(first: 10, channel: $channel) {
+            edges {
+              node {
+                id
+                pricing {
+                  price {
+                    gross {
+                      amount
+                    }
+                  }
+                }
+              }
+            }
+          }
+        }
+    """
+    variables = {"channel": channel_USD.slug}
+    api_client.post_graphql(query, variables)
+    with patch("saleor.graphql.product.schema.prefetch_variants"):
+        with CaptureQueriesContext(connection) as expected_queries:
+            expected_content = get_graphql_content(
+                api_client.post_graphql(query, variables)
+            )
+
+    # when
+    with CaptureQueriesContext(connection) as queries:
+        content = get_graphql_content(api_client.post_graphql(query, variables))
+
+    # then
+    assert content == expected_content
+    assert len(queries) <= len(expected_queries)
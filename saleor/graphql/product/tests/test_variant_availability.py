@@ -9,6 +9,10 @@ from django_countries import countries
 from ....channel.utils import DEPRECATION_WARNING_MESSAGE
 from ....shipping.models import ShippingZone
 from ....warehouse import WarehouseClickAndCollectOption
+from ....warehouse.availability_projection import (
+    mark_variants_availability_changed,
+    update_variants_availability,
+)
 from ....warehouse.models import PreorderReservation, Reservation, Stock, Warehouse
 from ...tests.utils import get_graphql_content
 
@@ -36,6 +40,46 @@ def test_variant_quantity_available_without_country_code(
     assert variant_data["quantityAvailable"] == 7
 
 
+def test_variant_quantity_available_from_availability_projection(
+    api_client, variant_with_many_stocks, channel_USD
+):
+    # given
+    update_variants_availability([variant_with_many_stocks.pk])
+    # stock changed without marking the variant, so the projection is outdated
+    variant_with_many_stocks.stocks.update(quantity=0)
+    variables = {
+        "id": graphene.Node.to_global_id("ProductVariant", variant_with_many_stocks.pk),
+        "channel": channel_USD.slug,
+    }
+
+    # when
+    response = api_client.post_graphql(QUERY_QUANTITY_AVAILABLE, variables)
+
+    # then
+    content = get_graphql_content(response)
+    assert content["data"]["productVariant"]["quantityAvailable"] == 7
+
+
+def test_variant_quantity_available_with_pending_availability_change(
+    api_client, variant_with_many_stocks, channel_USD
+):
+    # given
+    update_variants_availability([variant_with_many_stocks.pk])
+    variant_with_many_stocks.stocks.update(quantity=0)
+    mark_variants_availability_changed([variant_with_many_stocks.pk])
+    variables = {
+        "id": graphene.Node.to_global_id("ProductVariant", variant_with_many_stocks.pk),
+        "channel": channel_USD.slug,
+    }
+
+    # when
+    response = api_client.post_graphql(QUERY_QUANTITY_AVAILABLE, variables)
+
+    # then
+    content = get_graphql_content(response)
+    assert content["data"]["productVariant"]["quantityAvailable"] == 0
+
+
 def test_variant_quantity_available_without_country_code_or_channel(
     api_client, variant_with_many_stocks, channel_USD
 ):
@@ -10,6 +10,7 @@ from graphql import GraphQLError
 from ...core.tracing import traced_atomic_transaction
 from ...order import OrderStatus
 from ...order import models as order_models
+from ...warehouse.availability_projection import mark_variants_availability_changed
 from ...warehouse.models import Stock
 from ..core.enums import ProductErrorCode
 from .sorters import ProductOrderField
@@ -90,6 +91,7 @@ def create_stocks(
     except IntegrityError:
         msg = "Stock for one of warehouses already exists for this product variant."
         raise ValidationError(msg)
+    mark_variants_availability_changed([variant.pk])
     return new_stocks
 
 
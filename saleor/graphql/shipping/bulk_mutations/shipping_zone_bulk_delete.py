@@ -2,6 +2,7 @@ import graphene
 
 from ....permission.enums import ShippingPermissions
 from ....shipping import models
+from ....warehouse.availability_projection import mark_all_variants_availability_changed
 from ....webhook.event_types import WebhookEventAsyncType
 from ....webhook.utils import get_webhooks_for_event
 from ...core import ResolveInfo
@@ -31,6 +32,7 @@ class ShippingZoneBulkDelete(ModelBulkDeleteMutation):
     def bulk_action(cls, info: ResolveInfo, queryset, /):
         zones = [zone for zone in queryset]
         queryset.delete()
+        mark_all_variants_availability_changed()
         webhooks = get_webhooks_for_event(WebhookEventAsyncType.SHIPPING_ZONE_DELETED)
         manager = get_plugin_manager_promise(info.context).get()
         for zone in zones:
@@ -17,6 +17,7 @@ from ....shipping.utils import (
     default_shipping_zone_exists,
     get_countries_without_shipping_zone,
 )
+from ....warehouse.availability_projection import mark_all_variants_availability_changed
 from ...core import ResolveInfo
 from ...shipping import types as shipping_types
 from ...utils import resolve_global_ids_to_primary_keys
@@ -217,6 +218,7 @@ class ShippingZoneMixin:
                 drop_invalid_shipping_methods_relations_for_given_channels.delay(
                     shipping_method_ids, channel_ids
                 )
+            mark_all_variants_availability_changed()
 
     @classmethod
     def delete_invalid_shipping_zone_to_warehouse_relation(cls, shipping_zone):
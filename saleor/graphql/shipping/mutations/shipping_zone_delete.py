@@ -2,6 +2,7 @@ import graphene
 
 from ....permission.enums import ShippingPermissions
 from ....shipping import models
+from ....warehouse.availability_projection import mark_all_variants_availability_changed
 from ...channel.types import ChannelContext
 from ...core import ResolveInfo
 from ...core.mutations import ModelDeleteMutation
@@ -26,6 +27,7 @@ class ShippingZoneDelete(ModelDeleteMutation):
     def post_save_action(cls, info: ResolveInfo, instance, _cleaned_input):
         manager = get_plugin_manager_promise(info.context).get()
         cls.call_event(manager.shipping_zone_deleted, instance)
+        mark_all_variants_availability_changed()
 
     @classmethod
     def success_response(cls, instance):
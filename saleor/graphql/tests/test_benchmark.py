@@ -0,0 +1,98 @@
+import json
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from ..benchmark import BenchmarkResult, compare_results
+
+BASELINE = {
+    "product_list": {
+        "name": "product_list",
+        "queries": 10,
+        "time": 100.0,
+        "allocations": 1000.0,
+    }
+}
+
+
+def test_compare_results_no_regressions():
+    # given
+    results = [
+        BenchmarkResult(name="product_list", queries=9, time=110.0, allocations=900),
+        BenchmarkResult(name="order_list", queries=20, time=50.0, allocations=500),
+    ]
+
+    # when
+    regressions = compare_results(BASELINE, results, threshold=0.2)
+
+    # then
+    assert regressions == []
+
+
+def test_compare_results_regressions():
+    # given
+    results = [
+        BenchmarkResult(name="product_list", queries=11, time=130.0, allocations=1000.0)
+    ]
+
+    # when
+    regressions = compare_results(BASELINE, results, threshold=0.2)
+
+    # then
+    assert regressions == [
+        "product_list: 11 queries instead of 10",
+        "product_list: time 130.0 instead of 100.0",
+    ]
+
+
+def test_benchmark_graphql_command(
+    product, order_with_lines, superuser, channel_USD, tmp_path
+):
+    # given
+    output = tmp_path / "results.json"
+
+    # when
+    call_command(
+        "benchmark_graphql",
+        "--channel",
+        channel_USD.slug,
+        "--repeat",
+        "1",
+        "--output",
+        str(output),
+    )
+
+    # then
+    results = json.loads(output.read_text())
+    assert set(results) == {
+        "product_list",
+        "product_details",
+        "checkout_create",
+        "order_list",
+    }
+    assert all(result["queries"] > 0 for result in results.values())
+
+
+def test_benchmark_graphql_command_regression(product, channel_USD, tmp_path):
+    # given
+    baseline = tmp_path / "baseline.json"
+    baseline_product_list = {**BASELINE["product_list"], "queries": 0}
+    baseline.write_text(json.dumps({"product_list": baseline_product_list}))
+
+    # when
+    with pytest.raises(CommandError) as e:
+        call_command(
+            "benchmark_graphql",
+            "--operation",
+            "product_list",
+            "--channel",
+            channel_USD.slug,
+            "--repeat",
+            "1",
+            "--compare",
+            str(baseline),
+        )
+
+    # then
+    assert "product_list" in str(e.value)
+    assert "queries instead of 0" in str(e.value)
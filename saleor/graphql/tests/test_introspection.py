@@ -0,0 +1,70 @@
+from unittest import mock
+
+from graphql import get_default_backend
+from graphql.execution import ExecutionResult
+
+from ..api import get_schema
+from ..introspection import generate_introspection_key, get_schema_artifacts
+
+
+def _document(query):
+    return get_default_backend().document_from_string(get_schema(), query)
+
+
+def test_generate_introspection_key_ignores_formatting():
+    # given
+    document = _document("query Schema { __schema { queryType { name } } }")
+    reformatted_document = _document(
+        """
+        # Fetch the schema
+        query Schema {
+            __schema {
+                queryType { name }
+            }
+        }
+        """
+    )
+
+    # when
+    key = generate_introspection_key(document)
+    reformatted_key = generate_introspection_key(reformatted_document)
+
+    # then
+    assert key == reformatted_key
+    assert key != generate_introspection_key(document, operation_name="Schema")
+
+
+@mock.patch("saleor.graphql.introspection.MAX_INTROSPECTION_RESULTS", 1)
+def test_set_introspection_result_keeps_recent_results():
+    # given
+    artifacts = get_schema_artifacts(get_schema())
+    old_document = _document("{ __schema { queryType { name } } }")
+    new_document = _document("{ __schema { mutationType { name } } }")
+    artifacts.set_introspection_result(
+        old_document, None, None, ExecutionResult(data={"old": True})
+    )
+
+    # when
+    artifacts.set_introspection_result(
+        new_document, None, None, ExecutionResult(data={"new": True})
+    )
+
+    # then
+    assert artifacts.get_introspection_result(old_document) is None
+    new_result = artifacts.get_introspection_result(new_document)
+    assert new_result.get_execution_result().data == {"new": True}
+
+
+def test_set_introspection_result_skips_errors():
+    # given
+    artifacts = get_schema_artifacts(get_schema())
+    document = _document("{ __schema { unknown } }")
+
+    # when
+    result = artifacts.set_introspection_result(
+        document, None, None, ExecutionResult(errors=[Exception()], invalid=True)
+    )
+
+    # then
+    assert result is None
+    assert artifacts.get_introspection_result(document) is None
@@ -3,6 +3,8 @@ import re
 from django.test import override_settings
 from graphql.utils import schema_printer
 
+from .. import api
+from ..api import get_schema
 from ..utils import ALLOWED_ERRORS, INTERNAL_ERROR_MESSAGE, format_error
 from .utils import get_graphql_content
 
@@ -49,3 +51,13 @@ def test_format_error_prints_internal_error_msg_in_debug_mode():
     error = ValueError("Example error")
     result = format_error(error, ())
     assert result["message"] == str(error)
+
+
+def test_get_schema_returns_schema_built_once():
+    # when
+    built_schema = get_schema()
+
+    # then
+    assert get_schema() is built_schema
+    assert api.schema is built_schema
+    assert built_schema.get_query_type().name == "Query"
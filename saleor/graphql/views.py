@@ -1,17 +1,20 @@
-import hashlib
 import importlib
 import json
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from inspect import isclass
 from typing import Any, Dict, List, Optional, Tuple, Union
 
 import opentracing
 import opentracing.tags
+from asgiref.sync import sync_to_async
 from django.conf import settings
-from django.core.cache import cache
-from django.db import connection
+from django.db import close_old_connections, connection
 from django.db.backends.postgresql.base import DatabaseWrapper
-from django.http import HttpRequest, HttpResponseNotAllowed, JsonResponse
+from django.http import HttpRequest, HttpResponse, HttpResponseNotAllowed, JsonResponse
 from django.shortcuts import render
+from django.utils.module_loading import import_string
+from django.views.decorators.http import condition, require_safe
 from django.views.generic import View
 from graphql import GraphQLDocument, get_default_backend
 from graphql.error import GraphQLError, GraphQLSyntaxError
@@ -19,13 +22,21 @@ from graphql.execution import ExecutionResult
 from jwt.exceptions import PyJWTError
 from requests_hardened.ip_filter import InvalidIPAddress
 
-from .. import __version__ as saleor_version
 from ..core.exceptions import PermissionDenied, ReadOnlyException
+from ..core.replicas import record_write
 from ..core.utils import is_valid_ipv4, is_valid_ipv6
 from ..webhook import observability
-from .api import API_PATH, schema
+from .api import API_PATH, get_schema
 from .context import get_context_value
+from .core.context import get_requestor_key
+from .core.profiling import QueryProfile, is_profiling_requested, profile_sql
 from .core.validators.query_cost import validate_query_cost
+from .core.validators.query_cost_budget import (
+    QueryCostBudget,
+    charge_query_cost,
+    validate_query_cost_budget,
+)
+from .introspection import get_schema_artifacts
 from .query_cost_map import COST_MAP
 from .utils import format_error, query_fingerprint, query_identifier
 
@@ -47,6 +58,15 @@ def tracing_wrapper(execute, sql, params, many, context):
         return execute(sql, params, many, context)
 
 
+@dataclass
+class PreparedOperation:
+    document: GraphQLDocument
+    variables: Optional[dict]
+    operation_name: Optional[str]
+    query_contains_schema: bool
+    query_cost: int
+
+
 class GraphQLView(View):
     # This class is our implementation of `graphene_django.views.GraphQLView`,
     # which was extended to support the following features:
@@ -86,12 +106,13 @@ class GraphQLView(View):
                     self.import_middleware(middleware_name)
                     for middleware_name in middleware
                 ]
-        self.schema = self.schema or schema
+        self.schema = self.schema or schema or get_schema()
         if middleware is not None:
             self.middleware = list(instantiate_middleware(middleware))
         self.executor = executor
         self.root_value = root_value
         self.backend = backend
+        self.encode_response = import_string(settings.GRAPHQL_RESPONSE_ENCODER)
 
     @staticmethod
     def import_middleware(middleware_name):
@@ -128,7 +149,7 @@ class GraphQLView(View):
             },
         )
 
-    def _handle_query(self, request: HttpRequest) -> JsonResponse:
+    def _handle_query(self, request: HttpRequest) -> HttpResponse:
         try:
             data = self.parse_body(request)
         except ValueError:
@@ -138,16 +159,37 @@ class GraphQLView(View):
             )
 
         if isinstance(data, list):
+            if settings.GRAPHQL_BATCH_SHARED_CONTEXT:
+                request.share_dataloaders = True  # type: ignore[attr-defined]
             responses = [self.get_response(request, entry) for entry in data]
-            result: Union[list, Optional[dict]] = [
-                response for response, code in responses
-            ]
-            status_code = max((code for response, code in responses), default=200)
-        else:
-            result, status_code = self.get_response(request, data)
-        return JsonResponse(data=result, status=status_code, safe=False)
+            return self.create_batch_response(responses)
+        result, status_code = self.get_response(request, data)
+        return self.create_single_response(request, result, status_code)
+
+    def create_response(self, result, status_code: int) -> HttpResponse:
+        return HttpResponse(
+            self.encode_response(result),
+            status=status_code,
+            content_type="application/json",
+        )
 
-    def handle_query(self, request: HttpRequest) -> JsonResponse:
+    def create_single_response(
+        self, request: HttpRequest, result, status_code: int
+    ) -> HttpResponse:
+        response = self.create_response(result, status_code)
+        etag = getattr(request, "introspection_etag", None)
+        if etag:
+            # Operations are sent with POST, so the ETag only lets clients detect
+            # schema changes; 304 isn't a valid response to POST requests.
+            response["ETag"] = etag
+        return response
+
+    def create_batch_response(self, responses: List[tuple]) -> HttpResponse:
+        result = [response for response, code in responses]
+        status_code = max((code for response, code in responses), default=200)
+        return self.create_response(result, status_code)
+
+    def handle_query(self, request: HttpRequest) -> HttpResponse:
         tracer = opentracing.global_tracer()
 
         # Disable extending spans from header due to:
@@ -203,26 +245,32 @@ class GraphQLView(View):
     ) -> Tuple[Optional[Dict[str, List[Any]]], int]:
         with observability.report_gql_operation() as operation:
             execution_result = self.execute_graphql_request(request, data)
-            status_code = 200
-            if execution_result:
-                response = {}
-                if execution_result.errors:
-                    response["errors"] = [
-                        self.format_error(e) for e in execution_result.errors
-                    ]
-                if execution_result.invalid:
-                    status_code = 400
-                else:
-                    response["data"] = execution_result.data
-                if execution_result.extensions:
-                    response["extensions"] = execution_result.extensions
-                result: Optional[Dict[str, List[Any]]] = response
-            else:
-                result = None
+            result, status_code = self.format_execution_result(execution_result)
             operation.result = result
             operation.result_invalid = execution_result.invalid
         return result, status_code
 
+    def format_execution_result(
+        self, execution_result: Optional[ExecutionResult]
+    ) -> Tuple[Optional[Dict[str, List[Any]]], int]:
+        status_code = 200
+        if execution_result:
+            response = {}
+            if execution_result.errors:
+                response["errors"] = [
+                    self.format_error(e) for e in execution_result.errors
+                ]
+            if execution_result.invalid:
+                status_code = 400
+            else:
+                response["data"] = execution_result.data
+            if execution_result.extensions:
+                response["extensions"] = execution_result.extensions
+            result: Optional[Dict[str, List[Any]]] = response
+        else:
+            result = None
+        return result, status_code
+
     def get_root_value(self):
         return self.root_value
 
@@ -269,89 +317,166 @@ class GraphQLView(View):
     def execute_graphql_request(self, request: HttpRequest, data: dict):
         with opentracing.global_tracer().start_active_span("graphql_query") as scope:
             span = scope.span
-            span.set_tag(opentracing.tags.COMPONENT, "graphql")
-            span.set_tag(
-                opentracing.tags.HTTP_URL,
-                request.build_absolute_uri(request.get_full_path()),
-            )
+            operation = self.prepare_graphql_operation(request, data, span)
+            if isinstance(operation, ExecutionResult):
+                return operation
+            return self.execute_graphql_operation(request, operation, span)
 
-            query, variables, operation_name = self.get_graphql_params(request, data)
-
-            document, error = self.parse_query(query)
-            with observability.report_gql_operation() as operation:
-                operation.query = document
-                operation.name = operation_name
-                operation.variables = variables
-            if error or document is None:
-                return error
-
-            raw_query_string = document.document_string
-            span.set_tag("graphql.query", raw_query_string)
-            span.set_tag("graphql.query_identifier", query_identifier(document))
-            span.set_tag("graphql.query_fingerprint", query_fingerprint(document))
-            try:
-                query_contains_schema = self.check_if_query_contains_only_schema(
-                    document
-                )
-            except GraphQLError as e:
-                return ExecutionResult(errors=[e], invalid=True)
-
-            query_cost, cost_errors = validate_query_cost(
-                schema,
-                document,
-                variables,
-                COST_MAP,
-                settings.GRAPHQL_QUERY_MAX_COMPLEXITY,
-            )
-            span.set_tag("graphql.query_cost", query_cost)
-            if settings.GRAPHQL_QUERY_MAX_COMPLEXITY and cost_errors:
-                result = ExecutionResult(errors=cost_errors, invalid=True)
-                return set_query_cost_on_result(result, query_cost)
-
-            extra_options: Dict[str, Optional[Any]] = {}
-
-            if self.executor:
-                # We only include it optionally since
-                # executor is not a valid argument in all backends
-                extra_options["executor"] = self.executor
-
-            context = get_context_value(request)
-            if app := getattr(request, "app", None):
-                span.set_tag("app.id", app.id)
-                span.set_tag("app.name", app.name)
-
-            try:
-                with connection.execute_wrapper(tracing_wrapper):
-                    response = None
-                    should_use_cache_for_scheme = query_contains_schema & (
-                        not settings.DEBUG
+    def prepare_graphql_operation(
+        self, request: HttpRequest, data: dict, span: opentracing.Span
+    ) -> Union[PreparedOperation, ExecutionResult]:
+        """Parse and validate the operation, return an error result if invalid.
+
+        Doesn't access the database, so the async view runs it in the event loop.
+        """
+        span.set_tag(opentracing.tags.COMPONENT, "graphql")
+        span.set_tag(
+            opentracing.tags.HTTP_URL,
+            request.build_absolute_uri(request.get_full_path()),
+        )
+
+        query, variables, operation_name = self.get_graphql_params(request, data)
+
+        document, error = self.parse_query(query)
+        with observability.report_gql_operation() as operation:
+            operation.query = document
+            operation.name = operation_name
+            operation.variables = variables
+        if error or document is None:
+            return error  # type: ignore[return-value]
+
+        raw_query_string = document.document_string
+        span.set_tag("graphql.query", raw_query_string)
+        span.set_tag("graphql.query_identifier", query_identifier(document))
+        span.set_tag("graphql.query_fingerprint", query_fingerprint(document))
+        try:
+            query_contains_schema = self.check_if_query_contains_only_schema(document)
+        except GraphQLError as e:
+            return ExecutionResult(errors=[e], invalid=True)
+
+        query_cost, cost_errors = validate_query_cost(
+            self.schema,
+            document,
+            variables,
+            COST_MAP,
+            settings.GRAPHQL_QUERY_MAX_COMPLEXITY,
+        )
+        span.set_tag("graphql.query_cost", query_cost)
+        if settings.GRAPHQL_QUERY_MAX_COMPLEXITY and cost_errors:
+            result = ExecutionResult(errors=cost_errors, invalid=True)
+            return set_query_cost_on_result(result, query_cost)
+
+        return PreparedOperation(
+            document=document,
+            variables=variables,
+            operation_name=operation_name,
+            query_contains_schema=query_contains_schema,
+            query_cost=query_cost,
+        )
+
+    def execute_graphql_operation(
+        self,
+        request: HttpRequest,
+        operation: PreparedOperation,
+        span: opentracing.Span,
+    ) -> ExecutionResult:
+        document = operation.document
+        query_cost = operation.query_cost
+        extra_options: Dict[str, Optional[Any]] = {}
+
+        if self.executor:
+            # We only include it optionally since
+            # executor is not a valid argument in all backends
+            extra_options["executor"] = self.executor
+
+        context = get_context_value(request)
+        if app := getattr(request, "app", None):
+            span.set_tag("app.id", app.id)
+            span.set_tag("app.name", app.name)
+
+        # Dataloaders shared by operations of a batch could return data stale
+        # for a mutation, or changed by it for the following operations.
+        is_mutation = (
+            document.get_operation_type(operation.operation_name) == "mutation"
+        )
+        if is_mutation:
+            context.dataloaders = {}
+
+        budget = charge_query_cost(context, query_cost)
+        if budget_errors := validate_query_cost_budget(budget):
+            result = ExecutionResult(errors=budget_errors, invalid=True)
+            return set_query_cost_on_result(result, query_cost, budget)
+
+        middleware = self.middleware
+        context.profile = None
+        if is_profiling_requested(context):
+            context.profile = QueryProfile()
+            middleware = [*(middleware or []), context.profile]
+
+        try:
+            with connection.execute_wrapper(tracing_wrapper), profile_sql(
+                context.profile
+            ):
+                response = self.get_cached_introspection(request, operation)
+                if not response:
+                    response = document.execute(
+                        root=self.get_root_value(),
+                        variables=operation.variables,
+                        operation_name=operation.operation_name,
+                        context=context,
+                        middleware=middleware,
+                        **extra_options,
                     )
-                    if should_use_cache_for_scheme:
-                        key = generate_cache_key(raw_query_string)
-                        response = cache.get(key)
-
-                    if not response:
-                        response = document.execute(
-                            root=self.get_root_value(),
-                            variables=variables,
-                            operation_name=operation_name,
-                            context=context,
-                            middleware=self.middleware,
-                            **extra_options,
-                        )
-                        if should_use_cache_for_scheme:
-                            cache.set(key, response)
-
-                    return set_query_cost_on_result(response, query_cost)
-            except Exception as e:
-                span.set_tag(opentracing.tags.ERROR, True)
-
-                # In the graphql-core version that we are using,
-                # the Exception is raised for too big integers value.
-                # As it's a validation error we want to raise GraphQLError instead.
-                if str(e).startswith(INT_ERROR_MSG) or isinstance(e, ValueError):
-                    e = GraphQLError(str(e))
-                return ExecutionResult(errors=[e], invalid=True)
+                    if self.should_cache_response(operation):
+                        self.cache_introspection(request, operation, response)
+
+                if context.profile:
+                    response.extensions["profile"] = context.profile.as_dict()
+                if is_mutation:
+                    record_write(get_requestor_key(context))
+                return set_query_cost_on_result(response, query_cost, budget)
+        except Exception as e:
+            span.set_tag(opentracing.tags.ERROR, True)
+
+            # In the graphql-core version that we are using,
+            # the Exception is raised for too big integers value.
+            # As it's a validation error we want to raise GraphQLError instead.
+            if str(e).startswith(INT_ERROR_MSG) or isinstance(e, ValueError):
+                e = GraphQLError(str(e))
+            return ExecutionResult(errors=[e], invalid=True)
+        finally:
+            if is_mutation:
+                context.dataloaders = {}
+
+    @staticmethod
+    def should_cache_response(operation: PreparedOperation) -> bool:
+        # Only the introspection queries are cached.
+        return operation.query_contains_schema and not settings.DEBUG
+
+    def get_cached_introspection(
+        self, request: HttpRequest, operation: PreparedOperation
+    ) -> Optional[ExecutionResult]:
+        if not self.should_cache_response(operation):
+            return None
+        introspection = get_schema_artifacts(self.schema).get_introspection_result(
+            operation.document, operation.variables, operation.operation_name
+        )
+        if not introspection:
+            return None
+        request.introspection_etag = introspection.etag  # type: ignore[attr-defined]
+        return introspection.get_execution_result()
+
+    def cache_introspection(
+        self,
+        request: HttpRequest,
+        operation: PreparedOperation,
+        result: ExecutionResult,
+    ):
+        introspection = get_schema_artifacts(self.schema).set_introspection_result(
+            operation.document, operation.variables, operation.operation_name, result
+        )
+        if introspection:
+            request.introspection_etag = introspection.etag  # type: ignore[attr-defined]
 
     @staticmethod
     def parse_body(request: HttpRequest):
@@ -390,6 +515,113 @@ class GraphQLView(View):
         return format_error(error, cls.HANDLED_EXCEPTIONS)
 
 
+_thread_pool: Optional[ThreadPoolExecutor] = None
+
+
+def get_thread_pool() -> ThreadPoolExecutor:
+    global _thread_pool
+    if _thread_pool is None:
+        _thread_pool = ThreadPoolExecutor(
+            max_workers=settings.GRAPHQL_ASYNC_THREAD_POOL_SIZE,
+            thread_name_prefix="graphql",
+        )
+    return _thread_pool
+
+
+class AsyncGraphQLView(GraphQLView):
+    """GraphQL view executed by the event loop of the ASGI server.
+
+    Operations are parsed and validated in the event loop. Resolvers use the ORM,
+    so operations are executed in a thread pool of `GRAPHQL_ASYNC_THREAD_POOL_SIZE`
+    threads, which also limits the number of database connections of the process.
+    """
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        async def view(request, *args, **kwargs):
+            self = cls(**initkwargs)
+            self.setup(request, *args, **kwargs)
+            return await self.dispatch_async(request)
+
+        view.view_class = cls  # type: ignore[attr-defined]
+        view.view_initkwargs = initkwargs  # type: ignore[attr-defined]
+        # `csrf_exempt` would wrap the view in a sync function.
+        view.csrf_exempt = True  # type: ignore[attr-defined]
+        return view
+
+    async def dispatch_async(self, request: HttpRequest) -> HttpResponse:
+        if request.method != "POST":
+            return await sync_to_async(self.dispatch)(request)
+        with observability.report_api_call(request) as api_call:
+            response = await self._handle_query_async(request)
+            api_call.response = response
+            # Reporting sends the event to the buffer, so it's run in a thread.
+            await sync_to_async(api_call.report, thread_sensitive=False)()
+        return response
+
+    async def _handle_query_async(self, request: HttpRequest) -> HttpResponse:
+        try:
+            data = self.parse_body(request)
+        except ValueError:
+            return JsonResponse(
+                data={"errors": [self.format_error("Unable to parse query.")]},
+                status=400,
+            )
+
+        if isinstance(data, list):
+            if settings.GRAPHQL_BATCH_SHARED_CONTEXT:
+                request.share_dataloaders = True  # type: ignore[attr-defined]
+            # Executed one by one, as operations of a batch can share the context.
+            responses = [
+                await self.get_response_async(request, entry) for entry in data
+            ]
+            return self.create_batch_response(responses)
+        result, status_code = await self.get_response_async(request, data)
+        return self.create_single_response(request, result, status_code)
+
+    async def get_response_async(
+        self, request: HttpRequest, data: dict
+    ) -> Tuple[Optional[Dict[str, List[Any]]], int]:
+        with observability.report_gql_operation() as operation:
+            execution_result = await self.execute_graphql_request_async(request, data)
+            result, status_code = self.format_execution_result(execution_result)
+            operation.result = result
+            operation.result_invalid = execution_result.invalid
+        return result, status_code
+
+    async def execute_graphql_request_async(
+        self, request: HttpRequest, data: dict
+    ) -> ExecutionResult:
+        # Not activated, as the active span is shared by all coroutines of the thread.
+        span = opentracing.global_tracer().start_span("graphql_query")
+        try:
+            operation = self.prepare_graphql_operation(request, data, span)
+            if isinstance(operation, ExecutionResult):
+                return operation
+            # Cached introspection is returned by the thread too, after the query
+            # cost is charged from the budget kept in the cache.
+            return await sync_to_async(
+                self.execute_graphql_operation_in_thread,
+                thread_sensitive=False,
+                executor=get_thread_pool(),
+            )(request, operation, span)
+        finally:
+            span.finish()
+
+    def execute_graphql_operation_in_thread(
+        self,
+        request: HttpRequest,
+        operation: PreparedOperation,
+        span: opentracing.Span,
+    ) -> ExecutionResult:
+        # Connections of the pool threads aren't closed by the request signals.
+        close_old_connections()
+        try:
+            return self.execute_graphql_operation(request, operation, span)
+        finally:
+            close_old_connections()
+
+
 def get_key(key):
     try:
         int_key = int(key)
@@ -443,19 +675,36 @@ def instantiate_middleware(middlewares):
         yield middleware
 
 
-def generate_cache_key(raw_query: str) -> str:
-    hashed_query = hashlib.sha256(str(raw_query).encode("utf-8")).hexdigest()
-    return f"{saleor_version}-{hashed_query}"
+@require_safe
+@condition(etag_func=lambda request: get_schema_artifacts(get_schema()).sdl_etag)
+def schema_sdl(request):
+    return HttpResponse(
+        get_schema_artifacts(get_schema()).sdl,
+        content_type="text/plain; charset=utf-8",
+    )
 
 
-def set_query_cost_on_result(execution_result: ExecutionResult, query_cost):
+def set_query_cost_on_result(
+    execution_result: ExecutionResult,
+    query_cost,
+    budget: Optional[QueryCostBudget] = None,
+):
+    cost = {}
     if settings.GRAPHQL_QUERY_MAX_COMPLEXITY:
-        execution_result.extensions.update(
+        cost.update(
+            {
+                "requestedQueryCost": query_cost,
+                "maximumAvailable": settings.GRAPHQL_QUERY_MAX_COMPLEXITY,
+            }
+        )
+    if budget:
+        cost.update(
             {
-                "cost": {
-                    "requestedQueryCost": query_cost,
-                    "maximumAvailable": settings.GRAPHQL_QUERY_MAX_COMPLEXITY,
-                }
+                "requestedQueryCost": query_cost,
+                "budget": budget.limit,
+                "remainingBudget": budget.remaining,
             }
         )
+    if cost:
+        execution_result.extensions.update({"cost": cost})
     return execution_result
@@ -7,6 +7,7 @@ from django.db.models import F, Q
 from ....core.tracing import traced_atomic_transaction
 from ....permission.enums import ProductPermissions
 from ....warehouse import models
+from ....warehouse.availability_projection import mark_variants_availability_changed
 from ....warehouse.error_codes import StockBulkUpdateErrorCode
 from ....webhook.event_types import WebhookEventAsyncType
 from ....webhook.utils import get_webhooks_for_event
@@ -357,6 +358,9 @@ class StockBulkUpdate(BaseMutation):
             stocks_to_update.append(stock)
 
         models.Stock.objects.bulk_update(stocks_to_update, fields=["quantity"])
+        mark_variants_availability_changed(
+            stock.product_variant_id for stock in stocks_to_update
+        )
 
         return stocks_to_update
 
@@ -1,28 +1,22 @@
 import sys
 from collections import defaultdict
-from typing import (
-    TYPE_CHECKING,
-    DefaultDict,
-    Dict,
-    Iterable,
-    List,
-    Optional,
-    Tuple,
-    TypedDict,
-    Union,
-)
+from typing import DefaultDict, Iterable, List, Optional, Tuple
 from uuid import UUID
 
 from django.contrib.sites.models import Site
-from django.db.models import Exists, OuterRef, Q, QuerySet
+from django.db.models import Exists, OuterRef, Q
 from django.db.models.aggregates import Sum
 from django.db.models.functions import Coalesce
 from django.utils import timezone
-from django_stubs_ext import WithAnnotations
 
 from ...channel.models import Channel
 from ...product.models import ProductVariantChannelListing
 from ...warehouse import WarehouseClickAndCollectOption
+from ...warehouse.availability_projection import (
+    get_projected_available_quantities,
+    prepare_quantity_map,
+    prepare_warehouse_ids_by_shipping_zone_and_variant_map,
+)
 from ...warehouse.models import (
     ChannelWarehouse,
     PreorderReservation,
@@ -35,17 +29,6 @@ from ...warehouse.reservations import is_reservation_enabled
 from ..core.dataloaders import DataLoader
 from ..site.dataloaders import get_site_promise
 
-if TYPE_CHECKING:
-    # https://github.com/typeddjango/django-stubs/issues/719
-
-    class WithAvailableQuantity(TypedDict):
-        available_quantity: int
-
-    StockWithAvailableQuantity = WithAnnotations[Stock, WithAvailableQuantity]
-else:
-    StockWithAvailableQuantity = Stock
-
-
 CountryCode = Optional[str]
 VariantIdCountryCodeChannelSlug = Tuple[int, CountryCode, str]
 
@@ -58,6 +41,9 @@ class AvailableQuantityByProductVariantIdCountryCodeAndChannelSlugLoader(
     For each country code, for each shipping zone supporting that country,
     calculate the maximum available quantity, then return either that number
     or the maximum allowed checkout quantity, whichever is lower.
+
+    The quantities are read from the `VariantAvailability` projection when it's up
+    to date for the variant, and calculated from the stocks otherwise.
     """
 
     context_key = "available_quantity_by_productvariant_and_country"
@@ -101,6 +87,53 @@ class AvailableQuantityByProductVariantIdCountryCodeAndChannelSlugLoader(
         variant_ids: Iterable[int],
         site: Site,
     ) -> Iterable[Tuple[int, int]]:
+        variant_ids = list(variant_ids)
+        reservations_enabled = is_reservation_enabled(site.settings)
+
+        # read the quantities from the availability projection, variants that are
+        # not projected or have pending changes are calculated from the stocks
+        quantity_map: DefaultDict[int, int] = defaultdict(int)
+        if channel_slug:
+            quantity_map.update(
+                get_projected_available_quantities(
+                    variant_ids,
+                    country_code,
+                    channel_slug,
+                    reservations_enabled,
+                    self.database_connection_name,
+                )
+            )
+        not_projected_variant_ids = [
+            variant_id for variant_id in variant_ids if variant_id not in quantity_map
+        ]
+        if not_projected_variant_ids:
+            quantity_map.update(
+                self.calculate_quantities_by_country(
+                    country_code,
+                    channel_slug,
+                    not_projected_variant_ids,
+                    reservations_enabled,
+                )
+            )
+
+        # Return the quantities after capping them at the maximum quantity allowed in
+        # checkout. This prevent users from tracking the store's precise stock levels.
+        global_quantity_limit = site.settings.limit_quantity_per_checkout
+        return [
+            (
+                variant_id,
+                min(quantity_map[variant_id], global_quantity_limit or sys.maxsize),
+            )
+            for variant_id in variant_ids
+        ]
+
+    def calculate_quantities_by_country(
+        self,
+        country_code: Optional[CountryCode],
+        channel_slug: Optional[str],
+        variant_ids: List[int],
+        reservations_enabled: bool,
+    ) -> DefaultDict[int, int]:
         # get stocks only for warehouses assigned to the shipping zones
         # that are available in the given channel
         stocks = (
@@ -129,7 +162,9 @@ class AvailableQuantityByProductVariantIdCountryCodeAndChannelSlugLoader(
 
         stocks = stocks.annotate_available_quantity().order_by("pk")
 
-        stocks_reservations = self.prepare_stocks_reservations_map(variant_ids)
+        stocks_reservations = self.prepare_stocks_reservations_map(
+            variant_ids, reservations_enabled
+        )
 
         # A single country code (or a missing country code) can return results from
         # multiple shipping zones. We want to prepare warehouse by shipping zone map
@@ -139,28 +174,20 @@ class AvailableQuantityByProductVariantIdCountryCodeAndChannelSlugLoader(
             warehouse_ids_by_shipping_zone_by_variant,
             variants_with_global_cc_warehouses,
             available_quantity_by_warehouse_id_and_variant_id,
-        ) = self.prepare_warehouse_ids_by_shipping_zone_and_variant_map(
-            stocks, stocks_reservations, warehouse_shipping_zones_map, cc_warehouses
+        ) = prepare_warehouse_ids_by_shipping_zone_and_variant_map(
+            stocks,
+            stocks_reservations,
+            warehouse_shipping_zones_map,
+            cc_warehouses.in_bulk(),
         )
 
-        quantity_map = self.prepare_quantity_map(
+        return prepare_quantity_map(
             country_code,
             warehouse_ids_by_shipping_zone_by_variant,
             variants_with_global_cc_warehouses,
             available_quantity_by_warehouse_id_and_variant_id,
         )
 
-        # Return the quantities after capping them at the maximum quantity allowed in
-        # checkout. This prevent users from tracking the store's precise stock levels.
-        global_quantity_limit = site.settings.limit_quantity_per_checkout
-        return [
-            (
-                variant_id,
-                min(quantity_map[variant_id], global_quantity_limit or sys.maxsize),
-            )
-            for variant_id in variant_ids
-        ]
-
     def get_warehouse_shipping_zones(self, country_code, channel_slug):
         """Get the WarehouseShippingZone instances for a given channel and country."""
         WarehouseShippingZone = Warehouse.shipping_zones.through
@@ -235,11 +262,10 @@ class AvailableQuantityByProductVariantIdCountryCodeAndChannelSlugLoader(
             )
         return warehouses
 
-    def prepare_stocks_reservations_map(self, variant_ids):
+    def prepare_stocks_reservations_map(self, variant_ids, reservations_enabled):
         """Prepare stock id to quantity reserved map for provided variant ids."""
         stocks_reservations = defaultdict(int)
-        site = get_site_promise(self.context).get()
-        if is_reservation_enabled(site.settings):
+        if reservations_enabled:
             # Can't do second annotation on same queryset because it made
             # available_quantity annotated value incorrect thanks to how
             # Django's ORM builds SQLs with annotations
@@ -254,128 +280,6 @@ class AvailableQuantityByProductVariantIdCountryCodeAndChannelSlugLoader(
                 stocks_reservations[stock_id] = quantity_reserved
         return stocks_reservations
 
-    def prepare_warehouse_ids_by_shipping_zone_and_variant_map(
-        self,
-        stocks: QuerySet[StockWithAvailableQuantity],
-        stocks_reservations,
-        warehouse_shipping_zones_map,
-        cc_warehouses,
-    ):
-        """Combine all quantities within a single zone.
-
-        Prepare `warehouse_ids_by_shipping_zone_by_variant` map in the following format:
-            {
-                variant_id: {
-                    shipping_zone_id/warehouse_id: [
-                        warehouse_id
-                    ]
-                }
-            }
-
-        In case of the collection point warehouses the warehouse_id is used instead of
-        the shipping zone id. Every stock of the collection point warehouse is treated
-        as a magic single-warehouse shipping zone.
-        """
-        cc_warehouses_in_bulk = cc_warehouses.in_bulk()
-        warehouse_ids_by_shipping_zone_by_variant: DefaultDict[
-            int, DefaultDict[Union[int, UUID], List[UUID]]
-        ] = defaultdict(lambda: defaultdict(list))
-        variants_with_global_cc_warehouses = []
-        available_quantity_by_warehouse_id_and_variant_id: DefaultDict[
-            UUID, Dict[int, int]
-        ] = defaultdict(lambda: defaultdict(int))
-        for stock in stocks:
-            reserved_quantity = stocks_reservations[stock.id]
-            quantity = stock.available_quantity - reserved_quantity
-            # when the available_quantity was under 0 we do not want clipping to zero,
-            # as it means that the stock might be exceeded
-            if stock.available_quantity > 0:
-                quantity = max(0, quantity)
-            variant_id = stock.product_variant_id
-            warehouse_id = stock.warehouse_id
-            available_quantity_by_warehouse_id_and_variant_id[warehouse_id][
-                variant_id
-            ] += quantity
-            if shipping_zone_ids := warehouse_shipping_zones_map[warehouse_id]:
-                for shipping_zone_id in shipping_zone_ids:
-                    warehouse_ids_by_shipping_zone_by_variant[variant_id][
-                        shipping_zone_id
-                    ].append(warehouse_id)
-            else:
-                cc_option = cc_warehouses_in_bulk[warehouse_id].click_and_collect_option
-                # every stock of a collection point warehouse should treat as a magic
-                # single-warehouse shipping zone
-                warehouse_ids_by_shipping_zone_by_variant[variant_id][warehouse_id] = [
-                    warehouse_id
-                ]
-                # in case of global warehouses the quantity available will be the sum
-                # of the available quantity for that variant from all stocks,
-                # so we need to keep information for which variant there is a warehouse
-                # with the global stock
-                if cc_option == WarehouseClickAndCollectOption.ALL_WAREHOUSES:
-                    variants_with_global_cc_warehouses.append(variant_id)
-        return (
-            warehouse_ids_by_shipping_zone_by_variant,
-            variants_with_global_cc_warehouses,
-            available_quantity_by_warehouse_id_and_variant_id,
-        )
-
-    def prepare_quantity_map(
-        self,
-        country_code,
-        warehouse_ids_by_shipping_zone_by_variant,
-        variants_with_global_cc_warehouses,
-        available_quantity_by_warehouse_id_and_variant_id,
-    ):
-        """Prepare the variant id to quantity map.
-
-        When the country code is known, the available quantity is the sum of quantities
-        from all shipping zones supporting given country. When the country is not known
-        the highest known quantity is returned.
-
-        The local warehouses are treated as a magic single-warehouse shipping zone.
-        When the variant has any global collection point warehouse, the quantity is the
-        sum of the quantities from all shipping zones.
-        In case of global warehouses the available quantity of such collection point
-        is the sum of the available quantities from all stocks that passed the country
-        or channel conditions.
-        """
-        quantity_map: DefaultDict[int, int] = defaultdict(int)
-        for (
-            variant_id,
-            warehouse_ids_shipping_zone,
-        ) in warehouse_ids_by_shipping_zone_by_variant.items():
-            if country_code or variant_id in variants_with_global_cc_warehouses:
-                used_warehouse_ids = []
-                for warehouse_ids in warehouse_ids_shipping_zone.values():
-                    used_warehouse_ids.extend(warehouse_ids)
-                used_warehouse_ids = set(used_warehouse_ids)
-                # When country code is known or the global collection point warehouse
-                # for this variant exists, return the sum of quantities from all
-                # shipping zones supporting given country.
-                quantity = 0
-                for warehouse_id in used_warehouse_ids:
-                    quantity += available_quantity_by_warehouse_id_and_variant_id[
-                        warehouse_id
-                    ][variant_id]
-                quantity_map[variant_id] = quantity
-            else:
-                # When country code is unknown, return the highest known quantity.
-                quantity_values = []
-                for (
-                    warehouse_ids_per_shipping_zones
-                ) in warehouse_ids_shipping_zone.values():
-                    quantity = 0
-                    for warehouse_id in warehouse_ids_per_shipping_zones:
-                        quantity += available_quantity_by_warehouse_id_and_variant_id[
-                            warehouse_id
-                        ][variant_id]
-                    quantity_values.append(quantity)
-
-                quantity_map[variant_id] = max(quantity_values)
-
-        return quantity_map
-
 
 class StocksWithAvailableQuantityByProductVariantIdCountryCodeAndChannelLoader(
     DataLoader[VariantIdCountryCodeChannelSlug, Iterable[Stock]]
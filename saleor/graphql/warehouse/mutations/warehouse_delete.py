@@ -3,6 +3,7 @@ import graphene
 from ....core.tracing import traced_atomic_transaction
 from ....permission.enums import ProductPermissions
 from ....warehouse import models
+from ....warehouse.availability_projection import mark_all_variants_availability_changed
 from ...core import ResolveInfo
 from ...core.mutations import ModelDeleteMutation
 from ...core.types import WarehouseError
@@ -39,6 +40,7 @@ class WarehouseDelete(ModelDeleteMutation):
         db_id = instance.id
         with traced_atomic_transaction():
             instance.delete()
+            mark_all_variants_availability_changed()
 
             # After the instance is deleted, set its ID to the original database's
             # ID so that the success response contains ID of the deleted object.
@@ -7,6 +7,7 @@ from django.core.exceptions import ValidationError
 from ....channel import models as channel_models
 from ....permission.enums import ProductPermissions
 from ....warehouse import models
+from ....warehouse.availability_projection import mark_all_variants_availability_changed
 from ....warehouse.error_codes import WarehouseErrorCode
 from ....warehouse.validation import validate_warehouse_count
 from ...account.i18n import I18nMixin
@@ -44,6 +45,7 @@ class WarehouseShippingZoneAssign(ModelMutation, I18nMixin):
         )
         cls.clean_shipping_zones(warehouse, shipping_zones)
         warehouse.shipping_zones.add(*shipping_zones)
+        mark_all_variants_availability_changed()
         return WarehouseShippingZoneAssign(warehouse=warehouse)
 
     @classmethod
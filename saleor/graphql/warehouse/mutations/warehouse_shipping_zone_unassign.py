@@ -4,6 +4,7 @@ import graphene
 
 from ....permission.enums import ProductPermissions
 from ....warehouse import models
+from ....warehouse.availability_projection import mark_all_variants_availability_changed
 from ...account.i18n import I18nMixin
 from ...core import ResolveInfo
 from ...core.mutations import ModelMutation
@@ -39,4 +40,5 @@ class WarehouseShippingZoneUnassign(ModelMutation, I18nMixin):
             shipping_zone_ids, "shipping_zone_id", only_type=ShippingZone
         )
         warehouse.shipping_zones.remove(*shipping_zones)
+        mark_all_variants_availability_changed()
         return WarehouseShippingZoneAssign(warehouse=warehouse)
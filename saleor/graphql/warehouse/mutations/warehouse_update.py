@@ -2,6 +2,7 @@ import graphene
 
 from ....permission.enums import ProductPermissions
 from ....warehouse import models
+from ....warehouse.availability_projection import mark_all_variants_availability_changed
 from ...account.i18n import I18nMixin
 from ...core import ResolveInfo
 from ...core.descriptions import ADDED_IN_316
@@ -49,3 +50,5 @@ class WarehouseUpdate(WarehouseMixin, ModelWithExtRefMutation):
     def post_save_action(cls, info: ResolveInfo, instance, cleaned_input):
         manager = get_plugin_manager_promise(info.context).get()
         cls.call_event(manager.warehouse_updated, instance)
+        if "click_and_collect_option" in cleaned_input:
+            mark_all_variants_availability_changed()
@@ -1,6 +1,7 @@
 import graphene
 
 from ...webhook.event_types import WebhookEventAsyncType, WebhookEventSyncType
+from ...webhook.transport.asynchronous.circuit_breaker import CircuitBreakerState
 from ..core.descriptions import (
     ADDED_IN_36,
     ADDED_IN_38,
@@ -330,3 +331,22 @@ class EventDeliveryStatusEnum(BaseEnum):
 
     class Meta:
         doc_category = DOC_CATEGORY_WEBHOOKS
+
+
+class WebhookCircuitBreakerStateEnum(BaseEnum):
+    CLOSED = CircuitBreakerState.CLOSED
+    OPEN = CircuitBreakerState.OPEN
+    HALF_OPEN = CircuitBreakerState.HALF_OPEN
+
+    class Meta:
+        doc_category = DOC_CATEGORY_WEBHOOKS
+
+    @property
+    def description(self):
+        if self == WebhookCircuitBreakerStateEnum.CLOSED:
+            return "Deliveries are sent to the target."
+        if self == WebhookCircuitBreakerStateEnum.OPEN:
+            return "Deliveries to the target are deferred after repeated failures."
+        if self == WebhookCircuitBreakerStateEnum.HALF_OPEN:
+            return "A single probe delivery is sent to check if the target recovered."
+        return None
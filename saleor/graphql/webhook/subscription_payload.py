@@ -1,4 +1,4 @@
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence
 
 from celery.utils.log import get_task_logger
 from django.conf import settings
@@ -49,14 +49,6 @@ def initialize_request(
     return request
 
 
-def get_event_payload(event):
-    # Queries that use dataloaders return Promise object for the "event" field. In that
-    # case, we need to resolve them first.
-    if isinstance(event, Promise):
-        return event.get()
-    return event
-
-
 def generate_payload_from_subscription(
     event_type: str,
     subscribable_object,
@@ -80,6 +72,25 @@ def generate_payload_from_subscription(
     return: A payload ready to send via webhook. None if the function was not able to
     generate a payload
     """
+    return generate_payloads_from_subscription(
+        event_type, [subscribable_object], subscription_query, request, app=app
+    )[0]
+
+
+def generate_payloads_from_subscription(
+    event_type: str,
+    subscribable_objects: Sequence[Any],
+    subscription_query: Optional[str],
+    request: SaleorContext,
+    app: Optional[App] = None,
+) -> List[Optional[Dict[str, Any]]]:
+    """Generate webhook payloads for multiple objects from one subscription query.
+
+    The query is parsed once and all objects are resolved with the same context,
+    so the dataloaders are shared, and dataloader calls of all objects are batched
+    together. Return payloads in the order of `subscribable_objects`, None for
+    the objects for which the payload couldn't be generated.
+    """
     from ..api import schema
     from ..context import get_context_value
 
@@ -90,37 +101,59 @@ def generate_payload_from_subscription(
         ast,
     )
     app_id = app.pk if app else None
+    # Keep the dataloaders of a request reused for multiple webhooks of the same
+    # event, so the objects loaded for one app are not loaded again for the next.
+    # The app is read from the context on resolving the fields, so the permissions
+    # are still checked for each app separately.
+    dataloaders = getattr(request, "dataloaders", None)
     request.app = app
-    results = document.execute(
-        allow_subscriptions=True,
-        root=(event_type, subscribable_object),
-        context=get_context_value(request),
-    )
-    if hasattr(results, "errors"):
-        logger.warning(
-            "Unable to build a payload for subscription. \n"
-            "error: %s" % str(results.errors),
-            extra={"query": subscription_query, "app": app_id},
-        )
-        return None
-
-    payload: List[Any] = []
-    results.subscribe(payload.append)
-
-    if not payload:
-        logger.warning(
-            "Subscription did not return a payload.",
-            extra={"query": subscription_query, "app": app_id},
+    context = get_context_value(request)
+    if dataloaders is not None:
+        context.dataloaders = dataloaders
+
+    payload_instances: List[Any] = []
+    for subscribable_object in subscribable_objects:
+        results = document.execute(
+            allow_subscriptions=True,
+            root=(event_type, subscribable_object),
+            context=context,
         )
-        return None
-
-    payload_instance = payload[0]
-    event_payload = get_event_payload(payload_instance.data.get("event"))
-
-    if payload_instance.errors:
-        event_payload["errors"] = [
-            format_error(error, (GraphQLError, PermissionDenied))
-            for error in payload_instance.errors
+        if hasattr(results, "errors"):
+            logger.warning(
+                "Unable to build a payload for subscription. \n"
+                "error: %s" % str(results.errors),
+                extra={"query": subscription_query, "app": app_id},
+            )
+            payload_instances.append(None)
+            continue
+
+        payload: List[Any] = []
+        results.subscribe(payload.append)
+        if not payload:
+            logger.warning(
+                "Subscription did not return a payload.",
+                extra={"query": subscription_query, "app": app_id},
+            )
+            payload_instances.append(None)
+            continue
+        payload_instances.append(payload[0])
+
+    # Queries that use dataloaders return Promise object for the "event" field.
+    # They're resolved after executing the query for all objects, so the dataloaders
+    # are dispatched once for all of them.
+    events = Promise.all(
+        [
+            payload_instance.data.get("event") if payload_instance else None
+            for payload_instance in payload_instances
         ]
-
-    return event_payload
+    ).get()
+
+    event_payloads: List[Optional[Dict[str, Any]]] = []
+    for payload_instance, event_payload in zip(payload_instances, events):
+        if payload_instance and payload_instance.errors:
+            event_payload["errors"] = [
+                format_error(error, (GraphQLError, PermissionDenied))
+                for error in payload_instance.errors
+            ]
+        event_payloads.append(event_payload)
+    return event_payloads
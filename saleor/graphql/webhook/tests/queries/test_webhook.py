@@ -1,7 +1,10 @@
 import graphene
+from django.core.cache import cache
 
 from .....app.models import App
+from .....core import EventDeliveryStatus
 from .....webhook.models import Webhook
+from .....webhook.transport.asynchronous.circuit_breaker import record_delivery_attempt
 from ....tests.utils import (
     assert_no_permission,
     get_graphql_content,
@@ -201,3 +204,61 @@ def test_webhook_without_name(
     assert webhook_response["name"] is None
     events = webhook_without_name.events.all()
     assert len(events) == 1
+
+
+QUERY_WEBHOOK_CIRCUIT_BREAKER = """
+    query webhook($id: ID!) {
+      webhook(id: $id) {
+        circuitBreaker {
+          state
+          failureCount
+          openUntil
+        }
+      }
+    }
+"""
+
+
+def test_query_webhook_circuit_breaker(
+    staff_api_client, webhook, permission_manage_apps, settings
+):
+    # given
+    settings.WEBHOOK_CIRCUIT_BREAKER_FAILURE_THRESHOLD = 1
+    cache.clear()
+    record_delivery_attempt(webhook.target_url, EventDeliveryStatus.FAILED)
+    webhook_id = graphene.Node.to_global_id("Webhook", webhook.pk)
+    staff_api_client.user.user_permissions.add(permission_manage_apps)
+
+    # when
+    response = staff_api_client.post_graphql(
+        QUERY_WEBHOOK_CIRCUIT_BREAKER, variables={"id": webhook_id}
+    )
+
+    # then
+    content = get_graphql_content(response)
+    circuit_breaker = content["data"]["webhook"]["circuitBreaker"]
+    assert circuit_breaker["state"] == "OPEN"
+    assert circuit_breaker["failureCount"] == 0
+    assert circuit_breaker["openUntil"]
+    cache.clear()
+
+
+def test_query_webhook_circuit_breaker_closed(
+    staff_api_client, webhook, permission_manage_apps
+):
+    # given
+    webhook_id = graphene.Node.to_global_id("Webhook", webhook.pk)
+    staff_api_client.user.user_permissions.add(permission_manage_apps)
+
+    # when
+    response = staff_api_client.post_graphql(
+        QUERY_WEBHOOK_CIRCUIT_BREAKER, variables={"id": webhook_id}
+    )
+
+    # then
+    content = get_graphql_content(response)
+    assert content["data"]["webhook"]["circuitBreaker"] == {
+        "state": "CLOSED",
+        "failureCount": 0,
+        "openUntil": None,
+    }
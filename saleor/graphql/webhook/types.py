@@ -6,16 +6,27 @@ from ...core import models as core_models
 from ...webhook import models
 from ...webhook.deprecated_event_types import WebhookEventType
 from ...webhook.event_types import WebhookEventAsyncType, WebhookEventSyncType
+from ...webhook.transport.asynchronous.circuit_breaker import get_circuit_breaker_status
 from ..core import ResolveInfo
 from ..core.connection import (
     CountableConnection,
     create_connection_slice,
     filter_connection_queryset,
 )
-from ..core.descriptions import ADDED_IN_312, DEPRECATED_IN_3X_FIELD, PREVIEW_FEATURE
+from ..core.descriptions import (
+    ADDED_IN_312,
+    ADDED_IN_318,
+    DEPRECATED_IN_3X_FIELD,
+    PREVIEW_FEATURE,
+)
+from ..core.doc_category import DOC_CATEGORY_WEBHOOKS
 from ..core.fields import FilterConnectionField, JSONString
-from ..core.types import ModelObjectType, NonNullList
-from ..webhook.enums import EventDeliveryStatusEnum, WebhookEventTypeEnum
+from ..core.types import BaseObjectType, ModelObjectType, NonNullList
+from ..webhook.enums import (
+    EventDeliveryStatusEnum,
+    WebhookCircuitBreakerStateEnum,
+    WebhookEventTypeEnum,
+)
 from ..webhook.filters import EventDeliveryFilterInput
 from ..webhook.sorters import (
     EventDeliveryAttemptSortingInput,
@@ -149,6 +160,26 @@ class EventDeliveryCountableConnection(CountableConnection):
         node = EventDelivery
 
 
+class WebhookCircuitBreaker(BaseObjectType):
+    state = WebhookCircuitBreakerStateEnum(
+        required=True, description="State of the circuit breaker."
+    )
+    failure_count = graphene.Int(
+        required=True,
+        description="Number of failed delivery attempts in the current window.",
+    )
+    open_until = graphene.DateTime(
+        description="Time until which deliveries to the target are deferred."
+    )
+
+    class Meta:
+        description = (
+            "Health of a webhook target, based on the outcomes of async delivery "
+            "attempts." + ADDED_IN_318 + PREVIEW_FEATURE
+        )
+        doc_category = DOC_CATEGORY_WEBHOOKS
+
+
 class Webhook(ModelObjectType[models.Webhook]):
     id = graphene.GlobalID(required=True, description="The ID of webhook.")
     name = graphene.String(required=False, description="The name of webhook.")
@@ -200,6 +231,13 @@ class Webhook(ModelObjectType[models.Webhook]):
         + ADDED_IN_312
         + PREVIEW_FEATURE
     )
+    circuit_breaker = graphene.Field(
+        WebhookCircuitBreaker,
+        required=True,
+        description="Circuit breaker of the webhook target URL."
+        + ADDED_IN_318
+        + PREVIEW_FEATURE,
+    )
 
     class Meta:
         description = "Webhook."
@@ -247,3 +285,7 @@ class Webhook(ModelObjectType[models.Webhook]):
         return create_connection_slice(
             qs, info, kwargs, EventDeliveryCountableConnection
         )
+
+    @staticmethod
+    def resolve_circuit_breaker(root: models.Webhook, _info: ResolveInfo):
+        return get_circuit_breaker_status(root.target_url)
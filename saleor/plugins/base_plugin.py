@@ -952,6 +952,13 @@ class BasePlugin:
     # created.
     product_created: Callable[["Product", Any, None], Any]
 
+    # Trigger when products are created in bulk.
+    #
+    # Overwrite this method if you need to trigger specific logic after multiple
+    # products are created at once. When not implemented, `product_created` is
+    # triggered for each product.
+    product_created_bulk: Callable[[List["Product"], Any, None], Any]
+
     # Trigger when product is deleted.
     #
     # Overwrite this method if you need to trigger specific logic after a product is
@@ -994,6 +1001,13 @@ class BasePlugin:
     # variant is created.
     product_variant_created: Callable[["ProductVariant", Any, None], Any]
 
+    # Trigger when product variants are created in bulk.
+    #
+    # Overwrite this method if you need to trigger specific logic after multiple
+    # product variants are created at once. When not implemented,
+    # `product_variant_created` is triggered for each variant.
+    product_variant_created_bulk: Callable[[List["ProductVariant"], Any, None], Any]
+
     # Trigger when product variant is deleted.
     #
     # Overwrite this method if you need to trigger specific logic after a product
@@ -33,7 +33,7 @@ def test_get_product_limit_first_page(product):
     assert get_product_limit_first_page([product] * 16) == 4
 
 
-@patch("saleor.plugins.invoicing.utils.HTML")
+@patch("weasyprint.HTML")
 @patch("saleor.plugins.invoicing.utils.get_template")
 @patch("saleor.plugins.invoicing.utils.os")
 def test_generate_invoice_pdf_for_order(
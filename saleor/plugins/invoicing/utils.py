@@ -7,7 +7,6 @@ import pytz
 from django.conf import settings
 from django.template.loader import get_template
 from prices import Money
-from weasyprint import HTML
 
 from ...giftcard import GiftCardEvents
 from ...giftcard.models import GiftCardEvent
@@ -108,4 +107,7 @@ def generate_invoice_pdf(invoice):
             "rest_of_products": rest_of_products,
         }
     )
+    # Imported here, as loading the native libraries slows down the process start.
+    from weasyprint import HTML
+
     return HTML(string=rendered_template).write_pdf(), creation_date
@@ -28,6 +28,7 @@ from ..checkout import base_calculations
 from ..core.models import EventDelivery
 from ..core.payments import PaymentInterface
 from ..core.prices import quantize_price
+from ..core.replicas import get_replica_connection_name
 from ..core.taxes import TaxData, TaxType, zero_money, zero_taxed_money
 from ..graphql.core import ResolveInfo, SaleorContext
 from ..order import base_calculations as base_order_calculations
@@ -103,11 +104,12 @@ class PluginsManager(PaymentInterface):
 
     @property
     def database(self):
-        return (
-            settings.DATABASE_CONNECTION_REPLICA_NAME
-            if self._allow_replica
-            else settings.DATABASE_CONNECTION_DEFAULT_NAME
-        )
+        if not self._allow_replica:
+            return settings.DATABASE_CONNECTION_DEFAULT_NAME
+        # The replica is selected once to read the configuration from one snapshot.
+        if self._replica_connection_name is None:
+            self._replica_connection_name = get_replica_connection_name()
+        return self._replica_connection_name
 
     def _load_plugin(
         self,
@@ -139,6 +141,7 @@ class PluginsManager(PaymentInterface):
     def __init__(self, plugins: List[str], requestor_getter=None, allow_replica=True):
         with opentracing.global_tracer().start_active_span("PluginsManager.__init__"):
             self._allow_replica = allow_replica
+            self._replica_connection_name: Optional[str] = None
             self.all_plugins = []
             self.global_plugins = []
             self.plugins_per_channel = defaultdict(list)
@@ -234,6 +237,28 @@ class PluginsManager(PaymentInterface):
             return previous_value
         return returned_value
 
+    def __run_bulk_method_on_plugins(
+        self, method_name: str, instances: List[Any], **kwargs
+    ):
+        """Run `<method_name>_bulk` on each active plugin for all the instances.
+
+        Plugins that don't implement the bulk method have `method_name` run once
+        per instance.
+        """
+        if not instances:
+            return
+        bulk_method_name = f"{method_name}_bulk"
+        for plugin in self.get_plugins(active_only=True):
+            if getattr(plugin, bulk_method_name, NotImplemented) != NotImplemented:
+                self.__run_method_on_single_plugin(
+                    plugin, bulk_method_name, None, instances, **kwargs
+                )
+                continue
+            for instance in instances:
+                self.__run_method_on_single_plugin(
+                    plugin, method_name, None, instance, **kwargs
+                )
+
     def check_payment_balance(self, details: dict, channel_slug: str) -> dict:
         return self.__run_method_on_plugins(
             "check_payment_balance", None, details, channel_slug=channel_slug
@@ -644,6 +669,11 @@ class PluginsManager(PaymentInterface):
             "product_created", default_value, product, webhooks=webhooks
         )
 
+    def product_created_bulk(self, products: List["Product"], webhooks=None):
+        return self.__run_bulk_method_on_plugins(
+            "product_created", products, webhooks=webhooks
+        )
+
     def product_updated(self, product: "Product", webhooks=None):
         default_value = None
         return self.__run_method_on_plugins(
@@ -686,6 +716,13 @@ class PluginsManager(PaymentInterface):
             "product_variant_created", default_value, product_variant, webhooks=webhooks
         )
 
+    def product_variant_created_bulk(
+        self, product_variants: List["ProductVariant"], webhooks=None
+    ):
+        return self.__run_bulk_method_on_plugins(
+            "product_variant_created", product_variants, webhooks=webhooks
+        )
+
     def product_variant_updated(self, product_variant: "ProductVariant", webhooks=None):
         default_value = None
         return self.__run_method_on_plugins(
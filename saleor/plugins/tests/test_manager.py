@@ -5,7 +5,6 @@ from unittest import mock
 
 import pytest
 from django.http import HttpResponseNotFound, JsonResponse
-from django.test import override_settings
 from mock import patch
 from prices import Money, TaxedMoney
 
@@ -1520,25 +1519,34 @@ def test_payment_method_process_tokenization(
 
 
 @pytest.mark.parametrize(
-    "allow_replica, expected_connection_name",
+    "allow_replica, replica_selections_count",
     (
-        (True, "test replica"),
-        (False, "test default"),
+        (True, 1),
+        (False, 0),
     ),
 )
-def test_plugin_manager_database(allow_replica, expected_connection_name):
+@mock.patch(
+    "saleor.plugins.manager.get_replica_connection_name", return_value="default"
+)
+def test_plugin_manager_database(
+    mocked_get_replica_connection_name,
+    allow_replica,
+    replica_selections_count,
+    settings,
+):
     # given
     manager = PluginsManager(
         ["saleor.plugins.tests.sample_plugins.PluginSample"],
         allow_replica=allow_replica,
     )
 
-    # when & then
-    with override_settings(
-        DATABASE_CONNECTION_REPLICA_NAME="test replica",
-        DATABASE_CONNECTION_DEFAULT_NAME="test default",
-    ):
-        assert manager.database == expected_connection_name
+    # when
+    connection_names = {manager.database, manager.database}
+
+    # then
+    assert connection_names == {settings.DATABASE_CONNECTION_DEFAULT_NAME}
+    # the replica is selected once per manager
+    assert mocked_get_replica_connection_name.call_count == replica_selections_count
 
 
 def test_plugin_manager__get_channel_map(
@@ -1557,3 +1565,42 @@ def test_plugin_manager__get_channel_map(
         channel_JPY.pk: channel_JPY,
         other_channel_USD.pk: other_channel_USD,
     }
+
+
+def test_manager_product_created_bulk_falls_back_to_product_created(
+    settings, product_list
+):
+    # given
+    settings.PLUGINS = ["saleor.plugins.tests.sample_plugins.PluginSample"]
+    manager = get_plugins_manager()
+
+    # when
+    with patch.object(
+        PluginSample, "product_created", create=True
+    ) as mocked_product_created:
+        manager.product_created_bulk(product_list)
+
+    # then
+    assert [
+        args[0] for args, _ in mocked_product_created.call_args_list
+    ] == product_list
+
+
+def test_manager_product_created_bulk_calls_bulk_method(settings, product_list):
+    # given
+    settings.PLUGINS = ["saleor.plugins.tests.sample_plugins.PluginSample"]
+    manager = get_plugins_manager()
+
+    # when
+    with patch.object(
+        PluginSample, "product_created", create=True
+    ) as mocked_product_created, patch.object(
+        PluginSample, "product_created_bulk", create=True
+    ) as mocked_product_created_bulk:
+        manager.product_created_bulk(product_list)
+
+    # then
+    mocked_product_created.assert_not_called()
+    mocked_product_created_bulk.assert_called_once_with(
+        product_list, previous_value=None, webhooks=None
+    )
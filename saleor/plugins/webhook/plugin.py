@@ -15,7 +15,6 @@ from typing import (
 )
 
 import graphene
-from django.conf import settings
 
 from ...app.models import App
 from ...checkout.fetch import CheckoutInfo, CheckoutLineInfo
@@ -23,6 +22,7 @@ from ...checkout.models import Checkout
 from ...core import EventDeliveryStatus
 from ...core.models import EventDelivery
 from ...core.notify_events import NotifyEventType
+from ...core.replicas import get_replica_connection_name
 from ...core.taxes import TaxData, TaxType
 from ...core.utils import build_absolute_uri
 from ...core.utils.json_serializer import CustomJsonEncoder
@@ -84,8 +84,10 @@ from ...webhook.payloads import (
     generate_translation_payload,
 )
 from ...webhook.transport.asynchronous.transport import (
+    WebhookPayloadData,
     send_webhook_request_async,
     trigger_webhooks_async,
+    trigger_webhooks_async_for_multiple_objects,
 )
 from ...webhook.transport.list_stored_payment_methods import (
     get_list_stored_payment_methods_data_dict,
@@ -103,7 +105,7 @@ from ...webhook.transport.shipping import (
 from ...webhook.transport.synchronous.transport import (
     trigger_all_webhooks_sync,
     trigger_webhook_sync,
-    trigger_webhook_sync_if_not_cached,
+    trigger_webhooks_sync_if_not_cached,
 )
 from ...webhook.transport.utils import (
     DEFAULT_TAX_CODE,
@@ -1515,6 +1517,28 @@ class WebhookPlugin(BasePlugin):
                 legacy_data_generator=product_data_generator,
             )
 
+    def product_created_bulk(
+        self, products: List["Product"], previous_value: Any, webhooks=None
+    ) -> Any:
+        if not self.active:
+            return previous_value
+        event_type = WebhookEventAsyncType.PRODUCT_CREATED
+        if webhooks := self._get_webhooks_for_event(event_type, webhooks):
+            trigger_webhooks_async_for_multiple_objects(
+                event_type,
+                webhooks,
+                [
+                    WebhookPayloadData(
+                        subscribable_object=product,
+                        legacy_data_generator=partial(
+                            generate_product_payload, product, self.requestor
+                        ),
+                    )
+                    for product in products
+                ],
+                self.requestor,
+            )
+
     def product_updated(
         self, product: "Product", previous_value: Any, webhooks=None
     ) -> Any:
@@ -1639,6 +1663,33 @@ class WebhookPlugin(BasePlugin):
                 legacy_data_generator=product_variant_data_generator,
             )
 
+    def product_variant_created_bulk(
+        self,
+        product_variants: List["ProductVariant"],
+        previous_value: Any,
+        webhooks=None,
+    ) -> Any:
+        if not self.active:
+            return previous_value
+        event_type = WebhookEventAsyncType.PRODUCT_VARIANT_CREATED
+        if webhooks := self._get_webhooks_for_event(event_type, webhooks):
+            trigger_webhooks_async_for_multiple_objects(
+                event_type,
+                webhooks,
+                [
+                    WebhookPayloadData(
+                        subscribable_object=product_variant,
+                        legacy_data_generator=partial(
+                            generate_product_variant_payload,
+                            [product_variant],
+                            self.requestor,
+                        ),
+                    )
+                    for product_variant in product_variants
+                ],
+                self.requestor,
+            )
+
     def product_variant_updated(
         self, product_variant: "ProductVariant", previous_value: Any, webhooks=None
     ) -> Any:
@@ -2292,18 +2343,17 @@ class WebhookPlugin(BasePlugin):
                 list_payment_method_data.user.id, list_payment_method_data.channel.slug
             )
             payload = self._serialize_payload(payload_dict)
-            for webhook in webhooks:
-                if not webhook.app.identifier:
-                    continue
-                response_data = trigger_webhook_sync_if_not_cached(
-                    event_type,
-                    payload,
-                    webhook,
-                    cache_data=payload_dict,
-                    subscribable_object=list_payment_method_data,
-                    request_timeout=WEBHOOK_SYNC_TIMEOUT,
-                    cache_timeout=WEBHOOK_CACHE_DEFAULT_TIMEOUT,
-                )
+            app_webhooks = [webhook for webhook in webhooks if webhook.app.identifier]
+            responses_data = trigger_webhooks_sync_if_not_cached(
+                event_type,
+                payload,
+                app_webhooks,
+                cache_data=payload_dict,
+                subscribable_object=list_payment_method_data,
+                request_timeout=WEBHOOK_SYNC_TIMEOUT,
+                cache_timeout=WEBHOOK_CACHE_DEFAULT_TIMEOUT,
+            )
+            for webhook, response_data in zip(app_webhooks, responses_data):
                 if response_data:
                     previous_value.extend(
                         get_list_stored_payment_methods_from_response(
@@ -2517,15 +2567,16 @@ class WebhookPlugin(BasePlugin):
         payment_app_data = from_payment_app_id(payment_information.gateway)
 
         if payment_app_data is not None:
+            connection_name = get_replica_connection_name()
             if payment_app_data.app_identifier:
                 apps = (
-                    App.objects.using(settings.DATABASE_CONNECTION_REPLICA_NAME)
+                    App.objects.using(connection_name)
                     .for_event_type(event_type)
                     .filter(identifier=payment_app_data.app_identifier)
                 )
             else:
                 apps = (
-                    App.objects.using(settings.DATABASE_CONNECTION_REPLICA_NAME)
+                    App.objects.using(connection_name)
                     .for_event_type(event_type)
                     .filter(pk=payment_app_data.app_pk)
                 )
@@ -2889,17 +2940,16 @@ class WebhookPlugin(BasePlugin):
         if webhooks:
             payload = generate_checkout_payload(checkout, self.requestor)
             cache_data = get_cache_data_for_shipping_list_methods_for_checkout(payload)
-            for webhook in webhooks:
-                response_data = trigger_webhook_sync_if_not_cached(
-                    event_type=WebhookEventSyncType.SHIPPING_LIST_METHODS_FOR_CHECKOUT,
-                    payload=payload,
-                    webhook=webhook,
-                    cache_data=cache_data,
-                    subscribable_object=checkout,
-                    request_timeout=WEBHOOK_SYNC_TIMEOUT,
-                    cache_timeout=CACHE_TIME_SHIPPING_LIST_METHODS_FOR_CHECKOUT,
-                )
-
+            responses_data = trigger_webhooks_sync_if_not_cached(
+                event_type=WebhookEventSyncType.SHIPPING_LIST_METHODS_FOR_CHECKOUT,
+                payload=payload,
+                webhooks=list(webhooks),
+                cache_data=cache_data,
+                subscribable_object=checkout,
+                request_timeout=WEBHOOK_SYNC_TIMEOUT,
+                cache_timeout=CACHE_TIME_SHIPPING_LIST_METHODS_FOR_CHECKOUT,
+            )
+            for webhook, response_data in zip(webhooks, responses_data):
                 if response_data:
                     shipping_methods = parse_list_shipping_methods_response(
                         response_data, webhook.app
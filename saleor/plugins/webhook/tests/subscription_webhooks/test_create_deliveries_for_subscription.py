@@ -4,8 +4,11 @@ from unittest.mock import MagicMock, patch
 import graphene
 import pytest
 from django.core.files import File
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from freezegun import freeze_time
 
+from .....app.models import App
 from .....channel.models import Channel
 from .....giftcard.models import GiftCard
 from .....graphql.webhook.subscription_query import SubscriptionQuery
@@ -14,10 +17,12 @@ from .....product.models import Category
 from .....shipping.models import ShippingMethod, ShippingZone
 from .....site.models import SiteSettings
 from .....webhook.event_types import WebhookEventAsyncType, WebhookEventSyncType
+from .....webhook.models import Webhook
 from .....webhook.transport.asynchronous.transport import (
     create_deliveries_for_subscriptions,
     logger,
 )
+from .....webhook.utils import get_webhooks_for_event
 from . import subscription_queries
 from .payloads import (
     generate_account_events_payload,
@@ -2993,3 +2998,100 @@ def test_thumbnail_created_user(thumbnail_user, subscription_thumbnail_created_w
     assert deliveries[0].payload.payload == expected_payload
     assert len(deliveries) == len(webhooks)
     assert deliveries[0].webhook == webhooks[0]
+
+
+ORDER_UPDATED_WITH_RELATIONS = """
+    subscription{
+      event{
+        ...on OrderUpdated{
+          order{
+            id
+            user{
+              email
+            }
+            lines{
+              id
+              variant{
+                id
+                product{
+                  name
+                }
+              }
+            }
+            payments{
+              id
+            }
+          }
+        }
+      }
+    }
+"""
+
+
+def _create_order_updated_webhooks(count, permissions):
+    for index in range(count):
+        app = App.objects.create(name=f"App {index}", is_active=True)
+        app.permissions.add(*permissions)
+        webhook = Webhook.objects.create(
+            name=f"Webhook {index}",
+            app=app,
+            target_url="http://www.example.com/any",
+            subscription_query=ORDER_UPDATED_WITH_RELATIONS,
+        )
+        webhook.events.create(event_type=WebhookEventAsyncType.ORDER_UPDATED)
+
+
+def test_create_deliveries_for_subscriptions_shares_dataloaders_between_apps(
+    order_with_lines, permission_manage_orders
+):
+    # given
+    event_type = WebhookEventAsyncType.ORDER_UPDATED
+
+    def create_deliveries():
+        webhooks = get_webhooks_for_event(event_type)
+        with CaptureQueriesContext(connection) as queries:
+            deliveries = create_deliveries_for_subscriptions(
+                event_type, order_with_lines, webhooks
+            )
+        return deliveries, len(queries)
+
+    _create_order_updated_webhooks(1, [permission_manage_orders])
+    _, single_app_queries = create_deliveries()
+    _create_order_updated_webhooks(5, [permission_manage_orders])
+
+    # when
+    deliveries, many_apps_queries = create_deliveries()
+
+    # then
+    assert len(deliveries) == 6
+    payloads = {delivery.payload.payload for delivery in deliveries}
+    assert len(payloads) == 1
+    payload = json.loads(payloads.pop())
+    assert payload["order"]["user"]["email"] == order_with_lines.user_email
+    assert len(payload["order"]["lines"]) == order_with_lines.lines.count()
+    assert many_apps_queries == single_app_queries
+
+
+def test_create_deliveries_for_subscriptions_checks_permissions_per_app(
+    order_with_lines, permission_manage_orders
+):
+    # given
+    event_type = WebhookEventAsyncType.ORDER_UPDATED
+    _create_order_updated_webhooks(1, [permission_manage_orders])
+    _create_order_updated_webhooks(1, [])
+    webhooks = Webhook.objects.select_related("app").order_by("pk")
+
+    # when
+    deliveries = create_deliveries_for_subscriptions(
+        event_type, order_with_lines, webhooks
+    )
+
+    # then
+    payloads = {
+        delivery.webhook.app.permissions.exists(): json.loads(delivery.payload.payload)
+        for delivery in deliveries
+    }
+    assert payloads[True]["order"]["user"]["email"] == order_with_lines.user_email
+    assert "errors" not in payloads[True]
+    assert payloads[False]["order"]["user"] is None
+    assert payloads[False]["errors"]
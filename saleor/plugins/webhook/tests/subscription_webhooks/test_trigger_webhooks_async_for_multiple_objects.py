@@ -0,0 +1,104 @@
+import json
+from unittest.mock import patch
+
+import graphene
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .....core.models import EventDelivery, EventPayload
+from .....webhook.event_types import WebhookEventAsyncType
+from .....webhook.models import Webhook
+from .....webhook.transport.asynchronous.transport import (
+    WebhookPayloadData,
+    trigger_webhooks_async_for_multiple_objects,
+)
+
+PRODUCT_CREATED_WITH_RELATIONS = """
+    subscription{
+      event{
+        ...on ProductCreated{
+          product{
+            id
+            productType{
+              name
+            }
+            category{
+              name
+            }
+          }
+        }
+      }
+    }
+"""
+
+
+@patch("saleor.webhook.transport.asynchronous.transport.group")
+def test_trigger_webhooks_async_for_multiple_objects(
+    mocked_group, product_list, subscription_product_created_webhook, webhook
+):
+    # given
+    event_type = WebhookEventAsyncType.PRODUCT_CREATED
+    webhook.events.create(event_type=event_type)
+    webhooks = [subscription_product_created_webhook, webhook]
+    payloads_data = [
+        WebhookPayloadData(
+            subscribable_object=product,
+            legacy_data_generator=lambda product=product: json.dumps(
+                {"id": product.pk}
+            ),
+        )
+        for product in product_list
+    ]
+
+    # when
+    trigger_webhooks_async_for_multiple_objects(event_type, webhooks, payloads_data)
+
+    # then
+    deliveries = EventDelivery.objects.all()
+    assert len(deliveries) == 2 * len(product_list)
+    assert EventPayload.objects.count() == 2 * len(product_list)
+    subscription_payloads = [
+        json.loads(delivery.payload.get_payload())
+        for delivery in deliveries.filter(webhook=subscription_product_created_webhook)
+    ]
+    assert {payload["product"]["id"] for payload in subscription_payloads} == {
+        graphene.Node.to_global_id("Product", product.pk) for product in product_list
+    }
+    regular_payloads = [
+        json.loads(delivery.payload.get_payload())
+        for delivery in deliveries.filter(webhook=webhook)
+    ]
+    assert sorted(payload["id"] for payload in regular_payloads) == sorted(
+        product.pk for product in product_list
+    )
+    mocked_group.assert_called_once()
+    assert len(list(mocked_group.call_args.args[0])) == len(deliveries)
+
+
+@patch("saleor.webhook.transport.asynchronous.transport.group")
+def test_trigger_webhooks_async_for_multiple_objects_shares_dataloaders(
+    mocked_group, product_list, subscription_webhook
+):
+    # given
+    event_type = WebhookEventAsyncType.PRODUCT_CREATED
+    webhook = subscription_webhook(PRODUCT_CREATED_WITH_RELATIONS, event_type)
+    webhooks = list(Webhook.objects.filter(pk=webhook.pk).select_related("app"))
+
+    def trigger(products):
+        with CaptureQueriesContext(connection) as queries:
+            trigger_webhooks_async_for_multiple_objects(
+                event_type,
+                webhooks,
+                [
+                    WebhookPayloadData(subscribable_object=product)
+                    for product in products
+                ],
+            )
+        return len(queries)
+
+    # when
+    single_product_queries = trigger(product_list[:1])
+    all_products_queries = trigger(product_list)
+
+    # then
+    assert all_products_queries == single_product_queries
@@ -1,4 +1,7 @@
-from unittest.mock import Mock, patch
+import threading
+from copy import copy
+from datetime import timedelta
+from unittest.mock import ANY, Mock, patch
 
 from celery.canvas import Signature
 
@@ -76,6 +79,7 @@ def test_send_observability_events(
         observability_webhook_data.secret_key,
         WebhookEventAsyncType.OBSERVABILITY,
         dump_payload(events),
+        timeout=ANY,
     )
 
 
@@ -115,6 +119,7 @@ def test_send_observability_events_to_google_pub_sub(
         observability_webhook_data.secret_key,
         WebhookEventAsyncType.OBSERVABILITY,
         dump_payload(events[-1]),
+        timeout=ANY,
     )
 
 
@@ -134,3 +139,111 @@ def test_send_observability_events_to_google_pub_sub_when_reposnse_failed(
 
     send_observability_events([observability_webhook_data], events)
     assert mock_send_webhook_using_scheme_method.call_count == len(events)
+
+
+@patch(
+    "saleor.webhook.transport.asynchronous.transport.send_webhook_using_scheme_method"
+)
+def test_send_observability_events_in_batches(
+    mock_send_webhook_using_scheme_method, observability_webhook_data, settings
+):
+    settings.OBSERVABILITY_WEBHOOK_BATCH_SIZE = 2
+    events = [{"event": "data1"}, {"event": "data2"}, {"event": "data3"}]
+
+    send_observability_events([observability_webhook_data], events)
+
+    assert [
+        call.args[4] for call in mock_send_webhook_using_scheme_method.call_args_list
+    ] == [dump_payload(events[:2]), dump_payload(events[2:])]
+
+
+@patch(
+    "saleor.webhook.transport.asynchronous.transport.send_webhook_using_scheme_method"
+)
+def test_send_observability_events_to_webhooks_concurrently(
+    mock_send_webhook_using_scheme_method, observability_webhook_data
+):
+    other_webhook_data = copy(observability_webhook_data)
+    other_webhook_data.id += 1
+    other_webhook_data.target_url = "https://www.example.com/other"
+    barrier = threading.Barrier(2, timeout=5)
+
+    def send_webhook(*args, **kwargs):
+        # fails with BrokenBarrierError when the webhooks are called sequentially
+        barrier.wait()
+        return Mock(status=EventDeliveryStatus.SUCCESS)
+
+    mock_send_webhook_using_scheme_method.side_effect = send_webhook
+    events = [{"event": "data"}]
+
+    send_observability_events([observability_webhook_data, other_webhook_data], events)
+
+    assert {
+        call.args[0] for call in mock_send_webhook_using_scheme_method.call_args_list
+    } == {observability_webhook_data.target_url, other_webhook_data.target_url}
+    assert not barrier.broken
+
+
+@patch("saleor.webhook.transport.asynchronous.transport.logger")
+@patch(
+    "saleor.webhook.transport.asynchronous.transport.send_webhook_using_scheme_method"
+)
+def test_send_observability_events_drops_events_after_timeout(
+    mock_send_webhook_using_scheme_method,
+    mock_logger,
+    observability_webhook_data,
+    settings,
+):
+    settings.OBSERVABILITY_WEBHOOK_TIMEOUT = timedelta(0)
+    events = [{"event": "data"}, {"event": "data"}]
+
+    send_observability_events([observability_webhook_data], events)
+
+    mock_send_webhook_using_scheme_method.assert_not_called()
+    mock_logger.info.assert_called_once()
+    assert mock_logger.info.call_args.kwargs["extra"]["dropped_events_count"] == 2
+
+
+@patch(
+    "saleor.webhook.transport.asynchronous.transport.send_webhook_using_scheme_method"
+)
+def test_send_observability_events_limits_request_timeout_to_deadline(
+    mock_send_webhook_using_scheme_method, observability_webhook_data, settings
+):
+    # given
+    settings.OBSERVABILITY_WEBHOOK_TIMEOUT = timedelta(seconds=1)
+    settings.WEBHOOK_TIMEOUT = 10
+    events = [{"event": "data"}]
+
+    # when
+    send_observability_events([observability_webhook_data], events)
+
+    # then
+    timeout = mock_send_webhook_using_scheme_method.call_args.kwargs["timeout"]
+    assert 0 < timeout <= 1
+
+
+@patch("saleor.webhook.transport.asynchronous.transport.logger")
+@patch(
+    "saleor.webhook.transport.asynchronous.transport.send_webhook_using_scheme_method"
+)
+def test_send_observability_events_unknown_scheme_logs_not_sent_events(
+    mock_send_webhook_using_scheme_method,
+    mock_logger,
+    observability_webhook_data,
+    settings,
+):
+    # given
+    settings.OBSERVABILITY_WEBHOOK_BATCH_SIZE = 2
+    mock_send_webhook_using_scheme_method.side_effect = [
+        Mock(status=EventDeliveryStatus.SUCCESS),
+        ValueError(),
+    ]
+    events = [{"event": "data1"}, {"event": "data2"}, {"event": "data3"}]
+
+    # when
+    send_observability_events([observability_webhook_data], events)
+
+    # then
+    mock_logger.error.assert_called_once()
+    assert mock_logger.error.call_args.kwargs["extra"]["dropped_events_count"] == 1
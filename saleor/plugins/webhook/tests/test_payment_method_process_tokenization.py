@@ -499,6 +499,9 @@ def test_expected_result_invalidates_cache_for_app(
         list_stored_payment_methods_response,
         timeout=WEBHOOK_CACHE_DEFAULT_TIMEOUT,
     )
+    # fetching the stored payment methods also deletes the request coalescing lock
+    # key from the shared cache, only the deletes of the tested call are checked
+    mocked_cache_delete.reset_mock()
 
     # when
     response = plugin.payment_method_process_tokenization(request_data, previous_value)
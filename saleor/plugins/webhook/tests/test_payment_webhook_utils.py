@@ -1,3 +1,5 @@
+from unittest import mock
+
 import pytest
 
 from ....core import EventDeliveryStatus
@@ -259,6 +261,45 @@ def test_clear_successful_delivery_when_payload_in_multiple_deliveries(event_del
     assert EventPayload.objects.filter(pk=event_payload.pk).exists()
 
 
+@mock.patch("saleor.webhook.transport.utils.delete_event_payload_files_task.delay")
+def test_clear_successful_delivery_deletes_payload_file(
+    mocked_delete_files, event_delivery
+):
+    # given
+    event_delivery.status = EventDeliveryStatus.SUCCESS
+    event_delivery.save()
+    event_payload = event_delivery.payload
+    event_payload.payload_path = "event_payloads/aa/payload.json.gz"
+    event_payload.save(update_fields=["payload_path"])
+
+    # when
+    clear_successful_delivery(event_delivery)
+
+    # then
+    assert not EventPayload.objects.filter(pk=event_payload.pk).exists()
+    mocked_delete_files.assert_called_once_with([event_payload.payload_path])
+
+
+@mock.patch("saleor.webhook.transport.utils.delete_event_payload_files_task.delay")
+def test_clear_successful_delivery_keeps_file_of_shared_payload(
+    mocked_delete_files, event_delivery
+):
+    # given
+    event_delivery.status = EventDeliveryStatus.SUCCESS
+    event_delivery.save()
+    event_payload = event_delivery.payload
+    event_payload.payload_path = "event_payloads/aa/payload.json.gz"
+    event_payload.save(update_fields=["payload_path"])
+    EventDelivery.objects.create(payload=event_payload, webhook=event_delivery.webhook)
+
+    # when
+    clear_successful_delivery(event_delivery)
+
+    # then
+    assert EventPayload.objects.filter(pk=event_payload.pk).exists()
+    mocked_delete_files.assert_not_called()
+
+
 def test_clear_successful_delivery_on_failed_delivery(event_delivery):
     # given
     event_delivery.status = EventDeliveryStatus.FAILED
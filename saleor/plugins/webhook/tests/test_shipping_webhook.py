@@ -66,7 +66,7 @@ CHECKOUT_QUERY_SHIPPING_METHOD = """
 
 
 @mock.patch("saleor.webhook.transport.synchronous.transport.cache.set")
-@mock.patch("saleor.webhook.transport.shipping.trigger_webhook_sync")
+@mock.patch("saleor.webhook.transport.shipping.trigger_webhooks_sync")
 @mock.patch(
     "saleor.plugins.webhook.plugin.generate_excluded_shipping_methods_for_order_payload"
 )
@@ -84,14 +84,16 @@ def test_excluded_shipping_methods_for_order(
     shipping_app = shipping_app_factory()
     webhook_reason = "Order contains dangerous products."
     other_reason = "Shipping is not applicable for this order."
-    mocked_webhook.return_value = {
-        "excluded_methods": [
-            {
-                "id": graphene.Node.to_global_id("ShippingMethod", "1"),
-                "reason": webhook_reason,
-            }
-        ]
-    }
+    mocked_webhook.return_value = [
+        {
+            "excluded_methods": [
+                {
+                    "id": graphene.Node.to_global_id("ShippingMethod", "1"),
+                    "reason": webhook_reason,
+                }
+            ]
+        }
+    ]
     payload = mock.MagicMock()
     mocked_payload.return_value = payload
     plugin = webhook_plugin()
@@ -117,7 +119,7 @@ def test_excluded_shipping_methods_for_order(
     mocked_webhook.assert_called_once_with(
         WebhookEventSyncType.ORDER_FILTER_SHIPPING_METHODS,
         payload,
-        shipping_app.webhooks.get(events__event_type=event_type),
+        [shipping_app.webhooks.get(events__event_type=event_type)],
         subscribable_object=order_with_lines,
         timeout=settings.WEBHOOK_SYNC_TIMEOUT,
     )
@@ -133,7 +135,7 @@ def test_excluded_shipping_methods_for_order(
 
 
 @mock.patch("saleor.webhook.transport.synchronous.transport.cache.set")
-@mock.patch("saleor.webhook.transport.shipping.trigger_webhook_sync")
+@mock.patch("saleor.webhook.transport.shipping.trigger_webhooks_sync")
 @mock.patch(
     "saleor.plugins.webhook.plugin.generate_excluded_shipping_methods_for_order_payload"
 )
@@ -153,7 +155,7 @@ def test_multiple_app_with_excluded_shipping_methods_for_order(
     webhook_reason = "Order contains dangerous products."
     webhook_second_reason = "Shipping is not applicable for this order."
 
-    mocked_webhook.side_effect = [
+    mocked_webhook.return_value = [
         {
             "excluded_methods": [
                 {
@@ -196,20 +198,17 @@ def test_multiple_app_with_excluded_shipping_methods_for_order(
     assert webhook_reason in em.reason
     assert webhook_second_reason in em.reason
     event_type = WebhookEventSyncType.ORDER_FILTER_SHIPPING_METHODS
-    mocked_webhook.assert_any_call(
+    mocked_webhook.assert_called_once_with(
         event_type,
         payload,
-        shipping_app.webhooks.get(events__event_type=event_type),
+        mock.ANY,
         subscribable_object=order_with_lines,
         timeout=settings.WEBHOOK_SYNC_TIMEOUT,
     )
-    mocked_webhook.assert_any_call(
-        event_type,
-        payload,
+    assert set(mocked_webhook.call_args.args[2]) == {
+        shipping_app.webhooks.get(events__event_type=event_type),
         second_shipping_app.webhooks.get(events__event_type=event_type),
-        subscribable_object=order_with_lines,
-        timeout=settings.WEBHOOK_SYNC_TIMEOUT,
-    )
+    }
     expected_cache_key = CACHE_EXCLUDED_SHIPPING_KEY + str(order_with_lines.id)
 
     expected_excluded_shipping_method = [
@@ -226,7 +225,7 @@ def test_multiple_app_with_excluded_shipping_methods_for_order(
 
 
 @mock.patch("saleor.webhook.transport.synchronous.transport.cache.set")
-@mock.patch("saleor.webhook.transport.shipping.trigger_webhook_sync")
+@mock.patch("saleor.webhook.transport.shipping.trigger_webhooks_sync")
 @mock.patch(
     "saleor.plugins.webhook.plugin.generate_excluded_shipping_methods_for_order_payload"
 )
@@ -258,7 +257,7 @@ def test_multiple_webhooks_on_the_same_app_with_excluded_shipping_methods_for_or
     webhook_reason = "Order contains dangerous products."
     webhook_second_reason = "Shipping is not applicable for this order."
 
-    mocked_webhook.side_effect = [
+    mocked_webhook.return_value = [
         {
             "excluded_methods": [
                 {
@@ -302,14 +301,14 @@ def test_multiple_webhooks_on_the_same_app_with_excluded_shipping_methods_for_or
     assert webhook_second_reason in em.reason
     webhooks = shipping_app.webhooks.filter(events__event_type=event_type)
     assert len(webhooks) > 1
-    for webhook in webhooks:
-        mocked_webhook.assert_any_call(
-            event_type,
-            payload,
-            webhook,
-            subscribable_object=order_with_lines,
-            timeout=settings.WEBHOOK_SYNC_TIMEOUT,
-        )
+    mocked_webhook.assert_called_once_with(
+        event_type,
+        payload,
+        mock.ANY,
+        subscribable_object=order_with_lines,
+        timeout=settings.WEBHOOK_SYNC_TIMEOUT,
+    )
+    assert set(mocked_webhook.call_args.args[2]) == set(webhooks)
 
     expected_cache_key = CACHE_EXCLUDED_SHIPPING_KEY + str(order_with_lines.id)
 
@@ -523,7 +522,7 @@ def test_trigger_webhook_sync(mock_request, shipping_app):
 
 
 @mock.patch("saleor.webhook.transport.synchronous.transport.cache.set")
-@mock.patch("saleor.webhook.transport.shipping.trigger_webhook_sync")
+@mock.patch("saleor.webhook.transport.shipping.trigger_webhooks_sync")
 @mock.patch(
     "saleor.plugins.webhook.plugin."
     "generate_excluded_shipping_methods_for_checkout_payload"
@@ -543,14 +542,16 @@ def test_excluded_shipping_methods_for_checkout_webhook(
     webhook_reason = "Checkout contains dangerous products."
     other_reason = "Shipping is not applicable for this checkout."
 
-    mocked_webhook.return_value = {
-        "excluded_methods": [
-            {
-                "id": graphene.Node.to_global_id("ShippingMethod", "1"),
-                "reason": webhook_reason,
-            }
-        ]
-    }
+    mocked_webhook.return_value = [
+        {
+            "excluded_methods": [
+                {
+                    "id": graphene.Node.to_global_id("ShippingMethod", "1"),
+                    "reason": webhook_reason,
+                }
+            ]
+        }
+    ]
     payload = mock.MagicMock()
     mocked_payload.return_value = payload
     plugin = webhook_plugin()
@@ -575,7 +576,7 @@ def test_excluded_shipping_methods_for_checkout_webhook(
     mocked_webhook.assert_called_once_with(
         event_type,
         payload,
-        shipping_app.webhooks.get(events__event_type=event_type),
+        [shipping_app.webhooks.get(events__event_type=event_type)],
         subscribable_object=checkout_with_items,
         timeout=settings.WEBHOOK_SYNC_TIMEOUT,
     )
@@ -637,7 +638,7 @@ def test_excluded_shipping_methods_for_checkout(
 
 
 @mock.patch("saleor.webhook.transport.synchronous.transport.cache.set")
-@mock.patch("saleor.webhook.transport.shipping.trigger_webhook_sync")
+@mock.patch("saleor.webhook.transport.shipping.trigger_webhooks_sync")
 @mock.patch(
     "saleor.plugins.webhook.plugin."
     "generate_excluded_shipping_methods_for_checkout_payload"
@@ -658,7 +659,7 @@ def test_multiple_app_with_excluded_shipping_methods_for_checkout(
     webhook_reason = "Checkout contains dangerous products."
     webhook_second_reason = "Shipping is not applicable for this checkout."
 
-    mocked_webhook.side_effect = [
+    mocked_webhook.return_value = [
         {
             "excluded_methods": [
                 {
@@ -700,20 +701,17 @@ def test_multiple_app_with_excluded_shipping_methods_for_checkout(
     assert webhook_reason in em.reason
     assert webhook_second_reason in em.reason
     event_type = WebhookEventSyncType.CHECKOUT_FILTER_SHIPPING_METHODS
-    mocked_webhook.assert_any_call(
+    mocked_webhook.assert_called_once_with(
         event_type,
         payload,
-        shipping_app.webhooks.get(events__event_type=event_type),
+        mock.ANY,
         subscribable_object=checkout_with_items,
         timeout=settings.WEBHOOK_SYNC_TIMEOUT,
     )
-    mocked_webhook.assert_any_call(
-        event_type,
-        payload,
+    assert set(mocked_webhook.call_args.args[2]) == {
+        shipping_app.webhooks.get(events__event_type=event_type),
         second_shipping_app.webhooks.get(events__event_type=event_type),
-        subscribable_object=checkout_with_items,
-        timeout=settings.WEBHOOK_SYNC_TIMEOUT,
-    )
+    }
 
     expected_cache_key = CACHE_EXCLUDED_SHIPPING_KEY + str(checkout_with_items.token)
 
@@ -731,7 +729,7 @@ def test_multiple_app_with_excluded_shipping_methods_for_checkout(
 
 
 @mock.patch("saleor.webhook.transport.synchronous.transport.cache.set")
-@mock.patch("saleor.webhook.transport.shipping.trigger_webhook_sync")
+@mock.patch("saleor.webhook.transport.shipping.trigger_webhooks_sync")
 @mock.patch(
     "saleor.plugins.webhook.plugin."
     "generate_excluded_shipping_methods_for_checkout_payload"
@@ -764,7 +762,7 @@ def test_multiple_webhooks_on_the_same_app_with_excluded_shipping_methods_for_ch
     webhook_reason = "Checkout contains dangerous products."
     webhook_second_reason = "Shipping is not applicable for this checkout."
 
-    mocked_webhook.side_effect = [
+    mocked_webhook.return_value = [
         {
             "excluded_methods": [
                 {
@@ -807,14 +805,14 @@ def test_multiple_webhooks_on_the_same_app_with_excluded_shipping_methods_for_ch
     assert webhook_second_reason in em.reason
     webhooks = shipping_app.webhooks.filter(events__event_type=event_type)
     assert len(webhooks) > 1
-    for webhook in webhooks:
-        mocked_webhook.assert_any_call(
-            event_type,
-            payload,
-            webhook,
-            subscribable_object=checkout_with_items,
-            timeout=settings.WEBHOOK_SYNC_TIMEOUT,
-        )
+    mocked_webhook.assert_called_once_with(
+        event_type,
+        payload,
+        mock.ANY,
+        subscribable_object=checkout_with_items,
+        timeout=settings.WEBHOOK_SYNC_TIMEOUT,
+    )
+    assert set(mocked_webhook.call_args.args[2]) == set(webhooks)
 
     expected_cache_key = CACHE_EXCLUDED_SHIPPING_KEY + str(checkout_with_items.token)
 
@@ -429,6 +429,9 @@ def test_stored_payment_method_request_delete_invalidates_cache_for_app(
         list_stored_payment_methods_response,
         timeout=WEBHOOK_CACHE_DEFAULT_TIMEOUT,
     )
+    # fetching the stored payment methods also deletes the request coalescing lock
+    # key from the shared cache, only the deletes of the tested call are checked
+    mocked_cache_delete.reset_mock()
 
     # when
     response = plugin.stored_payment_method_request_delete(
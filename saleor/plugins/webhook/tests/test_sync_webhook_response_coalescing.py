@@ -0,0 +1,262 @@
+import threading
+from unittest import mock
+
+import pytest
+from django.core.cache import cache
+
+from ....webhook.event_types import WebhookEventSyncType
+from ....webhook.transport.synchronous.coalescing import (
+    FRESH_KEY_SUFFIX,
+    LOCK_KEY_SUFFIX,
+    REVALIDATE_KEY_SUFFIX,
+    coalesce_request,
+)
+from ....webhook.transport.synchronous.transport import (
+    trigger_webhook_sync_if_not_cached,
+)
+from ....webhook.transport.utils import generate_cache_key_for_webhook
+
+CACHE_KEY = "test-coalescing-cache-key"
+PAYLOAD = '{"checkout": "data"}'
+CACHE_DATA = {"channel_slug": "main"}
+EVENT_TYPE = WebhookEventSyncType.LIST_STORED_PAYMENT_METHODS
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def _run_in_threads(target, count):
+    results = [None] * count
+
+    def run(index):
+        results[index] = target()
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads, results
+
+
+def test_coalesce_request_sends_single_request_for_concurrent_calls():
+    # given
+    fetch_started = threading.Event()
+    release_fetch = threading.Event()
+    fetch = mock.Mock()
+
+    def slow_fetch():
+        fetch_started.set()
+        release_fetch.wait(5)
+        fetch()
+        return {"response": "data"}
+
+    owner, owner_result = _run_in_threads(
+        lambda: coalesce_request(CACHE_KEY, PAYLOAD, slow_fetch, lambda: None), 1
+    )
+    fetch_started.wait(5)
+
+    # when
+    waiters, waiters_results = _run_in_threads(
+        lambda: coalesce_request(CACHE_KEY, PAYLOAD, slow_fetch, lambda: None), 5
+    )
+    release_fetch.set()
+    for thread in owner + waiters:
+        thread.join(5)
+
+    # then
+    fetch.assert_called_once()
+    assert owner_result == [{"response": "data"}]
+    assert waiters_results == [{"response": "data"}] * 5
+    assert cache.get(CACHE_KEY + LOCK_KEY_SUFFIX) is None
+
+
+def test_coalesce_request_waiters_fetch_when_request_in_flight_fails():
+    # given
+    fetch_started = threading.Event()
+    release_fetch = threading.Event()
+
+    def failing_fetch():
+        fetch_started.set()
+        release_fetch.wait(5)
+        raise ValueError()
+
+    def owner():
+        try:
+            coalesce_request(CACHE_KEY, PAYLOAD, failing_fetch, lambda: None)
+        except ValueError:
+            return "failed"
+
+    owner_threads, owner_result = _run_in_threads(owner, 1)
+    fetch_started.wait(5)
+
+    # when
+    waiters, waiters_results = _run_in_threads(
+        lambda: coalesce_request(CACHE_KEY, PAYLOAD, lambda: "fetched", lambda: None), 2
+    )
+    release_fetch.set()
+    for thread in owner_threads + waiters:
+        thread.join(5)
+
+    # then
+    assert owner_result == ["failed"]
+    assert waiters_results == ["fetched", "fetched"]
+
+
+def test_coalesce_request_does_not_share_response_of_different_payload():
+    # given
+    fetch_started = threading.Event()
+    release_fetch = threading.Event()
+
+    def slow_fetch():
+        fetch_started.set()
+        release_fetch.wait(5)
+        return "first"
+
+    owner, owner_result = _run_in_threads(
+        lambda: coalesce_request(CACHE_KEY, PAYLOAD, slow_fetch, lambda: None), 1
+    )
+    fetch_started.wait(5)
+
+    # when
+    waiters, waiters_results = _run_in_threads(
+        lambda: coalesce_request(
+            CACHE_KEY, '{"checkout": "other"}', lambda: "second", lambda: None
+        ),
+        1,
+    )
+    waiters[0].join(0.5)
+    release_fetch.set()
+    for thread in owner + waiters:
+        thread.join(5)
+
+    # then
+    assert owner_result == ["first"]
+    assert waiters_results == ["second"]
+
+
+def test_coalesce_request_waits_for_response_cached_by_other_process(settings):
+    # given
+    settings.WEBHOOK_SYNC_COALESCING_TIMEOUT = 5
+    cache.add(CACHE_KEY + LOCK_KEY_SUFFIX, True, 5)
+    fetch = mock.Mock()
+    get_cached = mock.Mock(side_effect=[None, {"response": "cached"}])
+
+    # when
+    response = coalesce_request(CACHE_KEY, PAYLOAD, fetch, get_cached)
+
+    # then
+    assert response == {"response": "cached"}
+    assert get_cached.call_count == 2
+    fetch.assert_not_called()
+
+
+def test_coalesce_request_fetches_when_other_process_releases_lock(settings):
+    # given
+    settings.WEBHOOK_SYNC_COALESCING_TIMEOUT = 5
+    cache.add(CACHE_KEY + LOCK_KEY_SUFFIX, True, 5)
+
+    def get_cached():
+        cache.delete(CACHE_KEY + LOCK_KEY_SUFFIX)
+
+    # when
+    response = coalesce_request(CACHE_KEY, PAYLOAD, lambda: "fetched", get_cached)
+
+    # then
+    assert response == "fetched"
+
+
+def _get_cache_key(webhook):
+    return generate_cache_key_for_webhook(
+        CACHE_DATA, webhook.target_url, EVENT_TYPE, webhook.app_id
+    )
+
+
+@mock.patch("saleor.webhook.transport.synchronous.transport.send_webhook_request_sync")
+def test_trigger_webhook_sync_if_not_cached_stores_response_with_grace_period(
+    mock_request, settings, list_stored_payment_methods_app
+):
+    # given
+    settings.WEBHOOK_SYNC_CACHE_STALE_GRACE_PERIOD = 60
+    webhook = list_stored_payment_methods_app.webhooks.first()
+    mock_request.return_value = {"response": "fresh"}
+
+    # when
+    with mock.patch.object(cache, "set", wraps=cache.set) as mocked_cache_set:
+        response = trigger_webhook_sync_if_not_cached(
+            EVENT_TYPE, "{}", webhook, CACHE_DATA, cache_timeout=10
+        )
+
+    # then
+    cache_key = _get_cache_key(webhook)
+    assert response == {"response": "fresh"}
+    mocked_cache_set.assert_has_calls(
+        [
+            mock.call(cache_key, {"response": "fresh"}, timeout=70),
+            mock.call(cache_key + FRESH_KEY_SUFFIX, True, 10),
+        ]
+    )
+
+
+@mock.patch("saleor.webhook.transport.synchronous.transport.send_webhook_request_sync")
+def test_trigger_webhook_sync_if_not_cached_revalidates_stale_response(
+    mock_request, settings, list_stored_payment_methods_app
+):
+    # given
+    settings.WEBHOOK_SYNC_CACHE_STALE_GRACE_PERIOD = 60
+    webhook = list_stored_payment_methods_app.webhooks.first()
+    cache_key = _get_cache_key(webhook)
+    cache.set(cache_key, {"response": "stale"}, 60)
+    mock_request.return_value = {"response": "fresh"}
+
+    # when
+    response = trigger_webhook_sync_if_not_cached(EVENT_TYPE, "{}", webhook, CACHE_DATA)
+
+    # then
+    assert response == {"response": "fresh"}
+    mock_request.assert_called_once()
+    assert cache.get(cache_key) == {"response": "fresh"}
+    assert cache.get(cache_key + FRESH_KEY_SUFFIX)
+    assert cache.get(cache_key + REVALIDATE_KEY_SUFFIX) is None
+
+
+@mock.patch("saleor.webhook.transport.synchronous.transport.send_webhook_request_sync")
+def test_trigger_webhook_sync_if_not_cached_returns_stale_response_during_revalidation(
+    mock_request, settings, list_stored_payment_methods_app
+):
+    # given
+    settings.WEBHOOK_SYNC_CACHE_STALE_GRACE_PERIOD = 60
+    webhook = list_stored_payment_methods_app.webhooks.first()
+    cache_key = _get_cache_key(webhook)
+    cache.set(cache_key, {"response": "stale"}, 60)
+    cache.add(cache_key + REVALIDATE_KEY_SUFFIX, True, 60)
+
+    # when
+    response = trigger_webhook_sync_if_not_cached(EVENT_TYPE, "{}", webhook, CACHE_DATA)
+
+    # then
+    assert response == {"response": "stale"}
+    mock_request.assert_not_called()
+
+
+@mock.patch("saleor.webhook.transport.synchronous.transport.send_webhook_request_sync")
+def test_trigger_webhook_sync_if_not_cached_keeps_stale_response_on_failure(
+    mock_request, settings, list_stored_payment_methods_app
+):
+    # given
+    settings.WEBHOOK_SYNC_CACHE_STALE_GRACE_PERIOD = 60
+    webhook = list_stored_payment_methods_app.webhooks.first()
+    cache_key = _get_cache_key(webhook)
+    cache.set(cache_key, {"response": "stale"}, 60)
+    mock_request.return_value = None
+
+    # when
+    response = trigger_webhook_sync_if_not_cached(EVENT_TYPE, "{}", webhook, CACHE_DATA)
+
+    # then
+    assert response == {"response": "stale"}
+    mock_request.assert_called_once()
+    assert cache.get(cache_key) == {"response": "stale"}
+    assert cache.get(cache_key + REVALIDATE_KEY_SUFFIX) is None
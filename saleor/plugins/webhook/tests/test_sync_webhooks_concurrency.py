@@ -0,0 +1,229 @@
+import json
+import threading
+from unittest import mock
+
+import pytest
+from django.core.cache import cache
+
+from ....core import EventDeliveryStatus
+from ....core.models import EventDelivery, EventDeliveryAttempt, EventPayload
+from ....webhook.event_types import WebhookEventSyncType
+from ....webhook.transport.shipping import to_shipping_app_id
+from ....webhook.transport.synchronous.transport import (
+    send_webhook_requests_sync,
+    trigger_webhooks_sync_if_not_cached,
+)
+from ....webhook.transport.utils import WebhookResponse, generate_cache_key_for_webhook
+
+EVENT_TYPE = WebhookEventSyncType.SHIPPING_LIST_METHODS_FOR_CHECKOUT
+CACHE_DATA = {"checkout": "data"}
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def shipping_webhooks(shipping_app_factory, permission_manage_shipping):
+    webhooks = []
+    for index in range(3):
+        app = shipping_app_factory(app_name=f"Shipping App {index}")
+        app.permissions.add(permission_manage_shipping)
+        webhook = app.webhooks.get()
+        webhook.target_url = f"https://shipping-{index}.com/api/"
+        webhook.save(update_fields=["target_url"])
+        webhook.events.create(event_type=EVENT_TYPE)
+        webhooks.append(webhook)
+    return webhooks
+
+
+def _create_deliveries(webhooks):
+    payload = EventPayload.objects.create(payload="{}")
+    return [
+        EventDelivery.objects.create(
+            status=EventDeliveryStatus.PENDING,
+            event_type=EVENT_TYPE,
+            payload=payload,
+            webhook=webhook,
+        )
+        for webhook in webhooks
+    ]
+
+
+def _respond_concurrently(requests_count):
+    """Respond only when all requests are in flight at the same time."""
+    barrier = threading.Barrier(requests_count, timeout=5)
+
+    def respond(target_url, *args, **kwargs):
+        barrier.wait()
+        return WebhookResponse(content=json.dumps({"target_url": target_url}))
+
+    return respond
+
+
+@mock.patch("saleor.webhook.transport.synchronous.transport.send_webhook_using_http")
+def test_send_webhook_requests_sync_sends_requests_concurrently(
+    mocked_send, shipping_webhooks
+):
+    # given
+    deliveries = _create_deliveries(shipping_webhooks)
+    mocked_send.side_effect = _respond_concurrently(len(deliveries))
+
+    # when
+    responses = send_webhook_requests_sync(deliveries)
+
+    # then
+    assert responses == [
+        {"target_url": webhook.target_url} for webhook in shipping_webhooks
+    ]
+    assert not EventDelivery.objects.exists()
+    assert mocked_send.call_count == len(shipping_webhooks)
+
+
+@mock.patch("saleor.webhook.transport.synchronous.transport.send_webhook_using_http")
+def test_send_webhook_requests_sync_fails_requests_exceeding_deadline(
+    mocked_send, shipping_webhooks, settings
+):
+    # given
+    settings.WEBHOOK_SYNC_DEADLINE = 0.1
+    slow_webhook = shipping_webhooks[1]
+    deliveries = _create_deliveries(shipping_webhooks)
+    release_request = threading.Event()
+
+    def respond(target_url, *args, **kwargs):
+        if target_url == slow_webhook.target_url:
+            release_request.wait(5)
+        return WebhookResponse(content="{}")
+
+    mocked_send.side_effect = respond
+
+    # when
+    try:
+        responses = send_webhook_requests_sync(deliveries)
+    finally:
+        release_request.set()
+
+    # then
+    assert responses == [{}, None, {}]
+    delivery = EventDelivery.objects.get()
+    assert delivery.webhook == slow_webhook
+    assert delivery.status == EventDeliveryStatus.FAILED
+    attempt = EventDeliveryAttempt.objects.get(delivery=delivery)
+    assert attempt.status == EventDeliveryStatus.FAILED
+    assert attempt.response == "Webhook request exceeded the deadline."
+
+
+@mock.patch("saleor.webhook.transport.synchronous.transport.send_webhook_using_http")
+def test_send_webhook_requests_sync_limits_request_timeout_to_deadline(
+    mocked_send, shipping_webhooks, settings
+):
+    # given
+    settings.WEBHOOK_SYNC_DEADLINE = 5
+    deliveries = _create_deliveries(shipping_webhooks)
+    mocked_send.return_value = WebhookResponse(content="{}")
+
+    # when
+    send_webhook_requests_sync(deliveries, timeout=(2, 18))
+
+    # then
+    assert {call.kwargs["timeout"] for call in mocked_send.call_args_list} == {(2, 5)}
+
+
+@mock.patch("saleor.webhook.transport.synchronous.transport.send_webhook_using_http")
+def test_send_webhook_requests_sync_reuses_thread_pool(mocked_send, shipping_webhooks):
+    # given
+    mocked_send.return_value = WebhookResponse(content="{}")
+    send_webhook_requests_sync(_create_deliveries(shipping_webhooks))
+    threads_count = threading.active_count()
+
+    # when
+    send_webhook_requests_sync(_create_deliveries(shipping_webhooks))
+
+    # then
+    assert threading.active_count() == threads_count
+
+
+@mock.patch("saleor.webhook.transport.synchronous.transport.send_webhook_request_sync")
+def test_send_webhook_requests_sync_sequentially_with_single_worker(
+    mocked_send, shipping_webhooks, settings
+):
+    # given
+    settings.WEBHOOK_SYNC_MAX_WORKERS = 1
+    deliveries = _create_deliveries(shipping_webhooks)
+    mocked_send.return_value = {}
+
+    # when
+    responses = send_webhook_requests_sync(deliveries)
+
+    # then
+    assert responses == [{}, {}, {}]
+    assert [call.args[0] for call in mocked_send.call_args_list] == deliveries
+
+
+@mock.patch("saleor.webhook.transport.synchronous.transport.send_webhook_using_http")
+def test_trigger_webhooks_sync_if_not_cached_sends_only_missing_requests(
+    mocked_send, shipping_webhooks
+):
+    # given
+    cached_webhook = shipping_webhooks[0]
+    cache_keys = [
+        generate_cache_key_for_webhook(
+            CACHE_DATA, webhook.target_url, EVENT_TYPE, webhook.app_id
+        )
+        for webhook in shipping_webhooks
+    ]
+    cache.set(cache_keys[0], {"target_url": "cached"})
+    mocked_send.side_effect = _respond_concurrently(len(shipping_webhooks) - 1)
+
+    # when
+    responses = trigger_webhooks_sync_if_not_cached(
+        EVENT_TYPE, "{}", shipping_webhooks, CACHE_DATA
+    )
+
+    # then
+    assert responses == [{"target_url": "cached"}] + [
+        {"target_url": webhook.target_url} for webhook in shipping_webhooks[1:]
+    ]
+    assert cached_webhook.target_url not in [
+        call.args[0] for call in mocked_send.call_args_list
+    ]
+    assert [cache.get(cache_key) for cache_key in cache_keys] == responses
+
+
+@mock.patch("saleor.webhook.transport.synchronous.transport.send_webhook_using_http")
+def test_get_shipping_methods_for_checkout_from_multiple_apps(
+    mocked_send, webhook_plugin, checkout_with_item, shipping_webhooks
+):
+    # given
+    barrier = threading.Barrier(len(shipping_webhooks), timeout=5)
+
+    def respond(target_url, *args, **kwargs):
+        barrier.wait()
+        return WebhookResponse(
+            content=json.dumps(
+                [
+                    {
+                        "id": target_url,
+                        "name": target_url,
+                        "amount": 10,
+                        "currency": "USD",
+                        "maximum_delivery_days": 7,
+                    }
+                ]
+            )
+        )
+
+    mocked_send.side_effect = respond
+    plugin = webhook_plugin()
+
+    # when
+    methods = plugin.get_shipping_methods_for_checkout(checkout_with_item, None)
+
+    # then
+    assert sorted((method.id, method.name) for method in methods) == sorted(
+        (to_shipping_app_id(webhook.app, webhook.target_url), webhook.target_url)
+        for webhook in shipping_webhooks
+    )
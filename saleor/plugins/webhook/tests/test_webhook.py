@@ -610,6 +610,29 @@ def test_product_created(
     )
 
 
+@mock.patch("saleor.plugins.webhook.plugin.get_webhooks_for_event")
+@mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_async_for_multiple_objects")
+def test_product_created_bulk(
+    mocked_webhook_trigger,
+    mocked_get_webhooks_for_event,
+    any_webhook,
+    settings,
+    product_list,
+):
+    mocked_get_webhooks_for_event.return_value = [any_webhook]
+    settings.PLUGINS = ["saleor.plugins.webhook.plugin.WebhookPlugin"]
+    manager = get_plugins_manager()
+    manager.product_created_bulk(product_list)
+
+    mocked_webhook_trigger.assert_called_once_with(
+        WebhookEventAsyncType.PRODUCT_CREATED, [any_webhook], ANY, None
+    )
+    payloads_data = mocked_webhook_trigger.call_args.args[2]
+    assert [data.subscribable_object for data in payloads_data] == product_list
+    for data in payloads_data:
+        assert isinstance(data.legacy_data_generator, partial)
+
+
 @freeze_time("1914-06-28 10:50")
 @mock.patch("saleor.plugins.webhook.plugin.get_webhooks_for_event")
 @mock.patch("saleor.plugins.webhook.plugin.trigger_webhooks_async")
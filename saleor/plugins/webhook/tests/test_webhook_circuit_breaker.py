@@ -0,0 +1,297 @@
+from unittest import mock
+
+import pytest
+from django.core.cache import cache
+from freezegun import freeze_time
+
+from ....core import EventDeliveryStatus
+from ....core.models import EventDeliveryAttempt
+from ....webhook.transport.asynchronous.circuit_breaker import (
+    CircuitBreakerState,
+    get_circuit_breaker_delay,
+    get_circuit_breaker_status,
+    record_delivery_attempt,
+)
+from ....webhook.transport.asynchronous.rate_limit import get_rate_limit_delay
+from ....webhook.transport.asynchronous.transport import (
+    send_webhook_request_async,
+    send_webhook_requests_async,
+)
+
+TARGET_URL = "https://www.example.com/webhook"
+
+
+@pytest.fixture(autouse=True)
+def circuit_breaker(settings):
+    settings.WEBHOOK_CIRCUIT_BREAKER_FAILURE_THRESHOLD = 3
+    settings.WEBHOOK_CIRCUIT_BREAKER_FAILURE_WINDOW = 60
+    settings.WEBHOOK_CIRCUIT_BREAKER_OPEN_PERIOD = 30
+    settings.WEBHOOK_CIRCUIT_BREAKER_MAX_OPEN_PERIOD = 100
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def _record_failures(count, target_url=TARGET_URL):
+    for _ in range(count):
+        record_delivery_attempt(target_url, EventDeliveryStatus.FAILED)
+
+
+@freeze_time("2023-01-01 12:00:00")
+def test_circuit_breaker_opens_after_failure_threshold():
+    # given
+    _record_failures(2)
+    assert get_circuit_breaker_status(TARGET_URL).failure_count == 2
+    assert get_circuit_breaker_delay(TARGET_URL) == 0
+
+    # when
+    _record_failures(1)
+
+    # then
+    status = get_circuit_breaker_status(TARGET_URL)
+    assert status.state == CircuitBreakerState.OPEN
+    assert status.open_until.isoformat() == "2023-01-01T12:00:30+00:00"
+    assert get_circuit_breaker_delay(TARGET_URL) == 30
+
+
+def test_circuit_breaker_success_resets_failures():
+    # given
+    _record_failures(2)
+
+    # when
+    record_delivery_attempt(TARGET_URL, EventDeliveryStatus.SUCCESS)
+    _record_failures(2)
+
+    # then
+    status = get_circuit_breaker_status(TARGET_URL)
+    assert status.state == CircuitBreakerState.CLOSED
+    assert status.failure_count == 2
+
+
+def test_circuit_breaker_half_open_sends_single_probe():
+    # given
+    with freeze_time("2023-01-01 12:00:00"):
+        _record_failures(3)
+
+    with freeze_time("2023-01-01 12:00:31"):
+        # when
+        probe_delay = get_circuit_breaker_delay(TARGET_URL)
+        other_delay = get_circuit_breaker_delay(TARGET_URL)
+
+        # then
+        status = get_circuit_breaker_status(TARGET_URL)
+    assert status.state == CircuitBreakerState.HALF_OPEN
+    assert probe_delay == 0
+    assert other_delay == 30
+
+
+def test_circuit_breaker_probe_success_closes_breaker():
+    # given
+    with freeze_time("2023-01-01 12:00:00"):
+        _record_failures(3)
+
+    with freeze_time("2023-01-01 12:00:31"):
+        get_circuit_breaker_delay(TARGET_URL)
+
+        # when
+        record_delivery_attempt(TARGET_URL, EventDeliveryStatus.SUCCESS)
+
+        # then
+        status = get_circuit_breaker_status(TARGET_URL)
+        assert get_circuit_breaker_delay(TARGET_URL) == 0
+    assert status.state == CircuitBreakerState.CLOSED
+    assert status.failure_count == 0
+
+
+def test_circuit_breaker_probe_failure_doubles_open_period():
+    # given
+    with freeze_time("2023-01-01 12:00:00"):
+        _record_failures(3)
+
+    with freeze_time("2023-01-01 12:00:31"):
+        get_circuit_breaker_delay(TARGET_URL)
+
+        # when
+        _record_failures(1)
+
+        # then
+        status = get_circuit_breaker_status(TARGET_URL)
+        delay = get_circuit_breaker_delay(TARGET_URL)
+    assert status.state == CircuitBreakerState.OPEN
+    assert delay == 60
+
+
+def test_circuit_breaker_ignores_failures_when_open():
+    # given
+    with freeze_time("2023-01-01 12:00:00"):
+        _record_failures(3)
+
+    with freeze_time("2023-01-01 12:00:10"):
+        # when
+        _record_failures(3)
+
+        # then
+        delay = get_circuit_breaker_delay(TARGET_URL)
+    assert delay == 20
+
+
+def test_circuit_breaker_disabled(settings):
+    # given
+    settings.WEBHOOK_CIRCUIT_BREAKER_FAILURE_THRESHOLD = 0
+
+    # when
+    _record_failures(10)
+
+    # then
+    assert get_circuit_breaker_delay(TARGET_URL) == 0
+    assert get_circuit_breaker_status(TARGET_URL).state == CircuitBreakerState.CLOSED
+
+
+@freeze_time("2023-01-01 12:00:00")
+def test_get_rate_limit_delay(settings):
+    # given
+    settings.WEBHOOK_APP_RATE_LIMIT = 2
+    settings.WEBHOOK_APP_RATE_LIMIT_BURST = 3
+
+    # when
+    delays = [get_rate_limit_delay(1, delivery_id) for delivery_id in range(5)]
+
+    # then
+    assert delays == [0, 0, 0, 0.5, 1]
+    assert get_rate_limit_delay(2, 5) == 0
+
+
+def test_get_rate_limit_delay_refills_tokens(settings):
+    # given
+    settings.WEBHOOK_APP_RATE_LIMIT = 2
+    settings.WEBHOOK_APP_RATE_LIMIT_BURST = 1
+    with freeze_time("2023-01-01 12:00:00"):
+        assert get_rate_limit_delay(1, 1) == 0
+
+    # when
+    with freeze_time("2023-01-01 12:00:00.5"):
+        delay = get_rate_limit_delay(1, 2)
+
+    # then
+    assert delay == 0
+
+
+def test_get_rate_limit_delay_deferred_delivery_uses_reserved_slot(settings):
+    # given
+    settings.WEBHOOK_APP_RATE_LIMIT = 2
+    settings.WEBHOOK_APP_RATE_LIMIT_BURST = 1
+    with freeze_time("2023-01-01 12:00:00"):
+        assert get_rate_limit_delay(1, 1) == 0
+        assert get_rate_limit_delay(1, 2) == 0.5
+
+    # when
+    with freeze_time("2023-01-01 12:00:00.5"):
+        reserved_delay = get_rate_limit_delay(1, 2)
+        other_delay = get_rate_limit_delay(1, 3)
+
+    # then
+    assert reserved_delay == 0
+    assert other_delay == 0.5
+
+
+def test_get_rate_limit_delay_disabled(settings):
+    # given
+    settings.WEBHOOK_APP_RATE_LIMIT = 0
+
+    # when
+    delays = [get_rate_limit_delay(1, delivery_id) for delivery_id in range(100)]
+
+    # then
+    assert not any(delays)
+
+
+@mock.patch(
+    "saleor.webhook.transport.asynchronous.transport.send_webhook_using_scheme_method"
+)
+def test_send_webhook_request_async_records_attempt_outcome(
+    mocked_send_response, event_delivery, webhook_response
+):
+    # given
+    target_url = event_delivery.webhook.target_url
+    _record_failures(2, target_url)
+    mocked_send_response.return_value = webhook_response
+
+    # when
+    send_webhook_request_async(event_delivery.pk)
+
+    # then
+    assert get_circuit_breaker_status(target_url).failure_count == 0
+
+
+@mock.patch(
+    "saleor.webhook.transport.asynchronous.transport.send_webhook_request_async."
+    "signature_from_request"
+)
+@mock.patch(
+    "saleor.webhook.transport.asynchronous.transport.send_webhook_using_scheme_method"
+)
+@freeze_time("2023-01-01 12:00:00")
+def test_send_webhook_request_async_deferred_when_circuit_breaker_open(
+    mocked_send_response, mocked_signature, event_delivery
+):
+    # given
+    _record_failures(3, event_delivery.webhook.target_url)
+
+    # when
+    send_webhook_request_async(event_delivery.pk)
+
+    # then
+    mocked_send_response.assert_not_called()
+    assert not EventDeliveryAttempt.objects.filter(delivery=event_delivery).exists()
+    event_delivery.refresh_from_db()
+    assert event_delivery.status == EventDeliveryStatus.PENDING
+    mocked_signature.assert_called_once_with(countdown=30)
+    mocked_signature.return_value.apply_async.assert_called_once_with()
+
+
+@mock.patch(
+    "saleor.webhook.transport.asynchronous.transport.send_webhook_request_async."
+    "signature_from_request"
+)
+@mock.patch("saleor.webhook.transport.asynchronous.transport.clear_successful_delivery")
+@mock.patch(
+    "saleor.webhook.transport.asynchronous.transport.send_webhook_using_scheme_method"
+)
+def test_send_webhook_request_async_deferred_when_rate_limited(
+    mocked_send_response,
+    mocked_clear_delivery,
+    mocked_signature,
+    event_delivery,
+    webhook_response,
+    settings,
+):
+    # given
+    settings.WEBHOOK_APP_RATE_LIMIT = 1
+    settings.WEBHOOK_APP_RATE_LIMIT_BURST = 1
+    mocked_send_response.return_value = webhook_response
+
+    # when
+    with freeze_time("2023-01-01 12:00:00"):
+        send_webhook_request_async(event_delivery.pk)
+        send_webhook_request_async(event_delivery.pk)
+
+    # then
+    mocked_send_response.assert_called_once()
+    mocked_signature.assert_called_once_with(countdown=1)
+
+
+@mock.patch("saleor.webhook.transport.asynchronous.transport.group")
+@freeze_time("2023-01-01 12:00:00")
+def test_send_webhook_requests_async_schedules_deliveries_to_open_targets(
+    mocked_group, event_delivery
+):
+    # given
+    _record_failures(3, event_delivery.webhook.target_url)
+
+    # when
+    send_webhook_requests_async([event_delivery])
+
+    # then
+    (signature,) = mocked_group.call_args.args[0]
+    assert signature.args == (event_delivery.pk,)
+    assert signature.options["countdown"] == 30
@@ -0,0 +1,17 @@
+# Generated by Django 3.2.22 on 2026-10-19 09:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("product", "0192_alter_producttype_kind"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="productvariant",
+            name="stock_shards_count",
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+    ]
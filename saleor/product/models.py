@@ -131,8 +131,11 @@ class ProductType(ModelWithMetadata):
     is_shipping_required = models.BooleanField(default=True)
     is_digital = models.BooleanField(default=False)
     supplier = models.ForeignKey(
-        'account.Supplier', related_name="product_types", null=True, blank=True,
-        on_delete=models.CASCADE
+        "account.Supplier",
+        related_name="product_types",
+        null=True,
+        blank=True,
+        on_delete=models.CASCADE,
     )
     weight = MeasurementField(
         measurement=Weight,
@@ -199,7 +202,7 @@ class Product(SeoModel, ModelWithMetadata, ModelWithExternalReference):
         blank=True,
     )
     supplier = models.ForeignKey(
-        'account.Supplier',
+        "account.Supplier",
         related_name="product",
         on_delete=models.SET_NULL,
         blank=True,
@@ -375,6 +378,9 @@ class ProductVariant(SortableModel, ModelWithMetadata, ModelWithExternalReferenc
     quantity_limit_per_customer = models.IntegerField(
         blank=True, null=True, validators=[MinValueValidator(1)]
     )
+    # Number of shards each stock of the variant is split into; allocations and
+    # reservations claim units from a shard instead of locking the stock row.
+    stock_shards_count = models.PositiveSmallIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True, db_index=True)
     updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
@@ -111,6 +111,30 @@ DATABASES = {
     ),
 }
 
+# Additional read replicas, comma-separated database URLs. Reads are balanced between
+# all the replicas.
+DB_REPLICAS = os.environ.get("DB_REPLICAS")
+DATABASE_CONNECTION_REPLICA_NAMES = [DATABASE_CONNECTION_REPLICA_NAME]
+for index, replica_url in enumerate(get_list(DB_REPLICAS) if DB_REPLICAS else [], 1):
+    replica_name = f"{DATABASE_CONNECTION_REPLICA_NAME}_{index}"
+    DATABASES[replica_name] = dj_database_url.parse(
+        replica_url, conn_max_age=DB_CONN_MAX_AGE
+    )
+    DATABASE_CONNECTION_REPLICA_NAMES.append(replica_name)
+
+# Skip replicas lagging more than DATABASE_REPLICA_MAX_LAG and read from the primary
+# database until a replica replays the last write of the requestor. The lag is checked
+# once per DATABASE_REPLICA_LAG_CHECK_INTERVAL.
+DATABASE_REPLICA_LAG_AWARE_ROUTING = get_bool_from_env(
+    "DATABASE_REPLICA_LAG_AWARE_ROUTING", False
+)
+DATABASE_REPLICA_MAX_LAG = parse(
+    os.environ.get("DATABASE_REPLICA_MAX_LAG", "10 seconds")
+)
+DATABASE_REPLICA_LAG_CHECK_INTERVAL = parse(
+    os.environ.get("DATABASE_REPLICA_LAG_CHECK_INTERVAL", "1 second")
+)
+
 DATABASE_ROUTERS = ["saleor.core.db_routers.PrimaryReplicaRouter"]
 
 DEFAULT_AUTO_FIELD = "django.db.models.AutoField"
@@ -452,6 +476,16 @@ ALLOWED_GRAPHQL_ORIGINS: List[str] = get_list(
     os.environ.get("ALLOWED_GRAPHQL_ORIGINS", "*")
 )
 
+# Compression of ASGI responses. Higher levels give smaller responses at a higher CPU
+# cost. Brotli is used for clients accepting it when BROTLI_COMPRESSION_QUALITY is set
+# (0-11) and the `brotli` package is installed.
+GZIP_COMPRESSION_LEVEL = int(os.environ.get("GZIP_COMPRESSION_LEVEL", 6))
+BROTLI_COMPRESSION_QUALITY: Optional[int] = (
+    int(os.environ["BROTLI_COMPRESSION_QUALITY"])
+    if os.environ.get("BROTLI_COMPRESSION_QUALITY")
+    else None
+)
+
 SECURE_PROXY_SSL_HEADER = ("HTTP_X_FORWARDED_PROTO", "https")
 
 # Amazon S3 configuration
@@ -571,6 +605,28 @@ BEAT_UPDATE_SEARCH_SEC = parse(
 )
 BEAT_UPDATE_SEARCH_EXPIRE_AFTER_SEC = BEAT_UPDATE_SEARCH_SEC
 
+# Defines how often the pending changes of the variants availability are applied,
+# and after how many seconds the task expires if it wasn't picked up by a worker.
+BEAT_UPDATE_VARIANTS_AVAILABILITY_SEC = parse(
+    os.environ.get("BEAT_UPDATE_VARIANTS_AVAILABILITY_FREQUENCY", "20 seconds")
+)
+BEAT_UPDATE_VARIANTS_AVAILABILITY_EXPIRE_AFTER_SEC = (
+    BEAT_UPDATE_VARIANTS_AVAILABILITY_SEC
+)
+
+# Defines how often the expired stock and preorder reservations are deleted,
+# and after how many seconds the task expires if it wasn't picked up by a worker.
+BEAT_DELETE_EXPIRED_RESERVATIONS_SEC = parse(
+    os.environ.get("BEAT_DELETE_EXPIRED_RESERVATIONS_FREQUENCY", "1 minute")
+)
+BEAT_DELETE_EXPIRED_RESERVATIONS_EXPIRE_AFTER_SEC = BEAT_DELETE_EXPIRED_RESERVATIONS_SEC
+
+# Defines how often released stock quantity is returned to the stock shards
+# of variants with sharded stocks.
+BEAT_REBALANCE_STOCK_SHARDS_SEC = parse(
+    os.environ.get("BEAT_REBALANCE_STOCK_SHARDS_FREQUENCY", "1 minute")
+)
+
 # Defines the Celery beat scheduler entries.
 #
 # Note: if a Celery task triggered by a Celery beat entry has an expiration
@@ -588,7 +644,8 @@ CELERY_BEAT_SCHEDULE = {
     },
     "delete-expired-reservations": {
         "task": "saleor.warehouse.tasks.delete_expired_reservations_task",
-        "schedule": timedelta(days=1),
+        "schedule": timedelta(seconds=BEAT_DELETE_EXPIRED_RESERVATIONS_SEC),
+        "options": {"expires": BEAT_DELETE_EXPIRED_RESERVATIONS_EXPIRE_AFTER_SEC},
     },
     "delete-expired-checkouts": {
         "task": "saleor.checkout.tasks.delete_expired_checkouts",
@@ -602,6 +659,10 @@ CELERY_BEAT_SCHEDULE = {
         "task": "saleor.core.tasks.delete_event_payloads_task",
         "schedule": timedelta(days=1),
     },
+    "delete-unused-event-payload-files": {
+        "task": "saleor.core.tasks.delete_unused_event_payload_files_task",
+        "schedule": timedelta(days=1),
+    },
     "deactivate-expired-gift-cards": {
         "task": "saleor.giftcard.tasks.deactivate_expired_cards_task",
         "schedule": crontab(hour=0, minute=0),
@@ -610,6 +671,16 @@ CELERY_BEAT_SCHEDULE = {
         "task": "saleor.warehouse.tasks.update_stocks_quantity_allocated_task",
         "schedule": crontab(hour=0, minute=0),
     },
+    "rebalance-stock-shards": {
+        "task": "saleor.warehouse.tasks.rebalance_stock_shards_task",
+        "schedule": timedelta(seconds=BEAT_REBALANCE_STOCK_SHARDS_SEC),
+        "options": {"expires": BEAT_REBALANCE_STOCK_SHARDS_SEC},
+    },
+    "update-variants-availability": {
+        "task": "saleor.warehouse.tasks.update_variants_availability_task",
+        "schedule": timedelta(seconds=BEAT_UPDATE_VARIANTS_AVAILABILITY_SEC),
+        "options": {"expires": BEAT_UPDATE_VARIANTS_AVAILABILITY_EXPIRE_AFTER_SEC},
+    },
     "delete-old-export-files": {
         "task": "saleor.csv.tasks.delete_old_export_files",
         "schedule": crontab(hour=1, minute=0),
@@ -643,6 +714,31 @@ EVENT_PAYLOAD_DELETE_PERIOD = timedelta(
     seconds=parse(os.environ.get("EVENT_PAYLOAD_DELETE_PERIOD", "14 days"))
 )
 
+# Failed event deliveries are replayed in batches of the given size, sent one batch
+# per interval, so that a recovering app isn't flooded with requests.
+EVENT_DELIVERY_REPLAY_BATCH_SIZE = int(
+    os.environ.get("EVENT_DELIVERY_REPLAY_BATCH_SIZE", 100)
+)
+EVENT_DELIVERY_REPLAY_BATCH_INTERVAL = parse(
+    os.environ.get("EVENT_DELIVERY_REPLAY_BATCH_INTERVAL", "10 seconds")
+)
+
+# Event payloads larger than the threshold (in characters) are compressed and kept in
+# the payload storage instead of the database. Set to 0 to keep all payloads in the
+# database.
+EVENT_PAYLOAD_STORAGE = os.environ.get(
+    "EVENT_PAYLOAD_STORAGE", "saleor.core.payload_storage.PayloadStorage"
+)
+EVENT_PAYLOAD_STORAGE_THRESHOLD = int(
+    os.environ.get("EVENT_PAYLOAD_STORAGE_THRESHOLD", 64 * 1000)
+)
+EVENT_PAYLOAD_COMPRESS_LEVEL = int(os.environ.get("EVENT_PAYLOAD_COMPRESS_LEVEL", 6))
+# Unused payload files are kept for the period since their last modification, as
+# a payload reusing the file may not be committed yet.
+EVENT_PAYLOAD_FILE_GRACE_PERIOD = timedelta(
+    seconds=parse(os.environ.get("EVENT_PAYLOAD_FILE_GRACE_PERIOD", "1 hour"))
+)
+
 # Observability settings
 OBSERVABILITY_BROKER_URL = os.environ.get("OBSERVABILITY_BROKER_URL")
 OBSERVABILITY_ACTIVE = bool(OBSERVABILITY_BROKER_URL)
@@ -658,9 +754,30 @@ OBSERVABILITY_BUFFER_SIZE_LIMIT = int(
 OBSERVABILITY_BUFFER_BATCH_SIZE = int(
     os.environ.get("OBSERVABILITY_BUFFER_BATCH_SIZE", 100)
 )
+# Events are collected in a per-process buffer and written to the broker in batches
+# by a background thread. Set OBSERVABILITY_LOCAL_BUFFER_SIZE to 0 to write each
+# event to the broker right away.
+OBSERVABILITY_LOCAL_BUFFER_SIZE = int(
+    os.environ.get("OBSERVABILITY_LOCAL_BUFFER_SIZE", 1000)
+)
+OBSERVABILITY_LOCAL_BUFFER_FLUSH_PERIOD = timedelta(
+    seconds=parse(
+        os.environ.get("OBSERVABILITY_LOCAL_BUFFER_FLUSH_PERIOD", "1 second")
+    )
+)
 OBSERVABILITY_REPORT_PERIOD = timedelta(
     seconds=parse(os.environ.get("OBSERVABILITY_REPORT_PERIOD", "20 seconds"))
 )
+# Events are sent to the observability webhooks concurrently, each webhook gets
+# OBSERVABILITY_WEBHOOK_TIMEOUT to deliver them, the events not sent by then are
+# dropped.
+OBSERVABILITY_MAX_WORKERS = int(os.environ.get("OBSERVABILITY_MAX_WORKERS", 8))
+OBSERVABILITY_WEBHOOK_BATCH_SIZE = int(
+    os.environ.get("OBSERVABILITY_WEBHOOK_BATCH_SIZE", 100)
+)
+OBSERVABILITY_WEBHOOK_TIMEOUT = timedelta(
+    seconds=parse(os.environ.get("OBSERVABILITY_WEBHOOK_TIMEOUT", "10 seconds"))
+)
 OBSERVABILITY_BUFFER_TIMEOUT = timedelta(
     seconds=parse(os.environ.get("OBSERVABILITY_BUFFER_TIMEOUT", "5 minutes"))
 )
@@ -716,6 +833,30 @@ GRAPHQL_QUERY_MAX_COMPLEXITY = int(
     os.environ.get("GRAPHQL_QUERY_MAX_COMPLEXITY", 50000)
 )
 
+# Query cost budget of a single app, user or IP address, refilled within the budget
+# period. Queries exceeding the remaining budget are rejected. Apps can have their own
+# budget set in `App.query_cost_budget`. Set GRAPHQL_QUERY_COST_BUDGET=0 to disable.
+GRAPHQL_QUERY_COST_BUDGET = int(os.environ.get("GRAPHQL_QUERY_COST_BUDGET", 0))
+GRAPHQL_QUERY_COST_BUDGET_PERIOD = parse(
+    os.environ.get("GRAPHQL_QUERY_COST_BUDGET_PERIOD", "1 minute")
+)
+
+# Dotted path of the function encoding GraphQL responses to JSON bytes.
+GRAPHQL_RESPONSE_ENCODER = os.environ.get(
+    "GRAPHQL_RESPONSE_ENCODER", "saleor.graphql.core.json_encoder.encode_json"
+)
+
+# Serve the GraphQL API with an async view, which executes the operations in a pool of
+# GRAPHQL_ASYNC_THREAD_POOL_SIZE threads. Meant for ASGI servers.
+GRAPHQL_ASYNC_VIEW = get_bool_from_env("GRAPHQL_ASYNC_VIEW", False)
+GRAPHQL_ASYNC_THREAD_POOL_SIZE = int(
+    os.environ.get("GRAPHQL_ASYNC_THREAD_POOL_SIZE", 10)
+)
+
+# Share the context and the dataloaders between the operations of a batched request.
+# Dataloaders are reset around every mutation, so later operations see its changes.
+GRAPHQL_BATCH_SHARED_CONTEXT = get_bool_from_env("GRAPHQL_BATCH_SHARED_CONTEXT", False)
+
 # Max number entities that can be requested in single query by Apollo Federation
 # Federation protocol implements no securities on its own part - malicious actor
 # may build a query that requests for potentially few thousands of entities.
@@ -764,6 +905,45 @@ COMMON_REQUESTS_TIMEOUT = (REQUESTS_CONN_EST_TIMEOUT, 18)
 WEBHOOK_TIMEOUT = 10
 WEBHOOK_SYNC_TIMEOUT = COMMON_REQUESTS_TIMEOUT
 
+# Independent sync webhooks (eg. shipping methods of several apps) are sent
+# concurrently by a pool of `WEBHOOK_SYNC_MAX_WORKERS` threads per process. Requests
+# not finished within `WEBHOOK_SYNC_DEADLINE` are marked as failed.
+WEBHOOK_SYNC_MAX_WORKERS = int(os.environ.get("WEBHOOK_SYNC_MAX_WORKERS", 8))
+WEBHOOK_SYNC_DEADLINE = parse(os.environ.get("WEBHOOK_SYNC_DEADLINE", "20 seconds"))
+
+# Time (sec) for which concurrent sync webhook calls sharing a response cache key
+# wait for the single request in flight before sending their own.
+WEBHOOK_SYNC_COALESCING_TIMEOUT = sum(WEBHOOK_SYNC_TIMEOUT)
+
+# Time (sec) for which expired sync webhook responses stay in the cache and are
+# returned while a single request revalidates them. `0` disables it.
+WEBHOOK_SYNC_CACHE_STALE_GRACE_PERIOD = parse(
+    os.environ.get("WEBHOOK_SYNC_CACHE_STALE_GRACE_PERIOD", "0 seconds")
+)
+
+# Async webhook deliveries to a target URL are deferred for
+# `WEBHOOK_CIRCUIT_BREAKER_OPEN_PERIOD` seconds after it failed
+# `WEBHOOK_CIRCUIT_BREAKER_FAILURE_THRESHOLD` times within the failure window. The
+# period doubles, up to the max, each time a probe delivery fails again.
+# `WEBHOOK_CIRCUIT_BREAKER_FAILURE_THRESHOLD=0` disables the circuit breaker.
+WEBHOOK_CIRCUIT_BREAKER_FAILURE_THRESHOLD = int(
+    os.environ.get("WEBHOOK_CIRCUIT_BREAKER_FAILURE_THRESHOLD", 10)
+)
+WEBHOOK_CIRCUIT_BREAKER_FAILURE_WINDOW = parse(
+    os.environ.get("WEBHOOK_CIRCUIT_BREAKER_FAILURE_WINDOW", "1 minute")
+)
+WEBHOOK_CIRCUIT_BREAKER_OPEN_PERIOD = parse(
+    os.environ.get("WEBHOOK_CIRCUIT_BREAKER_OPEN_PERIOD", "30 seconds")
+)
+WEBHOOK_CIRCUIT_BREAKER_MAX_OPEN_PERIOD = parse(
+    os.environ.get("WEBHOOK_CIRCUIT_BREAKER_MAX_OPEN_PERIOD", "10 minutes")
+)
+
+# Max number of async webhook deliveries per second sent to a single app, with
+# bursts of up to `WEBHOOK_APP_RATE_LIMIT_BURST` deliveries. `0` disables the limit.
+WEBHOOK_APP_RATE_LIMIT = float(os.environ.get("WEBHOOK_APP_RATE_LIMIT", 0))
+WEBHOOK_APP_RATE_LIMIT_BURST = int(os.environ.get("WEBHOOK_APP_RATE_LIMIT_BURST", 10))
+
 # When `True`, HTTP requests made from arbitrary URLs will be rejected (e.g., webhooks).
 # if they try to access private IP address ranges, and loopback ranges (unless
 # `HTTP_IP_FILTER_ALLOW_LOOPBACK_IPS=False`).
@@ -775,6 +955,18 @@ HTTP_IP_FILTER_ALLOW_LOOPBACK_IPS: bool = get_bool_from_env(
     "HTTP_IP_FILTER_ALLOW_LOOPBACK_IPS", False
 )
 
+# HTTP sessions, with their keep-alive connections, are kept per target host for
+# webhook requests. `HTTP_SESSION_POOL_MAX_HOSTS=0` disables the pool. The idle
+# timeout should stay below the keep-alive timeout of the apps (5 seconds in Node.js)
+# to not reuse connections closed by them.
+HTTP_SESSION_POOL_MAX_HOSTS = int(os.environ.get("HTTP_SESSION_POOL_MAX_HOSTS", 100))
+HTTP_SESSION_POOL_MAX_CONNECTIONS_PER_HOST = int(
+    os.environ.get("HTTP_SESSION_POOL_MAX_CONNECTIONS_PER_HOST", 10)
+)
+HTTP_SESSION_POOL_IDLE_TIMEOUT = parse(
+    os.environ.get("HTTP_SESSION_POOL_IDLE_TIMEOUT", "4 seconds")
+)
+
 # Since we split checkout complete logic into two separate transactions, in order to
 # mimic stock lock, we apply short reservation for the stocks. The value represents
 # time of the reservation in seconds.
@@ -85,6 +85,12 @@ FdkAmFzQhgLtnEtnb+eBI7DNOJEuPLD52Jwnq2pGnJ/LxlqjjWJ5FsQQVSoDHGfM
 -----END RSA PRIVATE KEY-----"""
 
 DATABASE_CONNECTION_REPLICA_NAME = DATABASE_CONNECTION_DEFAULT_NAME  # noqa: F405
+DATABASE_CONNECTION_REPLICA_NAMES = [DATABASE_CONNECTION_REPLICA_NAME]
+
+EVENT_PAYLOAD_STORAGE = "saleor.core.payload_storage.FileSystemPayloadStorage"
 
 HTTP_IP_FILTER_ENABLED = False
 HTTP_IP_FILTER_ALLOW_LOOPBACK_IPS = True
+
+# The breaker state is kept in the cache, which isn't cleared between tests.
+WEBHOOK_CIRCUIT_BREAKER_FAILURE_THRESHOLD = 0
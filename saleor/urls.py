@@ -5,8 +5,7 @@ from django.urls import include, re_path
 from django.views.decorators.csrf import csrf_exempt
 
 from .core.views import jwks
-from .graphql.api import schema
-from .graphql.views import GraphQLView
+from .graphql.views import AsyncGraphQLView, GraphQLView, schema_sdl
 from .plugins.views import (
     handle_global_plugin_webhook,
     handle_plugin_per_channel_webhook,
@@ -15,8 +14,14 @@ from .plugins.views import (
 from .product.views import digital_product
 from .thumbnail.views import handle_thumbnail
 
+if settings.GRAPHQL_ASYNC_VIEW:
+    graphql_view = AsyncGraphQLView.as_view()
+else:
+    graphql_view = csrf_exempt(GraphQLView.as_view())
+
 urlpatterns = [
-    re_path(r"^graphql/$", csrf_exempt(GraphQLView.as_view(schema=schema)), name="api"),
+    re_path(r"^graphql/$", graphql_view, name="api"),
+    re_path(r"^graphql/schema\.graphql$", schema_sdl, name="api-schema-sdl"),
     re_path(
         r"^digital-download/(?P<token>[0-9A-Za-z_\-]+)/$",
         digital_product,
@@ -0,0 +1,534 @@
+"""Projection of the variants quantity available per channel and country.
+
+Calculating the available quantity joins stocks, allocations, reservations,
+warehouses, shipping zones and channels, which makes it the heaviest part of the
+storefront product queries. `VariantAvailability` keeps the result for each variant,
+channel and country, so the storefront can read it with a single lookup.
+
+The projection is maintained incrementally. Every change of the variant stocks,
+allocations or reservations records a `VariantAvailabilityChange`, and
+`update_variants_availability_task` recalculates the changed variants. The
+projection of a variant is read only when the variant has no pending changes and
+none of the reservations included in it expired; otherwise the quantity is
+calculated from the stocks, as before.
+"""
+from collections import defaultdict
+from datetime import datetime
+from typing import (
+    DefaultDict,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+from uuid import UUID
+
+from django.db import connection, transaction
+from django.db.models import Exists, Min, OuterRef, Q, Sum
+from django.utils import timezone
+
+from ..channel.models import Channel
+from ..product.models import ProductVariant
+from . import WarehouseClickAndCollectOption
+from .models import (
+    ChannelWarehouse,
+    Reservation,
+    ShippingZone,
+    Stock,
+    VariantAvailability,
+    VariantAvailabilityChange,
+    Warehouse,
+)
+
+VARIANTS_AVAILABILITY_BATCH_SIZE = 100
+
+
+def mark_variants_availability_changed(variant_ids: Iterable[Optional[int]]):
+    """Record that the availability of the variants has to be recalculated."""
+    VariantAvailabilityChange.objects.bulk_create(
+        [
+            VariantAvailabilityChange(product_variant_id=variant_id)
+            for variant_id in set(variant_ids)
+            if variant_id is not None
+        ]
+    )
+
+
+def mark_all_variants_availability_changed():
+    """Record that the availability of all stocked variants has to be recalculated.
+
+    Used when the warehouses, shipping zones or channels configuration changes.
+    Only a single marker is recorded, `expand_all_variants_availability_changes`
+    records the changes of the variants outside the request.
+    """
+    VariantAvailabilityChange.objects.create(product_variant=None)
+
+
+def expand_all_variants_availability_changes(batch_size: int):
+    """Replace the markers of all variants changed with changes of the variants.
+
+    The changes are recorded for ranges of `batch_size` stocks, each range by a
+    separate query.
+    """
+    marker_ids = list(
+        VariantAvailabilityChange.objects.filter(
+            product_variant__isnull=True
+        ).values_list("pk", flat=True)
+    )
+    if not marker_ids:
+        return
+    change_table = VariantAvailabilityChange._meta.db_table
+    stock_table = Stock._meta.db_table
+    last_pk = 0
+    with connection.cursor() as cursor:
+        while True:
+            cursor.execute(
+                f"""
+                WITH stocks AS (
+                    SELECT id, product_variant_id FROM {stock_table}
+                    WHERE id > %(last_pk)s
+                    ORDER BY id
+                    LIMIT %(batch_size)s
+                ), changes AS (
+                    INSERT INTO {change_table} (product_variant_id, created_at)
+                    SELECT DISTINCT product_variant_id, NOW() FROM stocks
+                )
+                SELECT MAX(id) FROM stocks
+                """,
+                {"last_pk": last_pk, "batch_size": batch_size},
+            )
+            last_pk = cursor.fetchone()[0]
+            if last_pk is None:
+                break
+    VariantAvailabilityChange.objects.filter(pk__in=marker_ids).delete()
+
+
+def get_projected_available_quantities(
+    variant_ids: Iterable[int],
+    country_code: Optional[str],
+    channel_slug: str,
+    reservations_enabled: bool,
+    database_connection_name: str,
+) -> Dict[int, int]:
+    """Return up-to-date projected quantities of the variants.
+
+    Variants with pending changes or with expired reservations included in the
+    projection are skipped and have to be calculated from the stocks; all variants
+    are skipped while all of them are marked as changed.
+    """
+    changes = VariantAvailabilityChange.objects.using(database_connection_name)
+    pending_changes = changes.filter(
+        Q(product_variant_id=OuterRef("product_variant_id"))
+        | Q(product_variant_id__isnull=True)
+    )
+    availabilities = (
+        VariantAvailability.objects.using(database_connection_name)
+        .filter(
+            product_variant_id__in=variant_ids,
+            channel__slug=channel_slug,
+            country_code=country_code or "",
+        )
+        .exclude(Exists(pending_changes))
+    )
+    if reservations_enabled:
+        availabilities = availabilities.exclude(
+            reservations_expire_at__lte=timezone.now()
+        )
+        field = "quantity"
+    else:
+        field = "quantity_ignoring_reservations"
+    return dict(availabilities.values_list("product_variant_id", field))
+
+
+def prepare_warehouse_ids_by_shipping_zone_and_variant_map(
+    stocks: Iterable[Stock],
+    stocks_reservations: Dict[int, int],
+    warehouse_shipping_zones_map: DefaultDict[UUID, List[int]],
+    cc_warehouses_in_bulk: Dict[UUID, Warehouse],
+):
+    """Combine all quantities within a single zone.
+
+    Prepare `warehouse_ids_by_shipping_zone_by_variant` map in the following format:
+        {
+            variant_id: {
+                shipping_zone_id/warehouse_id: [
+                    warehouse_id
+                ]
+            }
+        }
+
+    In case of the collection point warehouses the warehouse_id is used instead of
+    the shipping zone id. Every stock of the collection point warehouse is treated
+    as a magic single-warehouse shipping zone.
+
+    The stocks must be annotated with `available_quantity`.
+    """
+    warehouse_ids_by_shipping_zone_by_variant: DefaultDict[
+        int, DefaultDict[Union[int, UUID], List[UUID]]
+    ] = defaultdict(lambda: defaultdict(list))
+    variants_with_global_cc_warehouses = []
+    available_quantity_by_warehouse_id_and_variant_id: DefaultDict[
+        UUID, Dict[int, int]
+    ] = defaultdict(lambda: defaultdict(int))
+    for stock in stocks:
+        reserved_quantity = stocks_reservations[stock.id]
+        quantity = stock.available_quantity - reserved_quantity
+        # when the available_quantity was under 0 we do not want clipping to zero,
+        # as it means that the stock might be exceeded
+        if stock.available_quantity > 0:
+            quantity = max(0, quantity)
+        variant_id = stock.product_variant_id
+        warehouse_id = stock.warehouse_id
+        available_quantity_by_warehouse_id_and_variant_id[warehouse_id][
+            variant_id
+        ] += quantity
+        if shipping_zone_ids := warehouse_shipping_zones_map[warehouse_id]:
+            for shipping_zone_id in shipping_zone_ids:
+                warehouse_ids_by_shipping_zone_by_variant[variant_id][
+                    shipping_zone_id
+                ].append(warehouse_id)
+        else:
+            cc_option = cc_warehouses_in_bulk[warehouse_id].click_and_collect_option
+            # every stock of a collection point warehouse should treat as a magic
+            # single-warehouse shipping zone
+            warehouse_ids_by_shipping_zone_by_variant[variant_id][warehouse_id] = [
+                warehouse_id
+            ]
+            # in case of global warehouses the quantity available will be the sum
+            # of the available quantity for that variant from all stocks,
+            # so we need to keep information for which variant there is a warehouse
+            # with the global stock
+            if cc_option == WarehouseClickAndCollectOption.ALL_WAREHOUSES:
+                variants_with_global_cc_warehouses.append(variant_id)
+    return (
+        warehouse_ids_by_shipping_zone_by_variant,
+        variants_with_global_cc_warehouses,
+        available_quantity_by_warehouse_id_and_variant_id,
+    )
+
+
+def prepare_quantity_map(
+    country_code,
+    warehouse_ids_by_shipping_zone_by_variant,
+    variants_with_global_cc_warehouses,
+    available_quantity_by_warehouse_id_and_variant_id,
+) -> DefaultDict[int, int]:
+    """Prepare the variant id to quantity map.
+
+    When the country code is known, the available quantity is the sum of quantities
+    from all shipping zones supporting given country. When the country is not known
+    the highest known quantity is returned.
+
+    The local warehouses are treated as a magic single-warehouse shipping zone.
+    When the variant has any global collection point warehouse, the quantity is the
+    sum of the quantities from all shipping zones.
+    In case of global warehouses the available quantity of such collection point
+    is the sum of the available quantities from all stocks that passed the country
+    or channel conditions.
+    """
+    quantity_map: DefaultDict[int, int] = defaultdict(int)
+    for (
+        variant_id,
+        warehouse_ids_shipping_zone,
+    ) in warehouse_ids_by_shipping_zone_by_variant.items():
+        if country_code or variant_id in variants_with_global_cc_warehouses:
+            used_warehouse_ids = []
+            for warehouse_ids in warehouse_ids_shipping_zone.values():
+                used_warehouse_ids.extend(warehouse_ids)
+            used_warehouse_ids = set(used_warehouse_ids)
+            # When country code is known or the global collection point warehouse
+            # for this variant exists, return the sum of quantities from all
+            # shipping zones supporting given country.
+            quantity = 0
+            for warehouse_id in used_warehouse_ids:
+                quantity += available_quantity_by_warehouse_id_and_variant_id[
+                    warehouse_id
+                ][variant_id]
+            quantity_map[variant_id] = quantity
+        else:
+            # When country code is unknown, return the highest known quantity.
+            quantity_values = []
+            for (
+                warehouse_ids_per_shipping_zones
+            ) in warehouse_ids_shipping_zone.values():
+                quantity = 0
+                for warehouse_id in warehouse_ids_per_shipping_zones:
+                    quantity += available_quantity_by_warehouse_id_and_variant_id[
+                        warehouse_id
+                    ][variant_id]
+                quantity_values.append(quantity)
+
+            quantity_map[variant_id] = max(quantity_values)
+
+    return quantity_map
+
+
+class ChannelsShippingConfiguration(NamedTuple):
+    channel_ids: List[int]
+    warehouse_ids_by_channel: DefaultDict[int, Set[UUID]]
+    shipping_zone_ids_by_channel: DefaultDict[int, Set[int]]
+    countries_by_shipping_zone: Dict[int, List[str]]
+    warehouse_shipping_zones: List[Tuple[UUID, int]]
+    cc_warehouses: Dict[UUID, Warehouse]
+
+
+def get_channels_shipping_configuration() -> ChannelsShippingConfiguration:
+    """Return warehouses, shipping zones and their countries per channel."""
+    WarehouseShippingZone = Warehouse.shipping_zones.through
+    ShippingZoneChannel = Channel.shipping_zones.through  # type: ignore[attr-defined] # raw access to the through model # noqa: E501
+
+    warehouse_ids_by_channel: DefaultDict[int, Set[UUID]] = defaultdict(set)
+    for channel_id, warehouse_id in ChannelWarehouse.objects.values_list(
+        "channel_id", "warehouse_id"
+    ):
+        warehouse_ids_by_channel[channel_id].add(warehouse_id)
+
+    shipping_zone_ids_by_channel: DefaultDict[int, Set[int]] = defaultdict(set)
+    for channel_id, shipping_zone_id in ShippingZoneChannel.objects.values_list(
+        "channel_id", "shippingzone_id"
+    ):
+        shipping_zone_ids_by_channel[channel_id].add(shipping_zone_id)
+
+    countries_by_shipping_zone = {
+        shipping_zone.pk: [country.code for country in shipping_zone.countries]
+        for shipping_zone in ShippingZone.objects.only("pk", "countries")
+    }
+    warehouse_shipping_zones = list(
+        WarehouseShippingZone.objects.values_list("warehouse_id", "shippingzone_id")
+    )
+    cc_warehouses = Warehouse.objects.filter(
+        click_and_collect_option__in=[
+            WarehouseClickAndCollectOption.LOCAL_STOCK,
+            WarehouseClickAndCollectOption.ALL_WAREHOUSES,
+        ],
+    ).in_bulk()
+    return ChannelsShippingConfiguration(
+        channel_ids=list(Channel.objects.values_list("pk", flat=True)),
+        warehouse_ids_by_channel=warehouse_ids_by_channel,
+        shipping_zone_ids_by_channel=shipping_zone_ids_by_channel,
+        countries_by_shipping_zone=countries_by_shipping_zone,
+        warehouse_shipping_zones=warehouse_shipping_zones,
+        cc_warehouses=cc_warehouses,
+    )
+
+
+def _group_countries_by_shipping_zones(
+    shipping_zone_ids: Set[int], countries_by_shipping_zone: Dict[int, List[str]]
+) -> Dict[FrozenSet[int], List[str]]:
+    """Group the countries supported by the same set of shipping zones."""
+    shipping_zone_ids_by_country: DefaultDict[str, Set[int]] = defaultdict(set)
+    for shipping_zone_id in shipping_zone_ids:
+        for country_code in countries_by_shipping_zone.get(shipping_zone_id, []):
+            shipping_zone_ids_by_country[country_code].add(shipping_zone_id)
+
+    countries_by_shipping_zones: DefaultDict[FrozenSet[int], List[str]] = defaultdict(
+        list
+    )
+    for country_code, zone_ids in shipping_zone_ids_by_country.items():
+        countries_by_shipping_zones[frozenset(zone_ids)].append(country_code)
+    return countries_by_shipping_zones
+
+
+def calculate_variants_availability(
+    variant_ids: Iterable[int],
+    configuration: Optional[ChannelsShippingConfiguration] = None,
+) -> List[VariantAvailability]:
+    """Calculate the availability of the variants in every channel and country.
+
+    The quantities are the same as calculated for the storefront from the stocks,
+    before capping them at the maximum quantity allowed in checkout. Pass the
+    `configuration` when calculating several batches of variants.
+    """
+    variant_ids = list(variant_ids)
+    stocks = list(
+        Stock.objects.filter(product_variant_id__in=variant_ids)
+        .annotate_available_quantity()
+        .order_by("pk")
+    )
+    stocks_reservations: DefaultDict[int, int] = defaultdict(int)
+    reservations_expire_at: Dict[int, datetime] = {}
+    reservations = (
+        Reservation.objects.filter(stock__product_variant_id__in=variant_ids)
+        .not_expired()
+        .order_by()
+        .values("stock_id", "stock__product_variant_id")
+        .annotate(
+            quantity_reserved_sum=Sum("quantity_reserved"),
+            reserved_until_min=Min("reserved_until"),
+        )
+    )
+    for reservation in reservations:
+        stocks_reservations[reservation["stock_id"]] += reservation[
+            "quantity_reserved_sum"
+        ]
+        variant_id = reservation["stock__product_variant_id"]
+        expire_at = reservations_expire_at.get(variant_id)
+        if expire_at is None or reservation["reserved_until_min"] < expire_at:
+            reservations_expire_at[variant_id] = reservation["reserved_until_min"]
+
+    if configuration is None:
+        configuration = get_channels_shipping_configuration()
+    (
+        channel_ids,
+        warehouse_ids_by_channel,
+        shipping_zone_ids_by_channel,
+        countries_by_shipping_zone,
+        warehouse_shipping_zones,
+        cc_warehouses,
+    ) = configuration
+
+    availabilities: List[VariantAvailability] = []
+    for channel_id in channel_ids:
+        warehouse_ids = warehouse_ids_by_channel[channel_id]
+        shipping_zone_ids = shipping_zone_ids_by_channel[channel_id]
+        channel_warehouse_shipping_zones = [
+            (warehouse_id, shipping_zone_id)
+            for warehouse_id, shipping_zone_id in warehouse_shipping_zones
+            if warehouse_id in warehouse_ids and shipping_zone_id in shipping_zone_ids
+        ]
+        channel_cc_warehouses = {
+            pk: warehouse
+            for pk, warehouse in cc_warehouses.items()
+            if pk in warehouse_ids
+        }
+
+        # The quantity for the unknown country is calculated from all shipping zones
+        # and the collection points, for known countries only from the shipping
+        # zones supporting them, so countries of the same zones share the quantity.
+        countries_groups: List[Tuple[FrozenSet[int], List[str]]] = [
+            (frozenset(shipping_zone_ids), [""])
+        ]
+        countries_groups.extend(
+            _group_countries_by_shipping_zones(
+                shipping_zone_ids, countries_by_shipping_zone
+            ).items()
+        )
+        for zone_ids, country_codes in countries_groups:
+            country_known = bool(country_codes[0])
+            warehouse_shipping_zones_map: DefaultDict[UUID, List[int]] = defaultdict(
+                list
+            )
+            for warehouse_id, shipping_zone_id in channel_warehouse_shipping_zones:
+                if shipping_zone_id in zone_ids:
+                    warehouse_shipping_zones_map[warehouse_id].append(shipping_zone_id)
+            group_cc_warehouses = {} if country_known else channel_cc_warehouses
+            group_stocks = [
+                stock
+                for stock in stocks
+                if stock.warehouse_id in warehouse_shipping_zones_map
+                or stock.warehouse_id in group_cc_warehouses
+            ]
+
+            quantity_maps = [
+                prepare_quantity_map(
+                    country_codes[0],
+                    *prepare_warehouse_ids_by_shipping_zone_and_variant_map(
+                        group_stocks,
+                        reservations_map,
+                        warehouse_shipping_zones_map,
+                        group_cc_warehouses,
+                    ),
+                )
+                for reservations_map in [stocks_reservations, defaultdict(int)]
+            ]
+            quantity_map, quantity_ignoring_reservations_map = quantity_maps
+            for variant_id in variant_ids:
+                for country_code in country_codes:
+                    availabilities.append(
+                        VariantAvailability(
+                            product_variant_id=variant_id,
+                            channel_id=channel_id,
+                            country_code=country_code,
+                            quantity=max(0, quantity_map[variant_id]),
+                            quantity_ignoring_reservations=max(
+                                0, quantity_ignoring_reservations_map[variant_id]
+                            ),
+                            reservations_expire_at=reservations_expire_at.get(
+                                variant_id
+                            ),
+                        )
+                    )
+    return availabilities
+
+
+def update_variants_availability(
+    variant_ids: Iterable[int],
+    configuration: Optional[ChannelsShippingConfiguration] = None,
+):
+    """Replace the projected availability of the variants."""
+    with transaction.atomic():
+        # Serialize updates of the same variants, without blocking the inserts
+        # referencing them.
+        variant_ids = list(
+            ProductVariant.objects.select_for_update(no_key=True)
+            .filter(pk__in=variant_ids)
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+        availabilities = calculate_variants_availability(variant_ids, configuration)
+        VariantAvailability.objects.filter(product_variant_id__in=variant_ids).delete()
+        VariantAvailability.objects.bulk_create(availabilities)
+
+
+def get_variants_availability_mismatches(
+    variant_ids: Iterable[int],
+    configuration: Optional[ChannelsShippingConfiguration] = None,
+) -> List[int]:
+    """Return variants whose projected availability differs from the stocks.
+
+    Variants that aren't projected, have pending changes or expired reservations
+    included in the projection are skipped, as their projection is not used.
+    """
+    variant_ids = set(
+        VariantAvailability.objects.filter(product_variant_id__in=variant_ids)
+        .order_by()
+        .values_list("product_variant_id", flat=True)
+        .distinct()
+    )
+    if VariantAvailabilityChange.objects.filter(product_variant__isnull=True).exists():
+        return []
+    now = timezone.now()
+    pending_variant_ids = set(
+        VariantAvailabilityChange.objects.filter(
+            product_variant_id__in=variant_ids
+        ).values_list("product_variant_id", flat=True)
+    )
+    expired_variant_ids = set(
+        VariantAvailability.objects.filter(
+            product_variant_id__in=variant_ids, reservations_expire_at__lte=now
+        ).values_list("product_variant_id", flat=True)
+    )
+    variant_ids -= pending_variant_ids | expired_variant_ids
+
+    def get_key(availability):
+        return (
+            availability.product_variant_id,
+            availability.channel_id,
+            availability.country_code,
+        )
+
+    def get_quantities(availability):
+        return (availability.quantity, availability.quantity_ignoring_reservations)
+
+    expected = {
+        get_key(availability): get_quantities(availability)
+        for availability in calculate_variants_availability(variant_ids, configuration)
+    }
+    projected = {
+        get_key(availability): get_quantities(availability)
+        for availability in VariantAvailability.objects.filter(
+            product_variant_id__in=variant_ids
+        )
+    }
+    return sorted(
+        {
+            key[0]
+            for key in expected.keys() | projected.keys()
+            if expected.get(key) != projected.get(key)
+        }
+    )
@@ -21,6 +21,7 @@ from ..order.fetch import OrderLineInfo
 from ..order.models import OrderLine
 from ..plugins.manager import PluginsManager
 from ..product.models import ProductVariant, ProductVariantChannelListing
+from .availability_projection import mark_variants_availability_changed
 from .models import (
     Allocation,
     ChannelWarehouse,
@@ -28,8 +29,17 @@ from .models import (
     PreorderReservation,
     Reservation,
     Stock,
+    StockQuerySet,
     Warehouse,
 )
+from .shards import (
+    StockShardsExhausted,
+    claim_stock_shard,
+    increase_stocks_quantity_allocated,
+    lock_stock_shards,
+    rebalance_stock_shards,
+    release_reservations_to_stock_shards,
+)
 
 if TYPE_CHECKING:
     from ..channel.models import Channel
@@ -58,6 +68,10 @@ def allocate_stocks(
     Iterate by stocks and allocate as many items as needed or available in stock
     for order line, until allocated all required quantity for the order line.
     If there is less quantity in stocks then rise InsufficientStock exception.
+
+    Lines of variants with sharded stocks are allocated from a single stock shard
+    without locking the stocks. If any of them can't be allocated that way,
+    all of them are allocated as above, with the stock shards locked as well.
     """
     # allocation only applied to order lines with variants with track inventory
     # set to True
@@ -67,12 +81,6 @@ def allocate_stocks(
 
     channel_slug = channel.slug
 
-    variants = [line_info.variant for line_info in order_lines_info]
-    filter_lookup = {"product_variant__in": variants}
-
-    if additional_filter_lookup is not None:
-        filter_lookup.update(additional_filter_lookup)
-
     # in case of click and collect order, we need to check local or global stock
     # regardless of the country code
     stocks = (
@@ -80,43 +88,140 @@ def allocate_stocks(
         if collection_point_pk
         else Stock.objects.for_channel_and_country(channel_slug, country_code)
     )
+    if additional_filter_lookup is not None:
+        stocks = stocks.filter(**additional_filter_lookup)
 
-    stocks = list(
-        stocks.select_for_update(of=("self",))
-        .filter(**filter_lookup)
+    lines_info: List["OrderLineInfo"] = []
+    sharded_lines_info: List["OrderLineInfo"] = []
+    for line_info in order_lines_info:
+        if cast(ProductVariant, line_info.variant).stock_shards_count:
+            sharded_lines_info.append(line_info)
+        else:
+            lines_info.append(line_info)
+
+    insufficient_stock: List[InsufficientStockData] = []
+    allocations: List[Allocation] = []
+    if lines_info:
+        insufficient_stock, allocations = _allocate_stocks_for_lines(
+            lines_info,
+            stocks,
+            channel,
+            collection_point_pk,
+            check_reservations,
+            checkout_lines,
+        )
+
+    sharded_allocations: List[Allocation] = []
+    stock_ids_to_rebalance: List[int] = []
+    if sharded_lines_info:
+        try:
+            with transaction.atomic():
+                sharded_allocations = _allocate_stock_shards_for_lines(
+                    sharded_lines_info,
+                    stocks,
+                    channel,
+                    collection_point_pk,
+                    check_reservations,
+                    checkout_lines,
+                )
+        except StockShardsExhausted:
+            # The savepoint rollback releases claimed shards, so the stocks can be
+            # locked in the same order as in other transactions.
+            sharded_insufficient_stock, exact_allocations = _allocate_stocks_for_lines(
+                sharded_lines_info,
+                stocks,
+                channel,
+                collection_point_pk,
+                check_reservations,
+                checkout_lines,
+                lock_shards=True,
+            )
+            insufficient_stock.extend(sharded_insufficient_stock)
+            allocations.extend(exact_allocations)
+            stock_ids_to_rebalance = [
+                allocation.stock_id for allocation in exact_allocations
+            ]
+
+    if insufficient_stock:
+        raise InsufficientStock(insufficient_stock)
+
+    if allocations:
+        stocks_to_update = []
+        for alloc in Allocation.objects.bulk_create(allocations):
+            stock = alloc.stock
+            stock.quantity_allocated = (
+                F("quantity_allocated") + alloc.quantity_allocated
+            )
+            stocks_to_update.append(stock)
+        Stock.objects.bulk_update(stocks_to_update, ["quantity_allocated"])
+
+    if stock_ids_to_rebalance:
+        rebalance_stock_shards(stock_ids_to_rebalance)
+
+    if sharded_allocations:
+        quantity_allocated_for_stocks: Dict[int, int] = defaultdict(int)
+        for allocation in Allocation.objects.bulk_create(sharded_allocations):
+            quantity_allocated_for_stocks[
+                allocation.stock_id
+            ] += allocation.quantity_allocated
+            allocations.append(allocation)
+        # Updated in the same transaction as the allocations, so both are committed
+        # or rolled back together; the shard claim keeps the stock rows unlocked
+        # until this point.
+        increase_stocks_quantity_allocated(quantity_allocated_for_stocks)
+    mark_variants_availability_changed(
+        line_info.variant.pk  # type: ignore[union-attr]
+        for line_info in order_lines_info
+    )
+    for allocation in allocations:
+        allocated_stock = (
+            Allocation.objects.filter(stock_id=allocation.stock_id).aggregate(
+                Sum("quantity_allocated")
+            )["quantity_allocated__sum"]
+            or 0
+        )
+        if not max(allocation.stock.quantity - allocated_stock, 0):
+            transaction.on_commit(
+                lambda: manager.product_variant_out_of_stock(allocation.stock)
+            )
+
+
+def _allocate_stocks_for_lines(
+    order_lines_info: List["OrderLineInfo"],
+    stocks: StockQuerySet,
+    channel: "Channel",
+    collection_point_pk: Optional[UUID],
+    check_reservations: bool,
+    checkout_lines: Optional[Iterable["CheckoutLine"]],
+    lock_shards: bool = False,
+) -> Tuple[List[InsufficientStockData], List[Allocation]]:
+    """Prepare allocations for the lines, locking all the variants stocks."""
+    variants = [line_info.variant for line_info in order_lines_info]
+    stocks_data = list(
+        stocks.select_for_update(of=("self",), no_key=lock_shards)
+        .filter(product_variant__in=variants)
         .order_by("pk")
-        .values("id", "product_variant", "pk", "quantity", "warehouse_id")
+        .values("product_variant", "pk", "quantity", "warehouse_id")
     )
-    stocks_id = (stock.pop("id") for stock in stocks)
+    stocks_id = [stock_data["pk"] for stock_data in stocks_data]
+    if lock_shards:
+        lock_stock_shards(stocks_id)
 
     quantity_reservation_for_stocks: Dict = _prepare_stock_to_reserved_quantity_map(
         checkout_lines, check_reservations, stocks_id
     )
+    quantity_allocation_for_stocks = _prepare_stock_to_allocated_quantity_map(stocks_id)
 
-    quantity_allocation_list = list(
-        Allocation.objects.filter(
-            stock_id__in=stocks_id,
-            quantity_allocated__gt=0,
-        )
-        .values("stock")
-        .annotate(quantity_allocated_sum=Sum("quantity_allocated"))
-    )
-    quantity_allocation_for_stocks: Dict = defaultdict(int)
-    for allocation_data in quantity_allocation_list:
-        quantity_allocation_for_stocks[allocation_data["stock"]] += allocation_data[
-            "quantity_allocated_sum"
-        ]
-
-    stocks = sort_stocks(
+    stocks_data = sort_stocks(
         channel.allocation_strategy,
-        stocks,
+        stocks_data,
         channel,
         quantity_allocation_for_stocks,
         collection_point_pk,
     )
 
     variant_to_stocks: Dict[int, List[StockData]] = defaultdict(list)
-    for stock_data in stocks:
+    for stock_data in stocks_data:
         variant = stock_data.pop("product_variant")
         variant_to_stocks[variant].append(StockData(**stock_data))
 
@@ -133,31 +238,99 @@ def allocate_stocks(
             insufficient_stock,
         )
         allocations.extend(allocation_items)
+    return insufficient_stock, allocations
 
-    if insufficient_stock:
-        raise InsufficientStock(insufficient_stock)
 
-    if allocations:
-        stocks_to_update = []
-        for alloc in Allocation.objects.bulk_create(allocations):
-            stock = alloc.stock
-            stock.quantity_allocated = (
-                F("quantity_allocated") + alloc.quantity_allocated
+def _allocate_stock_shards_for_lines(
+    order_lines_info: List["OrderLineInfo"],
+    stocks: StockQuerySet,
+    channel: "Channel",
+    collection_point_pk: Optional[UUID],
+    check_reservations: bool,
+    checkout_lines: Optional[Iterable["CheckoutLine"]],
+) -> List[Allocation]:
+    """Prepare allocations for the lines, claiming the quantity from stock shards.
+
+    Each line is allocated from a single shard of the first stock that can cover
+    the whole line quantity. Raise `StockShardsExhausted` when a line can't be
+    allocated that way.
+    """
+    variants = [line_info.variant for line_info in order_lines_info]
+    stocks_data = list(
+        stocks.filter(product_variant__in=variants)
+        .order_by("pk")
+        .values("product_variant", "pk", "quantity", "warehouse_id")
+    )
+    stocks_id = [stock_data["pk"] for stock_data in stocks_data]
+    quantity_reservation_for_stocks: Dict = _prepare_stock_to_reserved_quantity_map(
+        checkout_lines, check_reservations, stocks_id
+    )
+    quantity_allocation_for_stocks = _prepare_stock_to_allocated_quantity_map(stocks_id)
+
+    stocks_data = sort_stocks(
+        channel.allocation_strategy,
+        stocks_data,
+        channel,
+        quantity_allocation_for_stocks,
+        collection_point_pk,
+    )
+
+    variant_to_stocks: Dict[int, List[StockData]] = defaultdict(list)
+    for stock_data in stocks_data:
+        variant = stock_data.pop("product_variant")
+        variant_to_stocks[variant].append(StockData(**stock_data))
+
+    if checkout_lines:
+        # The quantity reserved for the checkout is claimed again by the allocations.
+        release_reservations_to_stock_shards(
+            Reservation.objects.filter(
+                checkout_line__in=checkout_lines, stock_id__in=stocks_id
             )
-            stocks_to_update.append(stock)
-        Stock.objects.bulk_update(stocks_to_update, ["quantity_allocated"])
+        )
 
-        for allocation in allocations:
-            allocated_stock = (
-                Allocation.objects.filter(stock_id=allocation.stock_id).aggregate(
-                    Sum("quantity_allocated")
-                )["quantity_allocated__sum"]
-                or 0
+    allocations: List[Allocation] = []
+    for line_info in order_lines_info:
+        line_info.variant = cast(ProductVariant, line_info.variant)
+        quantity = line_info.quantity
+        for stock_data in variant_to_stocks[line_info.variant.pk]:
+            quantity_available_in_stock = (
+                stock_data.quantity
+                - quantity_allocation_for_stocks[stock_data.pk]
+                - quantity_reservation_for_stocks[stock_data.pk]
             )
-            if not max(allocation.stock.quantity - allocated_stock, 0):
-                transaction.on_commit(
-                    lambda: manager.product_variant_out_of_stock(allocation.stock)
+            if quantity_available_in_stock < quantity:
+                continue
+            if claim_stock_shard(stock_data.pk, quantity):
+                allocations.append(
+                    Allocation(
+                        order_line=line_info.line,
+                        stock_id=stock_data.pk,
+                        quantity_allocated=quantity,
+                    )
                 )
+                quantity_allocation_for_stocks[stock_data.pk] += quantity
+                break
+        else:
+            raise StockShardsExhausted()
+    return allocations
+
+
+def _prepare_stock_to_allocated_quantity_map(stocks_id: List[int]) -> Dict[int, int]:
+    """Prepare stock id to quantity allocated map for provided stock ids."""
+    quantity_allocation_list = list(
+        Allocation.objects.filter(
+            stock_id__in=stocks_id,
+            quantity_allocated__gt=0,
+        )
+        .values("stock")
+        .annotate(quantity_allocated_sum=Sum("quantity_allocated"))
+    )
+    quantity_allocation_for_stocks: Dict = defaultdict(int)
+    for allocation_data in quantity_allocation_list:
+        quantity_allocation_for_stocks[allocation_data["stock"]] += allocation_data[
+            "quantity_allocated_sum"
+        ]
+    return quantity_allocation_for_stocks
 
 
 def _prepare_stock_to_reserved_quantity_map(
@@ -354,6 +527,9 @@ def deallocate_stock(
             )
 
     Stock.objects.bulk_update(stocks_to_update, ["quantity_allocated"])
+    mark_variants_availability_changed(
+        stock.product_variant_id for stock in stocks_to_update
+    )
 
     if not_dellocated_lines:
         raise AllocationError(not_dellocated_lines)
@@ -399,6 +575,7 @@ def increase_stock(
             )
         stock.quantity_allocated = F("quantity_allocated") + quantity
         stock.save(update_fields=["quantity_allocated"])
+    mark_variants_availability_changed([stock.product_variant_id])
 
 
 @traced_atomic_transaction()
@@ -510,6 +687,7 @@ def decrease_stock(
             quantity_allocation_for_stocks,
             allow_stock_to_be_exceeded,
         )
+        mark_variants_availability_changed(variant.pk for variant in variants)
 
         stock_ids = (s.id for s in stocks)
         for stock in Stock.objects.filter(
@@ -610,6 +788,9 @@ def deallocate_stock_for_order(order: "Order", manager: PluginsManager):
 
     allocations.update(quantity_allocated=0)
     Stock.objects.bulk_update(stocks_to_update, ["quantity_allocated"])
+    mark_variants_availability_changed(
+        stock.product_variant_id for stock in stocks_to_update
+    )
 
 
 @traced_atomic_transaction()
@@ -634,6 +815,9 @@ def deallocate_stock_for_orders(orders_id, manager: PluginsManager):
 
     allocations.update(quantity_allocated=0)
     Stock.objects.bulk_update(stocks_to_update, ["quantity_allocated"])
+    mark_variants_availability_changed(
+        stock.product_variant_id for stock in stocks_to_update
+    )
 
 
 @traced_atomic_transaction()
@@ -841,6 +1025,7 @@ def deactivate_preorder_for_variant(product_variant: ProductVariant):
 
     if allocations_to_create:
         Allocation.objects.bulk_create(allocations_to_create)
+        mark_variants_availability_changed([product_variant.pk])
 
     if preorder_allocations:
         preorder_allocations.delete()
@@ -0,0 +1,28 @@
+# Generated by Django 3.2.22 on 2026-10-19 10:58
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("warehouse", "0035_variantavailability"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="preorderreservation",
+            index=django.contrib.postgres.indexes.BTreeIndex(
+                fields=["reserved_until"], name="preorder_reserved_until_idx"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="reservation",
+            index=django.contrib.postgres.indexes.BTreeIndex(
+                fields=["reserved_until"], name="reserved_until_idx"
+            ),
+        ),
+    ]
@@ -11,6 +11,7 @@ from typing import (
     cast,
 )
 
+from django.contrib.postgres.indexes import BTreeIndex
 from django.db import models
 from django.db.models import Count, Exists, F, OuterRef, Prefetch, Q, Sum
 from django.db.models.expressions import Subquery
@@ -400,6 +401,21 @@ class Stock(models.Model):
             self.save(update_fields=["quantity"])
 
 
+class StockShard(models.Model):
+    """Part of the stock quantity that can be claimed without locking the stock.
+
+    Shards exist only for variants with sharded allocation enabled, see
+    `ProductVariant.stock_shards_count`. The `quantity` is the number of units
+    that can still be allocated or reserved from the shard until the next rebalance.
+    """
+
+    stock = models.ForeignKey(Stock, on_delete=models.CASCADE, related_name="shards")
+    quantity = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ("pk",)
+
+
 class AllocationQueryset(models.QuerySet["Allocation"]):
     def annotate_stock_available_quantity(self):
         return self.annotate(
@@ -507,6 +523,8 @@ class PreorderReservation(models.Model):
         unique_together = [["checkout_line", "product_variant_channel_listing"]]
         indexes = [
             models.Index(fields=["checkout_line", "reserved_until"]),
+            # used by the expired reservations sweep
+            BTreeIndex(fields=["reserved_until"], name="preorder_reserved_until_idx"),
         ]
         ordering = ("pk",)
 
@@ -535,5 +553,48 @@ class Reservation(models.Model):
         unique_together = [["checkout_line", "stock"]]
         indexes = [
             models.Index(fields=["checkout_line", "reserved_until"]),
+            # used by the expired reservations sweep
+            BTreeIndex(fields=["reserved_until"], name="reserved_until_idx"),
         ]
         ordering = ("pk",)
+
+
+class VariantAvailability(models.Model):
+    """Quantity of the variant available in the channel for the given country.
+
+    Projection of the stocks, allocations and reservations kept for storefront
+    availability, see `saleor.warehouse.availability_projection`. An empty
+    `country_code` holds the quantity available when the country is unknown.
+    """
+
+    product_variant = models.ForeignKey(
+        ProductVariant, on_delete=models.CASCADE, related_name="availabilities"
+    )
+    channel = models.ForeignKey(
+        Channel, on_delete=models.CASCADE, related_name="variant_availabilities"
+    )
+    country_code = models.CharField(max_length=2, blank=True)
+    quantity = models.IntegerField(default=0)
+    quantity_ignoring_reservations = models.IntegerField(default=0)
+    # the earliest expiration of the reservations included in `quantity`
+    reservations_expire_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = [["product_variant", "channel", "country_code"]]
+        ordering = ("pk",)
+
+
+class VariantAvailabilityChange(models.Model):
+    """Change of the variant stocks not yet applied to its `VariantAvailability`.
+
+    A change without a variant marks the availability of all variants as changed.
+    """
+
+    product_variant = models.ForeignKey(
+        ProductVariant, null=True, on_delete=models.CASCADE, related_name="+"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ("pk",)
@@ -1,16 +1,25 @@
 from collections import defaultdict, namedtuple
 from datetime import datetime, timedelta
-from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple, Type, Union
 
-from django.db.models import F, Sum
+from django.db import transaction
+from django.db.models import BooleanField, ExpressionWrapper, F, Q, Sum
 from django.db.models.functions import Coalesce
 from django.utils import timezone
 
 from ..core.exceptions import InsufficientStock, InsufficientStockData
 from ..core.tracing import traced_atomic_transaction
 from ..product.models import ProductVariant, ProductVariantChannelListing
+from .availability_projection import mark_variants_availability_changed
 from .management import sort_stocks
 from .models import Allocation, PreorderReservation, Reservation, Stock
+from .shards import (
+    StockShardsExhausted,
+    claim_stock_shard,
+    lock_stock_shards,
+    rebalance_stock_shards,
+    release_reservations_to_stock_shards,
+)
 
 if TYPE_CHECKING:
     from ..channel.models import Channel
@@ -89,7 +98,16 @@ def reserve_stocks(
     *,
     replace: bool = True,
 ):
-    """Reserve stocks for given `checkout_lines` in given country."""
+    """Reserve stocks for given `checkout_lines` in given country.
+
+    When `replace` is set, lines already reserved for their whole quantity only
+    have the reservation time prolonged, and the reservations of the other lines
+    are updated in place.
+
+    Lines of variants with sharded stocks are reserved from a single stock shard
+    without locking the stocks. If any of them can't be reserved that way,
+    all of them are reserved with the stocks and stock shards locked.
+    """
     variants_ids = [line.variant_id for line in checkout_lines]
     variants = [variant for variant in variants if variant.pk in variants_ids]
     variants_map = {variant.id: variant for variant in variants}
@@ -97,17 +115,237 @@ def reserve_stocks(
     # Reservation is only applied to checkout lines with variants with track inventory
     # set to True
     checkout_lines = get_checkout_lines_to_reserve(checkout_lines, variants_map)
+    existing_reservations: List[Reservation] = []
+    prolonged_reservations: List[Reservation] = []
+    valid_reservations_filter = Q()
+    if checkout_lines and replace:
+        stocks = Stock.objects.get_variants_stocks_for_country(
+            country_code, channel.slug, variants
+        )
+        valid_reservations_filter = Q(stock__in=stocks.values("pk"))
+        (
+            checkout_lines,
+            existing_reservations,
+            prolonged_reservations,
+        ) = _prolong_unchanged_reservations(
+            Reservation, valid_reservations_filter, checkout_lines, reserved_until
+        )
     if not checkout_lines:
+        _save_reservations(
+            Reservation,
+            "stock_id",
+            [],
+            existing_reservations,
+            prolonged_reservations,
+            valid_reservations_filter,
+        )
         return
 
-    stocks = list(
-        Stock.objects.select_for_update(of=("self",))
-        .get_variants_stocks_for_country(country_code, channel.slug, variants)
-        .order_by("pk")
-        .values("id", "product_variant", "pk", "quantity", "warehouse_id")
+    lines: List["CheckoutLine"] = []
+    sharded_lines: List["CheckoutLine"] = []
+    for line in checkout_lines:
+        if variants_map[line.variant_id].stock_shards_count:
+            sharded_lines.append(line)
+        else:
+            lines.append(line)
+
+    insufficient_stocks: List[InsufficientStockData] = []
+    reservations: List[Reservation] = []
+    if lines:
+        insufficient_stocks, reservations = _reserve_stocks_for_lines(
+            lines, variants_map, country_code, channel, reserved_until
+        )
+
+    stock_ids_to_rebalance: List[int] = []
+    if sharded_lines:
+        try:
+            with transaction.atomic():
+                reservations.extend(
+                    _reserve_stock_shards_for_lines(
+                        sharded_lines,
+                        variants_map,
+                        country_code,
+                        channel,
+                        reserved_until,
+                        replace=replace,
+                    )
+                )
+        except StockShardsExhausted:
+            # The savepoint rollback releases claimed shards, so the stocks can be
+            # locked in the same order as in other transactions.
+            sharded_insufficient_stocks, exact_reservations = _reserve_stocks_for_lines(
+                sharded_lines,
+                variants_map,
+                country_code,
+                channel,
+                reserved_until,
+                lock_shards=True,
+            )
+            insufficient_stocks.extend(sharded_insufficient_stocks)
+            reservations.extend(exact_reservations)
+            stock_ids_to_rebalance = [
+                reservation.stock_id for reservation in exact_reservations
+            ]
+
+    if insufficient_stocks:
+        raise InsufficientStock(insufficient_stocks)
+
+    if reservations:
+        _save_reservations(
+            Reservation,
+            "stock_id",
+            reservations,
+            existing_reservations,
+            prolonged_reservations,
+            valid_reservations_filter,
+        )
+        mark_variants_availability_changed(line.variant_id for line in checkout_lines)
+
+    if stock_ids_to_rebalance:
+        rebalance_stock_shards(stock_ids_to_rebalance)
+
+
+def _prolong_unchanged_reservations(
+    model: Union[Type[Reservation], Type[PreorderReservation]],
+    valid_reservations_filter: Q,
+    checkout_lines: Iterable["CheckoutLine"],
+    reserved_until: datetime,
+) -> Tuple[List["CheckoutLine"], List, List]:
+    """Prolong reservations of lines whose whole quantity is already reserved.
+
+    Only active reservations matching `valid_reservations_filter` are taken into
+    account. Return the lines that have to be reserved again, their existing
+    reservations and the prolonged reservations, which are saved with
+    `_save_reservations`.
+    """
+    quantity_by_line_id = {line.pk: line.quantity for line in checkout_lines}
+    reservations = model.objects.filter(
+        checkout_line_id__in=list(quantity_by_line_id)
+    ).annotate(
+        is_valid=ExpressionWrapper(
+            valid_reservations_filter, output_field=BooleanField()
+        )
+    )
+    now = timezone.now()
+    active_reservations_by_line_id: Dict[int, List] = defaultdict(list)
+    existing_reservations_by_line_id: Dict[int, List] = defaultdict(list)
+    for reservation in reservations:
+        existing_reservations_by_line_id[reservation.checkout_line_id].append(
+            reservation
+        )
+        if reservation.reserved_until > now:
+            active_reservations_by_line_id[reservation.checkout_line_id].append(
+                reservation
+            )
+
+    unchanged_line_ids = set()
+    prolonged_reservations = []
+    for line_id, active_reservations in active_reservations_by_line_id.items():
+        quantity_reserved = sum(
+            reservation.quantity_reserved for reservation in active_reservations
+        )
+        if quantity_reserved != quantity_by_line_id[line_id] or not all(
+            reservation.is_valid for reservation in active_reservations
+        ):
+            continue
+        unchanged_line_ids.add(line_id)
+        for reservation in active_reservations:
+            reservation.reserved_until = reserved_until
+            prolonged_reservations.append(reservation)
+
+    return (
+        [line for line in checkout_lines if line.pk not in unchanged_line_ids],
+        [
+            reservation
+            for line_id, line_reservations in existing_reservations_by_line_id.items()
+            if line_id not in unchanged_line_ids
+            for reservation in line_reservations
+        ],
+        prolonged_reservations,
     )
-    stocks_id = [stock.pop("id") for stock in stocks]
 
+
+def _save_reservations(
+    model: Union[Type[Reservation], Type[PreorderReservation]],
+    target_field: str,
+    reservations: List,
+    existing_reservations: List,
+    prolonged_reservations: List,
+    valid_reservations_filter: Q,
+):
+    """Save the reservations of the lines, updating the existing rows in place.
+
+    Existing reservations that are not in `reservations` are deleted. Rows are
+    matched by the checkout line and `target_field`, which are unique together.
+    Prolonged reservations are updated in the same query, as long as they are
+    still active and match `valid_reservations_filter`, so expired rows are not
+    brought back.
+    """
+    existing_reservations_map = {
+        (reservation.checkout_line_id, getattr(reservation, target_field)): (
+            reservation
+        )
+        for reservation in existing_reservations
+    }
+
+    reservations_to_create = []
+    reservations_to_update = []
+    for reservation in reservations:
+        existing_reservation = existing_reservations_map.pop(
+            (reservation.checkout_line_id, getattr(reservation, target_field)), None
+        )
+        if existing_reservation is None:
+            reservations_to_create.append(reservation)
+            continue
+        existing_reservation.quantity_reserved = reservation.quantity_reserved
+        existing_reservation.reserved_until = reservation.reserved_until
+        reservations_to_update.append(existing_reservation)
+
+    if existing_reservations_map:
+        model.objects.filter(
+            pk__in=[
+                reservation.pk for reservation in existing_reservations_map.values()
+            ]
+        ).delete()
+    updated_line_ids = {
+        reservation.checkout_line_id for reservation in reservations_to_update
+    }
+    model.objects.filter(
+        Q(checkout_line_id__in=updated_line_ids)
+        | (valid_reservations_filter & Q(reserved_until__gt=timezone.now()))
+    ).bulk_update(
+        reservations_to_update + prolonged_reservations,
+        ["quantity_reserved", "reserved_until"],
+    )
+    model.objects.bulk_create(reservations_to_create)
+
+
+def _get_variants_stocks_data(
+    checkout_lines: List["CheckoutLine"],
+    variants_map: Dict[int, "ProductVariant"],
+    country_code: str,
+    channel: "Channel",
+    lock: bool,
+    no_key_lock: bool = False,
+):
+    variants = [variants_map[line.variant_id] for line in checkout_lines]
+    stocks = Stock.objects.get_variants_stocks_for_country(
+        country_code, channel.slug, variants
+    )
+    if lock:
+        stocks = stocks.select_for_update(of=("self",), no_key=no_key_lock)
+    stocks_data = list(
+        stocks.order_by("pk").values(
+            "id", "product_variant", "pk", "quantity", "warehouse_id"
+        )
+    )
+    stocks_id = [stock_data.pop("id") for stock_data in stocks_data]
+    return stocks_data, stocks_id
+
+
+def _prepare_stock_quantity_maps(
+    stocks_id: List[int], checkout_lines: List["CheckoutLine"]
+) -> Tuple[Dict[int, int], Dict[int, int]]:
     quantity_allocation_list = list(
         Allocation.objects.filter(
             stock_id__in=stocks_id,
@@ -137,18 +375,53 @@ def reserve_stocks(
         quantity_reservation_for_stocks[reservation["stock"]] += reservation[
             "quantity_reserved_sum"
         ]
+    return quantity_allocation_for_stocks, quantity_reservation_for_stocks
+
 
-    stocks = sort_stocks(
+def _group_stocks_by_variant(
+    stocks_data, channel: "Channel", quantity_allocation_for_stocks: Dict[int, int]
+) -> Dict[int, List[StockData]]:
+    stocks_data = sort_stocks(
         channel.allocation_strategy,
-        stocks,
+        stocks_data,
         channel,
         quantity_allocation_for_stocks,
     )
 
     variant_to_stocks: Dict[int, List[StockData]] = defaultdict(list)
-    for stock_data in stocks:
+    for stock_data in stocks_data:
         variant = stock_data.pop("product_variant")
         variant_to_stocks[variant].append(StockData(**stock_data))
+    return variant_to_stocks
+
+
+def _reserve_stocks_for_lines(
+    checkout_lines: List["CheckoutLine"],
+    variants_map: Dict[int, "ProductVariant"],
+    country_code: str,
+    channel: "Channel",
+    reserved_until: datetime,
+    lock_shards: bool = False,
+) -> Tuple[List[InsufficientStockData], List[Reservation]]:
+    """Prepare reservations for the lines, locking all the variants stocks."""
+    stocks_data, stocks_id = _get_variants_stocks_data(
+        checkout_lines,
+        variants_map,
+        country_code,
+        channel,
+        lock=True,
+        no_key_lock=lock_shards,
+    )
+    if lock_shards:
+        lock_stock_shards(stocks_id)
+
+    (
+        quantity_allocation_for_stocks,
+        quantity_reservation_for_stocks,
+    ) = _prepare_stock_quantity_maps(stocks_id, checkout_lines)
+    variant_to_stocks = _group_stocks_by_variant(
+        stocks_data, channel, quantity_allocation_for_stocks
+    )
 
     insufficient_stocks: List[InsufficientStockData] = []
     reservations: List[Reservation] = []
@@ -164,14 +437,69 @@ def reserve_stocks(
             reserved_until,
         )
         reservations.extend(reserved_items)
+    return insufficient_stocks, reservations
 
-    if insufficient_stocks:
-        raise InsufficientStock(insufficient_stocks)
 
-    if reservations:
-        if replace:
-            Reservation.objects.filter(checkout_line__in=checkout_lines).delete()
-        Reservation.objects.bulk_create(reservations)
+def _reserve_stock_shards_for_lines(
+    checkout_lines: List["CheckoutLine"],
+    variants_map: Dict[int, "ProductVariant"],
+    country_code: str,
+    channel: "Channel",
+    reserved_until: datetime,
+    *,
+    replace: bool,
+) -> List[Reservation]:
+    """Prepare reservations for the lines, claiming the quantity from stock shards.
+
+    Each line is reserved from a single shard of the first stock that can cover
+    the whole line quantity. Raise `StockShardsExhausted` when a line can't be
+    reserved that way.
+    """
+    stocks_data, stocks_id = _get_variants_stocks_data(
+        checkout_lines, variants_map, country_code, channel, lock=False
+    )
+    (
+        quantity_allocation_for_stocks,
+        quantity_reservation_for_stocks,
+    ) = _prepare_stock_quantity_maps(stocks_id, checkout_lines)
+    variant_to_stocks = _group_stocks_by_variant(
+        stocks_data, channel, quantity_allocation_for_stocks
+    )
+
+    if replace:
+        # Reservations of the lines are replaced, so their quantity can be claimed
+        # again.
+        release_reservations_to_stock_shards(
+            Reservation.objects.filter(
+                checkout_line__in=checkout_lines, stock_id__in=stocks_id
+            )
+        )
+
+    reservations: List[Reservation] = []
+    for line in checkout_lines:
+        quantity = line.quantity
+        for stock_data in variant_to_stocks[line.variant_id]:
+            quantity_available_in_stock = (
+                stock_data.quantity
+                - quantity_allocation_for_stocks[stock_data.pk]
+                - quantity_reservation_for_stocks[stock_data.pk]
+            )
+            if quantity_available_in_stock < quantity:
+                continue
+            if claim_stock_shard(stock_data.pk, quantity):
+                reservations.append(
+                    Reservation(
+                        checkout_line=line,
+                        stock_id=stock_data.pk,
+                        quantity_reserved=quantity,
+                        reserved_until=reserved_until,
+                    )
+                )
+                quantity_reservation_for_stocks[stock_data.pk] += quantity
+                break
+        else:
+            raise StockShardsExhausted()
+    return reservations
 
 
 def _create_stock_reservations(
@@ -268,7 +596,32 @@ def reserve_preorders(
         ):
             checkout_lines_to_reserve.append(line)
 
+    existing_reservations: List[PreorderReservation] = []
+    prolonged_reservations: List[PreorderReservation] = []
+    valid_reservations_filter = Q()
+    if checkout_lines_to_reserve and replace:
+        valid_reservations_filter = Q(
+            product_variant_channel_listing__channel__slug=channel_slug
+        )
+        (
+            checkout_lines_to_reserve,
+            existing_reservations,
+            prolonged_reservations,
+        ) = _prolong_unchanged_reservations(
+            PreorderReservation,
+            valid_reservations_filter,
+            checkout_lines_to_reserve,
+            reserved_until,
+        )
     if not checkout_lines_to_reserve:
+        _save_reservations(
+            PreorderReservation,
+            "product_variant_channel_listing_id",
+            [],
+            existing_reservations,
+            prolonged_reservations,
+            valid_reservations_filter,
+        )
         return
 
     variant_channels: Dict[int, List[ProductVariantChannelListing]] = defaultdict(list)
@@ -284,7 +637,7 @@ def reserve_preorders(
     }
 
     listings_reservations: Dict = get_listings_reservations(
-        checkout_lines, all_variants_channel_listings
+        checkout_lines_to_reserve, all_variants_channel_listings
     )
 
     insufficient_stocks: List[InsufficientStockData] = []
@@ -306,12 +659,15 @@ def reserve_preorders(
     if insufficient_stocks:
         raise InsufficientStock(insufficient_stocks)
 
-    if reservation:
-        if replace:
-            PreorderReservation.objects.filter(
-                checkout_line__in=checkout_lines_to_reserve
-            ).delete()
-        PreorderReservation.objects.bulk_create(reservations)
+    if reservations:
+        _save_reservations(
+            PreorderReservation,
+            "product_variant_channel_listing_id",
+            reservations,
+            existing_reservations,
+            prolonged_reservations,
+            valid_reservations_filter,
+        )
 
 
 def _create_preorder_reservation(
@@ -0,0 +1,190 @@
+"""Sharded stock counters for variants with high allocation contention.
+
+For variants with `ProductVariant.stock_shards_count` set, the available quantity of
+each stock is split into `StockShard` sub-counters. Allocations and reservations
+claim units from a single shard locked with `SKIP LOCKED`, so concurrent checkouts
+of the same variant don't serialize on the `Stock` row.
+
+The shard quantities are a conservative budget: claims decrease them, but units
+released by deallocations, expired reservations or stock increases are returned
+only when the shards are rebalanced. When no shard can satisfy a line, the line
+falls back to the regular allocation, which locks the stock and all its shards,
+and rebalances the shards afterwards.
+
+Sharded allocations increase `Stock.quantity_allocated` right after the commit, so
+the stock rows are locked only for that update. All changes of the field are
+relative, so the order in which they are applied doesn't matter.
+
+Stocks are locked with `FOR NO KEY UPDATE` before their shards are locked. A
+transaction holding a claimed shard still needs a `FOR KEY SHARE` lock on the stock
+to insert an allocation or reservation referencing it, which a plain `FOR UPDATE`
+lock would block.
+"""
+from collections import defaultdict
+from typing import TYPE_CHECKING, Dict, Iterable, List
+
+from django.db.models import F, Sum
+
+from ..core.tracing import traced_atomic_transaction
+from .models import Allocation, Reservation, Stock, StockShard
+
+if TYPE_CHECKING:
+    from .models import ReservationQuerySet
+
+
+class StockShardsExhausted(Exception):
+    """Raised when a line can't be claimed from the stock shards."""
+
+
+def claim_stock_shard(stock_id: int, quantity: int) -> bool:
+    """Claim `quantity` units from a single, currently not locked shard of the stock.
+
+    Locks the claimed shard until the end of the transaction; shards locked
+    by other transactions are skipped.
+    """
+    shard_id = (
+        StockShard.objects.select_for_update(skip_locked=True)
+        .filter(stock_id=stock_id, quantity__gte=quantity)
+        .order_by("?")
+        .values_list("pk", flat=True)
+        .first()
+    )
+    if shard_id is None:
+        return False
+    StockShard.objects.filter(pk=shard_id).update(quantity=F("quantity") - quantity)
+    return True
+
+
+def release_to_stock_shard(stock_id: int, quantity: int) -> bool:
+    """Return `quantity` units to a single, currently not locked shard of the stock.
+
+    When all shards are locked the units are returned by the next rebalance.
+    """
+    shard_id = (
+        StockShard.objects.select_for_update(skip_locked=True)
+        .filter(stock_id=stock_id)
+        .order_by("?")
+        .values_list("pk", flat=True)
+        .first()
+    )
+    if shard_id is None:
+        return False
+    StockShard.objects.filter(pk=shard_id).update(quantity=F("quantity") + quantity)
+    return True
+
+
+def release_reservations_to_stock_shards(reservations: "ReservationQuerySet"):
+    """Return the quantity of the active reservations to the stock shards.
+
+    Used when the reserved quantity is claimed again, by a new reservation or an
+    allocation of the same checkout line.
+    """
+    quantity_reserved_for_stocks = (
+        reservations.not_expired()
+        .order_by()
+        .values("stock")
+        .annotate(quantity_reserved_sum=Sum("quantity_reserved"))
+        .values_list("stock", "quantity_reserved_sum")
+    )
+    for stock_id, quantity_reserved in quantity_reserved_for_stocks:
+        if quantity_reserved:
+            release_to_stock_shard(stock_id, quantity_reserved)
+
+
+def increase_stocks_quantity_allocated(quantity_allocated_for_stocks: Dict[int, int]):
+    stocks = [
+        Stock(pk=stock_id, quantity_allocated=F("quantity_allocated") + quantity)
+        for stock_id, quantity in sorted(quantity_allocated_for_stocks.items())
+    ]
+    Stock.objects.bulk_update(stocks, ["quantity_allocated"])
+
+
+def lock_stock_shards(stock_ids: Iterable[int]):
+    """Lock all shards of the given stocks.
+
+    Must be called after locking the stocks themselves with `FOR NO KEY UPDATE`,
+    so the lock order is the same as in `rebalance_stock_shards`.
+    """
+    list(
+        StockShard.objects.select_for_update()
+        .filter(stock_id__in=stock_ids)
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+
+
+def get_sharded_stock_ids() -> List[int]:
+    """Return stocks that have or should have shards."""
+    return list(
+        Stock.objects.filter(product_variant__stock_shards_count__gt=0)
+        .union(Stock.objects.filter(shards__isnull=False))
+        .values_list("pk", flat=True)
+    )
+
+
+@traced_atomic_transaction()
+def rebalance_stock_shards(stock_ids: Iterable[int]):
+    """Split the available quantity of the stocks evenly across their shards.
+
+    The number of shards is adjusted to `ProductVariant.stock_shards_count`.
+    """
+    stocks = list(
+        Stock.objects.select_for_update(of=("self",), no_key=True)
+        .filter(pk__in=stock_ids)
+        .select_related("product_variant")
+        .order_by("pk")
+    )
+    stock_ids = [stock.pk for stock in stocks]
+    shards_by_stock: Dict[int, List[StockShard]] = defaultdict(list)
+    for shard in (
+        StockShard.objects.select_for_update()
+        .filter(stock_id__in=stock_ids)
+        .order_by("pk")
+    ):
+        shards_by_stock[shard.stock_id].append(shard)
+
+    quantity_allocated_for_stocks = dict(
+        Allocation.objects.filter(stock_id__in=stock_ids)
+        .order_by()
+        .values("stock")
+        .annotate(quantity_allocated_sum=Sum("quantity_allocated"))
+        .values_list("stock", "quantity_allocated_sum")
+    )
+    quantity_reserved_for_stocks = dict(
+        Reservation.objects.filter(stock_id__in=stock_ids)
+        .not_expired()
+        .order_by()
+        .values("stock")
+        .annotate(quantity_reserved_sum=Sum("quantity_reserved"))
+        .values_list("stock", "quantity_reserved_sum")
+    )
+
+    shards_to_create: List[StockShard] = []
+    shards_to_update: List[StockShard] = []
+    shard_ids_to_delete: List[int] = []
+    for stock in stocks:
+        shards_count = stock.product_variant.stock_shards_count
+        shards = shards_by_stock[stock.pk]
+        shard_ids_to_delete.extend(shard.pk for shard in shards[shards_count:])
+        shards_to_update.extend(shards[:shards_count])
+        new_shards = [
+            StockShard(stock=stock) for _ in range(shards_count - len(shards))
+        ]
+        shards_to_create.extend(new_shards)
+
+        if not shards_count:
+            continue
+        available_quantity = max(
+            stock.quantity
+            - quantity_allocated_for_stocks.get(stock.pk, 0)
+            - quantity_reserved_for_stocks.get(stock.pk, 0),
+            0,
+        )
+        base_quantity, remainder = divmod(available_quantity, shards_count)
+        for index, shard in enumerate(shards[:shards_count] + new_shards):
+            shard.quantity = base_quantity + (1 if index < remainder else 0)
+
+    if shard_ids_to_delete:
+        StockShard.objects.filter(pk__in=shard_ids_to_delete).delete()
+    StockShard.objects.bulk_create(shards_to_create)
+    StockShard.objects.bulk_update(shards_to_update, ["quantity"])
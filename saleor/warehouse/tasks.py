@@ -1,13 +1,38 @@
+from datetime import timedelta
+from typing import Dict, Optional
+
 from celery.utils.log import get_task_logger
-from django.db.models import F, Sum
-from django.db.models.functions import Coalesce
+from django.conf import settings
+from django.db import connection
+from django.db.models import Exists, Min, OuterRef
 from django.utils import timezone
 
 from ..celeryconf import app
-from .models import Allocation, PreorderReservation, Reservation, Stock
+from ..product.models import ProductVariant
+from .availability_projection import (
+    VARIANTS_AVAILABILITY_BATCH_SIZE,
+    expand_all_variants_availability_changes,
+    get_channels_shipping_configuration,
+    mark_variants_availability_changed,
+    update_variants_availability,
+)
+from .models import (
+    Allocation,
+    PreorderReservation,
+    Reservation,
+    Stock,
+    VariantAvailability,
+    VariantAvailabilityChange,
+)
+from .shards import get_sharded_stock_ids, rebalance_stock_shards
 
 task_logger = get_task_logger(__name__)
 
+EXPIRED_RESERVATIONS_BATCH_SIZE = 1000
+UPDATE_STOCKS_QUANTITY_ALLOCATED_BATCH_SIZE = 10000
+REBALANCE_STOCK_SHARDS_BATCH_SIZE = 100
+EXPAND_VARIANTS_AVAILABILITY_CHANGES_BATCH_SIZE = 10000
+
 
 @app.task
 def delete_empty_allocations_task():
@@ -16,14 +41,43 @@ def delete_empty_allocations_task():
         task_logger.debug("Removed %s allocations", count)
 
 
-@app.task
+@app.task(expires=settings.BEAT_DELETE_EXPIRED_RESERVATIONS_EXPIRE_AFTER_SEC)
 def delete_expired_reservations_task():
-    stock_reservations, _ = Reservation.objects.filter(
-        reserved_until__lt=timezone.now()
-    ).delete()
-    preorder_reservations, _ = PreorderReservation.objects.filter(
-        reserved_until__lt=timezone.now()
-    ).delete()
+    """Delete a batch of the longest expired reservations.
+
+    The reservations are selected with the `reserved_until` indexes, so each run
+    only reads the rows it deletes. The task is triggered again while there are
+    more expired reservations.
+    """
+    now = timezone.now()
+    stock_reservation_ids = list(
+        Reservation.objects.filter(reserved_until__lt=now)
+        .order_by("reserved_until")
+        .values_list("pk", flat=True)[:EXPIRED_RESERVATIONS_BATCH_SIZE]
+    )
+    preorder_reservation_ids = list(
+        PreorderReservation.objects.filter(reserved_until__lt=now)
+        .order_by("reserved_until")
+        .values_list("pk", flat=True)[:EXPIRED_RESERVATIONS_BATCH_SIZE]
+    )
+
+    stock_reservations = 0
+    if stock_reservation_ids:
+        variant_ids = list(
+            Stock.objects.filter(reservations__pk__in=stock_reservation_ids)
+            .order_by()
+            .values_list("product_variant_id", flat=True)
+            .distinct()
+        )
+        stock_reservations, _ = Reservation.objects.filter(
+            pk__in=stock_reservation_ids
+        ).delete()
+        mark_variants_availability_changed(variant_ids)
+    preorder_reservations = 0
+    if preorder_reservation_ids:
+        preorder_reservations, _ = PreorderReservation.objects.filter(
+            pk__in=preorder_reservation_ids
+        ).delete()
 
     if stock_reservations or preorder_reservations:
         task_logger.debug(
@@ -31,29 +85,184 @@ def delete_expired_reservations_task():
             stock_reservations,
             preorder_reservations,
         )
+    if EXPIRED_RESERVATIONS_BATCH_SIZE in (
+        len(stock_reservation_ids),
+        len(preorder_reservation_ids),
+    ):
+        delete_expired_reservations_task.delay()
+
+
+def _get_stock_pk_ranges(batch_size: int):
+    """Yield keyset `(lower, upper]` ranges of stock pks, `batch_size` stocks each."""
+    last_pk = 0
+    while True:
+        upper_pk = (
+            Stock.objects.filter(pk__gt=last_pk)
+            .order_by("pk")
+            .values_list("pk", flat=True)[batch_size - 1 : batch_size]
+            .first()
+        )
+        if upper_pk is None:
+            if Stock.objects.filter(pk__gt=last_pk).exists():
+                yield last_pk, None
+            return
+        yield last_pk, upper_pk
+        last_pk = upper_pk
+
+
+def _reconcile_stocks_quantity_allocated(
+    lower_pk: int, upper_pk: Optional[int], dry_run: bool
+) -> int:
+    """Set `Stock.quantity_allocated` to the sum of allocations for the pk range.
+
+    The availability of the variants of corrected stocks is marked as changed.
+    Return the number of mismatched stocks; in dry-run mode nothing is updated.
+    """
+    params: Dict[str, Optional[int]] = {"lower_pk": lower_pk, "upper_pk": upper_pk}
+    totals = f"""
+        SELECT
+            stock.id AS stock_id,
+            COALESCE(SUM(allocation.quantity_allocated), 0) AS allocated
+        FROM {Stock._meta.db_table} AS stock
+        LEFT JOIN {Allocation._meta.db_table} AS allocation
+            ON allocation.stock_id = stock.id
+        WHERE stock.id > %(lower_pk)s
+            AND (%(upper_pk)s IS NULL OR stock.id <= %(upper_pk)s)
+        GROUP BY stock.id
+    """
+    if dry_run:
+        query = f"""
+            SELECT COUNT(*)
+            FROM {Stock._meta.db_table} AS stock
+            JOIN ({totals}) AS totals ON totals.stock_id = stock.id
+            WHERE stock.quantity_allocated <> totals.allocated
+        """
+    else:
+        query = f"""
+            UPDATE {Stock._meta.db_table} AS stock
+            SET quantity_allocated = totals.allocated
+            FROM ({totals}) AS totals
+            WHERE totals.stock_id = stock.id
+                AND stock.quantity_allocated <> totals.allocated
+            RETURNING stock.product_variant_id
+        """
+    with connection.cursor() as cursor:
+        cursor.execute(query, params)
+        if dry_run:
+            return cursor.fetchone()[0]
+        variant_ids = [variant_id for (variant_id,) in cursor.fetchall()]
+    mark_variants_availability_changed(variant_ids)
+    return len(variant_ids)
 
 
 @app.task
-def update_stocks_quantity_allocated_task():
-    stocks_to_update = []
-    for mismatched_stock in Stock.objects.annotate(
-        allocations_allocated=Coalesce(Sum("allocations__quantity_allocated"), 0)
-    ).exclude(quantity_allocated=F("allocations_allocated")):
-        allocations_allocated = getattr(
-            mismatched_stock, "allocations_allocated"
-        )  # annotation
+def update_stocks_quantity_allocated_task(dry_run=False):
+    """Reconcile `Stock.quantity_allocated` with the stock allocations.
+
+    Stocks are processed in keyset ranges of pk, each range reconciled by a single
+    set-based query. With `dry_run` mismatches are only counted.
+    """
+    mismatched_count = 0
+    for lower_pk, upper_pk in _get_stock_pk_ranges(
+        UPDATE_STOCKS_QUANTITY_ALLOCATED_BATCH_SIZE
+    ):
+        mismatched_count += _reconcile_stocks_quantity_allocated(
+            lower_pk, upper_pk, dry_run
+        )
+
+    if dry_run:
         task_logger.info(
-            "Mismatch updating quantity_allocated: stock %d had "
-            "%d allocated, but should have %d.",
-            mismatched_stock.pk,
-            mismatched_stock.quantity_allocated,
-            allocations_allocated,
-        )
-        mismatched_stock.quantity_allocated = allocations_allocated
-        stocks_to_update.append(mismatched_stock)
-
-    Stock.objects.bulk_update(stocks_to_update, ["quantity_allocated"])
-    task_logger.info(
-        "Finished updating quantity_allocated on stocks, %d were corrected.",
-        len(stocks_to_update),
+            "Dry run of updating quantity_allocated on stocks, %d are mismatched.",
+            mismatched_count,
+        )
+    else:
+        task_logger.info(
+            "Finished updating quantity_allocated on stocks, %d were corrected.",
+            mismatched_count,
+        )
+    return mismatched_count
+
+
+@app.task
+def rebalance_stock_shards_task():
+    """Return the quantity released since the last rebalance to the stock shards."""
+    stock_ids = sorted(get_sharded_stock_ids())
+    for index in range(0, len(stock_ids), REBALANCE_STOCK_SHARDS_BATCH_SIZE):
+        rebalance_stock_shards(
+            stock_ids[index : index + REBALANCE_STOCK_SHARDS_BATCH_SIZE]
+        )
+    if stock_ids:
+        task_logger.debug("Rebalanced shards of %s stocks", len(stock_ids))
+
+
+@app.task(expires=settings.BEAT_UPDATE_VARIANTS_AVAILABILITY_EXPIRE_AFTER_SEC)
+def update_variants_availability_task():
+    """Apply pending changes to the variants availability projection.
+
+    Markers of all variants changed are first expanded to changes of the stocked
+    variants. The changes are applied in batches of variants until none are left
+    or until the next scheduled run is due, which continues the work. When there
+    are no pending changes, project the availability of stocked variants that
+    aren't projected yet.
+    """
+    expiration_date = timezone.now() + timedelta(
+        seconds=settings.BEAT_UPDATE_VARIANTS_AVAILABILITY_SEC
+    )
+    expand_all_variants_availability_changes(
+        EXPAND_VARIANTS_AVAILABILITY_CHANGES_BATCH_SIZE
+    )
+    # loaded once for all the batches, only when there are variants to update
+    configuration = None
+    updated_count = 0
+    while expiration_date > timezone.now():
+        change_ids, variant_ids = _get_variants_availability_changes()
+        if not variant_ids:
+            break
+        configuration = configuration or get_channels_shipping_configuration()
+        update_variants_availability(variant_ids, configuration)
+        # only the changes read before the update are applied, the ones recorded
+        # meanwhile are handled by the next batch
+        VariantAvailabilityChange.objects.filter(pk__in=change_ids).delete()
+        updated_count += len(variant_ids)
+    else:
+        task_logger.warning("Task invocation time limit reached, aborting task")
+
+    if not updated_count:
+        variant_ids = set(
+            ProductVariant.objects.filter(
+                Exists(Stock.objects.filter(product_variant_id=OuterRef("pk"))),
+                ~Exists(
+                    VariantAvailability.objects.filter(
+                        product_variant_id=OuterRef("pk")
+                    )
+                ),
+            )
+            .order_by("pk")
+            .values_list("pk", flat=True)[:VARIANTS_AVAILABILITY_BATCH_SIZE]
+        )
+        if not variant_ids:
+            return
+        update_variants_availability(variant_ids, configuration)
+        updated_count = len(variant_ids)
+    task_logger.debug("Updated availability of %s variants", updated_count)
+
+
+def _get_variants_availability_changes():
+    """Return pending changes of the variants that were changed first.
+
+    All changes recorded for a variant are returned together, so every variant
+    is updated once per batch no matter how many times it was changed.
+    """
+    variant_ids = list(
+        VariantAvailabilityChange.objects.filter(product_variant_id__isnull=False)
+        .values("product_variant_id")
+        .annotate(first_change_id=Min("pk"))
+        .order_by("first_change_id")
+        .values_list("product_variant_id", flat=True)[:VARIANTS_AVAILABILITY_BATCH_SIZE]
+    )
+    change_ids = list(
+        VariantAvailabilityChange.objects.filter(
+            product_variant_id__in=variant_ids
+        ).values_list("pk", flat=True)
     )
+    return change_ids, set(variant_ids)
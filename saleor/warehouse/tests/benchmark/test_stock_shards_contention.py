@@ -0,0 +1,81 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from django.db import connection
+
+from ....core.exceptions import InsufficientStock
+from ....order.fetch import OrderLineInfo
+from ....order.models import OrderLine
+from ....plugins.manager import get_plugins_manager
+from ...management import allocate_stocks
+from ...models import Allocation
+from ...shards import rebalance_stock_shards
+
+logger = logging.getLogger(__name__)
+
+COUNTRY_CODE = "US"
+WORKERS = 4
+LINES_PER_WORKER = 5
+STOCK_QUANTITY = 15
+
+
+def _allocate_lines(lines, channel):
+    allocated = 0
+    try:
+        for line in lines:
+            line_data = OrderLineInfo(line=line, variant=line.variant, quantity=1)
+            try:
+                allocate_stocks(
+                    [line_data], COUNTRY_CODE, channel, manager=get_plugins_manager()
+                )
+            except InsufficientStock:
+                continue
+            allocated += 1
+    finally:
+        connection.close()
+    return allocated
+
+
+@pytest.mark.parametrize("stock_shards_count", [0, 4])
+def test_concurrent_allocations_do_not_oversell(
+    stock_shards_count, order_line, stock, channel_USD, transactional_db
+):
+    # given
+    variant = stock.product_variant
+    variant.stock_shards_count = stock_shards_count
+    variant.save(update_fields=["stock_shards_count"])
+    stock.quantity = STOCK_QUANTITY
+    stock.save(update_fields=["quantity"])
+    rebalance_stock_shards([stock.pk])
+
+    lines = [order_line]
+    for _ in range(WORKERS * LINES_PER_WORKER - 1):
+        line = OrderLine.objects.get(pk=order_line.pk)
+        line.pk = None
+        line.save()
+        lines.append(line)
+    lines_per_worker = [lines[index::WORKERS] for index in range(WORKERS)]
+
+    # when
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=WORKERS) as executor:
+        allocated = sum(
+            executor.map(_allocate_lines, lines_per_worker, [channel_USD] * WORKERS)
+        )
+    duration = time.monotonic() - start
+
+    # then
+    rebalance_stock_shards([stock.pk])
+    stock.refresh_from_db()
+    allocations_count = Allocation.objects.filter(stock=stock).count()
+    assert allocations_count == allocated == STOCK_QUANTITY
+    assert stock.quantity_allocated == STOCK_QUANTITY
+    logger.info(
+        "Allocated %s lines with %s stock shards in %.3fs (%.1f lines/s).",
+        allocated,
+        stock_shards_count,
+        duration,
+        allocated / duration,
+    )
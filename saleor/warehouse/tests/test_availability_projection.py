@@ -0,0 +1,265 @@
+from datetime import timedelta
+from unittest.mock import ANY, patch
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.utils import timezone
+
+from ...product.models import ProductVariant
+from ..availability_projection import (
+    VARIANTS_AVAILABILITY_BATCH_SIZE,
+    calculate_variants_availability,
+    expand_all_variants_availability_changes,
+    get_channels_shipping_configuration,
+    get_projected_available_quantities,
+    get_variants_availability_mismatches,
+    mark_all_variants_availability_changed,
+    mark_variants_availability_changed,
+    update_variants_availability,
+)
+from ..models import (
+    Allocation,
+    Reservation,
+    Stock,
+    VariantAvailability,
+    VariantAvailabilityChange,
+)
+from ..tasks import update_variants_availability_task
+
+COUNTRY_CODE = "US"
+RESERVATION_LENGTH = 5
+
+
+def _get_projected_quantity(variant_id, channel_slug, reservations_enabled=False):
+    return get_projected_available_quantities(
+        [variant_id], COUNTRY_CODE, channel_slug, reservations_enabled, "default"
+    ).get(variant_id)
+
+
+def test_calculate_variants_availability(stock, channel_USD, order_line):
+    # given
+    Allocation.objects.create(order_line=order_line, stock=stock, quantity_allocated=3)
+
+    # when
+    availabilities = calculate_variants_availability([stock.product_variant_id])
+
+    # then
+    availability_by_country = {
+        availability.country_code: availability
+        for availability in availabilities
+        if availability.channel_id == channel_USD.pk
+    }
+    assert availability_by_country[COUNTRY_CODE].quantity == 12
+    assert availability_by_country[COUNTRY_CODE].quantity_ignoring_reservations == 12
+    assert availability_by_country[""].quantity == 12
+
+
+def test_calculate_variants_availability_with_reservations(
+    stock, channel_USD, checkout_line
+):
+    # given
+    reserved_until = timezone.now() + timedelta(minutes=RESERVATION_LENGTH)
+    Reservation.objects.create(
+        checkout_line=checkout_line,
+        stock=stock,
+        quantity_reserved=5,
+        reserved_until=reserved_until,
+    )
+
+    # when
+    availabilities = calculate_variants_availability([stock.product_variant_id])
+
+    # then
+    availability = next(
+        availability
+        for availability in availabilities
+        if availability.channel_id == channel_USD.pk
+        and availability.country_code == COUNTRY_CODE
+    )
+    assert availability.quantity == 10
+    assert availability.quantity_ignoring_reservations == 15
+    assert availability.reservations_expire_at == reserved_until
+
+
+def test_update_variants_availability(stock, channel_USD):
+    # when
+    update_variants_availability([stock.product_variant_id])
+
+    # then
+    assert _get_projected_quantity(stock.product_variant_id, channel_USD.slug) == 15
+
+
+def test_projected_quantity_skipped_for_pending_change(stock, channel_USD):
+    # given
+    update_variants_availability([stock.product_variant_id])
+
+    # when
+    mark_variants_availability_changed([stock.product_variant_id, None])
+
+    # then
+    assert _get_projected_quantity(stock.product_variant_id, channel_USD.slug) is None
+
+
+def test_projected_quantity_skipped_for_expired_reservations(
+    stock, channel_USD, checkout_line
+):
+    # given
+    Reservation.objects.create(
+        checkout_line=checkout_line,
+        stock=stock,
+        quantity_reserved=5,
+        reserved_until=timezone.now() + timedelta(minutes=RESERVATION_LENGTH),
+    )
+    update_variants_availability([stock.product_variant_id])
+    variant_id = stock.product_variant_id
+
+    # when
+    VariantAvailability.objects.update(
+        reservations_expire_at=timezone.now() - timedelta(minutes=1)
+    )
+
+    # then
+    assert _get_projected_quantity(variant_id, channel_USD.slug, True) is None
+    assert _get_projected_quantity(variant_id, channel_USD.slug, False) == 15
+
+
+def test_update_variants_availability_task_applies_changes(stock, channel_USD):
+    # given
+    update_variants_availability([stock.product_variant_id])
+    stock.quantity = 5
+    stock.save(update_fields=["quantity"])
+    mark_variants_availability_changed([stock.product_variant_id])
+
+    # when
+    update_variants_availability_task()
+
+    # then
+    assert not VariantAvailabilityChange.objects.exists()
+    assert _get_projected_quantity(stock.product_variant_id, channel_USD.slug) == 5
+
+
+def test_update_variants_availability_task_deduplicates_changes(stock, channel_USD):
+    # given
+    update_variants_availability([stock.product_variant_id])
+    stock.quantity = 5
+    stock.save(update_fields=["quantity"])
+    for _ in range(VARIANTS_AVAILABILITY_BATCH_SIZE + 1):
+        mark_variants_availability_changed([stock.product_variant_id])
+
+    # when
+    with patch(
+        "saleor.warehouse.tasks.update_variants_availability",
+        wraps=update_variants_availability,
+    ) as update_mock:
+        update_variants_availability_task()
+
+    # then
+    update_mock.assert_called_once_with({stock.product_variant_id}, ANY)
+    assert not VariantAvailabilityChange.objects.exists()
+    assert _get_projected_quantity(stock.product_variant_id, channel_USD.slug) == 5
+
+
+@patch("saleor.warehouse.tasks.VARIANTS_AVAILABILITY_BATCH_SIZE", 1)
+def test_update_variants_availability_task_drains_changes(stock, channel_USD):
+    # given
+    variant = stock.product_variant
+    other_variant = ProductVariant.objects.create(
+        product=variant.product, sku="other-sku"
+    )
+    Stock.objects.create(
+        product_variant=other_variant, warehouse=stock.warehouse, quantity=15
+    )
+    variant_ids = [variant.pk, other_variant.pk]
+    update_variants_availability(variant_ids)
+    Stock.objects.update(quantity=1)
+    mark_variants_availability_changed(variant_ids)
+
+    # when
+    with patch(
+        "saleor.warehouse.tasks.get_channels_shipping_configuration",
+        wraps=get_channels_shipping_configuration,
+    ) as get_configuration_mock:
+        update_variants_availability_task()
+
+    # then
+    assert not VariantAvailabilityChange.objects.exists()
+    for variant_id in variant_ids:
+        assert _get_projected_quantity(variant_id, channel_USD.slug) == 1
+    get_configuration_mock.assert_called_once_with()
+
+
+def test_update_variants_availability_task_projects_new_variants(stock, channel_USD):
+    # when
+    update_variants_availability_task()
+
+    # then
+    assert _get_projected_quantity(stock.product_variant_id, channel_USD.slug) == 15
+
+
+def test_mark_all_variants_availability_changed(stock, channel_USD):
+    # given
+    update_variants_availability([stock.product_variant_id])
+
+    # when
+    mark_all_variants_availability_changed()
+
+    # then
+    change = VariantAvailabilityChange.objects.get()
+    assert change.product_variant_id is None
+    assert _get_projected_quantity(stock.product_variant_id, channel_USD.slug) is None
+
+
+def test_expand_all_variants_availability_changes(stocks_for_cc, channel_USD):
+    # given
+    mark_all_variants_availability_changed()
+
+    # when
+    expand_all_variants_availability_changes(batch_size=2)
+
+    # then
+    assert set(
+        VariantAvailabilityChange.objects.values_list("product_variant_id", flat=True)
+    ) == set(Stock.objects.values_list("product_variant_id", flat=True))
+
+
+def test_update_variants_availability_task_all_variants_changed(stock, channel_USD):
+    # given
+    update_variants_availability([stock.product_variant_id])
+    stock.quantity = 5
+    stock.save(update_fields=["quantity"])
+    mark_all_variants_availability_changed()
+
+    # when
+    update_variants_availability_task()
+
+    # then
+    assert not VariantAvailabilityChange.objects.exists()
+    assert _get_projected_quantity(stock.product_variant_id, channel_USD.slug) == 5
+
+
+def test_get_variants_availability_mismatches(stock):
+    # given
+    update_variants_availability([stock.product_variant_id])
+
+    # when
+    VariantAvailability.objects.update(quantity=1)
+
+    # then
+    assert get_variants_availability_mismatches([stock.product_variant_id]) == [
+        stock.product_variant_id
+    ]
+
+
+def test_check_variants_availability_command(stock, channel_USD):
+    # given
+    update_variants_availability([stock.product_variant_id])
+    VariantAvailability.objects.update(quantity=1)
+
+    # when
+    with pytest.raises(CommandError):
+        call_command("check_variants_availability")
+    call_command("check_variants_availability", "--fix")
+
+    # then
+    assert _get_projected_quantity(stock.product_variant_id, channel_USD.slug) == 15
+    call_command("check_variants_availability")
@@ -57,7 +57,7 @@ def test_preorder_reservation_skips_prev_reservation_delete_if_replace_is_disabl
         )
 
 
-def test_preorder_reservation_removes_previous_reservations_for_checkout(
+def test_preorder_reservation_replaces_previous_reservations_for_checkout(
     checkout_line_with_preorder_item, channel_USD
 ):
     checkout_line = checkout_line_with_preorder_item
@@ -71,16 +71,18 @@ def test_preorder_reservation_removes_previous_reservations_for_checkout(
         reserved_until=timezone.now() + timedelta(hours=1),
     )
 
+    reserved_until = timezone.now() + timedelta(minutes=RESERVATION_LENGTH)
     reserve_preorders(
         [checkout_line],
         [checkout_line.variant],
         COUNTRY_CODE,
         channel_USD.slug,
-        timezone.now() + timedelta(minutes=RESERVATION_LENGTH),
+        reserved_until,
     )
 
-    with pytest.raises(PreorderReservation.DoesNotExist):
-        previous_reservation.refresh_from_db()
+    reservation = PreorderReservation.objects.get(checkout_line=checkout_line)
+    assert reservation.pk == previous_reservation.pk
+    assert reservation.reserved_until == reserved_until
 
 
 def test_preorder_reservation_fails_if_there_is_not_enough_channel_threshold_available(
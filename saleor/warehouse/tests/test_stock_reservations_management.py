@@ -173,7 +173,7 @@ def test_multiple_stocks_reserved_if_single_stock_is_not_enough_sorting_order_st
     assert reservation.reserved_until > timezone.now() + timedelta(minutes=1)
 
 
-def test_stocks_reservation_removes_previous_reservations_for_checkout(
+def test_stocks_reservation_replaces_previous_reservations_for_checkout(
     checkout_line, channel_USD
 ):
     checkout_line.quantity = 5
@@ -190,6 +190,39 @@ def test_stocks_reservation_removes_previous_reservations_for_checkout(
         reserved_until=timezone.now() + timedelta(hours=1),
     )
 
+    reserved_until = timezone.now() + timedelta(minutes=RESERVATION_LENGTH)
+    reserve_stocks(
+        [checkout_line],
+        [checkout_line.variant],
+        COUNTRY_CODE,
+        channel_USD,
+        reserved_until,
+    )
+
+    reservation = Reservation.objects.get(checkout_line=checkout_line)
+    assert reservation.pk == previous_reservation.pk
+    assert reservation.reserved_until == reserved_until
+
+
+def test_stocks_reservation_updates_changed_reservation_in_place(
+    checkout_line, channel_USD
+):
+    # given
+    checkout_line.quantity = 7
+    checkout_line.save()
+
+    stock = Stock.objects.get(product_variant=checkout_line.variant)
+    stock.quantity = 10
+    stock.save(update_fields=["quantity"])
+
+    previous_reservation = Reservation.objects.create(
+        checkout_line=checkout_line,
+        stock=stock,
+        quantity_reserved=5,
+        reserved_until=timezone.now() + timedelta(hours=1),
+    )
+
+    # when
     reserve_stocks(
         [checkout_line],
         [checkout_line.variant],
@@ -198,8 +231,113 @@ def test_stocks_reservation_removes_previous_reservations_for_checkout(
         timezone.now() + timedelta(minutes=RESERVATION_LENGTH),
     )
 
-    with pytest.raises(Reservation.DoesNotExist):
-        previous_reservation.refresh_from_db()
+    # then
+    reservation = Reservation.objects.get(checkout_line=checkout_line)
+    assert reservation.pk == previous_reservation.pk
+    assert reservation.quantity_reserved == 7
+
+
+def test_stocks_reservation_prolongs_unchanged_reservation(checkout_line, channel_USD):
+    # given
+    checkout_line.quantity = 5
+    checkout_line.save()
+
+    stock = Stock.objects.get(product_variant=checkout_line.variant)
+    Reservation.objects.create(
+        checkout_line=checkout_line,
+        stock=stock,
+        quantity_reserved=5,
+        reserved_until=timezone.now() + timedelta(minutes=1),
+    )
+    # the line is not reserved again, so the stock quantity is not validated
+    stock.quantity = 0
+    stock.save(update_fields=["quantity"])
+    reserved_until = timezone.now() + timedelta(minutes=RESERVATION_LENGTH)
+
+    # when
+    reserve_stocks(
+        [checkout_line],
+        [checkout_line.variant],
+        COUNTRY_CODE,
+        channel_USD,
+        reserved_until,
+    )
+
+    # then
+    reservation = Reservation.objects.get(checkout_line=checkout_line)
+    assert reservation.quantity_reserved == 5
+    assert reservation.reserved_until == reserved_until
+
+
+def test_stocks_reservation_reserves_line_with_expired_reservation_again(
+    checkout_line, channel_USD
+):
+    # given
+    checkout_line.quantity = 5
+    checkout_line.save()
+
+    stock = Stock.objects.get(product_variant=checkout_line.variant)
+    Reservation.objects.create(
+        checkout_line=checkout_line,
+        stock=stock,
+        quantity_reserved=5,
+        reserved_until=timezone.now() - timedelta(minutes=1),
+    )
+    stock.quantity = 3
+    stock.save(update_fields=["quantity"])
+
+    # when
+    with pytest.raises(InsufficientStock):
+        reserve_stocks(
+            [checkout_line],
+            [checkout_line.variant],
+            COUNTRY_CODE,
+            channel_USD,
+            timezone.now() + timedelta(minutes=RESERVATION_LENGTH),
+        )
+
+
+def test_stocks_reservation_does_not_prolong_expired_reservation(
+    checkout_line, channel_USD, warehouse_no_shipping_zone
+):
+    # given
+    checkout_line.quantity = 5
+    checkout_line.save()
+
+    stock = Stock.objects.get(product_variant=checkout_line.variant)
+    Reservation.objects.create(
+        checkout_line=checkout_line,
+        stock=stock,
+        quantity_reserved=5,
+        reserved_until=timezone.now() + timedelta(minutes=1),
+    )
+    expired_reserved_until = timezone.now() - timedelta(minutes=1)
+    expired_reservation = Reservation.objects.create(
+        checkout_line=checkout_line,
+        stock=Stock.objects.create(
+            product_variant=checkout_line.variant,
+            warehouse=warehouse_no_shipping_zone,
+            quantity=10,
+        ),
+        quantity_reserved=3,
+        reserved_until=expired_reserved_until,
+    )
+    reserved_until = timezone.now() + timedelta(minutes=RESERVATION_LENGTH)
+
+    # when
+    reserve_stocks(
+        [checkout_line],
+        [checkout_line.variant],
+        COUNTRY_CODE,
+        channel_USD,
+        reserved_until,
+    )
+
+    # then
+    reservation = Reservation.objects.get(checkout_line=checkout_line, stock=stock)
+    assert reservation.reserved_until == reserved_until
+    expired_reservation.refresh_from_db()
+    assert expired_reservation.reserved_until == expired_reserved_until
 
 
 def test_stock_reservation_fails_if_there_is_not_enough_stock_available(
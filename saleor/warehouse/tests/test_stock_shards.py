@@ -0,0 +1,346 @@
+from datetime import timedelta
+
+import pytest
+from django.db import DatabaseError, transaction
+from django.utils import timezone
+
+from ...core.exceptions import InsufficientStock
+from ...order.fetch import OrderLineInfo
+from ...plugins.manager import get_plugins_manager
+from ..management import allocate_stocks, deallocate_stock
+from ..models import Allocation, Reservation, Stock, StockShard
+from ..reservations import reserve_stocks
+from ..shards import (
+    claim_stock_shard,
+    get_sharded_stock_ids,
+    rebalance_stock_shards,
+    release_to_stock_shard,
+)
+from ..tasks import rebalance_stock_shards_task
+
+COUNTRY_CODE = "US"
+RESERVATION_LENGTH = 5
+
+
+def _shard_stock(stock):
+    variant = stock.product_variant
+    variant.stock_shards_count = 4
+    variant.save(update_fields=["stock_shards_count"])
+    stock.quantity = 10
+    stock.save(update_fields=["quantity"])
+    rebalance_stock_shards([stock.pk])
+    return stock
+
+
+@pytest.fixture
+def sharded_stock(stock):
+    return _shard_stock(stock)
+
+
+@pytest.fixture
+def checkout_line_sharded_stock(checkout_line):
+    return _shard_stock(Stock.objects.get(product_variant=checkout_line.variant))
+
+
+def _get_shard_quantities(stock):
+    return list(stock.shards.values_list("quantity", flat=True))
+
+
+def test_rebalance_stock_shards_splits_available_quantity(sharded_stock):
+    # then
+    assert _get_shard_quantities(sharded_stock) == [3, 3, 2, 2]
+
+
+def test_rebalance_stock_shards_includes_allocations_and_reservations(
+    sharded_stock, order_line, checkout_line
+):
+    # given
+    Allocation.objects.create(
+        order_line=order_line, stock=sharded_stock, quantity_allocated=3
+    )
+    Reservation.objects.create(
+        checkout_line=checkout_line,
+        stock=sharded_stock,
+        quantity_reserved=2,
+        reserved_until=timezone.now() + timedelta(minutes=RESERVATION_LENGTH),
+    )
+
+    # when
+    rebalance_stock_shards([sharded_stock.pk])
+
+    # then
+    assert _get_shard_quantities(sharded_stock) == [2, 1, 1, 1]
+
+
+def test_rebalance_stock_shards_removes_shards_of_not_sharded_variant(
+    sharded_stock,
+):
+    # given
+    variant = sharded_stock.product_variant
+    variant.stock_shards_count = 0
+    variant.save(update_fields=["stock_shards_count"])
+
+    # when
+    rebalance_stock_shards_task()
+
+    # then
+    assert not StockShard.objects.exists()
+    assert get_sharded_stock_ids() == []
+
+
+def test_claim_stock_shard(sharded_stock):
+    # when
+    claimed = claim_stock_shard(sharded_stock.pk, 3)
+
+    # then
+    assert claimed
+    assert sum(_get_shard_quantities(sharded_stock)) == 7
+
+
+def test_claim_stock_shard_exceeding_single_shard(sharded_stock):
+    # when
+    claimed = claim_stock_shard(sharded_stock.pk, 4)
+
+    # then
+    assert not claimed
+    assert sum(_get_shard_quantities(sharded_stock)) == 10
+
+
+def test_release_to_stock_shard(sharded_stock):
+    # when
+    released = release_to_stock_shard(sharded_stock.pk, 2)
+
+    # then
+    assert released
+    assert sum(_get_shard_quantities(sharded_stock)) == 12
+
+
+def test_allocate_stocks_from_stock_shard(order_line, sharded_stock, channel_USD):
+    # given
+    line_data = OrderLineInfo(line=order_line, variant=order_line.variant, quantity=2)
+
+    # when
+    allocate_stocks(
+        [line_data], COUNTRY_CODE, channel_USD, manager=get_plugins_manager()
+    )
+
+    # then
+    allocation = Allocation.objects.get(order_line=order_line, stock=sharded_stock)
+    assert allocation.quantity_allocated == 2
+    sharded_stock.refresh_from_db()
+    assert sharded_stock.quantity_allocated == 2
+    assert sum(_get_shard_quantities(sharded_stock)) == 8
+
+    rebalance_stock_shards_task()
+    sharded_stock.refresh_from_db()
+    assert sharded_stock.quantity_allocated == 2
+    assert _get_shard_quantities(sharded_stock) == [2, 2, 2, 2]
+
+
+def test_allocate_stocks_from_stock_shard_rolled_back(
+    order_line, sharded_stock, channel_USD
+):
+    # given
+    line_data = OrderLineInfo(line=order_line, variant=order_line.variant, quantity=2)
+
+    # when
+    with pytest.raises(DatabaseError):
+        with transaction.atomic():
+            allocate_stocks(
+                [line_data], COUNTRY_CODE, channel_USD, manager=get_plugins_manager()
+            )
+            raise DatabaseError()
+
+    # then
+    assert not Allocation.objects.filter(order_line=order_line).exists()
+    sharded_stock.refresh_from_db()
+    assert sharded_stock.quantity_allocated == 0
+    assert sum(_get_shard_quantities(sharded_stock)) == 10
+
+
+def test_deallocate_stock_allocated_from_stock_shard(
+    order_line, sharded_stock, channel_USD
+):
+    # given
+    line_data = OrderLineInfo(line=order_line, variant=order_line.variant, quantity=2)
+    allocate_stocks(
+        [line_data], COUNTRY_CODE, channel_USD, manager=get_plugins_manager()
+    )
+
+    # when
+    deallocate_stock([line_data], manager=get_plugins_manager())
+
+    # then
+    sharded_stock.refresh_from_db()
+    assert sharded_stock.quantity_allocated == 0
+
+
+def test_allocate_stocks_from_stock_shard_releases_checkout_reservation(
+    order_line, checkout_line, checkout_line_sharded_stock, channel_USD
+):
+    # given
+    checkout_line.quantity = 3
+    checkout_line.save(update_fields=["quantity"])
+    reserve_stocks(
+        [checkout_line],
+        [checkout_line_sharded_stock.product_variant],
+        COUNTRY_CODE,
+        channel_USD,
+        timezone.now() + timedelta(minutes=RESERVATION_LENGTH),
+    )
+    order_line.variant = checkout_line.variant
+    order_line.save(update_fields=["variant"])
+    line_data = OrderLineInfo(line=order_line, variant=order_line.variant, quantity=3)
+
+    # when
+    allocate_stocks(
+        [line_data],
+        COUNTRY_CODE,
+        channel_USD,
+        manager=get_plugins_manager(),
+        check_reservations=True,
+        checkout_lines=[checkout_line],
+    )
+
+    # then
+    allocation = Allocation.objects.get(
+        order_line=order_line, stock=checkout_line_sharded_stock
+    )
+    assert allocation.quantity_allocated == 3
+    assert sum(_get_shard_quantities(checkout_line_sharded_stock)) == 7
+
+
+def test_allocate_stocks_falls_back_when_stock_shards_exhausted(
+    order_line, sharded_stock, channel_USD
+):
+    # given
+    line_data = OrderLineInfo(line=order_line, variant=order_line.variant, quantity=8)
+
+    # when
+    allocate_stocks(
+        [line_data], COUNTRY_CODE, channel_USD, manager=get_plugins_manager()
+    )
+
+    # then
+    allocation = Allocation.objects.get(order_line=order_line, stock=sharded_stock)
+    assert allocation.quantity_allocated == 8
+    sharded_stock.refresh_from_db()
+    assert sharded_stock.quantity_allocated == 8
+    assert _get_shard_quantities(sharded_stock) == [1, 1, 0, 0]
+
+
+def test_allocate_stocks_sharded_insufficient_stock(
+    order_line, sharded_stock, channel_USD
+):
+    # given
+    line_data = OrderLineInfo(line=order_line, variant=order_line.variant, quantity=11)
+
+    # when
+    with pytest.raises(InsufficientStock):
+        allocate_stocks(
+            [line_data], COUNTRY_CODE, channel_USD, manager=get_plugins_manager()
+        )
+
+    # then
+    assert not Allocation.objects.exists()
+    assert sum(_get_shard_quantities(sharded_stock)) == 10
+
+
+def test_reserve_stocks_from_stock_shard(
+    checkout_line, checkout_line_sharded_stock, channel_USD
+):
+    # given
+    checkout_line.quantity = 3
+    checkout_line.save(update_fields=["quantity"])
+
+    # when
+    reserve_stocks(
+        [checkout_line],
+        [checkout_line_sharded_stock.product_variant],
+        COUNTRY_CODE,
+        channel_USD,
+        timezone.now() + timedelta(minutes=RESERVATION_LENGTH),
+    )
+
+    # then
+    reservation = Reservation.objects.get(
+        checkout_line=checkout_line, stock=checkout_line_sharded_stock
+    )
+    assert reservation.quantity_reserved == 3
+    assert sum(_get_shard_quantities(checkout_line_sharded_stock)) == 7
+
+
+def test_reserve_stocks_from_stock_shard_replaces_reservation(
+    checkout_line, checkout_line_sharded_stock, channel_USD
+):
+    # given
+    checkout_line.quantity = 3
+    checkout_line.save(update_fields=["quantity"])
+    reserve_stocks(
+        [checkout_line],
+        [checkout_line_sharded_stock.product_variant],
+        COUNTRY_CODE,
+        channel_USD,
+        timezone.now() + timedelta(minutes=RESERVATION_LENGTH),
+    )
+
+    # when
+    reserve_stocks(
+        [checkout_line],
+        [checkout_line_sharded_stock.product_variant],
+        COUNTRY_CODE,
+        channel_USD,
+        timezone.now() + timedelta(minutes=RESERVATION_LENGTH),
+    )
+
+    # then
+    reservation = Reservation.objects.get(
+        checkout_line=checkout_line, stock=checkout_line_sharded_stock
+    )
+    assert reservation.quantity_reserved == 3
+    assert sum(_get_shard_quantities(checkout_line_sharded_stock)) == 7
+
+
+def test_reserve_stocks_falls_back_when_stock_shards_exhausted(
+    checkout_line, checkout_line_sharded_stock, channel_USD
+):
+    # given
+    checkout_line.quantity = 9
+    checkout_line.save(update_fields=["quantity"])
+
+    # when
+    reserve_stocks(
+        [checkout_line],
+        [checkout_line_sharded_stock.product_variant],
+        COUNTRY_CODE,
+        channel_USD,
+        timezone.now() + timedelta(minutes=RESERVATION_LENGTH),
+    )
+
+    # then
+    reservation = Reservation.objects.get(
+        checkout_line=checkout_line, stock=checkout_line_sharded_stock
+    )
+    assert reservation.quantity_reserved == 9
+    assert _get_shard_quantities(checkout_line_sharded_stock) == [1, 0, 0, 0]
+
+
+def test_reserve_stocks_sharded_insufficient_stock(
+    checkout_line, checkout_line_sharded_stock, channel_USD
+):
+    # given
+    checkout_line.quantity = 11
+    checkout_line.save(update_fields=["quantity"])
+
+    # when
+    with pytest.raises(InsufficientStock):
+        reserve_stocks(
+            [checkout_line],
+            [checkout_line_sharded_stock.product_variant],
+            COUNTRY_CODE,
+            channel_USD,
+            timezone.now() + timedelta(minutes=RESERVATION_LENGTH),
+        )
+
+    # then
+    assert not Reservation.objects.exists()
@@ -1,9 +1,16 @@
 from datetime import timedelta
+from unittest.mock import patch
 
 import pytest
 from django.utils import timezone
 
-from ..models import PreorderReservation, Reservation
+from ..models import (
+    Allocation,
+    PreorderReservation,
+    Reservation,
+    Stock,
+    VariantAvailabilityChange,
+)
 from ..tasks import (
     delete_expired_reservations_task,
     update_stocks_quantity_allocated_task,
@@ -48,6 +55,28 @@ def test_delete_expired_reservations_task_skips_active_preorder_reservations(
     assert PreorderReservation.objects.count() == reservations_count
 
 
+def test_delete_expired_reservations_task_marks_variants_availability_changed(
+    checkout_line_with_reservation_in_many_stocks,
+):
+    Reservation.objects.update(reserved_until=timezone.now() - timedelta(seconds=1))
+    delete_expired_reservations_task()
+    assert VariantAvailabilityChange.objects.filter(
+        product_variant=checkout_line_with_reservation_in_many_stocks.variant
+    ).exists()
+
+
+@patch("saleor.warehouse.tasks.delete_expired_reservations_task.delay")
+@patch("saleor.warehouse.tasks.EXPIRED_RESERVATIONS_BATCH_SIZE", 1)
+def test_delete_expired_reservations_task_deletes_in_batches(
+    mocked_delay, checkout_line_with_reservation_in_many_stocks
+):
+    reservations_count = Reservation.objects.count()
+    Reservation.objects.update(reserved_until=timezone.now() - timedelta(seconds=1))
+    delete_expired_reservations_task()
+    assert Reservation.objects.count() == reservations_count - 1
+    mocked_delay.assert_called_once_with()
+
+
 @pytest.mark.parametrize(
     "allocation_allocated, stock_allocated, expected",
     (
@@ -85,3 +114,52 @@ def test_update_stocks_quantity_allocated_task_stock_without_allocations(stock):
 
     stock.refresh_from_db()
     assert stock.quantity_allocated == 0
+
+
+def test_update_stocks_quantity_allocated_task_marks_availability_changed(
+    allocation, stock
+):
+    # given
+    mismatched_stock = allocation.stock
+    mismatched_stock.quantity_allocated = allocation.quantity_allocated + 1
+    mismatched_stock.save(update_fields=["quantity_allocated"])
+    VariantAvailabilityChange.objects.all().delete()
+
+    # when
+    update_stocks_quantity_allocated_task()
+
+    # then
+    assert list(
+        VariantAvailabilityChange.objects.values_list("product_variant_id", flat=True)
+    ) == [mismatched_stock.product_variant_id]
+
+
+def test_update_stocks_quantity_allocated_task_dry_run(allocation):
+    allocation.quantity_allocated = 10
+    allocation.save(update_fields=["quantity_allocated"])
+    stock = allocation.stock
+    stock.quantity_allocated = 9
+    stock.save(update_fields=["quantity_allocated"])
+
+    mismatched_count = update_stocks_quantity_allocated_task(dry_run=True)
+
+    stock.refresh_from_db()
+    assert mismatched_count == 1
+    assert stock.quantity_allocated == 9
+
+
+def test_update_stocks_quantity_allocated_task_in_batches(stocks_for_cc, monkeypatch):
+    monkeypatch.setattr(
+        "saleor.warehouse.tasks.UPDATE_STOCKS_QUANTITY_ALLOCATED_BATCH_SIZE", 2
+    )
+    Allocation.objects.all().delete()
+    stocks = Stock.objects.order_by("pk")
+    stocks.update(quantity_allocated=5)
+    correct_stock = stocks.first()
+    correct_stock.quantity_allocated = 0
+    correct_stock.save(update_fields=["quantity_allocated"])
+
+    mismatched_count = update_stocks_quantity_allocated_task()
+
+    assert mismatched_count == Stock.objects.count() - 1
+    assert not Stock.objects.exclude(quantity_allocated=0).exists()
@@ -1,22 +1,96 @@
+import atexit
+import logging
 import math
+import os
 import pickle
+import threading
 import zlib
-from typing import Any, Dict, List, Optional, Tuple
+from collections import deque
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
 
 from asgiref.local import Local
 from django.conf import settings
 from redis import ConnectionPool, Redis
 
 from .exceptions import ConnectionNotConfigured
+from .payload_schema import JsonTruncText, ObservabilityEventTypes
 
+logger = logging.getLogger(__name__)
 KEY_TYPE = str
 DEFAULT_CONNECTION_TIMEOUT = 0.5
 _local = Local()
+PICKLE_VERSION = 5
+# zlib header flag set when the data was compressed with a preset dictionary
+ZLIB_FDICT_FLAG = 0x20
+
+
+@lru_cache(maxsize=None)
+def get_preset_dictionary() -> bytes:
+    """Return pickled skeletons of the observability events.
+
+    The skeletons are used as the zlib preset dictionary, so the field names and
+    class paths that every event repeats don't have to be stored in each entry.
+    """
+    text = JsonTruncText()
+    headers = [("Content-Type", "application/json"), ("Content-Length", "")]
+    app = {"id": "", "name": ""}
+    api_call = {
+        "event_type": ObservabilityEventTypes.API_CALL,
+        "request": {
+            "id": "",
+            "method": "POST",
+            "url": "",
+            "time": 0.0,
+            "headers": headers,
+            "content_length": 0,
+        },
+        "response": {"headers": headers, "status_code": 200, "content_length": 0},
+        "app": app,
+        "gql_operations": [
+            {
+                "name": text,
+                "operation_type": "query",
+                "query": text,
+                "result": text,
+                "result_invalid": False,
+            }
+        ],
+    }
+    event_delivery_attempt = {
+        "event_type": ObservabilityEventTypes.EVENT_DELIVERY_ATTEMPT,
+        "id": "",
+        "time": datetime(2000, 1, 1, tzinfo=timezone.utc),
+        "duration": 0.0,
+        "status": "success",
+        "next_retry": None,
+        "request": {"headers": headers},
+        "response": {
+            "headers": headers,
+            "status_code": 200,
+            "content_length": 0,
+            "body": text,
+        },
+        "event_delivery": {
+            "id": "",
+            "status": "success",
+            "event_type": "",
+            "event_sync": False,
+            "payload": {"content_length": 0, "body": text},
+        },
+        "webhook": {"id": "", "name": "", "target_url": "", "subscription_query": text},
+        "app": app,
+    }
+    return pickle.dumps([event_delivery_attempt, api_call], PICKLE_VERSION)
 
 
 class BaseBuffer:
-    _compressor_preset = 6
-    _pickle_version = 5
+    # Fastest compression level. With the preset dictionary it compresses events
+    # better than the default level without it. Events stored with any other level
+    # or without the dictionary are still decoded.
+    _compressor_preset = 1
+    _pickle_version = PICKLE_VERSION
 
     def __init__(
         self,
@@ -35,11 +109,20 @@ class BaseBuffer:
         self.timeout = timeout
 
     def decode(self, value: bytes) -> Any:
-        return pickle.loads(zlib.decompress(value))
+        if len(value) > 1 and value[1] & ZLIB_FDICT_FLAG:
+            decompressor = zlib.decompressobj(zdict=get_preset_dictionary())
+            data = decompressor.decompress(value) + decompressor.flush()
+        else:
+            data = zlib.decompress(value)
+        return pickle.loads(data)
 
     def encode(self, value: Any) -> bytes:
-        return zlib.compress(
-            pickle.dumps(value, self._pickle_version), self._compressor_preset
+        compressor = zlib.compressobj(
+            self._compressor_preset, zdict=get_preset_dictionary()
+        )
+        return (
+            compressor.compress(pickle.dumps(value, self._pickle_version))
+            + compressor.flush()
         )
 
     def put_event(self, event: Any) -> int:
@@ -210,3 +293,117 @@ def get_buffer(
         connection_timeout=connection_timeout,
         timeout=timeout,
     )
+
+
+class LocalBuffer:
+    """Per-process ring buffer writing events to the shared buffer in batches.
+
+    Events are appended to a bounded deque, which doesn't need a lock, and written
+    to the shared buffer by a background thread in a single pipeline when
+    `flush_size` events are collected or every `flush_period` seconds. When
+    the ring buffer is full the oldest events are dropped.
+    """
+
+    def __init__(
+        self,
+        get_buffer: Callable[[], BaseBuffer],
+        max_size: int,
+        flush_size: int,
+        flush_period: float,
+    ):
+        self.get_buffer = get_buffer
+        self.max_size = max_size
+        self.flush_size = flush_size
+        self.flush_period = flush_period
+        self.dropped_events_count = 0
+        self._events: Deque[Any] = deque(maxlen=max_size)
+        self._not_flushed_dropped_events_count = 0
+        self._flush_requested = threading.Event()
+        self._flush_lock = threading.Lock()
+        self._thread_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        atexit.register(self.flush)
+
+    def put_event(self, event: Any):
+        if len(self._events) == self.max_size:
+            self._not_flushed_dropped_events_count += 1
+        self._events.append(event)
+        self._ensure_flush_thread()
+        if len(self._events) >= self.flush_size:
+            self._flush_requested.set()
+
+    def size(self) -> int:
+        return len(self._events)
+
+    def flush(self) -> int:
+        """Write the collected events to the shared buffer.
+
+        Return the number of events dropped since the previous flush.
+        """
+        with self._flush_lock:
+            events = []
+            while self._events:
+                try:
+                    events.append(self._events.popleft())
+                except IndexError:
+                    break
+            dropped = self._not_flushed_dropped_events_count
+            self._not_flushed_dropped_events_count = 0
+            if events:
+                try:
+                    dropped += self.get_buffer().put_events(events)
+                except Exception:
+                    logger.error("Could not flush observability events.", exc_info=True)
+                    dropped += len(events)
+            if dropped:
+                self.dropped_events_count += dropped
+                logger.warning(
+                    "Observability buffer full, %s events dropped.",
+                    dropped,
+                    extra={"dropped_events_count": dropped},
+                )
+            return dropped
+
+    def _ensure_flush_thread(self):
+        pid = os.getpid()
+        if self._pid == pid and self._thread and self._thread.is_alive():
+            return
+        with self._thread_lock:
+            if self._pid == pid and self._thread and self._thread.is_alive():
+                return
+            if self._pid is not None and self._pid != pid:
+                # The events collected before forking are flushed by the parent.
+                self._events.clear()
+                self._not_flushed_dropped_events_count = 0
+            self._pid = pid
+            self._thread = threading.Thread(
+                target=self._run, name="observability-buffer-flush", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            self._flush_requested.wait(self.flush_period)
+            self._flush_requested.clear()
+            self.flush()
+
+
+_local_buffers: Dict[KEY_TYPE, LocalBuffer] = {}
+_local_buffers_lock = threading.Lock()
+
+
+def get_local_buffer(key: KEY_TYPE) -> LocalBuffer:
+    if local_buffer := _local_buffers.get(key):
+        return local_buffer
+    with _local_buffers_lock:
+        if key not in _local_buffers:
+            _local_buffers[key] = LocalBuffer(
+                lambda: get_buffer(key),
+                max_size=settings.OBSERVABILITY_LOCAL_BUFFER_SIZE,
+                flush_size=settings.OBSERVABILITY_BUFFER_BATCH_SIZE,
+                flush_period=(
+                    settings.OBSERVABILITY_LOCAL_BUFFER_FLUSH_PERIOD.total_seconds()
+                ),
+            )
+        return _local_buffers[key]
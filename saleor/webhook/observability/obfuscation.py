@@ -21,7 +21,7 @@ from graphql.validation import validate
 from graphql.validation.rules.base import ValidationRule
 from graphql.validation.validation import ValidationContext
 
-from ...graphql.api import schema
+from ...graphql.api import get_schema
 from .sensitive_data import ALLOWED_HEADERS, SENSITIVE_HEADERS, SensitiveFieldsMap
 
 if TYPE_CHECKING:
@@ -202,7 +202,7 @@ def anonymize_event_payload(
     if not subscription_query:
         return payload
     graphql_backend = get_default_backend()
-    document = graphql_backend.document_from_string(schema, subscription_query)
+    document = graphql_backend.document_from_string(get_schema(), subscription_query)
     if _contain_sensitive_field(document, sensitive_fields):
         return MASK
     return payload
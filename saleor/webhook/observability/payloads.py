@@ -202,6 +202,7 @@ def generate_event_delivery_attempt_payload(
             "payload set. Can't generate payload."
         )
     response_body = attempt.response or ""
+    delivery_payload = attempt.delivery.payload.get_payload()
     payload = EventDeliveryAttemptPayload(
         id=graphene.Node.to_global_id("EventDeliveryAttempt", attempt.pk),
         event_type=ObservabilityEventTypes.EVENT_DELIVERY_ATTEMPT,
@@ -224,7 +225,7 @@ def generate_event_delivery_attempt_payload(
             event_type=attempt.delivery.event_type,
             event_sync=attempt.delivery.event_type in WebhookEventSyncType.ALL,
             payload=EventDeliveryPayload(
-                content_length=len(attempt.delivery.payload.payload.encode("utf-8")),
+                content_length=len(delivery_payload.encode("utf-8")),
                 body=TRUNC_PLACEHOLDER,
             ),
         ),
@@ -256,7 +257,7 @@ def generate_event_delivery_attempt_payload(
     payload["response"]["body"] = JsonTruncText.truncate(response_body, remaining // 2)
     remaining -= payload["response"]["body"].byte_size
 
-    event_delivery_payload = json.loads(attempt.delivery.payload.payload)
+    event_delivery_payload = json.loads(delivery_payload)
     event_delivery_payload = anonymize_event_payload(
         subscription_query,
         attempt.delivery.event_type,
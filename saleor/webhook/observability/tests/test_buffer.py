@@ -1,11 +1,16 @@
+import pickle
+import time
+import zlib
 from datetime import timedelta
 
 import pytest
+from django.http import JsonResponse
 from django.utils import timezone
 from freezegun import freeze_time
 
-from ..buffers import RedisBuffer, get_buffer
+from ..buffers import LocalBuffer, RedisBuffer, get_buffer, get_local_buffer
 from ..exceptions import ConnectionNotConfigured
+from ..payloads import generate_api_call_payload
 from ..tests.conftest import BATCH_SIZE, BROKER_URL_HOST, KEY, MAX_SIZE
 
 
@@ -114,6 +119,40 @@ def test_put_multi_key_events_when_buffer_full(patch_connection_pool):
     assert dropped == {key_a: 2, key_b: MAX_SIZE, key_c: MAX_SIZE * 2}
 
 
+def test_encode_decode_api_call_payload(buffer, app, rf, gql_operation_factory):
+    # given
+    request = rf.post(
+        "/graphql", data={"query": "{ shop { name } }"}, content_type="application/json"
+    )
+    request.app = app
+    result = {"data": {"shop": {"name": "Saleor e-commerce"}}}
+    payload = generate_api_call_payload(
+        request,
+        JsonResponse(result),
+        [gql_operation_factory("{ shop { name } }", None, None, result)],
+        1024,
+    )
+
+    # when
+    encoded = buffer.encode(payload)
+
+    # then
+    assert buffer.decode(encoded) == payload
+    assert len(encoded) < len(zlib.compress(pickle.dumps(payload, 5), 6))
+
+
+def test_decode_event_compressed_without_preset_dictionary(buffer):
+    # given
+    event = {"event": "data"}
+    encoded = zlib.compress(pickle.dumps(event, 5), 6)
+
+    # when
+    decoded = buffer.decode(encoded)
+
+    # then
+    assert decoded == event
+
+
 def test_pop_event(buffer):
     event = "buffer", {"event": "data"}
     buffer.put_event(event)
@@ -159,3 +198,67 @@ def test_pop_expired_events(buffer):
     with freeze_time(push_time + timedelta(seconds=buffer.timeout + 1)):
         popped_events = buffer.pop_events()
     assert popped_events == []
+
+
+@pytest.fixture
+def local_buffer(buffer):
+    return LocalBuffer(
+        lambda: buffer, max_size=MAX_SIZE, flush_size=BATCH_SIZE, flush_period=60
+    )
+
+
+def test_local_buffer_flush(local_buffer, buffer):
+    events = [{"event": f"data{i}"} for i in range(BATCH_SIZE - 1)]
+    for event in events:
+        local_buffer.put_event(event)
+
+    dropped = local_buffer.flush()
+
+    assert dropped == 0
+    assert local_buffer.size() == 0
+    assert buffer.pop_events() == events[: BATCH_SIZE - 1]
+
+
+def test_local_buffer_flushes_when_flush_size_reached(local_buffer, buffer):
+    for i in range(BATCH_SIZE):
+        local_buffer.put_event({"event": f"data{i}"})
+
+    for _ in range(100):
+        if buffer.size() == BATCH_SIZE:
+            break
+        time.sleep(0.01)
+    assert buffer.size() == BATCH_SIZE
+    assert local_buffer.size() == 0
+
+
+def test_local_buffer_drops_oldest_events_when_full(local_buffer, buffer):
+    local_buffer.flush_size = MAX_SIZE * 2
+    events = [{"event": f"data{i}"} for i in range(MAX_SIZE + 2)]
+    for event in events:
+        local_buffer.put_event(event)
+
+    dropped = local_buffer.flush()
+
+    assert dropped == 2
+    assert local_buffer.dropped_events_count == 2
+    assert buffer.size() == MAX_SIZE
+    assert buffer.pop_events() == events[2 : BATCH_SIZE + 2]
+
+
+def test_local_buffer_counts_events_not_flushed_as_dropped(local_buffer, redis_server):
+    local_buffer.put_event({"event": "data"})
+    redis_server.connected = False
+
+    dropped = local_buffer.flush()
+
+    assert dropped == 1
+    assert local_buffer.dropped_events_count == 1
+    assert local_buffer.size() == 0
+
+
+def test_get_local_buffer(settings):
+    local_buffer = get_local_buffer(KEY)
+
+    assert get_local_buffer(KEY) is local_buffer
+    assert local_buffer.max_size == settings.OBSERVABILITY_LOCAL_BUFFER_SIZE
+    assert local_buffer.flush_size == settings.OBSERVABILITY_BUFFER_BATCH_SIZE
@@ -7,6 +7,7 @@ from celery.exceptions import Retry
 from django.http import HttpResponse
 from freezegun import freeze_time
 
+from ..buffers import LocalBuffer
 from ..exceptions import ApiCallTruncationError, EventDeliveryAttemptTruncationError
 from ..payload_schema import JsonTruncText
 from ..payloads import CustomJsonEncoder
@@ -21,7 +22,7 @@ from ..utils import (
     report_gql_operation,
     task_next_retry_date,
 )
-from .conftest import BATCH_SIZE
+from .conftest import BATCH_SIZE, MAX_SIZE
 
 
 @pytest.fixture
@@ -243,11 +244,28 @@ def test_report_event_delivery_attempt_not_active(
     mock_put_event.assert_not_called()
 
 
-def test_put_event(patch_get_buffer, buffer):
+def test_put_event(patch_get_buffer, buffer, settings):
+    settings.OBSERVABILITY_LOCAL_BUFFER_SIZE = 0
     put_event(lambda: {"payload": "data"})
     assert buffer.size() == 1
 
 
+def test_put_event_to_local_buffer(buffer):
+    local_buffer = LocalBuffer(
+        lambda: buffer, max_size=MAX_SIZE, flush_size=BATCH_SIZE, flush_period=60
+    )
+    with patch(
+        "saleor.webhook.observability.utils.get_local_buffer",
+        return_value=local_buffer,
+    ):
+        put_event(lambda: {"payload": "data"})
+
+    assert local_buffer.size() == 1
+    assert buffer.size() == 0
+    local_buffer.flush()
+    assert buffer.size() == 1
+
+
 @pytest.mark.parametrize(
     "error",
     [
@@ -276,6 +294,19 @@ def test_pop_events_with_remaining_size(patch_get_buffer, buffer):
     assert batch_count == 1
 
 
+@patch("saleor.webhook.observability.utils.logger")
+def test_pop_events_with_remaining_size_when_buffer_full(
+    mock_logger, patch_get_buffer, buffer
+):
+    buffer.put_events([f"payload-{i}" for i in range(MAX_SIZE)])
+
+    pop_events_with_remaining_size()
+
+    mock_logger.warning.assert_called_once()
+    extra = mock_logger.warning.call_args.kwargs["extra"]
+    assert extra["buffer_high_water_mark"] == MAX_SIZE
+
+
 def test_pop_events_with_remaining_size_catch_exceptions(
     redis_server, buffer, patch_get_buffer
 ):
@@ -17,7 +17,7 @@ from pytimeparse import parse
 from ...core.utils import get_domain
 from ..event_types import WebhookEventAsyncType
 from ..utils import get_webhooks_for_event
-from .buffers import get_buffer
+from .buffers import get_buffer, get_local_buffer
 from .exceptions import TruncationError
 from .payloads import generate_api_call_payload, generate_event_delivery_attempt_payload
 from .tracing import opentracing_trace
@@ -93,7 +93,10 @@ def put_event(generate_payload: Callable[[], Any]):
     try:
         payload = generate_payload()
         with opentracing_trace("put_event", "buffer"):
-            if get_buffer(get_buffer_name()).put_event(payload):
+            buffer_name = get_buffer_name()
+            if settings.OBSERVABILITY_LOCAL_BUFFER_SIZE:
+                get_local_buffer(buffer_name).put_event(payload)
+            elif get_buffer(buffer_name).put_event(payload):
                 logger.warning("Observability buffer full, event dropped.")
     except TruncationError as err:
         logger.warning("Observability event dropped. %s", err, extra=err.extra)
@@ -102,11 +105,21 @@ def put_event(generate_payload: Callable[[], Any]):
 
 
 def pop_events_with_remaining_size() -> Tuple[List[Any], int]:
-    with opentracing_trace("pop_events", "buffer"):
+    with opentracing_trace("pop_events", "buffer") as span:
         try:
             buffer = get_buffer(get_buffer_name())
             events, remaining = buffer.pop_events_get_size()
             batch_count = buffer.in_batches(remaining)
+            # The buffer only grows between the reports, so its size on popping
+            # is the high-water mark of the last report period.
+            buffer_size = len(events) + remaining
+            span.set_tag("buffer.high_water_mark", buffer_size)
+            if buffer_size >= buffer.max_size:
+                logger.warning(
+                    "Observability buffer reached its size limit (%s events).",
+                    buffer.max_size,
+                    extra={"buffer_high_water_mark": buffer_size},
+                )
         except Exception:
             logger.error("Could not pop observability events batch.", exc_info=True)
             events, batch_count = [], 0
@@ -1,10 +1,16 @@
+import datetime
+import json
 from collections import OrderedDict
 from collections.abc import Iterable
-from typing import Any, Dict, Optional
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
 
 import graphene
+from django.core.serializers.json import DjangoJSONEncoder
 from django.core.serializers.json import Serializer as JSONSerializer
 from django.core.serializers.python import Serializer as PythonBaseSerializer
+from django.db.models import Field, Model
 from django.utils.functional import SimpleLazyObject
 
 
@@ -103,3 +109,206 @@ class PayloadSerializer(JSONSerializer):
         # Finally update the data with the super class' "self._current" content
         data.update(self._current)  # type: ignore[attr-defined] # internals of serializer # noqa: E501
         return data
+
+
+# Types left as they are by Django's Python serializer, see
+# `django.utils.encoding.is_protected_type`.
+PROTECTED_TYPES = (
+    type(None),
+    int,
+    float,
+    Decimal,
+    datetime.datetime,
+    datetime.date,
+    datetime.time,
+)
+# Protected types that the JSON encoder converts with its `default` method.
+ENCODER_DEFAULT_TYPES = (Decimal, datetime.datetime, datetime.date, datetime.time)
+
+FieldGetter = Callable[[Model, Callable[[Any], Any]], Any]
+
+
+def _get_field_getter(field: Field) -> FieldGetter:
+    # Mirror `django.core.serializers.python.Serializer._value_from_field`.
+    attname = field.attname
+    has_default_value_from_object = (
+        type(field).value_from_object is Field.value_from_object
+    )
+    has_default_value_to_string = type(field).value_to_string is Field.value_to_string
+
+    def getter(obj, encode):
+        if has_default_value_from_object:
+            value = getattr(obj, attname)
+        else:
+            value = field.value_from_object(obj)
+        if isinstance(value, ENCODER_DEFAULT_TYPES):
+            return encode(value)
+        if isinstance(value, PROTECTED_TYPES):
+            return value
+        if isinstance(value, str) and has_default_value_to_string:
+            return value
+        return field.value_to_string(obj)
+
+    return getter
+
+
+def _get_m2m_field_getter(field: Field) -> FieldGetter:
+    # Mirror `django.core.serializers.python.Serializer.handle_m2m_field`.
+    def getter(obj, encode):
+        related_objects = getattr(obj, "_prefetched_objects_cache", {}).get(
+            field.name, getattr(obj, field.name).iterator()
+        )
+        values = []
+        for related in related_objects:
+            pk_getter = get_model_fields_plan(type(related), frozenset())[1]
+            values.append(pk_getter(related, encode))
+        return values
+
+    return getter
+
+
+@lru_cache(maxsize=None)
+def get_model_fields_plan(
+    model: type, selected_fields: Optional[FrozenSet[str]]
+) -> Tuple[Tuple[Tuple[str, FieldGetter], ...], FieldGetter]:
+    """Return the getters of the model fields serialized by Django's serializers.
+
+    The fields are resolved the same way as in `Serializer.serialize`, but only
+    once for a model and a set of selected fields. Return the getters of
+    the serialized fields and the getter of the primary key.
+    """
+    opts = model._meta.concrete_model._meta  # type: ignore[attr-defined]
+    getters: List[Tuple[str, FieldGetter]] = []
+    for field in opts.local_fields:
+        if not field.serialize:
+            continue
+        name = field.attname if field.remote_field is None else field.attname[:-3]
+        if selected_fields is None or name in selected_fields:
+            getters.append((field.name, _get_field_getter(field)))
+    for field in opts.local_many_to_many:
+        if not field.serialize or not field.remote_field.through._meta.auto_created:
+            continue
+        if selected_fields is None or field.attname in selected_fields:
+            getters.append((field.name, _get_m2m_field_getter(field)))
+    return tuple(getters), _get_field_getter(opts.pk)
+
+
+class CompiledPayloadSerializer:
+    """Serialize objects to the same JSON as `PayloadSerializer`, but faster.
+
+    The serialized fields of each model are resolved once and cached, values
+    converted by the JSON encoder's `default` method are converted up front, and
+    each object is encoded with the C accelerated `json.dumps` instead of
+    the pure Python encoder used by `json.dump`.
+    """
+
+    def __init__(self, extra_model_fields=None):
+        self.extra_model_fields = extra_model_fields or {}
+
+    def serialize(
+        self,
+        queryset,
+        *,
+        fields=None,
+        additional_fields=None,
+        extra_dict_data=None,
+        obj_id_name="id",
+        pk_field_name="id",
+        dump_type_name=True,
+        **json_kwargs,
+    ) -> str:
+        json_kwargs.setdefault("cls", DjangoJSONEncoder)
+        json_kwargs.setdefault("ensure_ascii", False)
+        indent = json_kwargs.get("indent")
+        if indent:
+            json_kwargs["separators"] = (",", ": ")
+        encode = json_kwargs["cls"]().default
+        selected_fields = frozenset(fields) if fields is not None else None
+
+        dumped_objects = []
+        for obj in queryset:
+            data = self._get_dump_object(
+                obj,
+                selected_fields,
+                encode,
+                additional_fields or {},
+                extra_dict_data or {},
+                obj_id_name,
+                pk_field_name,
+                dump_type_name,
+            )
+            dumped_objects.append(json.dumps(data, **json_kwargs))
+
+        if indent:
+            return "[" + ",".join("\n" + obj for obj in dumped_objects) + "\n]\n"
+        return "[" + ", ".join(dumped_objects) + "]"
+
+    def _get_dump_object(
+        self,
+        obj,
+        selected_fields,
+        encode,
+        additional_fields,
+        extra_dict_data,
+        obj_id_name,
+        pk_field_name,
+        dump_type_name,
+    ):
+        object_name = obj._meta.object_name
+        data: Dict[str, Optional[Any]] = {}
+        if dump_type_name:
+            data["type"] = str(object_name)
+        data[obj_id_name] = graphene.Node.to_global_id(
+            object_name, getattr(obj, pk_field_name)
+        )
+
+        for field_name, (qs, fields) in additional_fields.items():
+            data_to_serialize = qs(obj)
+            if not data_to_serialize:
+                data[field_name] = None
+                continue
+            if isinstance(data_to_serialize, SimpleLazyObject):
+                data_to_serialize = data_to_serialize._wrapped  # type: ignore[attr-defined] # noqa: E501
+            additional_selected_fields = (
+                frozenset(fields) if fields is not None else None
+            )
+            if isinstance(data_to_serialize, Iterable):
+                data[field_name] = [
+                    self._get_additional_dump_object(
+                        item, additional_selected_fields, encode
+                    )
+                    for item in data_to_serialize
+                ]
+            else:
+                data[field_name] = self._get_additional_dump_object(
+                    data_to_serialize, additional_selected_fields, encode
+                )
+
+        called_data = {}
+        for key, value in extra_dict_data.items():
+            if callable(value):
+                called_data[key] = value(obj)
+        data.update(extra_dict_data)
+        data.update(called_data)
+
+        getters, _ = get_model_fields_plan(type(obj), selected_fields)
+        for name, getter in getters:
+            data[name] = getter(obj, encode)
+        return data
+
+    def _get_additional_dump_object(self, obj, selected_fields, encode):
+        # Mirror `PythonSerializer.get_dump_object`.
+        object_name = obj._meta.object_name
+        data = {
+            "type": str(object_name),
+            "id": graphene.Node.to_global_id(object_name, obj.id),
+        }
+        getters, _ = get_model_fields_plan(type(obj), selected_fields)
+        for name, getter in getters:
+            data[name] = getter(obj, encode)
+
+        for field in self.extra_model_fields.get(object_name, ()):
+            value = getattr(obj, field, None)
+            if value is not None:
+                data[field] = str(value)
+        return data
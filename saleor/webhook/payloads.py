@@ -50,7 +50,7 @@ from ..thumbnail.models import Thumbnail
 from ..warehouse.models import Stock, Warehouse
 from . import traced_payload_generator
 from .event_types import WebhookEventAsyncType
-from .payload_serializers import PayloadSerializer
+from .payload_serializers import CompiledPayloadSerializer
 from .serializers import (
     serialize_checkout_lines,
     serialize_checkout_lines_for_tax_calculation,
@@ -151,7 +151,7 @@ def generate_meta(*, requestor_data: Dict[str, Any], camel_case=False, **kwargs)
 def generate_metadata_updated_payload(
     instance: Any, requestor: Optional["RequestorOrLazyObject"] = None
 ):
-    serializer = PayloadSerializer()
+    serializer = CompiledPayloadSerializer()
 
     if isinstance(instance, Checkout) or isinstance(instance, TransactionItem):
         pk_field_name = "token"
@@ -221,7 +221,7 @@ def generate_order_lines_payload(lines: Iterable[OrderLine]):
     for line in lines:
         quantize_price_fields(line, line_price_fields, line.currency)
 
-    serializer = PayloadSerializer()
+    serializer = CompiledPayloadSerializer()
     return serializer.serialize(
         lines,
         fields=line_fields,
@@ -235,7 +235,7 @@ def generate_order_lines_payload(lines: Iterable[OrderLine]):
 
 
 def _generate_collection_point_payload(warehouse: "Warehouse"):
-    serializer = PayloadSerializer()
+    serializer = CompiledPayloadSerializer()
     collection_point_fields = (
         "name",
         "email",
@@ -261,7 +261,7 @@ def _generate_shipping_method_payload(shipping_method, channel):
     if not shipping_method_channel_listing:
         return None
 
-    serializer = PayloadSerializer()
+    serializer = CompiledPayloadSerializer()
     shipping_method_fields = ("name", "type")
 
     payload = serializer.serialize(
@@ -285,7 +285,7 @@ def generate_order_payload(
     requestor: Optional["RequestorOrLazyObject"] = None,
     with_meta: bool = True,
 ):
-    serializer = PayloadSerializer()
+    serializer = CompiledPayloadSerializer()
     fulfillment_fields = (
         "status",
         "tracking_number",
@@ -392,7 +392,7 @@ def _generate_order_payment_payload(payments: Iterable["Payment"]):
         "billing_country_code",
         "billing_country_area",
     )
-    serializer = PayloadSerializer()
+    serializer = CompiledPayloadSerializer()
     return serializer.serialize(
         payments,
         fields=payment_fields,
@@ -431,7 +431,7 @@ def generate_sale_payload(
     if current_catalogue is None:
         current_catalogue = defaultdict(set)
 
-    serializer = PayloadSerializer()
+    serializer = CompiledPayloadSerializer()
 
     return serializer.serialize(
         [promotion],
@@ -473,7 +473,7 @@ def generate_sale_toggle_payload(
     catalogue: DefaultDict[str, Set[str]],
     requestor: Optional["RequestorOrLazyObject"] = None,
 ):
-    serializer = PayloadSerializer()
+    serializer = CompiledPayloadSerializer()
 
     extra_dict_data = {key: list(ids) for key, ids in catalogue.items()}
     extra_dict_data["meta"] = generate_meta(
@@ -493,7 +493,7 @@ def generate_sale_toggle_payload(
 def generate_invoice_payload(
     invoice: "Invoice", requestor: Optional["RequestorOrLazyObject"] = None
 ):
-    serializer = PayloadSerializer()
+    serializer = CompiledPayloadSerializer()
     invoice_fields = ("id", "number", "external_url", "created")
     if invoice.order is not None:
         quantize_price_fields(invoice.order, ORDER_PRICE_FIELDS, invoice.order.currency)
@@ -516,7 +516,7 @@ def _generate_order_payload_for_invoice(order: "Order"):
     # The method should be removed after removing the deprecated order token field.
     # After that, we should move generating order data to the `additional_fields`
     # in the `generate_invoice_payload` method.
-    serializer = PayloadSerializer()
+    serializer = CompiledPayloadSerializer()
     payload = serializer.serialize(
         [order],
         fields=ORDER_FIELDS,
@@ -533,7 +533,7 @@ def _generate_order_payload_for_invoice(order: "Order"):
 def generate_checkout_payload(
     checkout: "Checkout", requestor: Optional["RequestorOrLazyObject"] = None
 ):
-    serializer = PayloadSerializer()
+    serializer = CompiledPayloadSerializer()
     checkout_fields = (
         "last_change",
         "status",
@@ -607,7 +607,7 @@ def generate_checkout_payload(
 def generate_customer_payload(
     customer: "User", requestor: Optional["RequestorOrLazyObject"] = None
 ):
-    serializer = PayloadSerializer()
+    serializer = CompiledPayloadSerializer()
     data = serializer.serialize(
         [customer],
         fields=[
@@ -645,7 +645,7 @@ def generate_customer_payload(
 def generate_collection_payload(
     collection: "Collection", requestor: Optional["RequestorOrLazyObject"] = None
 ):
-    serializer = PayloadSerializer()
+    serializer = CompiledPayloadSerializer()
     data = serializer.serialize(
         [collection],
         fields=[
@@ -679,7 +679,7 @@ PRODUCT_FIELDS = (
 
 
 def serialize_product_channel_listing_payload(channel_listings):
-    serializer = PayloadSerializer()
+    serializer = CompiledPayloadSerializer()
     fields = (
         "published_at",
         "is_published",
@@ -716,7 +716,7 @@ def _get_charge_taxes_for_product(product: "Product") -> bool:
 def generate_product_payload(
     product: "Product", requestor: Optional["RequestorOrLazyObject"] = None
 ):
-    serializer = PayloadSerializer(
+    serializer = CompiledPayloadSerializer(
         extra_model_fields={"ProductVariant": ("quantity", "quantity_allocated")}
     )
     product_payload = serializer.serialize(
@@ -758,7 +758,7 @@ def generate_product_payload(
 def generate_product_deleted_payload(
     product: "Product", variants_id, requestor: Optional["RequestorOrLazyObject"] = None
 ):
-    serializer = PayloadSerializer()
+    serializer = CompiledPayloadSerializer()
     product_fields = PRODUCT_FIELDS
     product_variant_ids = [
         graphene.Node.to_global_id("ProductVariant", pk) for pk in variants_id
@@ -786,7 +786,7 @@ PRODUCT_VARIANT_FIELDS = (
 
 @traced_payload_generator
 def generate_product_variant_listings_payload(variant_channel_listings):
-    serializer = PayloadSerializer()
+    serializer = CompiledPayloadSerializer()
     fields = (
         "currency",
         "price_amount",
@@ -819,7 +819,7 @@ def generate_product_variant_media_payload(product_variant):
 def generate_product_variant_with_stock_payload(
     stocks: Iterable["Stock"], requestor: Optional["RequestorOrLazyObject"] = None
 ):
-    serializer = PayloadSerializer()
+    serializer = CompiledPayloadSerializer()
     extra_dict_data = {
         "product_id": lambda v: graphene.Node.to_global_id(
             "Product", v.product_variant.product_id
@@ -857,7 +857,7 @@ def generate_product_variant_payload(
             requestor_data=generate_requestor(requestor)
         )
 
-    serializer = PayloadSerializer()
+    serializer = CompiledPayloadSerializer()
     payload = serializer.serialize(
         product_variants,
         fields=PRODUCT_VARIANT_FIELDS,
@@ -873,7 +873,7 @@ def generate_product_variant_stocks_payload(product_variant: "ProductVariant"):
 
 @traced_payload_generator
 def generate_fulfillment_lines_payload(fulfillment: Fulfillment):
-    serializer = PayloadSerializer()
+    serializer = CompiledPayloadSerializer()
     lines = FulfillmentLine.objects.prefetch_related(
         "order_line__variant__product__product_type", "stock"
     ).filter(fulfillment=fulfillment)
@@ -945,7 +945,7 @@ def generate_fulfillment_lines_payload(fulfillment: Fulfillment):
 def generate_fulfillment_payload(
     fulfillment: Fulfillment, requestor: Optional["RequestorOrLazyObject"] = None
 ):
-    serializer = PayloadSerializer()
+    serializer = CompiledPayloadSerializer()
 
     # fulfillment fields to serialize
     fulfillment_fields = (
@@ -992,7 +992,7 @@ def generate_fulfillment_payload(
 def generate_page_payload(
     page: Page, requestor: Optional["RequestorOrLazyObject"] = None
 ):
-    serializer = PayloadSerializer()
+    serializer = CompiledPayloadSerializer()
     page_fields = [
         "private_metadata",
         "metadata",
@@ -1260,7 +1260,7 @@ def generate_checkout_payload_for_tax_calculation(
     tax_configuration = checkout_info.tax_configuration
     prices_entered_with_tax = tax_configuration.prices_entered_with_tax
 
-    serializer = PayloadSerializer()
+    serializer = CompiledPayloadSerializer()
 
     checkout_fields = ("currency",)
 
@@ -1348,7 +1348,7 @@ def generate_checkout_payload_for_tax_calculation(
 
 
 def _generate_order_lines_payload_for_tax_calculation(lines: QuerySet[OrderLine]):
-    serializer = PayloadSerializer()
+    serializer = CompiledPayloadSerializer()
 
     charge_taxes = False
     if lines:
@@ -1386,7 +1386,7 @@ def _generate_order_lines_payload_for_tax_calculation(lines: QuerySet[OrderLine]
 
 @traced_payload_generator
 def generate_order_payload_for_tax_calculation(order: "Order"):
-    serializer = PayloadSerializer()
+    serializer = CompiledPayloadSerializer()
 
     tax_configuration = order.channel.tax_configuration
     prices_entered_with_tax = tax_configuration.prices_entered_with_tax
@@ -0,0 +1,131 @@
+import datetime
+import ipaddress
+import logging
+import ssl
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests_hardened
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.x509.oid import NameOID
+
+from ....core.http_client import HTTPSessionPool
+
+logger = logging.getLogger(__name__)
+
+REQUESTS_COUNT = 50
+
+HTTPConfig = requests_hardened.Config(
+    ip_filter_enable=True,
+    ip_filter_allow_loopback_ips=True,
+    never_redirect=True,
+    default_timeout=(2, 10),
+)
+
+
+class _WebhookHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        self.server.connections_count += 1
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        body = b'{"excluded_methods": []}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _write_certificate(path):
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "127.0.0.1")])
+    now = datetime.datetime.utcnow()
+    certificate = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(minutes=1))
+        .not_valid_after(now + datetime.timedelta(hours=1))
+        .add_extension(
+            x509.SubjectAlternativeName(
+                [x509.IPAddress(ipaddress.ip_address("127.0.0.1"))]
+            ),
+            critical=False,
+        )
+        .sign(key, hashes.SHA256())
+    )
+    cert_path = path / "cert.pem"
+    key_path = path / "key.pem"
+    cert_path.write_bytes(certificate.public_bytes(serialization.Encoding.PEM))
+    key_path.write_bytes(
+        key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+    )
+    return str(cert_path), str(key_path)
+
+
+@pytest.fixture
+def tls_stub(tmp_path):
+    cert_path, key_path = _write_certificate(tmp_path)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _WebhookHandler)
+    server.daemon_threads = True
+    server.connections_count = 0
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(cert_path, key_path)
+    server.socket = context.wrap_socket(server.socket, server_side=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server, f"https://127.0.0.1:{server.server_address[1]}/webhook", cert_path
+    server.shutdown()
+    server.server_close()
+
+
+def _send_requests(client, url, cert_path):
+    start = time.perf_counter()
+    for _ in range(REQUESTS_COUNT):
+        response = client.send_request("POST", url, data="{}", verify=cert_path)
+        assert response.status_code == 200
+    return (time.perf_counter() - start) / REQUESTS_COUNT
+
+
+@pytest.mark.enable_socket
+def test_webhook_requests_reuse_tls_connections(tls_stub):
+    # given
+    server, url, cert_path = tls_stub
+    client = requests_hardened.Manager(HTTPConfig)
+    pooled_client = HTTPSessionPool(
+        HTTPConfig, max_hosts=1, max_connections_per_host=1, idle_timeout=60
+    )
+
+    # when
+    duration = _send_requests(client, url, cert_path)
+    connections_count = server.connections_count
+    pooled_duration = _send_requests(pooled_client, url, cert_path)
+    pooled_client.clear()
+
+    # then
+    logger.info(
+        "Webhook request: pooled session %.2f ms, new session %.2f ms",
+        pooled_duration * 1000,
+        duration * 1000,
+    )
+    assert connections_count == REQUESTS_COUNT
+    assert server.connections_count - connections_count == 1
+    assert pooled_duration < duration
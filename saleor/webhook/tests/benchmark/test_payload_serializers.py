@@ -0,0 +1,112 @@
+import logging
+import time
+from copy import copy
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+
+from ....checkout.fetch import fetch_checkout_info, fetch_checkout_lines
+from ....order.models import OrderLine
+from ....plugins.manager import get_plugins_manager
+from ... import payloads
+from ...payload_serializers import PayloadSerializer
+from ...payloads import (
+    generate_checkout_payload_for_tax_calculation,
+    generate_order_payload,
+)
+
+logger = logging.getLogger(__name__)
+
+LINES_COUNT = 200
+ROUNDS = 5
+
+
+def _measure(generate_payload):
+    payload = generate_payload()
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        generate_payload()
+    return payload, (time.perf_counter() - start) / ROUNDS
+
+
+def _compare_serializers(generate_payload):
+    payload, duration = _measure(generate_payload)
+    with patch("saleor.webhook.payloads.CompiledPayloadSerializer", PayloadSerializer):
+        legacy_payload, legacy_duration = _measure(generate_payload)
+    logger.info(
+        "%s: compiled serializer %.2f ms, legacy serializer %.2f ms",
+        generate_payload.__name__,
+        duration * 1000,
+        legacy_duration * 1000,
+    )
+    return payload, legacy_payload
+
+
+@pytest.fixture
+def large_order(order_with_lines):
+    line = order_with_lines.lines.first()
+    lines = []
+    for _ in range(LINES_COUNT - order_with_lines.lines.count()):
+        new_line = copy(line)
+        new_line.pk = uuid4()
+        lines.append(new_line)
+    OrderLine.objects.bulk_create(lines)
+    return order_with_lines
+
+
+def test_serialize_large_order_lines(large_order):
+    # given
+    lines = list(large_order.lines.all())
+
+    def serialize_order_lines():
+        return payloads.CompiledPayloadSerializer().serialize(lines)
+
+    # when
+    payload, legacy_payload = _compare_serializers(serialize_order_lines)
+
+    # then
+    assert payload == legacy_payload
+
+
+def test_generate_order_payload_with_large_order(large_order):
+    # given
+    order = (
+        type(large_order)
+        .objects.prefetch_related(
+            "lines__variant__product__product_type",
+            "fulfillments",
+            "payments",
+            "discounts",
+        )
+        .get(pk=large_order.pk)
+    )
+
+    def generate_order_payload_for_large_order():
+        return generate_order_payload(order, with_meta=False)
+
+    # when
+    payload, legacy_payload = _compare_serializers(
+        generate_order_payload_for_large_order
+    )
+
+    # then
+    assert payload == legacy_payload
+
+
+def test_generate_checkout_payload_for_tax_calculation_with_many_lines(
+    checkout_with_items,
+):
+    # given
+    manager = get_plugins_manager()
+    lines, _ = fetch_checkout_lines(checkout_with_items)
+    checkout_info = fetch_checkout_info(checkout_with_items, lines, manager)
+
+    def generate_checkout_payload():
+        return generate_checkout_payload_for_tax_calculation(checkout_info, lines)
+
+    # when
+    payload, legacy_payload = _compare_serializers(generate_checkout_payload)
+
+    # then
+    assert payload == legacy_payload
@@ -1,4 +1,5 @@
 from typing import Type
+from unittest.mock import patch
 
 import pytest
 
@@ -59,6 +60,19 @@ def test_get_webhooks_for_event(sync_webhook, async_app_factory, async_type):
     assert set(webhooks) == {async_webhook, any_webhook}
 
 
+@patch("saleor.webhook.utils.get_replica_connection_name", return_value="default")
+def test_get_webhooks_for_event_uses_selected_replica(
+    mocked_get_replica_connection_name, async_app_factory, async_type
+):
+    _, async_webhook = async_app_factory()
+
+    webhooks = get_webhooks_for_event(async_type)
+
+    assert list(webhooks) == [async_webhook]
+    assert webhooks.db == "default"
+    mocked_get_replica_connection_name.assert_called_once_with()
+
+
 def test_get_webhooks_for_event_when_app_webhook_inactive(
     sync_webhook, async_app_factory, async_type
 ):
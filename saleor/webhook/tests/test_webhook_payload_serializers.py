@@ -1,4 +1,8 @@
-from ..payload_serializers import PythonSerializer
+from ..payload_serializers import (
+    CompiledPayloadSerializer,
+    PayloadSerializer,
+    PythonSerializer,
+)
 
 
 def test_python_serializer_extra_model_fields(product_with_single_variant):
@@ -32,3 +36,65 @@ def test_python_serializer_extra_model_fields_incorrect_fields(
     result = serializer.get_dump_object(annotated_variant)
     assert result["type"] == "ProductVariant"
     assert result["test_item"] == "test_value"
+
+
+def test_compiled_payload_serializer_matches_payload_serializer(
+    order_with_lines, payment_dummy
+):
+    # given
+    lines = order_with_lines.lines.all()
+    options = {
+        "additional_fields": {
+            "channel": (lambda o: o.channel, ("slug", "currency_code")),
+            "shipping_address": (lambda o: o.shipping_address, None),
+            "lines": (lambda o: lines, ("product_name", "quantity")),
+            "voucher": (lambda o: o.voucher, ("code",)),
+        },
+        "extra_dict_data": {
+            "token": str(order_with_lines.id),
+            "created": order_with_lines.created_at,
+            "payments_count": lambda o: o.payments.count(),
+        },
+    }
+
+    # when
+    payload = CompiledPayloadSerializer().serialize(
+        [order_with_lines, order_with_lines], **options
+    )
+
+    # then
+    assert payload == PayloadSerializer().serialize(
+        [order_with_lines, order_with_lines], **options
+    )
+
+
+def test_compiled_payload_serializer_matches_payload_serializer_with_options(
+    product_with_single_variant, app, permission_manage_products
+):
+    # given
+    app.permissions.add(permission_manage_products)
+    variants = product_with_single_variant.variants.annotate_quantities()
+    extra_model_fields = {"ProductVariant": ("quantity", "quantity_allocated")}
+    options = {
+        "fields": ("name", "updated_at", "variants", "rating"),
+        "additional_fields": {"variants": (lambda _: variants, ("sku",))},
+        "obj_id_name": "product_id",
+        "dump_type_name": False,
+        "indent": 2,
+    }
+
+    # when
+    product_payload = CompiledPayloadSerializer(extra_model_fields).serialize(
+        [product_with_single_variant], **options
+    )
+    app_payload = CompiledPayloadSerializer().serialize(
+        [app], fields=("name", "permissions")
+    )
+
+    # then
+    assert product_payload == PayloadSerializer(extra_model_fields).serialize(
+        [product_with_single_variant], **options
+    )
+    assert app_payload == PayloadSerializer().serialize(
+        [app], fields=("name", "permissions")
+    )
@@ -0,0 +1,147 @@
+"""Circuit breaker for async webhook deliveries, kept per target URL in the cache.
+
+The breaker is closed as long as the target responds. When the delivery attempts
+fail `WEBHOOK_CIRCUIT_BREAKER_FAILURE_THRESHOLD` times within the failure window,
+it opens and the deliveries to the target are deferred, without sending requests,
+for the open period. Then it is half-open: a single probe delivery is sent, and its
+outcome closes the breaker or opens it again for twice as long.
+"""
+import datetime
+import hashlib
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+import pytz
+from django.conf import settings
+from django.core.cache import cache
+
+from ....core import EventDeliveryStatus
+
+CACHE_KEY_PREFIX = "webhook-circuit-breaker:"
+FAILURES_KEY_SUFFIX = ":failures"
+OPEN_KEY_SUFFIX = ":open"
+TRIPS_KEY_SUFFIX = ":trips"
+PROBE_KEY_SUFFIX = ":probe"
+
+
+class CircuitBreakerState:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    CHOICES = [
+        (CLOSED, "Closed"),
+        (OPEN, "Open"),
+        (HALF_OPEN, "Half open"),
+    ]
+
+
+@dataclass
+class CircuitBreakerStatus:
+    state: str
+    failure_count: int
+    open_until: Optional[datetime.datetime]
+
+
+def _get_cache_key(target_url: str) -> str:
+    return CACHE_KEY_PREFIX + hashlib.sha256(target_url.encode()).hexdigest()
+
+
+def is_circuit_breaker_enabled() -> bool:
+    return settings.WEBHOOK_CIRCUIT_BREAKER_FAILURE_THRESHOLD > 0
+
+
+def get_circuit_breaker_status(target_url: str) -> CircuitBreakerStatus:
+    key = _get_cache_key(target_url)
+    values = cache.get_many(
+        [key + FAILURES_KEY_SUFFIX, key + OPEN_KEY_SUFFIX, key + TRIPS_KEY_SUFFIX]
+    )
+    failure_count = values.get(key + FAILURES_KEY_SUFFIX, 0)
+    open_until = values.get(key + OPEN_KEY_SUFFIX)
+    if open_until:
+        return CircuitBreakerStatus(
+            state=CircuitBreakerState.OPEN,
+            failure_count=failure_count,
+            open_until=datetime.datetime.fromtimestamp(open_until, tz=pytz.utc),
+        )
+    state = CircuitBreakerState.CLOSED
+    if values.get(key + TRIPS_KEY_SUFFIX):
+        state = CircuitBreakerState.HALF_OPEN
+    return CircuitBreakerStatus(
+        state=state, failure_count=failure_count, open_until=None
+    )
+
+
+def get_open_circuit_delay(target_url: str) -> float:
+    """Return the number of seconds for which the breaker stays open."""
+    if not is_circuit_breaker_enabled():
+        return 0
+    open_until = cache.get(_get_cache_key(target_url) + OPEN_KEY_SUFFIX)
+    if not open_until:
+        return 0
+    return max(open_until - time.time(), 0)
+
+
+def get_circuit_breaker_delay(target_url: str) -> float:
+    """Return the number of seconds by which a delivery to the target is deferred.
+
+    When the breaker is half-open, only the first caller gets 0 and sends the probe
+    delivery.
+    """
+    if not is_circuit_breaker_enabled():
+        return 0
+    key = _get_cache_key(target_url)
+    values = cache.get_many([key + OPEN_KEY_SUFFIX, key + TRIPS_KEY_SUFFIX])
+    open_until = values.get(key + OPEN_KEY_SUFFIX)
+    if open_until:
+        return max(open_until - time.time(), 0)
+    if not values.get(key + TRIPS_KEY_SUFFIX):
+        return 0
+    probe_timeout = settings.WEBHOOK_CIRCUIT_BREAKER_OPEN_PERIOD
+    if cache.add(key + PROBE_KEY_SUFFIX, True, probe_timeout):
+        return 0
+    return probe_timeout
+
+
+def record_delivery_attempt(target_url: str, status: str):
+    """Update the breaker of the target with the outcome of a delivery attempt."""
+    if not is_circuit_breaker_enabled():
+        return
+    key = _get_cache_key(target_url)
+    if status == EventDeliveryStatus.SUCCESS:
+        cache.delete_many(
+            [key + FAILURES_KEY_SUFFIX, key + TRIPS_KEY_SUFFIX, key + PROBE_KEY_SUFFIX]
+        )
+        return
+
+    values = cache.get_many([key + OPEN_KEY_SUFFIX, key + TRIPS_KEY_SUFFIX])
+    if values.get(key + OPEN_KEY_SUFFIX):
+        # Attempts sent before the breaker opened.
+        return
+    trips = values.get(key + TRIPS_KEY_SUFFIX)
+    if trips:
+        # The probe delivery failed.
+        _open(key, trips + 1)
+        return
+
+    failures_key = key + FAILURES_KEY_SUFFIX
+    cache.add(failures_key, 0, settings.WEBHOOK_CIRCUIT_BREAKER_FAILURE_WINDOW)
+    try:
+        failure_count = cache.incr(failures_key)
+    except ValueError:
+        # The failure window expired in the meantime.
+        return
+    if failure_count >= settings.WEBHOOK_CIRCUIT_BREAKER_FAILURE_THRESHOLD:
+        _open(key, 1)
+
+
+def _open(key: str, trips: int):
+    max_open_period = settings.WEBHOOK_CIRCUIT_BREAKER_MAX_OPEN_PERIOD
+    open_period = min(
+        settings.WEBHOOK_CIRCUIT_BREAKER_OPEN_PERIOD * 2 ** (trips - 1),
+        max_open_period,
+    )
+    cache.set(key + OPEN_KEY_SUFFIX, time.time() + open_period, open_period)
+    cache.set(key + TRIPS_KEY_SUFFIX, trips, open_period + max_open_period)
+    cache.delete_many([key + FAILURES_KEY_SUFFIX, key + PROBE_KEY_SUFFIX])
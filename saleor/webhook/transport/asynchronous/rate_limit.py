@@ -0,0 +1,47 @@
+"""Per-app token bucket limiting the rate of async webhook deliveries.
+
+The bucket is kept in the cache as the theoretical arrival time of the next
+delivery (GCRA), so it is shared by all workers. The update isn't atomic and
+concurrent workers can exceed the limit slightly.
+
+A delivery exceeding the limit reserves the next free slot and is deferred until
+then, so deferred deliveries are spread over consecutive slots instead of all
+being re-queued for the same moment.
+"""
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+CACHE_KEY_PREFIX = "webhook-app-rate-limit:"
+RESERVATION_CACHE_KEY_PREFIX = "webhook-rate-limit-reservation:"
+# Time for which the reservation is kept after its slot, in case the deferred
+# task is picked up late.
+RESERVATION_TIMEOUT = 60 * 60
+
+
+def get_rate_limit_delay(app_id: int, delivery_id: int) -> float:
+    """Take a token from the app bucket for the delivery.
+
+    Return 0 when the delivery can be sent, otherwise the number of seconds after
+    which the slot reserved for the delivery comes; the delivery is sent without
+    taking another token then.
+    """
+    rate = settings.WEBHOOK_APP_RATE_LIMIT
+    if not rate:
+        return 0
+    reservation_key = f"{RESERVATION_CACHE_KEY_PREFIX}{delivery_id}"
+    if cache.delete(reservation_key):
+        return 0
+    interval = 1 / rate
+    tolerance = interval * (max(settings.WEBHOOK_APP_RATE_LIMIT_BURST, 1) - 1)
+    key = f"{CACHE_KEY_PREFIX}{app_id}"
+    now = time.time()
+    arrival_time = max(cache.get(key) or now, now)
+    delay = max(arrival_time - now - tolerance, 0)
+    arrival_time += interval
+    cache.set(key, arrival_time, math.ceil(arrival_time - now))
+    if delay:
+        cache.set(reservation_key, True, math.ceil(delay) + RESERVATION_TIMEOUT)
+    return delay
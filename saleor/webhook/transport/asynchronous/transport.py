@@ -1,6 +1,9 @@
 import json
 import logging
-from typing import TYPE_CHECKING, Any, List, Sequence
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Sequence, Tuple
 from urllib.parse import urlparse
 
 from celery import group
@@ -14,6 +17,7 @@ from ....core.tracing import webhooks_opentracing_trace
 from ....core.utils import get_domain
 from ....graphql.webhook.subscription_payload import (
     generate_payload_from_subscription,
+    generate_payloads_from_subscription,
     initialize_request,
 )
 from ....graphql.webhook.subscription_types import WEBHOOK_TYPES_MAP
@@ -31,6 +35,12 @@ from ..utils import (
     handle_webhook_retry,
     send_webhook_using_scheme_method,
 )
+from .circuit_breaker import (
+    get_circuit_breaker_delay,
+    get_open_circuit_delay,
+    record_delivery_attempt,
+)
+from .rate_limit import get_rate_limit_delay
 
 if TYPE_CHECKING:
     from ....webhook.models import Webhook
@@ -39,6 +49,9 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 task_logger = get_task_logger(__name__)
 
+WEBHOOK_BULK_CREATE_BATCH_SIZE = 1000
+WEBHOOK_TASKS_CHUNK_SIZE = 100
+
 
 def create_deliveries_for_subscriptions(
     event_type, subscribable_object, webhooks, requestor=None
@@ -62,16 +75,18 @@ def create_deliveries_for_subscriptions(
 
     event_payloads = []
     event_deliveries = []
+    # The request is shared by all webhooks to reuse the dataloaders across them.
+    request = initialize_request(
+        requestor,
+        event_type in WebhookEventSyncType.ALL,
+        event_type=event_type,
+    )
     for webhook in webhooks:
         data = generate_payload_from_subscription(
             event_type=event_type,
             subscribable_object=subscribable_object,
             subscription_query=webhook.subscription_query,
-            request=initialize_request(
-                requestor,
-                event_type in WebhookEventSyncType.ALL,
-                event_type=event_type,
-            ),
+            request=request,
             app=webhook.app,
         )
         if not data:
@@ -79,7 +94,9 @@ def create_deliveries_for_subscriptions(
                 "No payload was generated with subscription for event: %s" % event_type
             )
             continue
-        event_payload = EventPayload(payload=json.dumps({**data}))
+        event_payload = EventPayload.objects.build_with_payload_file(
+            json.dumps({**data})
+        )
         event_payloads.append(event_payload)
         event_deliveries.append(
             EventDelivery(
@@ -147,7 +164,7 @@ def trigger_webhooks_async(
         elif data is None:
             raise NotImplementedError("No payload was provided for regular webhooks.")
 
-        payload = EventPayload.objects.create(payload=data)
+        payload = EventPayload.objects.create_with_payload_file(data)
         deliveries.extend(
             create_event_delivery_list_for_webhooks(
                 webhooks=regular_webhooks,
@@ -169,6 +186,132 @@ def trigger_webhooks_async(
         send_webhook_request_async.delay(delivery.id)
 
 
+@dataclass
+class WebhookPayloadData:
+    subscribable_object: Any
+    legacy_data_generator: Optional[Callable[[], str]] = None
+    data: Optional[str] = None  # deprecated, legacy_data_generator should be used
+
+
+def trigger_webhooks_async_for_multiple_objects(
+    event_type,
+    webhooks,
+    webhook_payloads_data: Sequence[WebhookPayloadData],
+    requestor=None,
+):
+    """Trigger async webhooks - both regular and subscription - for multiple objects.
+
+    Payloads of all objects are generated first, subscription payloads with one
+    context per webhook. Then the payloads and deliveries are bulk created and the
+    delivery tasks are sent in chunks.
+
+    :param event_type: used in both webhook types as event type.
+    :param webhooks: used in both webhook types, queryset of async webhooks.
+    :param webhook_payloads_data: subscribable objects and legacy payloads of
+        the objects for which the event is triggered.
+    :param requestor: used in subscription webhooks to generate meta data for payload.
+    """
+    regular_webhooks, subscription_webhooks = group_webhooks_by_subscription(webhooks)
+    event_payloads: List[EventPayload] = []
+    event_deliveries: List[EventDelivery] = []
+
+    def add_deliveries(data, webhooks_to_deliver):
+        event_payload = EventPayload.objects.build_with_payload_file(data)
+        event_payloads.append(event_payload)
+        event_deliveries.extend(
+            EventDelivery(
+                status=EventDeliveryStatus.PENDING,
+                event_type=event_type,
+                payload=event_payload,
+                webhook=webhook,
+            )
+            for webhook in webhooks_to_deliver
+        )
+
+    if regular_webhooks:
+        for payload_data in webhook_payloads_data:
+            data = payload_data.data
+            if payload_data.legacy_data_generator:
+                data = payload_data.legacy_data_generator()
+            elif data is None:
+                raise NotImplementedError(
+                    "No payload was provided for regular webhooks."
+                )
+            add_deliveries(data, regular_webhooks)
+
+    if subscription_webhooks and event_type not in WEBHOOK_TYPES_MAP:
+        logger.info(
+            "Skipping subscription webhook. Event %s is not subscribable.", event_type
+        )
+    elif subscription_webhooks:
+        subscribable_objects = [
+            payload_data.subscribable_object for payload_data in webhook_payloads_data
+        ]
+        request = initialize_request(
+            requestor,
+            event_type in WebhookEventSyncType.ALL,
+            event_type=event_type,
+        )
+        for webhook in subscription_webhooks:
+            payloads = generate_payloads_from_subscription(
+                event_type=event_type,
+                subscribable_objects=subscribable_objects,
+                subscription_query=webhook.subscription_query,
+                request=request,
+                app=webhook.app,
+            )
+            for data in payloads:
+                if not data:
+                    logger.info(
+                        "No payload was generated with subscription for event: %s"
+                        % event_type
+                    )
+                    continue
+                add_deliveries(json.dumps({**data}), [webhook])
+
+    EventPayload.objects.bulk_create(
+        event_payloads, batch_size=WEBHOOK_BULK_CREATE_BATCH_SIZE
+    )
+    deliveries = EventDelivery.objects.bulk_create(
+        event_deliveries, batch_size=WEBHOOK_BULK_CREATE_BATCH_SIZE
+    )
+    send_webhook_requests_async(deliveries)
+
+
+def send_webhook_requests_async(deliveries: Sequence[EventDelivery]):
+    """Send the delivery tasks in chunks, each chunk with a single broker producer.
+
+    Tasks of deliveries to targets with an open circuit breaker are scheduled for
+    when the breaker closes.
+    """
+    delays: Dict[str, float] = {}
+    for delivery in deliveries:
+        target_url = delivery.webhook.target_url
+        if target_url not in delays:
+            delays[target_url] = get_open_circuit_delay(target_url)
+
+    for index in range(0, len(deliveries), WEBHOOK_TASKS_CHUNK_SIZE):
+        chunk = deliveries[index : index + WEBHOOK_TASKS_CHUNK_SIZE]
+        group(
+            send_webhook_request_async.s(delivery.id).set(
+                countdown=delays[delivery.webhook.target_url] or None
+            )
+            for delivery in chunk
+        ).apply_async()
+
+
+def get_delivery_delay(delivery: EventDelivery) -> float:
+    """Return the number of seconds by which the delivery is deferred.
+
+    Deliveries are deferred while the circuit breaker of the target is open and
+    when the app exceeds its rate limit.
+    """
+    webhook = delivery.webhook
+    return get_circuit_breaker_delay(webhook.target_url) or get_rate_limit_delay(
+        webhook.app_id, delivery.id
+    )
+
+
 @app.task(
     queue=settings.WEBHOOK_CELERY_QUEUE_NAME,
     bind=True,
@@ -181,6 +324,18 @@ def send_webhook_request_async(self, event_delivery_id):
         return None
 
     webhook = delivery.webhook
+    delay = get_delivery_delay(delivery)
+    if delay:
+        # Defer the delivery without counting it as a retry.
+        task_logger.info(
+            "[Webhook ID:%r] Delivery id: %r deferred by %.1f s.",
+            webhook.id,
+            delivery.id,
+            delay,
+        )
+        self.signature_from_request(countdown=delay).apply_async()
+        return None
+
     domain = get_domain()
     attempt = create_attempt(delivery, self.request.id)
     delivery_status = EventDeliveryStatus.SUCCESS
@@ -189,7 +344,7 @@ def send_webhook_request_async(self, event_delivery_id):
             raise ValueError(
                 "Event delivery id: %r has no payload." % event_delivery_id
             )
-        data = delivery.payload.payload
+        data = delivery.payload.get_payload()
         with webhooks_opentracing_trace(delivery.event_type, domain, app=webhook.app):
             response = send_webhook_using_scheme_method(
                 webhook.target_url,
@@ -201,6 +356,7 @@ def send_webhook_request_async(self, event_delivery_id):
             )
 
         attempt_update(attempt, response)
+        record_delivery_attempt(webhook.target_url, response.status)
         if response.status == EventDeliveryStatus.FAILED:
             handle_webhook_retry(self, webhook, response.content, delivery, attempt)
             delivery_status = EventDeliveryStatus.FAILED
@@ -221,57 +377,83 @@ def send_webhook_request_async(self, event_delivery_id):
     clear_successful_delivery(delivery)
 
 
-def send_observability_events(webhooks: List[WebhookData], events: List[Any]):
+def _send_observability_events_to_webhook(
+    webhook: WebhookData, events: List[Any], deadline: float
+):
     event_type = WebhookEventAsyncType.OBSERVABILITY
-    for webhook in webhooks:
-        scheme = urlparse(webhook.target_url).scheme.lower()
-        failed = 0
-        extra = {
-            "webhook_id": webhook.id,
-            "webhook_target_url": webhook.target_url,
-            "events_count": len(events),
-        }
-        try:
-            if scheme in [WebhookSchemes.AWS_SQS, WebhookSchemes.GOOGLE_CLOUD_PUBSUB]:
-                for event in events:
-                    response = send_webhook_using_scheme_method(
-                        webhook.target_url,
-                        webhook.saleor_domain,
-                        webhook.secret_key,
-                        event_type,
-                        observability.dump_payload(event),
-                    )
-                    if response.status == EventDeliveryStatus.FAILED:
-                        failed += 1
-            else:
+    scheme = urlparse(webhook.target_url).scheme.lower()
+    extra = {
+        "webhook_id": webhook.id,
+        "webhook_target_url": webhook.target_url,
+        "events_count": len(events),
+    }
+    # Message queues receive each event separately, HTTP targets receive the events
+    # in batches limited by OBSERVABILITY_WEBHOOK_BATCH_SIZE.
+    batches: List[Tuple[Any, int]]
+    if scheme in [WebhookSchemes.AWS_SQS, WebhookSchemes.GOOGLE_CLOUD_PUBSUB]:
+        batches = [(event, 1) for event in events]
+    else:
+        batch_size = max(1, settings.OBSERVABILITY_WEBHOOK_BATCH_SIZE)
+        chunks = [events[i : i + batch_size] for i in range(0, len(events), batch_size)]
+        batches = [(chunk, len(chunk)) for chunk in chunks]
+
+    failed, not_sent = 0, 0
+    response = None
+    start = time.monotonic()
+    with observability.opentracing_trace("send_events_to_webhook", "webhooks") as span:
+        for index, (batch, batch_events_count) in enumerate(batches):
+            # Don't let a slow target hold the events of the next reports.
+            remaining_time = deadline - time.monotonic()
+            if remaining_time <= 0:
+                not_sent = sum(count for _, count in batches[index:])
+                break
+            try:
                 response = send_webhook_using_scheme_method(
                     webhook.target_url,
                     webhook.saleor_domain,
                     webhook.secret_key,
                     event_type,
-                    observability.dump_payload(events),
+                    observability.dump_payload(batch),
+                    timeout=min(remaining_time, settings.WEBHOOK_TIMEOUT),
                 )
-                if response.status == EventDeliveryStatus.FAILED:
-                    failed = len(events)
-        except ValueError:
-            logger.error(
-                "Webhook ID: %r unknown webhook scheme: %r.",
-                webhook.id,
-                scheme,
-                extra={**extra, "dropped_events_count": len(events)},
-            )
-            continue
-        if failed:
-            logger.info(
-                "Webhook ID: %r failed request to %r (%s/%s events dropped): %r.",
-                webhook.id,
-                webhook.target_url,
-                failed,
-                len(events),
-                response.content,
-                extra={**extra, "dropped_events_count": failed},
-            )
-            continue
+            except ValueError:
+                not_sent = sum(count for _, count in batches[index:])
+                logger.error(
+                    "Webhook ID: %r unknown webhook scheme: %r.",
+                    webhook.id,
+                    scheme,
+                    extra={**extra, "dropped_events_count": failed + not_sent},
+                )
+                return
+            if response.status == EventDeliveryStatus.FAILED:
+                failed += batch_events_count
+        batch_latency = time.monotonic() - start
+        span.set_tag("webhook.id", webhook.id)
+        span.set_tag("events.count", len(events))
+        span.set_tag("events.dropped", failed + not_sent)
+        span.set_tag("batch.latency", batch_latency)
+
+    extra["batch_latency"] = batch_latency
+    if not_sent:
+        logger.info(
+            "Webhook ID: %r timed out sending to %r (%s/%s events dropped).",
+            webhook.id,
+            webhook.target_url,
+            failed + not_sent,
+            len(events),
+            extra={**extra, "dropped_events_count": failed + not_sent},
+        )
+    elif failed:
+        logger.info(
+            "Webhook ID: %r failed request to %r (%s/%s events dropped): %r.",
+            webhook.id,
+            webhook.target_url,
+            failed,
+            len(events),
+            response.content if response else None,
+            extra={**extra, "dropped_events_count": failed},
+        )
+    else:
         logger.debug(
             "Successful delivered %s events to %r.",
             len(events),
@@ -280,6 +462,32 @@ def send_observability_events(webhooks: List[WebhookData], events: List[Any]):
         )
 
 
+def send_observability_events(webhooks: List[WebhookData], events: List[Any]):
+    """Send the events to all observability webhooks concurrently.
+
+    Each webhook gets OBSERVABILITY_WEBHOOK_TIMEOUT to deliver the events, requests
+    time out when it runs out and the events not sent by then are dropped, so a slow
+    target doesn't delay the other ones.
+    """
+    deadline = time.monotonic() + settings.OBSERVABILITY_WEBHOOK_TIMEOUT.total_seconds()
+    if len(webhooks) == 1:
+        _send_observability_events_to_webhook(webhooks[0], events, deadline)
+        return
+    max_workers = min(len(webhooks), settings.OBSERVABILITY_MAX_WORKERS)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(
+                _send_observability_events_to_webhook, webhook, events, deadline
+            )
+            for webhook in webhooks
+        ]
+        for future in futures:
+            try:
+                future.result()
+            except Exception:
+                logger.error("Could not send observability events.", exc_info=True)
+
+
 @app.task
 def observability_send_events():
     with observability.opentracing_trace("send_events_task", "task"):
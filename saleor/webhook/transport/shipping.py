@@ -19,7 +19,14 @@ from ...plugins.base_plugin import ExcludedShippingMethod
 from ...shipping.interface import ShippingMethodData
 from ...webhook.utils import get_webhooks_for_event
 from ..const import APP_ID_PREFIX, CACHE_EXCLUDED_SHIPPING_TIME
-from .synchronous.transport import trigger_webhook_sync
+from .synchronous.coalescing import (
+    coalesce_request,
+    get_cache_timeout,
+    mark_fresh,
+    revalidate,
+    should_revalidate,
+)
+from .synchronous.transport import trigger_webhooks_sync
 
 logger = logging.getLogger(__name__)
 
@@ -97,33 +104,50 @@ def get_excluded_shipping_methods_or_fetch(
     """Return data of all excluded shipping methods.
 
     The data will be fetched from the cache. If missing it will fetch it from all
-    defined webhooks by calling a request to each of them one by one.
+    defined webhooks by sending the requests to all of them concurrently. Concurrent
+    calls for the same cache key wait for a single round of requests.
     """
-    cached_data = cache.get(cache_key)
-    if cached_data:
-        cached_payload, excluded_shipping_methods = cached_data
-        if (payload == cached_payload) or _compare_order_payloads(
-            payload, cached_payload
-        ):
-            return parse_excluded_shipping_methods(excluded_shipping_methods)
 
-    excluded_methods = []
-    # Gather responses from webhooks
-    for webhook in webhooks:
-        if not webhook:
-            continue
-        response_data = trigger_webhook_sync(
+    def get_cached_excluded_methods():
+        cached_data = cache.get(cache_key)
+        if cached_data:
+            cached_payload, excluded_shipping_methods = cached_data
+            if (payload == cached_payload) or _compare_order_payloads(
+                payload, cached_payload
+            ):
+                return excluded_shipping_methods
+        return None
+
+    def fetch():
+        excluded_methods = []
+        # Gather responses from webhooks
+        responses_data = trigger_webhooks_sync(
             event_type,
             payload,
-            webhook,
+            [webhook for webhook in webhooks if webhook],
             subscribable_object=subscribable_object,
             timeout=settings.WEBHOOK_SYNC_TIMEOUT,
         )
-        if response_data:
-            excluded_methods.extend(
-                get_excluded_shipping_methods_from_response(response_data)
-            )
-    cache.set(cache_key, (payload, excluded_methods), CACHE_EXCLUDED_SHIPPING_TIME)
+        for response_data in responses_data:
+            if response_data:
+                excluded_methods.extend(
+                    get_excluded_shipping_methods_from_response(response_data)
+                )
+        cache.set(
+            cache_key,
+            (payload, excluded_methods),
+            get_cache_timeout(CACHE_EXCLUDED_SHIPPING_TIME),
+        )
+        mark_fresh(cache_key, CACHE_EXCLUDED_SHIPPING_TIME)
+        return excluded_methods
+
+    excluded_methods = get_cached_excluded_methods()
+    if excluded_methods is None:
+        excluded_methods = coalesce_request(
+            cache_key, payload, fetch, get_cached_excluded_methods
+        )
+    elif should_revalidate(cache_key):
+        excluded_methods = revalidate(cache_key, fetch, excluded_methods)
     return parse_excluded_shipping_methods(excluded_methods)
 
 
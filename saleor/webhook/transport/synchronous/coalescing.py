@@ -0,0 +1,145 @@
+"""Request coalescing and stale-while-revalidate for cached sync webhook responses.
+
+When a response is not cached, only one request per cache key is sent at a time.
+Threads of the same process wait for the result of the thread sending the same
+payload, other processes wait, using a cache lock, until the result is cached.
+
+With `WEBHOOK_SYNC_CACHE_STALE_GRACE_PERIOD` set, responses are kept in the cache
+for the grace period after they expire. A stale response is returned right away,
+while a single caller sends the request to revalidate it.
+"""
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+LOCK_KEY_SUFFIX = ":lock"
+FRESH_KEY_SUFFIX = ":fresh"
+REVALIDATE_KEY_SUFFIX = ":revalidate"
+POLL_INTERVAL = 0.05
+
+
+class _InFlightRequest:
+    def __init__(self):
+        self.done = threading.Event()
+        self.failed = False
+        self.result: Any = None
+
+
+_in_flight_requests: Dict[Tuple[str, str], _InFlightRequest] = {}
+_in_flight_requests_lock = threading.Lock()
+
+
+def coalesce_request(
+    cache_key: str,
+    payload: str,
+    fetch: Callable[[], T],
+    get_cached: Callable[[], Optional[T]],
+) -> T:
+    """Call `fetch` once for all concurrent callers with the same cache key.
+
+    `fetch` is expected to store its result in the cache, and `get_cached` to return
+    the stored result or None. The result of a request is only shared with the
+    threads sending the same payload, as the cache key may not cover all of it.
+    Callers that wait longer than `WEBHOOK_SYNC_COALESCING_TIMEOUT` call `fetch`
+    themselves.
+    """
+    in_flight_key = (cache_key, payload)
+    with _in_flight_requests_lock:
+        in_flight_request = _in_flight_requests.get(in_flight_key)
+        is_owner = in_flight_request is None
+        if in_flight_request is None:
+            in_flight_request = _InFlightRequest()
+            _in_flight_requests[in_flight_key] = in_flight_request
+
+    if not is_owner:
+        timeout = settings.WEBHOOK_SYNC_COALESCING_TIMEOUT
+        if in_flight_request.done.wait(timeout) and not in_flight_request.failed:
+            return in_flight_request.result
+        return fetch()
+
+    try:
+        in_flight_request.result = _coalesce_between_processes(
+            cache_key, fetch, get_cached
+        )
+    except Exception:
+        in_flight_request.failed = True
+        raise
+    finally:
+        in_flight_request.done.set()
+        with _in_flight_requests_lock:
+            _in_flight_requests.pop(in_flight_key, None)
+    return in_flight_request.result
+
+
+def _coalesce_between_processes(
+    cache_key: str, fetch: Callable[[], T], get_cached: Callable[[], Optional[T]]
+) -> T:
+    timeout = settings.WEBHOOK_SYNC_COALESCING_TIMEOUT
+    lock_key = cache_key + LOCK_KEY_SUFFIX
+    if cache.add(lock_key, True, timeout):
+        try:
+            return fetch()
+        finally:
+            cache.delete(lock_key)
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        time.sleep(POLL_INTERVAL)
+        cached_value = get_cached()
+        if cached_value is not None:
+            return cached_value
+        if cache.get(lock_key) is None:
+            # The request in flight failed or its response wasn't cached.
+            break
+    return fetch()
+
+
+def get_cache_timeout(timeout: int) -> int:
+    """Return the time for which a response is kept in the cache, stale or not."""
+    return timeout + settings.WEBHOOK_SYNC_CACHE_STALE_GRACE_PERIOD
+
+
+def mark_fresh(cache_key: str, timeout: int):
+    if settings.WEBHOOK_SYNC_CACHE_STALE_GRACE_PERIOD:
+        cache.set(cache_key + FRESH_KEY_SUFFIX, True, timeout)
+
+
+def should_revalidate(cache_key: str) -> bool:
+    """Return True if the cached response is stale and the caller should refresh it.
+
+    Only one caller at a time gets True for a cache key, the others keep using
+    the stale response.
+    """
+    if not settings.WEBHOOK_SYNC_CACHE_STALE_GRACE_PERIOD:
+        return False
+    if cache.get(cache_key + FRESH_KEY_SUFFIX):
+        return False
+    return cache.add(
+        cache_key + REVALIDATE_KEY_SUFFIX,
+        True,
+        settings.WEBHOOK_SYNC_COALESCING_TIMEOUT,
+    )
+
+
+def revalidate(cache_key: str, fetch: Callable[[], Optional[T]], stale_value: T) -> T:
+    """Refresh a stale response, fall back to the stale one if the request fails."""
+    try:
+        value = fetch()
+    except Exception:
+        logger.warning("Could not revalidate cached webhook response.", exc_info=True)
+        value = None
+    finally:
+        finish_revalidation(cache_key)
+    return stale_value if value is None else value
+
+
+def finish_revalidation(cache_key: str):
+    cache.delete(cache_key + REVALIDATE_KEY_SUFFIX)
@@ -1,7 +1,21 @@
+import hashlib
 import json
 import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
 from json import JSONDecodeError
-from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Tuple, TypeVar
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    TypeVar,
+)
 from urllib.parse import urlparse
 
 from celery.utils.log import get_task_logger
@@ -10,7 +24,7 @@ from django.core.cache import cache
 
 from ....celeryconf import app
 from ....core import EventDeliveryStatus
-from ....core.models import EventDelivery, EventPayload
+from ....core.models import EventDelivery, EventDeliveryAttempt, EventPayload
 from ....core.tracing import webhooks_opentracing_trace
 from ....core.utils import get_domain
 from ....graphql.webhook.subscription_payload import (
@@ -38,6 +52,14 @@ from ..utils import (
     handle_webhook_retry,
     send_webhook_using_http,
 )
+from .coalescing import (
+    coalesce_request,
+    finish_revalidation,
+    get_cache_timeout,
+    mark_fresh,
+    revalidate,
+    should_revalidate,
+)
 
 if TYPE_CHECKING:
     from ....webhook.models import Webhook
@@ -48,6 +70,10 @@ R = TypeVar("R")
 logger = logging.getLogger(__name__)
 task_logger = get_task_logger(__name__)
 
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_pid: Optional[int] = None
+_executor_lock = threading.Lock()
+
 
 @app.task(
     bind=True,
@@ -83,11 +109,17 @@ def handle_transaction_request_task(self, delivery_id, request_event_id):
     )
 
 
-def _send_webhook_request_sync(
-    delivery, timeout=settings.WEBHOOK_SYNC_TIMEOUT, attempt=None
-) -> Tuple[WebhookResponse, Optional[Dict[Any, Any]]]:
+class SyncWebhookRequest(NamedTuple):
+    delivery: EventDelivery
+    attempt: EventDeliveryAttempt
+    domain: str
+    message: bytes
+    signature: str
+
+
+def _prepare_webhook_request_sync(delivery, attempt=None) -> SyncWebhookRequest:
     event_payload = delivery.payload
-    data = event_payload.payload
+    data = event_payload.get_payload()
     webhook = delivery.webhook
     parts = urlparse(webhook.target_url)
     domain = get_domain()
@@ -105,18 +137,29 @@ def _send_webhook_request_sync(
     )
     if attempt is None:
         attempt = create_attempt(delivery=delivery, task_id=None)
+    # Make sure the app is fetched before the request is sent from another thread.
+    webhook.app
+    return SyncWebhookRequest(delivery, attempt, domain, message, signature)
+
+
+def _send_prepared_webhook_request_sync(
+    request: SyncWebhookRequest, timeout=settings.WEBHOOK_SYNC_TIMEOUT
+) -> Tuple[WebhookResponse, Optional[Dict[Any, Any]]]:
+    """Send a prepared sync webhook request without accessing the database."""
+    delivery, attempt = request.delivery, request.attempt
+    webhook = delivery.webhook
     response = WebhookResponse(content="")
     response_data = None
 
     try:
         with webhooks_opentracing_trace(
-            delivery.event_type, domain, sync=True, app=webhook.app
+            delivery.event_type, request.domain, sync=True, app=webhook.app
         ):
             response = send_webhook_using_http(
                 webhook.target_url,
-                message,
-                domain,
-                signature,
+                request.message,
+                request.domain,
+                request.signature,
                 delivery.event_type,
                 timeout=timeout,
                 custom_headers=webhook.custom_headers,
@@ -148,11 +191,24 @@ def _send_webhook_request_sync(
                 webhook.target_url,
                 attempt.id,
             )
+    return response, response_data
+
+
+def _finish_webhook_request_sync(
+    request: SyncWebhookRequest, response: WebhookResponse
+):
+    attempt_update(request.attempt, response)
+    delivery_update(request.delivery, response.status)
+    observability.report_event_delivery_attempt(request.attempt)
+    clear_successful_delivery(request.delivery)
 
-    attempt_update(attempt, response)
-    delivery_update(delivery, response.status)
-    observability.report_event_delivery_attempt(attempt)
-    clear_successful_delivery(delivery)
+
+def _send_webhook_request_sync(
+    delivery, timeout=settings.WEBHOOK_SYNC_TIMEOUT, attempt=None
+) -> Tuple[WebhookResponse, Optional[Dict[Any, Any]]]:
+    request = _prepare_webhook_request_sync(delivery, attempt)
+    response, response_data = _send_prepared_webhook_request_sync(request, timeout)
+    _finish_webhook_request_sync(request, response)
     return response, response_data
 
 
@@ -163,6 +219,72 @@ def send_webhook_request_sync(
     return response_data if response.status == EventDeliveryStatus.SUCCESS else None
 
 
+def _get_executor() -> ThreadPoolExecutor:
+    """Return the thread pool sending the sync webhook requests of the process."""
+    global _executor, _executor_pid
+    with _executor_lock:
+        if _executor is None or _executor_pid != os.getpid():
+            # Threads of the parent process don't exist after a fork.
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.WEBHOOK_SYNC_MAX_WORKERS,
+                thread_name_prefix="sync-webhook",
+            )
+            _executor_pid = os.getpid()
+        return _executor
+
+
+def _limit_timeout(timeout, limit: float):
+    if isinstance(timeout, tuple):
+        return tuple(min(value, limit) for value in timeout)
+    return min(timeout, limit)
+
+
+def send_webhook_requests_sync(
+    deliveries: List[EventDelivery], timeout=settings.WEBHOOK_SYNC_TIMEOUT
+) -> List[Optional[Dict[Any, Any]]]:
+    """Send synchronous webhook requests concurrently.
+
+    Deliveries and their attempts are updated in the calling thread, only the HTTP
+    requests are sent from the thread pool shared by the process. Responses are
+    returned in the order of deliveries. Requests not finished within
+    `WEBHOOK_SYNC_DEADLINE` are failed.
+    """
+    if len(deliveries) < 2 or settings.WEBHOOK_SYNC_MAX_WORKERS < 2:
+        return [send_webhook_request_sync(delivery, timeout) for delivery in deliveries]
+
+    requests = [_prepare_webhook_request_sync(delivery) for delivery in deliveries]
+    # Requests exceeding the deadline keep a worker busy until they time out.
+    timeout = _limit_timeout(timeout, settings.WEBHOOK_SYNC_DEADLINE)
+    executor = _get_executor()
+    futures = [
+        executor.submit(_send_prepared_webhook_request_sync, request, timeout)
+        for request in requests
+    ]
+    wait(futures, timeout=settings.WEBHOOK_SYNC_DEADLINE)
+    for future in futures:
+        future.cancel()
+
+    responses_data = []
+    for request, future in zip(requests, futures):
+        response_data = None
+        if future.done() and not future.cancelled():
+            response, response_data = future.result()
+        else:
+            logger.info(
+                "[Webhook] Request to %r exceeded the deadline of sync webhooks.",
+                request.delivery.webhook.target_url,
+            )
+            response = WebhookResponse(
+                content="Webhook request exceeded the deadline.",
+                status=EventDeliveryStatus.FAILED,
+            )
+        _finish_webhook_request_sync(request, response)
+        if response.status != EventDeliveryStatus.SUCCESS:
+            response_data = None
+        responses_data.append(response_data)
+    return responses_data
+
+
 def trigger_webhook_sync_if_not_cached(
     event_type: str,
     payload: str,
@@ -177,13 +299,17 @@ def trigger_webhook_sync_if_not_cached(
 
     - Send a synchronous webhook request if cache is expired.
     - Fetch response from cache if it is still valid.
+    - Send a single request for concurrent calls with the same cache key.
+    - Return a stale response while it's revalidated, when
+      `WEBHOOK_SYNC_CACHE_STALE_GRACE_PERIOD` is set.
     """
 
     cache_key = generate_cache_key_for_webhook(
         cache_data, webhook.target_url, event_type, webhook.app_id
     )
-    response_data = cache.get(cache_key)
-    if response_data is None:
+    cache_timeout = cache_timeout or WEBHOOK_CACHE_DEFAULT_TIMEOUT
+
+    def fetch():
         response_data = trigger_webhook_sync(
             event_type,
             payload,
@@ -196,8 +322,16 @@ def trigger_webhook_sync_if_not_cached(
             cache.set(
                 cache_key,
                 response_data,
-                timeout=cache_timeout or WEBHOOK_CACHE_DEFAULT_TIMEOUT,
+                timeout=get_cache_timeout(cache_timeout),
             )
+            mark_fresh(cache_key, cache_timeout)
+        return response_data
+
+    response_data = cache.get(cache_key)
+    if response_data is None:
+        return coalesce_request(cache_key, payload, fetch, lambda: cache.get(cache_key))
+    if should_revalidate(cache_key):
+        return revalidate(cache_key, fetch, response_data)
     return response_data
 
 
@@ -250,32 +384,43 @@ def create_delivery_for_subscription_sync_event(
     return event_delivery
 
 
-def trigger_webhook_sync(
+def _create_delivery_sync(
     event_type: str,
     payload: str,
     webhook: "Webhook",
     subscribable_object=None,
-    timeout=None,
     request=None,
-) -> Optional[Dict[Any, Any]]:
-    """Send a synchronous webhook request."""
+) -> Optional[EventDelivery]:
     if webhook.subscription_query:
-        delivery = create_delivery_for_subscription_sync_event(
+        return create_delivery_for_subscription_sync_event(
             event_type=event_type,
             subscribable_object=subscribable_object,
             webhook=webhook,
             request=request,
         )
-        if not delivery:
-            return None
-    else:
-        event_payload = EventPayload.objects.create(payload=payload)
-        delivery = EventDelivery.objects.create(
-            status=EventDeliveryStatus.PENDING,
-            event_type=event_type,
-            payload=event_payload,
-            webhook=webhook,
-        )
+    event_payload = EventPayload.objects.create(payload=payload)
+    return EventDelivery.objects.create(
+        status=EventDeliveryStatus.PENDING,
+        event_type=event_type,
+        payload=event_payload,
+        webhook=webhook,
+    )
+
+
+def trigger_webhook_sync(
+    event_type: str,
+    payload: str,
+    webhook: "Webhook",
+    subscribable_object=None,
+    timeout=None,
+    request=None,
+) -> Optional[Dict[Any, Any]]:
+    """Send a synchronous webhook request."""
+    delivery = _create_delivery_sync(
+        event_type, payload, webhook, subscribable_object, request
+    )
+    if not delivery:
+        return None
 
     kwargs = {}
     if timeout:
@@ -284,6 +429,142 @@ def trigger_webhook_sync(
     return send_webhook_request_sync(delivery, **kwargs)
 
 
+def trigger_webhooks_sync(
+    event_type: str,
+    payload: str,
+    webhooks: List["Webhook"],
+    subscribable_object=None,
+    timeout=None,
+    request=None,
+) -> List[Optional[Dict[Any, Any]]]:
+    """Send synchronous webhook requests concurrently.
+
+    Return the responses in the order of webhooks.
+    """
+    if request is None and any(webhook.subscription_query for webhook in webhooks):
+        request = initialize_request(
+            sync_event=event_type in WebhookEventSyncType.ALL, event_type=event_type
+        )
+    deliveries = [
+        _create_delivery_sync(
+            event_type, payload, webhook, subscribable_object, request
+        )
+        for webhook in webhooks
+    ]
+
+    kwargs = {}
+    if timeout:
+        kwargs = {"timeout": timeout}
+
+    responses_data = iter(
+        send_webhook_requests_sync(
+            [delivery for delivery in deliveries if delivery], **kwargs
+        )
+    )
+    return [next(responses_data) if delivery else None for delivery in deliveries]
+
+
+def trigger_webhooks_sync_if_not_cached(
+    event_type: str,
+    payload: str,
+    webhooks: List["Webhook"],
+    cache_data: dict,
+    subscribable_object=None,
+    request_timeout=None,
+    cache_timeout=None,
+    request=None,
+) -> List[Optional[dict]]:
+    """Get responses for synchronous webhooks in the order of webhooks.
+
+    Works like `trigger_webhook_sync_if_not_cached` called for each webhook, with
+    the requests for the missing and stale responses sent concurrently.
+    """
+    if len(webhooks) < 2:
+        return [
+            trigger_webhook_sync_if_not_cached(
+                event_type,
+                payload,
+                webhook,
+                cache_data,
+                subscribable_object=subscribable_object,
+                request_timeout=request_timeout,
+                cache_timeout=cache_timeout,
+                request=request,
+            )
+            for webhook in webhooks
+        ]
+
+    cache_keys = [
+        generate_cache_key_for_webhook(
+            cache_data, webhook.target_url, event_type, webhook.app_id
+        )
+        for webhook in webhooks
+    ]
+    cache_timeout = cache_timeout or WEBHOOK_CACHE_DEFAULT_TIMEOUT
+
+    def fetch(indexes):
+        responses_data = trigger_webhooks_sync(
+            event_type,
+            payload,
+            [webhooks[index] for index in indexes],
+            subscribable_object=subscribable_object,
+            timeout=request_timeout,
+            request=request,
+        )
+        for index, response_data in zip(indexes, responses_data):
+            if response_data is not None:
+                cache.set(
+                    cache_keys[index],
+                    response_data,
+                    timeout=get_cache_timeout(cache_timeout),
+                )
+                mark_fresh(cache_keys[index], cache_timeout)
+        return responses_data
+
+    responses = [cache.get(cache_key) for cache_key in cache_keys]
+    missing = [index for index, response in enumerate(responses) if response is None]
+    stale = [
+        index
+        for index, response in enumerate(responses)
+        if response is not None and should_revalidate(cache_keys[index])
+    ]
+
+    def get_cached_missing():
+        cached = [cache.get(cache_keys[index]) for index in missing]
+        return None if any(response is None for response in cached) else cached
+
+    if stale:
+        # Stale responses are revalidated together with the missing ones.
+        indexes = sorted(missing + stale)
+        try:
+            fetched = fetch(indexes)
+        except Exception:
+            if missing:
+                raise
+            logger.warning(
+                "Could not revalidate cached webhook responses.", exc_info=True
+            )
+            fetched = [None] * len(indexes)
+        finally:
+            for index in stale:
+                finish_revalidation(cache_keys[index])
+    elif missing:
+        indexes = missing
+        batch_key = hashlib.sha256(
+            ":".join(cache_keys[index] for index in missing).encode("utf-8")
+        ).hexdigest()
+        fetched = coalesce_request(
+            batch_key, payload, lambda: fetch(missing), get_cached_missing
+        )
+    else:
+        return responses
+
+    for index, response_data in zip(indexes, fetched):
+        if response_data is not None:
+            responses[index] = response_data
+    return responses
+
+
 def trigger_all_webhooks_sync(
     event_type: str,
     generate_payload: Callable,
@@ -21,13 +21,14 @@ from requests_hardened.ip_filter import InvalidIPAddress
 
 from ...app.headers import AppHeaders, DeprecatedAppHeaders
 from ...app.models import App
-from ...core.http_client import HTTPClient
+from ...core.http_client import PooledHTTPClient
 from ...core.models import (
     EventDelivery,
     EventDeliveryAttempt,
     EventDeliveryStatus,
     EventPayload,
 )
+from ...core.tasks import delete_event_payload_files_task
 from ...core.taxes import TaxData, TaxLineData
 from ...core.utils import build_absolute_uri
 from ...core.utils.events import call_event
@@ -131,7 +132,7 @@ def send_webhook_using_http(
         headers.update(custom_headers)
 
     try:
-        response = HTTPClient.send_request(
+        response = PooledHTTPClient.send_request(
             "POST",
             target_url,
             data=message,
@@ -261,6 +262,7 @@ def send_webhook_using_scheme_method(
     event_type,
     data,
     custom_headers=None,
+    timeout=settings.WEBHOOK_TIMEOUT,
 ) -> WebhookResponse:
     parts = urlparse(target_url)
     message = data.encode("utf-8")
@@ -281,6 +283,7 @@ def send_webhook_using_scheme_method(
             signature,
             event_type,
             custom_headers=custom_headers,
+            timeout=timeout,
         )
     raise ValueError("Unknown webhook scheme: %r" % (parts.scheme,))
 
@@ -385,9 +388,17 @@ def attempt_update(
 def clear_successful_delivery(delivery: "EventDelivery"):
     if delivery.status == EventDeliveryStatus.SUCCESS:
         payload_id = delivery.payload_id
+        # The transports fetch the payload together with the delivery.
+        payload = delivery.payload if payload_id else None
         delivery.delete()
-        if payload_id:
-            EventPayload.objects.filter(pk=payload_id, deliveries__isnull=True).delete()
+        if not payload_id:
+            return
+        deleted, _ = EventPayload.objects.filter(
+            pk=payload_id, deliveries__isnull=True
+        ).delete()
+        # The payload is kept while other deliveries share it.
+        if deleted and payload and payload.payload_path:
+            delete_event_payload_files_task.delay([payload.payload_path])
 
 
 def delivery_update(delivery: "EventDelivery", status: str):
@@ -1,10 +1,10 @@
 from typing import TYPE_CHECKING, Optional
 
-from django.conf import settings
 from django.db.models import Q
 from django.db.models.expressions import Exists, OuterRef
 
 from ..app.models import App
+from ..core.replicas import get_replica_connection_name
 from .event_types import WebhookEventAsyncType, WebhookEventSyncType
 from .models import Webhook, WebhookEvent
 
@@ -42,18 +42,17 @@ def get_webhooks_for_event(
     if apps_identifier:
         app_kwargs["identifier__in"] = apps_identifier
 
-    apps = App.objects.using(settings.DATABASE_CONNECTION_REPLICA_NAME).filter(
-        **app_kwargs
-    )
+    connection_name = get_replica_connection_name()
+    apps = App.objects.using(connection_name).filter(**app_kwargs)
     event_types = [event_type]
     if event_type in WebhookEventAsyncType.ALL:
         event_types.append(WebhookEventAsyncType.ANY)
 
-    webhook_events = WebhookEvent.objects.using(
-        settings.DATABASE_CONNECTION_REPLICA_NAME
-    ).filter(event_type__in=event_types)
+    webhook_events = WebhookEvent.objects.using(connection_name).filter(
+        event_type__in=event_types
+    )
     return (
-        webhooks.using(settings.DATABASE_CONNECTION_REPLICA_NAME)
+        webhooks.using(connection_name)
         .filter(
             Q(is_active=True, app__in=apps)
             & Q(Exists(webhook_events.filter(webhook_id=OuterRef("id"))))